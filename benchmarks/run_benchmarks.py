@@ -0,0 +1,653 @@
+"""
+离线性能基准。
+
+用 `benchmarks.synthetic_jacket` 生成的合成模型 / 清单驱动关键流水线阶段，
+逐阶段记录耗时与峰值内存，写出 JSON 结果，并可与基线对比标记回归：
+
+    python -m benchmarks.run_benchmarks --preset small
+    python -m benchmarks.run_benchmarks --preset medium --update-baseline
+    python -m benchmarks.run_benchmarks --preset medium --threshold 0.2
+
+依赖缺失（pandas / SQLAlchemy / jinja2 / Windows COM 等）的阶段记为 skipped，
+不影响其他阶段；存在回归时进程返回码为 1。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPORT_MODULE_ROOT = PROJECT_ROOT / "pages" / "output_feasibility_analysis_report"
+SPECIAL_STRATEGY_INPUTS = PROJECT_ROOT / "special_strategy_inputs"
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baseline.json"
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "benchmarks" / "results"
+RESULT_SCHEMA_VERSION = 1
+
+# 绝对量低于该值的波动不算回归，避免毫秒级阶段被噪声误判。
+MIN_REGRESSION_SECONDS = 0.02
+MIN_REGRESSION_PEAK_MB = 1.0
+
+DEFAULT_FILE_RECORDS = {"small": 2_000, "medium": 20_000, "large": 100_000}
+
+
+def _ensure_import_path() -> None:
+    for path in (PROJECT_ROOT, REPORT_MODULE_ROOT):
+        text = str(path)
+        if text not in sys.path:
+            sys.path.insert(0, text)
+
+
+_ensure_import_path()
+
+from benchmarks.synthetic_jacket import (  # noqa: E402
+    JacketModel,
+    PRESETS,
+    expected_listing_counts,
+    spec_for_preset,
+    write_synthetic_bundle,
+)
+
+
+class StageSkipped(Exception):
+    pass
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str = "ok"
+    seconds: list[float] = field(default_factory=list)
+    seconds_min: float | None = None
+    seconds_median: float | None = None
+    peak_mb: float | None = None
+    detail: dict[str, Any] = field(default_factory=dict)
+    message: str = ""
+
+
+@dataclass
+class BenchContext:
+    preset: str
+    workdir: Path
+    model: JacketModel
+    sacinp_path: Path
+    psilst_path: Path
+    file_records: int
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+def _require(module_name: str):
+    try:
+        return __import__(module_name, fromlist=["*"])
+    except ImportError as exc:
+        missing = getattr(exc, "name", "") or module_name
+        raise StageSkipped(f"missing dependency: {missing}") from exc
+
+
+def _need(ctx: BenchContext, key: str) -> Any:
+    if key not in ctx.state:
+        raise StageSkipped(f"upstream stage did not produce {key!r}")
+    return ctx.state[key]
+
+
+# =========================
+# sacinp / 风险评级
+# =========================
+
+def _stage_parse_sacinp(ctx: BenchContext) -> dict[str, Any]:
+    tool = _require("pages.output_special_strategy.inspection_tool")
+    joints, groups, members, sections = tool.parse_sacinp(ctx.sacinp_path)
+    ctx.state["sacinp"] = (joints, groups, members, sections)
+    return {"joints": len(joints), "members": len(members), "groups": len(groups)}
+
+
+def _stage_classify_structure(ctx: BenchContext) -> dict[str, Any]:
+    tool = _require("pages.output_special_strategy.inspection_tool")
+    joints, _, members, _ = _need(ctx, "sacinp")
+    joints2, members2 = tool.classify_structure(
+        joints,
+        members,
+        ctx.model.work_points,
+        ctx.model.wp_z,
+        min_leg_od=610.0,
+        x_angle_deviation=15.0,
+    )
+    ctx.state["classified"] = (joints2, members2)
+    member_types = members2["MemberType"].fillna("").astype(str)
+    joint_types = joints2["JointType"].fillna("").astype(str)
+    return {
+        "leg_members": int((member_types == "LEG").sum()),
+        "x_brace_members": int((member_types == "X-Brace").sum()),
+        "leg_joints": int((joint_types == "LegJoint").sum()),
+        "x_joints": int((joint_types == "X Joint").sum()),
+    }
+
+
+def _risk_inputs(ctx: BenchContext) -> tuple[Any, ...]:
+    cached = ctx.state.get("risk_inputs")
+    if cached is not None:
+        return cached
+    tool = _require("pages.output_special_strategy.inspection_tool")
+    pd = _require("pandas")
+
+    cfg = tool.load_from_params_json(SPECIAL_STRATEGY_INPUTS / "special_strategy_params.json")
+    cfg["wp_z"] = ctx.model.wp_z
+    cfg["work_points"] = list(ctx.model.work_points)
+    rm = cfg["risk_pack"].rm
+
+    members = ctx.model.members
+    collapse_rows = [
+        {"LOCATION": f"{a}-{b}", "FACTOR": 1.2 + (index % 17) * 0.1}
+        for index, (a, b, _) in enumerate(members[:: max(1, len(members) // 200)])
+    ]
+    collapse_df = pd.DataFrame(collapse_rows, columns=["LOCATION", "FACTOR"])
+    collapse_summary_df = pd.DataFrame({"LastLoadFactor": [2.35, 2.6]})
+
+    fatigue_rows = []
+    brace_by_joint: dict[str, str] = {}
+    for a, b, _ in members:
+        brace_by_joint.setdefault(a, b)
+        brace_by_joint.setdefault(b, a)
+    for index, jid in enumerate(list(ctx.model.joints)):
+        brace = brace_by_joint.get(jid, "")
+        fatigue_rows.append(
+            {
+                "JOINT": jid,
+                "BRACE": brace,
+                "MEMBER": f"{jid}-{brace}",
+                "Dmax_percent": round(0.5 + (index * 37 % 400) / 10.0, 2),
+            }
+        )
+    fatigue_df = pd.DataFrame(fatigue_rows, columns=["JOINT", "BRACE", "MEMBER", "Dmax_percent"])
+
+    cached = (tool, cfg, rm, collapse_df, collapse_summary_df, fatigue_df)
+    ctx.state["risk_inputs"] = cached
+    return cached
+
+
+def _stage_build_member_risk(ctx: BenchContext) -> dict[str, Any]:
+    tool, cfg, rm, collapse_df, collapse_summary_df, _ = _risk_inputs(ctx)
+    _, members2 = _need(ctx, "classified")
+    df = tool.build_member_risk_vba(members2, collapse_df, collapse_summary_df, cfg, rm)
+    ctx.state["member_risk_df"] = df
+    return {"rows": len(df)}
+
+
+def _stage_build_joint_risk(ctx: BenchContext) -> dict[str, Any]:
+    tool, cfg, rm, collapse_df, collapse_summary_df, fatigue_df = _risk_inputs(ctx)
+    joints2, _ = _need(ctx, "classified")
+    df = tool.build_joint_risk_vba(joints2, fatigue_df, collapse_df, collapse_summary_df, cfg, rm)
+    ctx.state["joint_risk_df"] = df
+    return {"rows": len(df)}
+
+
+def _stage_build_joint_forecast(ctx: BenchContext) -> dict[str, Any]:
+    tool, cfg, rm, *_ = _risk_inputs(ctx)
+    joint_risk_df = _need(ctx, "joint_risk_df")
+    df = tool.build_joint_forecast_vba_wide(joint_risk_df, cfg, rm)
+    return {"rows": len(df)}
+
+
+# =========================
+# psilst
+# =========================
+
+def _stage_psilst_read_lines(ctx: BenchContext) -> dict[str, Any]:
+    reader = _require("src.parsers.psilst_reader")
+    lines = reader.read_lines(str(ctx.psilst_path))
+    ctx.state["psilst_lines"] = lines
+    return {"lines": len(lines), "bytes": ctx.psilst_path.stat().st_size}
+
+
+def _stage_psilst_read_ui_lines(ctx: BenchContext) -> dict[str, Any]:
+    reader = _require("src.parsers.psilst_reader")
+    lines = reader.read_ui_analysis_lines(str(ctx.psilst_path))
+    return {"lines": len(lines)}
+
+
+def _psilst_parser_stage(module_name: str, func_name: str, count_key: str) -> Callable[[BenchContext], dict[str, Any]]:
+    def _stage(ctx: BenchContext) -> dict[str, Any]:
+        module = _require(f"src.parsers.{module_name}")
+        lines = _need(ctx, "psilst_lines")
+        result = getattr(module, func_name)(lines)
+        rows = result if isinstance(result, list) else result.get("rows", [])
+        expected = getattr(expected_listing_counts(ctx.model), count_key)
+        if len(rows) != expected:
+            raise RuntimeError(f"{func_name} parsed {len(rows)} rows, expected {expected}")
+        return {"rows": len(rows)}
+
+    return _stage
+
+
+def _stage_build_analysis_results(ctx: BenchContext) -> dict[str, Any]:
+    report_service = _require("src.report_service")
+    result = report_service.build_analysis_results_for_ui(str(ctx.psilst_path), [])
+    return {"sections": len(result) if hasattr(result, "__len__") else 0}
+
+
+# =========================
+# 报告渲染
+# =========================
+
+def _synthetic_report_rows(ctx: BenchContext, time_nodes: list[str]) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
+    risk_levels = ["一", "二", "三", "四", "五"]
+    inspect_levels = ["II", "III", "IV"]
+    node_rows: list[dict[str, Any]] = []
+    for index, jid in enumerate(ctx.model.x_joint_ids + ctx.model.leg_joint_ids):
+        for t_index, time_node in enumerate(time_nodes):
+            level = (index + t_index) % 5 + 1
+            node_rows.append(
+                {
+                    "joint_id": jid,
+                    "brace": jid,
+                    "joint_type": "X Joint" if jid.endswith("X") else "LegJoint",
+                    "damage": round(0.01 * (index % 90), 4),
+                    "beta": 3.1,
+                    "pf": 1.0e-3,
+                    "time_node": time_node,
+                    "fatigue_prob_level": level,
+                    "collapse_prob_level": (level + 1) % 5 + 1,
+                    "combined_prob_level": level,
+                    "node_risk_level": risk_levels[level - 1],
+                    "inspect_level": inspect_levels[level % 3],
+                    "consequence_level": 2,
+                    "a": 0.272,
+                    "b": 0.158,
+                    "rm": 2.35,
+                    "vr": 0.1,
+                }
+            )
+    member_rows: list[dict[str, Any]] = []
+    for index, (a, b, gid) in enumerate(ctx.model.members):
+        level = index % 5 + 1
+        member_rows.append(
+            {
+                "joint_a": a,
+                "joint_b": b,
+                "member_type": {"LG1": "LEG", "XB1": "X-Brace"}.get(gid, "Other"),
+                "time_node": time_nodes[index % len(time_nodes)],
+                "collapse_prob_level": level,
+                "member_risk_level": risk_levels[level - 1],
+                "inspect_level": inspect_levels[index % 3],
+                "consequence_level": 2,
+                "a": 0.272,
+                "b": 0.158,
+                "rm": 2.35,
+                "vr": 0.1,
+            }
+        )
+    node_current = [row for row in node_rows if row["time_node"] == time_nodes[0]]
+    return node_current, node_rows, member_rows, member_rows
+
+
+def _stage_render_report(ctx: BenchContext) -> dict[str, Any]:
+    generator = _require("pages.output_special_strategy.report_jinja2_generator")
+    template = SPECIAL_STRATEGY_INPUTS / "special_strategy_report_template.docx"
+    if not template.exists():
+        raise StageSkipped(f"template not found: {template}")
+    metadata_path = SPECIAL_STRATEGY_INPUTS / "report_metadata.template.json"
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8-sig")) if metadata_path.exists() else {}
+    node_risk, node_strategy, member_risk, member_strategy = _synthetic_report_rows(ctx, list(generator.TIME_ORDER))
+    context = generator.build_context(node_risk, node_strategy, member_risk, member_strategy, metadata)
+    output = ctx.workdir / "report" / "synthetic_report.docx"
+    generator.render_report(template, output, context)
+    return {"node_rows": len(node_strategy), "member_rows": len(member_risk), "bytes": output.stat().st_size}
+
+
+# =========================
+# 文件列表
+# =========================
+
+def _file_service(ctx: BenchContext):
+    cached = ctx.state.get("file_service")
+    if cached is not None:
+        return cached
+    _require("sqlalchemy")
+    database = _require("shiyou_db.database")
+    models = _require("shiyou_db.models")
+    service_module = _require("shiyou_db.service")
+    from sqlalchemy.orm import sessionmaker
+
+    db_path = ctx.workdir / "file_records.sqlite3"
+    engine = database.build_engine_from_url(f"sqlite:///{db_path.as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    facilities = [f"WC{index // 4 + 1}-{index % 4 + 1}" for index in range(12)]
+    categories = ["结构模型文件", "海况文件", "桩基文件", "静力分析结果文件", "疲劳分析结果文件"]
+    with session_factory() as session:
+        if session.query(models.FileRecord).count() == 0:
+            file_type = models.FileType(code="bench", name="bench")
+            session.add(file_type)
+            session.flush()
+            now = datetime(2026, 1, 1)
+            session.bulk_save_objects(
+                [
+                    models.FileRecord(
+                        original_name=f"DOC-{index:07d}.pdf",
+                        stored_name=f"{index:07d}.pdf",
+                        file_ext=".pdf",
+                        file_type_id=file_type.id,
+                        module_code="doc_man" if index % 3 else "model_files",
+                        logical_path=f"{facilities[index % len(facilities)]}/{categories[index % len(categories)]}/{index % 40:02d}",
+                        facility_code=facilities[index % len(facilities)],
+                        storage_path=f"/bench/{index:07d}.pdf",
+                        file_size=1024 + index,
+                        file_hash=f"{index:064x}",
+                        uploaded_at=now,
+                        updated_at=now,
+                        category_name=categories[index % len(categories)],
+                        document_code=f"SY-{index % 97:02d}-{index:07d}",
+                        document_title=f"合成文档 {index} 结构检测报告",
+                        discipline_name=("结构", "安全", "工艺")[index % 3],
+                        is_deleted=index % 50 == 0,
+                    )
+                    for index in range(ctx.file_records)
+                ]
+            )
+            session.commit()
+
+    service = service_module.FileMetadataService.from_engine(engine, session_factory, ctx.workdir / "storage")
+    # bulk_save_objects 不触发 ORM 事件，切片索引需在写入后统一回填。
+    service.rebuild_search_index()
+    ctx.state["file_service"] = service
+    return service
+
+
+# 合成数据里 index % 12 == 1 的记录落在 WC1-2，且 index % 3 != 0，全部属于 doc_man。
+BENCH_FILE_MODULE = "doc_man"
+BENCH_FILE_FACILITY = "WC1-2"
+
+
+def _stage_list_files_page(ctx: BenchContext) -> dict[str, Any]:
+    service = _file_service(ctx)
+    # 取该设施记录中段的一页，记录数随预设变化。
+    offset = ctx.file_records // 24
+    rows = service.list_files(module_code=BENCH_FILE_MODULE, facility_code=BENCH_FILE_FACILITY, limit=100, offset=offset)
+    if not rows:
+        raise RuntimeError(f"list_files returned no rows for {BENCH_FILE_MODULE}/{BENCH_FILE_FACILITY} at offset {offset}")
+    return {"rows": len(rows)}
+
+
+def _stage_count_files(ctx: BenchContext) -> dict[str, Any]:
+    service = _file_service(ctx)
+    count = service.count_files(module_code=BENCH_FILE_MODULE, facility_code=BENCH_FILE_FACILITY)
+    if not count:
+        raise RuntimeError(f"count_files found no rows for {BENCH_FILE_MODULE}/{BENCH_FILE_FACILITY}")
+    return {"count": count}
+
+
+def _stage_search_files(ctx: BenchContext) -> dict[str, Any]:
+    service = _file_service(ctx)
+    rows = service.list_files(module_code="doc_man", document_code_query="0012", limit=200)
+    return {"rows": len(rows)}
+
+
+STAGES: list[tuple[str, Callable[[BenchContext], dict[str, Any]]]] = [
+    ("sacinp.parse_sacinp", _stage_parse_sacinp),
+    ("sacinp.classify_structure", _stage_classify_structure),
+    ("risk.build_member_risk_vba", _stage_build_member_risk),
+    ("risk.build_joint_risk_vba", _stage_build_joint_risk),
+    ("risk.build_joint_forecast_vba_wide", _stage_build_joint_forecast),
+    ("psilst.read_lines", _stage_psilst_read_lines),
+    ("psilst.read_ui_analysis_lines", _stage_psilst_read_ui_lines),
+    ("psilst.parse_load_case_status", _psilst_parser_stage("load_case_status_parser", "parse_load_case_status", "load_case_status_rows")),
+    ("psilst.parse_basic_case_desc", _psilst_parser_stage("basic_case_desc_parser", "parse_basic_case_desc", "basic_case_rows")),
+    ("psilst.parse_basic_case_loads", _psilst_parser_stage("basic_case_loads_parser", "parse_basic_case_loads", "basic_case_rows")),
+    ("psilst.parse_combo_case_desc", _psilst_parser_stage("combo_case_desc_parser", "parse_combo_case_desc", "combo_case_rows")),
+    ("psilst.parse_combo_case_loads", _psilst_parser_stage("combo_case_loads_parser", "parse_combo_case_loads", "combo_case_rows")),
+    ("psilst.parse_member_group_summary", _psilst_parser_stage("member_group_summary_parser", "parse_member_group_summary", "member_group_rows")),
+    ("psilst.parse_joint_can_summary", _psilst_parser_stage("joint_can_summary_parser", "parse_joint_can_summary", "joint_can_rows")),
+    ("psilst.parse_pile_group_summary", _psilst_parser_stage("pile_group_summary_parser", "parse_pile_group_summary", "pile_group_rows")),
+    ("psilst.parse_pile_head_forces", _psilst_parser_stage("pile_head_force_parser", "parse_pile_head_forces", "pile_head_force_rows")),
+    ("psilst.parse_pile_axial_capacity_summary", _psilst_parser_stage("pile_axial_capacity_summary_parser", "parse_pile_axial_capacity_summary", "pile_axial_rows")),
+    ("psilst.build_analysis_results_for_ui", _stage_build_analysis_results),
+    ("report.render_report", _stage_render_report),
+    ("files.list_files_page", _stage_list_files_page),
+    ("files.count_files", _stage_count_files),
+    ("files.search_files", _stage_search_files),
+]
+
+
+def run_stage(ctx: BenchContext, name: str, func: Callable[[BenchContext], dict[str, Any]], *, repeat: int, measure_memory: bool) -> StageResult:
+    result = StageResult(name=name)
+    try:
+        for _ in range(max(1, repeat)):
+            gc.collect()
+            started = time.perf_counter()
+            result.detail = func(ctx) or {}
+            result.seconds.append(time.perf_counter() - started)
+        if measure_memory:
+            # tracemalloc 会显著拖慢执行，单独跑一轮只取峰值。
+            gc.collect()
+            tracemalloc.start()
+            try:
+                func(ctx)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            result.peak_mb = round(peak / (1024 * 1024), 3)
+    except StageSkipped as exc:
+        result.status = "skipped"
+        result.message = str(exc)
+    except Exception as exc:
+        result.status = "error"
+        result.message = f"{type(exc).__name__}: {exc}"
+
+    if result.seconds and result.status == "ok":
+        result.seconds_min = round(min(result.seconds), 6)
+        result.seconds_median = round(statistics.median(result.seconds), 6)
+    result.seconds = [round(value, 6) for value in result.seconds]
+    return result
+
+
+def _max_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节。
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage / divisor, 3)
+
+
+def run_benchmarks(
+    preset: str,
+    *,
+    workdir: Path,
+    repeat: int = 3,
+    measure_memory: bool = True,
+    only: list[str] | None = None,
+    listing_mb: float | None = None,
+    file_records: int | None = None,
+) -> dict[str, Any]:
+    overrides: dict[str, Any] = {}
+    if listing_mb is not None:
+        overrides["listing_target_bytes"] = int(listing_mb * 1024 * 1024)
+    spec = spec_for_preset(preset, **overrides)
+
+    started = time.perf_counter()
+    bundle = write_synthetic_bundle(workdir / "inputs", spec)
+    generate_seconds = time.perf_counter() - started
+
+    ctx = BenchContext(
+        preset=preset,
+        workdir=workdir,
+        model=bundle["model"],
+        sacinp_path=bundle["sacinp"],
+        psilst_path=bundle["psilst"],
+        file_records=int(file_records if file_records is not None else DEFAULT_FILE_RECORDS.get(preset, 2_000)),
+    )
+
+    stages: dict[str, dict[str, Any]] = {}
+    for name, func in STAGES:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        result = run_stage(ctx, name, func, repeat=repeat, measure_memory=measure_memory)
+        print(_format_stage_line(result), flush=True)
+        payload = asdict(result)
+        payload.pop("name")
+        stages[name] = payload
+
+    return {
+        "schema": RESULT_SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "preset": preset,
+        "spec": asdict(spec),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "inputs": {
+            "joints": len(ctx.model.joints),
+            "members": len(ctx.model.members),
+            "sacinp_bytes": ctx.sacinp_path.stat().st_size,
+            "psilst_bytes": ctx.psilst_path.stat().st_size,
+            "file_records": ctx.file_records,
+            "generate_seconds": round(generate_seconds, 6),
+        },
+        "max_rss_mb": _max_rss_mb(),
+        "stages": stages,
+    }
+
+
+def _format_stage_line(result: StageResult) -> str:
+    if result.status != "ok":
+        return f"[{result.status:>7}] {result.name}: {result.message}"
+    peak = "-" if result.peak_mb is None else f"{result.peak_mb:.2f}MB"
+    return f"[{result.status:>7}] {result.name}: median={result.seconds_median:.4f}s min={result.seconds_min:.4f}s peak={peak} {result.detail}"
+
+
+def compare_with_baseline(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """按阶段比较中位耗时和峰值内存，超过 (1 + threshold) 倍且超过绝对下限记为回归。"""
+    preset_baseline = (baseline.get("presets") or {}).get(current.get("preset"), {})
+    base_stages = preset_baseline.get("stages") or {}
+    regressions: list[dict[str, Any]] = []
+
+    for name, stage in (current.get("stages") or {}).items():
+        base = base_stages.get(name)
+        if not base or stage.get("status") != "ok" or base.get("status") != "ok":
+            continue
+        for metric, floor in (("seconds_median", MIN_REGRESSION_SECONDS), ("peak_mb", MIN_REGRESSION_PEAK_MB)):
+            now_value = stage.get(metric)
+            base_value = base.get(metric)
+            if now_value is None or base_value is None:
+                continue
+            if now_value > base_value * (1.0 + threshold) and now_value - base_value > floor:
+                regressions.append(
+                    {
+                        "stage": name,
+                        "metric": metric,
+                        "baseline": base_value,
+                        "current": now_value,
+                        "ratio": round(now_value / base_value, 3) if base_value else None,
+                    }
+                )
+    return regressions
+
+
+def _load_json(path: Path) -> dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run offline pipeline benchmarks on a synthetic jacket model.")
+    parser.add_argument("--preset", default="small", choices=sorted(PRESETS), help="Synthetic model / listing scale.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; median is compared.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the extra tracemalloc pass per stage.")
+    parser.add_argument("--only", action="append", default=[], help="Stage name prefix filter, repeatable (e.g. psilst.).")
+    parser.add_argument("--listing-mb", type=float, default=None, help="Override psilst target size in MB.")
+    parser.add_argument("--file-records", type=int, default=None, help="Override number of synthetic file records.")
+    parser.add_argument("--workdir", default="", help="Directory for generated inputs; defaults to a temp dir.")
+    parser.add_argument("--output", default="", help="Result JSON path; defaults to benchmarks/results/<preset>-<time>.json.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON path.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline for the preset.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown before flagging (0.2 = 20%%).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if args.workdir:
+        workdir = Path(args.workdir).resolve()
+        workdir.mkdir(parents=True, exist_ok=True)
+        current = run_benchmarks(
+            args.preset,
+            workdir=workdir,
+            repeat=args.repeat,
+            measure_memory=not args.no_memory,
+            only=args.only,
+            listing_mb=args.listing_mb,
+            file_records=args.file_records,
+        )
+    else:
+        with tempfile.TemporaryDirectory(prefix="shiyou_bench_") as tmp:
+            current = run_benchmarks(
+                args.preset,
+                workdir=Path(tmp),
+                repeat=args.repeat,
+                measure_memory=not args.no_memory,
+                only=args.only,
+                listing_mb=args.listing_mb,
+                file_records=args.file_records,
+            )
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    output = Path(args.output) if args.output else DEFAULT_OUTPUT_DIR / f"{args.preset}-{stamp}.json"
+    baseline_path = Path(args.baseline)
+    baseline = _load_json(baseline_path)
+
+    regressions = compare_with_baseline(current, baseline, args.threshold)
+    current["regressions"] = regressions
+    current["threshold"] = args.threshold
+    _write_json(output, current)
+    print(f"results: {output}")
+
+    if args.update_baseline:
+        baseline.setdefault("schema", RESULT_SCHEMA_VERSION)
+        baseline.setdefault("presets", {})[args.preset] = {
+            key: current[key] for key in ("created_at", "spec", "environment", "inputs", "stages")
+        }
+        _write_json(baseline_path, baseline)
+        print(f"baseline updated: {baseline_path} [{args.preset}]")
+        return 0
+
+    errors = [name for name, stage in current["stages"].items() if stage["status"] == "error"]
+    for item in regressions:
+        print(
+            f"REGRESSION {item['stage']} {item['metric']}: "
+            f"{item['baseline']} -> {item['current']} (x{item['ratio']})"
+        )
+    for name in errors:
+        print(f"ERROR {name}: {current['stages'][name]['message']}")
+    return 1 if regressions or errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,555 @@
+"""
+合成导管架基准数据。
+
+按固定随机种子生成 SACS `sacinp` 结构模型和 `psilst` 结果清单，
+列宽与 `inspection_tool.parse_sacinp` 以及可行性报告各 psilst 解析器
+读取的格式一致，用于离线性能基准和回归对比：
+
+1. 模型规模由腿柱网格、层数控制，节点 ID 保持 SACS 的 4 字符宽度；
+2. 清单规模由工况数、构件 / 节点 / 桩数控制，另可按目标字节数填充
+   与解析无关的中间结果页，模拟真实 psilst.M1 的体量；
+3. 所有输出均为流式写出，生成超大文件时内存占用与规模无关。
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Iterator
+
+
+_BASE36 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+LEG_GROUP = "LG1"
+BRACE_GROUP = "XB1"
+HORIZONTAL_GROUP = "HZ1"
+LEG_OD_CM = 200.0
+BRACE_OD_CM = 80.0
+HORIZONTAL_OD_CM = 60.0
+
+PAGE_ROWS = 50
+FORM_FEED = "\x0c"
+
+
+def _b36(value: int, width: int) -> str:
+    if value < 0 or value >= 36**width:
+        raise ValueError(f"value out of range for {width} base36 chars: {value}")
+    chars: list[str] = []
+    for _ in range(width):
+        value, rem = divmod(value, 36)
+        chars.append(_BASE36[rem])
+    return "".join(reversed(chars))
+
+
+@dataclass(frozen=True)
+class JacketSpec:
+    legs_x: int = 2
+    legs_y: int = 2
+    levels: int = 6
+    leg_spacing_m: float = 20.0
+    water_depth_m: float = 100.0
+    top_elevation_m: float = 10.0
+    basic_cases: int = 24
+    combo_cases: int = 16
+    piles_per_leg: int = 1
+    listing_target_bytes: int = 0
+    seed: int = 20240601
+
+    @property
+    def legs(self) -> int:
+        return self.legs_x * self.legs_y
+
+    @property
+    def faces(self) -> list[tuple[int, int]]:
+        return _grid_faces(self.legs_x, self.legs_y)
+
+    @property
+    def piles(self) -> int:
+        return self.legs * self.piles_per_leg
+
+
+PRESETS: dict[str, JacketSpec] = {
+    "small": JacketSpec(),
+    "medium": JacketSpec(legs_x=3, legs_y=2, levels=20, basic_cases=60, combo_cases=80, piles_per_leg=2, listing_target_bytes=32 * 1024 * 1024),
+    "large": JacketSpec(legs_x=4, legs_y=2, levels=60, basic_cases=120, combo_cases=240, piles_per_leg=3, listing_target_bytes=256 * 1024 * 1024),
+}
+
+
+def spec_for_preset(name: str, **overrides) -> JacketSpec:
+    try:
+        spec = PRESETS[str(name or "").strip().lower()]
+    except KeyError as exc:
+        raise ValueError(f"unknown preset: {name!r}, choose from {sorted(PRESETS)}") from exc
+    clean = {key: value for key, value in overrides.items() if value is not None}
+    return replace(spec, **clean) if clean else spec
+
+
+def _grid_faces(legs_x: int, legs_y: int) -> list[tuple[int, int]]:
+    faces: list[tuple[int, int]] = []
+    for iy in range(legs_y):
+        for ix in range(legs_x - 1):
+            faces.append((iy * legs_x + ix, iy * legs_x + ix + 1))
+    for iy in range(legs_y - 1):
+        for ix in range(legs_x):
+            faces.append((iy * legs_x + ix, (iy + 1) * legs_x + ix))
+    return faces
+
+
+@dataclass
+class JacketModel:
+    spec: JacketSpec
+    joints: dict[str, tuple[float, float, float]] = field(default_factory=dict)
+    members: list[tuple[str, str, str]] = field(default_factory=list)
+    leg_joint_ids: list[str] = field(default_factory=list)
+    x_joint_ids: list[str] = field(default_factory=list)
+    work_points: list[tuple[float, float]] = field(default_factory=list)
+
+    @property
+    def wp_z(self) -> float:
+        return float(self.spec.top_elevation_m)
+
+
+def _leg_joint_id(level: int, leg: int) -> str:
+    return f"{_b36(level, 2)}{_b36(leg, 1)}L"
+
+
+def _x_joint_id(bay: int, face: int) -> str:
+    return f"{_b36(bay, 2)}{_b36(face, 1)}X"
+
+
+def build_jacket_model(spec: JacketSpec) -> JacketModel:
+    """按腿柱网格和层数生成节点 / 构件拓扑（竖直腿柱 + 水平杆 + 各立面 X 撑）。"""
+    if spec.legs_x < 2 or spec.legs_y < 1 or spec.levels < 2:
+        raise ValueError("jacket needs at least 2x1 legs and 2 levels")
+    if spec.legs > 36 or len(spec.faces) > 36:
+        raise ValueError("leg grid too large for 4-char SACS joint ids")
+
+    model = JacketModel(spec=spec)
+    bottom = -float(spec.water_depth_m)
+    bay_height = (float(spec.top_elevation_m) - bottom) / (spec.levels - 1)
+    elevations = [round(bottom + bay_height * level, 2) for level in range(spec.levels)]
+    leg_xy = [
+        (round(ix * spec.leg_spacing_m, 2), round(iy * spec.leg_spacing_m, 2))
+        for iy in range(spec.legs_y)
+        for ix in range(spec.legs_x)
+    ]
+
+    for level, z in enumerate(elevations):
+        for leg, (x, y) in enumerate(leg_xy):
+            jid = _leg_joint_id(level, leg)
+            model.joints[jid] = (x, y, z)
+            model.leg_joint_ids.append(jid)
+
+    for level in range(spec.levels - 1):
+        for leg in range(spec.legs):
+            model.members.append((_leg_joint_id(level, leg), _leg_joint_id(level + 1, leg), LEG_GROUP))
+
+    for level in range(1, spec.levels):
+        for a, b in spec.faces:
+            model.members.append((_leg_joint_id(level, a), _leg_joint_id(level, b), HORIZONTAL_GROUP))
+
+    for bay in range(spec.levels - 1):
+        z_mid = round((elevations[bay] + elevations[bay + 1]) / 2.0, 2)
+        for face, (a, b) in enumerate(spec.faces):
+            xa, ya = leg_xy[a]
+            xb, yb = leg_xy[b]
+            xid = _x_joint_id(bay, face)
+            model.joints[xid] = (round((xa + xb) / 2.0, 2), round((ya + yb) / 2.0, 2), z_mid)
+            model.x_joint_ids.append(xid)
+            model.members.extend(
+                [
+                    (_leg_joint_id(bay, a), xid, BRACE_GROUP),
+                    (xid, _leg_joint_id(bay + 1, b), BRACE_GROUP),
+                    (_leg_joint_id(bay, b), xid, BRACE_GROUP),
+                    (xid, _leg_joint_id(bay + 1, a), BRACE_GROUP),
+                ]
+            )
+
+    model.work_points = list(leg_xy)
+    return model
+
+
+# =========================
+# sacinp
+# =========================
+
+def _grup_line(gid: str, od_cm: float, thk_cm: float) -> str:
+    return f"GRUP {gid:<3}{'':9}{od_cm:6.2f}{thk_cm:6.3f} 20.007.72035.50 1    1.001.00     0.500 8.0855"
+
+
+def _joint_line(jid: str, xyz: tuple[float, float, float]) -> str:
+    x, y, z = xyz
+    return f"JOINT {jid:<4} {x:7.2f}{y:7.2f}{z:7.2f}"
+
+
+def _member_line(a: str, b: str, gid: str) -> str:
+    return f"MEMBER {a:<4}{b:<4} {gid:<3}"
+
+
+def iter_sacinp_lines(model: JacketModel) -> Iterator[str]:
+    spec = model.spec
+    yield "LDOPT       NF+Z1.025000  7.849000 -100.00  100.00GLOBMN     CMB  NPNP"
+    yield "OPTIONS   MN SDUC 1  1 DCDC     C PTPTPTPTPT    PTPT PT"
+    yield "SECT"
+    yield "SECT 1688      TUB                               16.8000.800"
+    yield "GRUP"
+    yield _grup_line(LEG_GROUP, LEG_OD_CM, 6.0)
+    yield _grup_line(BRACE_GROUP, BRACE_OD_CM, 2.5)
+    yield _grup_line(HORIZONTAL_GROUP, HORIZONTAL_OD_CM, 2.0)
+    yield "MEMBER"
+    for a, b, gid in model.members:
+        yield _member_line(a, b, gid)
+    yield "JOINT"
+    for jid, xyz in model.joints.items():
+        yield _joint_line(jid, xyz)
+    yield "LOAD"
+    for case in range(1, spec.basic_cases + 1):
+        yield f"LOADCN{case:>4}"
+        yield f"LOADLB{case:>4}SYNTHETIC BASIC LOAD {case}"
+    yield "END"
+
+
+def write_sacinp(path: str | Path, model: JacketModel) -> Path:
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8", newline="\n") as handle:
+        for line in iter_sacinp_lines(model):
+            handle.write(line)
+            handle.write("\n")
+    return out
+
+
+# =========================
+# psilst
+# =========================
+
+@dataclass(frozen=True)
+class ListingCounts:
+    load_case_status_rows: int
+    basic_case_rows: int
+    combo_case_rows: int
+    member_group_rows: int
+    joint_can_rows: int
+    pile_group_rows: int
+    pile_head_force_rows: int
+    pile_axial_rows: int
+
+
+def basic_case_labels(spec: JacketSpec) -> list[str]:
+    return [f"B{_b36(index, 3)}" for index in range(spec.basic_cases)]
+
+
+def combo_case_labels(spec: JacketSpec) -> list[str]:
+    # 前一半为操作工况（AMOD=1.00），后一半为极端工况（AMOD=1.33）。
+    operation = (spec.combo_cases + 1) // 2
+    labels = [f"OP{_b36(index, 2)}" for index in range(operation)]
+    labels.extend(f"EL{_b36(index, 2)}" for index in range(spec.combo_cases - operation))
+    return labels
+
+
+def pile_ids(spec: JacketSpec) -> list[str]:
+    return [f"{index + 1:03d}P" for index in range(spec.piles)]
+
+
+def expected_listing_counts(model: JacketModel) -> ListingCounts:
+    spec = model.spec
+    return ListingCounts(
+        load_case_status_rows=spec.combo_cases,
+        basic_case_rows=spec.basic_cases,
+        combo_case_rows=spec.combo_cases,
+        member_group_rows=len(model.members),
+        joint_can_rows=len(model.joints),
+        pile_group_rows=spec.piles,
+        pile_head_force_rows=spec.combo_cases * spec.piles,
+        pile_axial_rows=spec.piles,
+    )
+
+
+class _PageWriter:
+    def __init__(self) -> None:
+        self.page = 0
+
+    def banner(self) -> str:
+        self.page += 1
+        return (
+            f"{FORM_FEED}SACS CONNECT EDITION   SYNTHETIC JACKET BENCHMARK"
+            f"{'':30}DATE 19-OCT-2026  TIME 10:00:00  PAGE {self.page:6d}"
+        )
+
+    def paged(self, titles: list[str], rows: list[str], page_rows: int = PAGE_ROWS) -> Iterator[str]:
+        for start in range(0, max(1, len(rows)), page_rows):
+            yield self.banner()
+            yield from titles
+            yield from rows[start : start + page_rows]
+            yield ""
+
+
+def _load_case_status_lines(pages: _PageWriter, spec: JacketSpec) -> Iterator[str]:
+    rows: list[str] = []
+    for case_no, label in enumerate(combo_case_labels(spec), start=1):
+        amod = 1.33 if label.startswith("EL") else 1.00
+        rows.append(f"{case_no:8d}    {label:<4}     YES    NO      NO        1.00    {amod:4.2f}")
+    yield from pages.paged(
+        [
+            "          **** LOAD CASE STATUS REPORT ****",
+            "     LOAD   LOAD   PRINT   DEAD   P-DELTA    LOAD    AMOD",
+            "     CASE    ID    OPTION  LOAD    LOAD     FACTOR  FACTOR",
+        ],
+        rows,
+    )
+    yield "                              ****** APPLIED LOAD SUMMARY ******"
+
+
+def _seastate_lines(pages: _PageWriter, spec: JacketSpec, rng: random.Random) -> Iterator[str]:
+    basic = basic_case_labels(spec)
+    combos = combo_case_labels(spec)
+
+    yield from pages.paged(
+        [
+            "                    ***** SEASTATE BASIC LOAD CASE DESCRIPTIONS *****",
+            "    LOAD  LOAD   DESCRIPTION",
+            "    CASE  LABEL",
+        ],
+        [f"{case:6d}    {label:<4}    SYNTHETIC BASIC LOAD {case}" for case, label in enumerate(basic, start=1)],
+    )
+
+    basic_rows = []
+    for case, label in enumerate(basic, start=1):
+        values = [rng.uniform(-5000.0, 5000.0) for _ in range(6)] + [rng.uniform(0.0, 90000.0), rng.uniform(0.0, 30000.0)]
+        basic_rows.append(f"{case:6d}  {label:<4}" + "".join(f"{value:12.2f}" for value in values))
+    yield from pages.paged(
+        [
+            "                    ****** SEASTATE BASIC LOAD CASE SUMMARY ******",
+            "                         RELATIVE TO MUDLINE ELEVATION",
+            "    LOAD  LOAD        FX          FY          FZ          MX          MY          MZ         DEAD      BUOYANCY",
+            "    CASE  LABEL      (KN)        (KN)        (KN)       (KN-M)      (KN-M)      (KN-M)       LOAD",
+        ],
+        basic_rows,
+    )
+
+    combo_rows: list[str] = []
+    first_case = len(basic) + 1
+    for offset, label in enumerate(combos):
+        combo_rows.append(f"{first_case + offset:>12}  {label:<4}")
+        for basic_label in rng.sample(basic, k=min(3, len(basic))):
+            percent = f"{rng.uniform(0.1, 99.0):.3f}"
+            combo_rows.append(f"{'':12}{basic_label:<15}     {percent:>6} LOAD")
+    yield from pages.paged(
+        [
+            "                    ***** SEASTATE COMBINED LOAD CASES *****",
+            "COMBINED LOAD CASE",
+            "LOAD CASE LABEL",
+            "BASIC LOAD CASE             PERCENT",
+        ],
+        combo_rows,
+    )
+
+    combo_load_rows = []
+    for offset, label in enumerate(combos):
+        values = [rng.uniform(-8000.0, 8000.0) for _ in range(6)]
+        combo_load_rows.append(f"{first_case + offset:6d}  {label:<4}" + "".join(f"{value:12.2f}" for value in values))
+    yield from pages.paged(
+        [
+            "                    ****** SEASTATE COMBINED LOAD CASE SUMMARY ******",
+            "                         RELATIVE TO MUDLINE ELEVATION",
+            "    LOAD  LOAD        FX          FY          FZ          MX          MY          MZ",
+            "    CASE  LABEL      (KN)        (KN)        (KN)       (KN-M)      (KN-M)      (KN-M)",
+        ],
+        combo_load_rows,
+    )
+    yield "                    ***** SEASTATE LOAD CASE CENTER REPORT *****"
+
+
+def _pile_axial_lines(pages: _PageWriter, spec: JacketSpec, rng: random.Random) -> Iterator[str]:
+    combos = combo_case_labels(spec)
+    rows = []
+    for pile in pile_ids(spec):
+        comp_case = rng.choice(combos)
+        tens_case = rng.choice(combos)
+        comp_load = -rng.uniform(20000.0, 60000.0)
+        tens_load = rng.uniform(1000.0, 9000.0)
+        rows.append(
+            f"{pile} PA  243.80  9.50 6002.4 133.0  -89154.0 {comp_load:9.1f} {comp_load:9.1f} {comp_case}"
+            f" {89154.0 / -comp_load:6.2f}   96017.2 {tens_load:9.1f} {tens_load:9.1f} {tens_case}"
+            f" {96017.2 / tens_load:6.2f}     {-comp_load / 89154.0:4.2f} {comp_case}"
+        )
+    yield from pages.paged(
+        [
+            "                               * * *  S O I L  M A X I M U M  A X I A L  C A P A C I T Y  S U M M A R Y  * * *",
+            "PILE GRP  ********* PILE *********  ************** COMPRESSION *************  **************** TENSION ***************",
+            " JT         PILEHEAD  WEIGHT  PEN.   CAPACITY    MAX.     CRITICAL CONDITION   CAPACITY    MAX.     CRITICAL CONDITION    *MAXIMUM*",
+            "           O.D.  THK.               (INCL. WT)   LOAD      LOAD  LOAD SAFETY  (INCL. WT)   LOAD      LOAD  LOAD SAFETY    UNITY LOAD",
+            "           CM    CM     KN     M       KN        KN        KN    CASE FACTOR     KN        KN        KN    CASE FACTOR    CHECK CASE",
+        ],
+        rows,
+    )
+    yield "***** SACS LOAD CASE REPORT *****"
+
+
+def _member_group_lines(pages: _PageWriter, model: JacketModel, rng: random.Random) -> Iterator[str]:
+    combos = combo_case_labels(model.spec)
+    rows = []
+    for a, b, gid in model.members:
+        uc = rng.uniform(0.05, 1.2)
+        rows.append(
+            f"{gid} {a}-{b} {rng.choice(combos)} {uc:6.2f}   0.9 {rng.uniform(-200, 200):8.1f}"
+            f" {rng.uniform(-90, 90):6.1f} {rng.uniform(-20, 20):6.1f}   .2E+03 .6E+06 .3E+03 .3E+03   HYDRO"
+            "    0.92   0.92   0.85   0.85"
+        )
+    yield from pages.paged(
+        [
+            "                         * * *  M E M B E R  G R O U P  S U M M A R Y  * * *",
+            "                                    API RP2A-WSD 21ST ED.",
+            "                                                           MAX.     DIST   * APPLIED STRESSES *    ** ALLOWABLE STRESSES **    CRIT",
+            "GRUP   CRITICAL     LOAD  UNITY     FROM   AXIAL   BENDING STRESS  AXIAL  EULER  BENDING  BENDING  COND",
+            "ID      MEMBER      COND  CHECK      END           Y       Z",
+            "                                          M     N/MM2   N/MM2   N/MM2   N/MM2   N/MM2   N/MM2   N/MM2",
+        ],
+        rows,
+    )
+
+
+def _joint_can_lines(pages: _PageWriter, model: JacketModel, rng: random.Random) -> Iterator[str]:
+    combos = combo_case_labels(model.spec)
+    joint_ids = list(model.joints)
+    rows = []
+    for jid in joint_ids:
+        load_uc = rng.uniform(0.01, 1.5)
+        strn_uc = rng.uniform(0.01, 3.0)
+        brace = rng.choice(joint_ids)
+        rows.append(
+            f" {jid:<4}  61.000    1.600    355.000 {load_uc:7.3f} {strn_uc:7.3f}     61.000    1.600"
+            f"    355.000 {load_uc:7.3f}   {strn_uc:7.3f}   {brace:<4}   {rng.choice(combos)}"
+        )
+    yield from pages.paged(
+        [
+            "                              * * J O I N T   C A N   S U M M A R Y * *",
+            "                                      (UNITY CHECK ORDER)",
+            "      **************** ORIGINAL ******************   ************ LOAD DESIGN ***********   *** STRENGTH ANALYSIS ****",
+            "                                      LOAD    STRN                                  LOAD    STRN    BRACE   LOAD",
+            "JOINT DIAMETER THICKNESS  YLD STRS    UC      UC     DIAMETER THICKNESS  YLD STRS    UC      UC     JOINT   CASE",
+        ],
+        rows,
+    )
+
+
+def _pile_group_lines(pages: _PageWriter, spec: JacketSpec, rng: random.Random) -> Iterator[str]:
+    combos = combo_case_labels(spec)
+    rows = []
+    for pile in pile_ids(spec):
+        rows.append(
+            f"       0.0 {rng.uniform(1, 40):9.3f} {rng.uniform(1, 10):7.3f} {rng.uniform(0, 0.01):7.5f}"
+            f" {rng.uniform(1e4, 1e5):10.1f} {rng.uniform(1e3, 1e4):8.1f} {-rng.uniform(1e4, 9e4):8.1f}"
+            f" {rng.uniform(10, 300):7.2f} {-rng.uniform(10, 100):7.2f} {rng.uniform(1, 40):7.2f}"
+            f" {-rng.uniform(100, 400):7.2f}   {pile}     {rng.choice(combos)}      {rng.uniform(0.1, 1.2):5.3f}"
+        )
+    yield from pages.paged(
+        [
+            "                              * *  P I L E  G R O U P  S U M M A R Y  * *",
+            "                                            GROUP ID = PA",
+            "  DISTANCE        DEFLECTIONS                   BENDING  SHEAR    AXIAL      ****** MAXIMUM STRESSES *****",
+            "  FROM PILEHEAD  LATERAL  AXIAL  ROTATION      MOMENT    FORCE    LOAD      BENDING   AXIAL   SHEAR  COMB.",
+            "      M            CM      CM      RAD          KN-M       KN       KN        N/MM2",
+        ],
+        rows,
+    )
+    yield pages.banner()
+    yield "                       * *  P I L E H E A D  C O M P A R I S O N  * *"
+
+
+def _pile_head_force_lines(pages: _PageWriter, spec: JacketSpec, rng: random.Random) -> Iterator[str]:
+    piles = pile_ids(spec)
+    for label in combo_case_labels(spec):
+        yield pages.banner()
+        yield f"                                        FINAL PILE HEAD FORCES (KN   AND KN-M    ) FOR LOAD CASE {label}"
+        yield "                                                    PILE HEAD COORDINATES"
+        yield "     PILE   BATTER"
+        yield "     JOINT  JOINT       FORCE(X)       FORCE(Y)       FORCE(Z)      MOMENT(X)      MOMENT(Y)      MOMENT(Z)"
+        values_by_pile = []
+        for index, pile in enumerate(piles):
+            values = [-rng.uniform(5000.0, 60000.0)] + [rng.uniform(-12000.0, 12000.0) for _ in range(5)]
+            values_by_pile.append(values)
+            batter = f"{index + 101}P"
+            yield f"     {pile}   {batter}  " + "".join(f"{value:15.3f}" for value in values)
+        yield "                                                     STRUCTURAL COORDINATES"
+        yield "     PILE   BATTER"
+        yield "     JOINT  JOINT       FORCE(X)       FORCE(Y)       FORCE(Z)      MOMENT(X)      MOMENT(Y)      MOMENT(Z)"
+        for index, (pile, values) in enumerate(zip(piles, values_by_pile)):
+            batter = f"{index + 101}P"
+            yield f"     {pile}   {batter}  " + "".join(f"{value:15.3f}" for value in reversed(values))
+        yield ""
+
+
+def _filler_lines(pages: _PageWriter, target_bytes: int, rng: random.Random) -> Iterator[str]:
+    """与任何解析 marker 都不重叠的中间结果页，用于把清单撑到目标大小。"""
+    written = 0
+    row = 0
+    while written < target_bytes:
+        line = pages.banner()
+        written += len(line) + 1
+        yield line
+        title = "                          ** MEMBER DETAIL REPORT - INTERMEDIATE STRESSES **"
+        written += len(title) + 1
+        yield title
+        for _ in range(PAGE_ROWS):
+            row += 1
+            line = (
+                f" M{row:08d}  STA {rng.uniform(0, 30):6.2f}  SX {rng.uniform(-250, 250):9.3f}"
+                f"  SY {rng.uniform(-250, 250):9.3f}  SZ {rng.uniform(-250, 250):9.3f}"
+                f"  TAU {rng.uniform(-90, 90):8.3f}  VM {rng.uniform(0, 355):8.3f}  R"
+            )
+            written += len(line) + 1
+            yield line
+            if written >= target_bytes:
+                break
+
+
+def iter_psilst_lines(model: JacketModel) -> Iterator[str]:
+    """按 SACS 清单的大致顺序逐行产出 psilst 内容。
+
+    顺序：工况状态 → 海况工况 → 土壤轴向承载力 →（填充）→ 构件组 / 节点冲剪 /
+    桩组摘要 →（填充）→ 各工况桩头力。填充字节按 4:1 分配到两处。
+    """
+    spec = model.spec
+    rng = random.Random(spec.seed)
+    pages = _PageWriter()
+    filler_total = max(0, int(spec.listing_target_bytes))
+    early_filler = int(filler_total * 0.8)
+
+    yield from _load_case_status_lines(pages, spec)
+    yield from _seastate_lines(pages, spec, rng)
+    yield from _pile_axial_lines(pages, spec, rng)
+    yield from _filler_lines(pages, early_filler, rng)
+    yield from _member_group_lines(pages, model, rng)
+    yield from _joint_can_lines(pages, model, rng)
+    yield from _pile_group_lines(pages, spec, rng)
+    yield from _filler_lines(pages, filler_total - early_filler, rng)
+    yield from _pile_head_force_lines(pages, spec, rng)
+    yield pages.banner()
+    yield "                              *** END OF SYNTHETIC LISTING ***"
+
+
+def write_psilst(path: str | Path, model: JacketModel) -> Path:
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="latin-1", newline="\n") as handle:
+        for line in iter_psilst_lines(model):
+            handle.write(line)
+            handle.write("\n")
+    return out
+
+
+def write_synthetic_bundle(directory: str | Path, spec: JacketSpec) -> dict[str, object]:
+    """在目录下写出 `sacinp.bench` 与 `psilst.bench`，返回路径和期望行数。"""
+    root = Path(directory)
+    model = build_jacket_model(spec)
+    sacinp_path = write_sacinp(root / "sacinp.bench", model)
+    psilst_path = write_psilst(root / "psilst.bench", model)
+    return {
+        "model": model,
+        "sacinp": sacinp_path,
+        "psilst": psilst_path,
+        "counts": expected_listing_counts(model),
+    }
+
@@ -0,0 +1,328 @@
+"""
+桌面端启动的导入耗时统计与导入约束。
+
+设置 SHIYOU_IMPORT_PROFILE=1 启动时，main.py 最先调用 install_import_profiler：在
+sys.meta_path 最前面挂一个查找器，给每个新导入模块的 exec_module 计时，按模块记下
+自身耗时（扣除其中嵌套导入的子模块）和总耗时；重型依赖（HEAVY_MODULES）第一次被
+导入时还记下是哪个模块引入的。mark_startup 记录启动里程碑（QApplication 创建、主窗口
+显示等），主窗口显示后 log_startup_report 打印摘要；设置 SHIYOU_IMPORT_PROFILE_REPORT
+时退出前把完整报告写成 JSON。
+
+约束部分：startup_import_graph 静态解析模块顶层的 import 语句，得到从 main.py 出发
+启动时必然执行的导入图；tests/test_startup_imports.py 用它保证 pandas、openpyxl、
+python-docx、PyMuPDF、matplotlib、pyvista/vtk 等只在打开用到它们的页面时才加载。
+"""
+
+from __future__ import annotations
+
+import ast
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+HEAVY_MODULES = frozenset(
+    {
+        "pandas",
+        "numpy",
+        "openpyxl",
+        "xlrd",
+        "docx",
+        "fitz",
+        "pymupdf",
+        "matplotlib",
+        "pyvista",
+        "pyvistaqt",
+        "vtk",
+        "vtkmodules",
+        "jinja2",
+        "tables",
+    }
+)
+
+_PROCESS_START = time.perf_counter()
+
+
+def _profile_enabled() -> bool:
+    return os.environ.get("SHIYOU_IMPORT_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class _ModuleTiming:
+    name: str
+    self_ms: float = 0.0
+    total_ms: float = 0.0
+    parent: str = ""
+    started_ms: float = 0.0
+
+
+_TIMINGS: dict[str, _ModuleTiming] = {}
+_MILESTONES: list[tuple[str, float]] = []
+_LOCK = threading.RLock()
+_STACK = threading.local()
+_FINDER: "_TimingFinder | None" = None
+
+
+def _elapsed_ms() -> float:
+    return (time.perf_counter() - _PROCESS_START) * 1000.0
+
+
+def _wrap_exec_module(loader: Any) -> None:
+    # 只给加载器实例打补丁：类本身（BuiltinImporter 等）共享给所有模块，不能改。
+    if isinstance(loader, type) or getattr(loader, "_shiyou_timed", False):
+        return
+    original = getattr(loader, "exec_module", None)
+    if original is None:
+        return
+
+    def exec_module(module):
+        stack = getattr(_STACK, "frames", None)
+        if stack is None:
+            stack = _STACK.frames = []
+        name = module.__name__
+        parent = stack[-1][0] if stack else ""
+        started = time.perf_counter()
+        stack.append([name, 0.0])
+        try:
+            return original(module)
+        finally:
+            _, child_ms = stack.pop()
+            total_ms = (time.perf_counter() - started) * 1000.0
+            if stack:
+                stack[-1][1] += total_ms
+            with _LOCK:
+                _TIMINGS[name] = _ModuleTiming(
+                    name,
+                    self_ms=max(total_ms - child_ms, 0.0),
+                    total_ms=total_ms,
+                    parent=parent,
+                    started_ms=(started - _PROCESS_START) * 1000.0,
+                )
+
+    try:
+        loader.exec_module = exec_module
+        loader._shiyou_timed = True
+    except (AttributeError, TypeError):
+        pass
+
+
+class _TimingFinder:
+    """委托给其后的查找器找到 spec，再给加载器的 exec_module 计时。"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, "busy", False):
+            return None
+        self._local.busy = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None:
+                        _wrap_exec_module(spec.loader)
+                    return spec
+            return None
+        finally:
+            self._local.busy = False
+
+
+def install_import_profiler(force: bool = False) -> bool:
+    """未设置 SHIYOU_IMPORT_PROFILE 时什么也不做；返回是否已在统计。"""
+    global _FINDER
+    if not (force or _profile_enabled()):
+        return False
+    with _LOCK:
+        if _FINDER is None:
+            _FINDER = _TimingFinder()
+            sys.meta_path.insert(0, _FINDER)
+    return True
+
+
+def uninstall_import_profiler() -> None:
+    global _FINDER
+    with _LOCK:
+        if _FINDER is not None and _FINDER in sys.meta_path:
+            sys.meta_path.remove(_FINDER)
+        _FINDER = None
+
+
+def reset_import_profile() -> None:
+    with _LOCK:
+        _TIMINGS.clear()
+        _MILESTONES.clear()
+
+
+def import_profiler_active() -> bool:
+    return _FINDER is not None
+
+
+def mark_startup(name: str) -> None:
+    """记录启动里程碑（距进程启动的毫秒数）；未开启统计时不记录。"""
+    if _FINDER is None:
+        return
+    with _LOCK:
+        _MILESTONES.append((str(name), _elapsed_ms()))
+
+
+def _heavy_root(name: str) -> str | None:
+    root = name.split(".", 1)[0]
+    return root if root in HEAVY_MODULES else None
+
+
+def import_report(limit: int = 30) -> dict[str, Any]:
+    with _LOCK:
+        timings = list(_TIMINGS.values())
+        milestones = list(_MILESTONES)
+    heavy: dict[str, dict[str, Any]] = {}
+    for item in sorted(timings, key=lambda timing: timing.started_ms):
+        root = _heavy_root(item.name)
+        if root is None or root in heavy:
+            continue
+        # 引入者取最近的非重型祖先，指出是哪个业务模块把它拉进来的。
+        parent = item.parent
+        while parent and _heavy_root(parent):
+            parent = _TIMINGS.get(parent, _ModuleTiming(parent)).parent
+        heavy[root] = {"imported_by": parent or "-", "at_ms": round(item.started_ms, 1)}
+    for root, info in heavy.items():
+        info["total_ms"] = round(
+            sum(timing.self_ms for timing in timings if _heavy_root(timing.name) == root), 1
+        )
+    return {
+        "enabled": _FINDER is not None,
+        "module_count": len(timings),
+        "total_import_ms": round(sum(timing.self_ms for timing in timings), 1),
+        "milestones": [{"name": name, "at_ms": round(at_ms, 1)} for name, at_ms in milestones],
+        "heavy_modules": heavy,
+        "slowest_modules": [
+            {
+                "module": timing.name,
+                "self_ms": round(timing.self_ms, 2),
+                "total_ms": round(timing.total_ms, 2),
+                "imported_by": timing.parent or "-",
+            }
+            for timing in sorted(timings, key=lambda timing: timing.self_ms, reverse=True)[: max(int(limit), 0)]
+        ],
+    }
+
+
+def log_startup_report(limit: int = 15) -> None:
+    if _FINDER is None:
+        return
+    report = import_report(limit)
+    milestones = ", ".join(f"{item['name']}={item['at_ms']:.0f}ms" for item in report["milestones"])
+    print(
+        f"[startup] {report['module_count']} modules imported in {report['total_import_ms']:.0f}ms; {milestones}"
+    )
+    for name, info in report["heavy_modules"].items():
+        print(f"[startup] heavy import {name} ({info['total_ms']:.0f}ms) via {info['imported_by']}")
+    for item in report["slowest_modules"]:
+        print(f"[startup]   {item['self_ms']:8.1f}ms  {item['module']}  <- {item['imported_by']}")
+
+
+def _write_report_at_exit() -> None:
+    target = os.environ.get("SHIYOU_IMPORT_PROFILE_REPORT", "").strip()
+    if not target or _FINDER is None:
+        return
+    try:
+        Path(target).write_text(json.dumps(import_report(100), ensure_ascii=False, indent=2), encoding="utf-8")
+    except Exception as exc:
+        print(f"[startup] write import report failed: {exc}")
+
+
+atexit.register(_write_report_at_exit)
+
+
+# ---------------------------------------------------------------------------
+# 静态导入图
+# ---------------------------------------------------------------------------
+
+
+def _module_file(root: Path, module: str) -> Path | None:
+    base = root.joinpath(*module.split("."))
+    if (base / "__init__.py").is_file():
+        return base / "__init__.py"
+    if base.with_suffix(".py").is_file():
+        return base.with_suffix(".py")
+    return None
+
+
+def _top_level_imports(path: Path, module: str) -> list[str]:
+    """模块导入时一定会执行的 import：顶层及顶层 if/try/with 中的，不含函数体内的延迟导入。"""
+    tree = ast.parse(path.read_text(encoding="utf-8-sig"), filename=str(path))
+    package = module if path.name == "__init__.py" else module.rpartition(".")[0]
+    found: list[str] = []
+
+    def visit(nodes: Iterable[ast.stmt]) -> None:
+        for node in nodes:
+            if isinstance(node, ast.Import):
+                found.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    parts = package.split(".") if package else []
+                    parts = parts[: len(parts) - (node.level - 1)]
+                    base = ".".join(parts + ([node.module] if node.module else []))
+                else:
+                    base = node.module or ""
+                found.append(base)
+                found.extend(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+            elif isinstance(node, ast.If):
+                # TYPE_CHECKING 块只给类型检查器看，运行时不执行。
+                test = node.test
+                if not (isinstance(test, ast.Name) and test.id == "TYPE_CHECKING"):
+                    visit(node.body)
+                visit(node.orelse)
+            elif isinstance(node, ast.Try):
+                visit(node.body)
+                for handler in node.handlers:
+                    visit(handler.body)
+                visit(node.orelse)
+                visit(node.finalbody)
+            elif isinstance(node, ast.With):
+                visit(node.body)
+
+    visit(tree.body)
+    return [name for name in found if name]
+
+
+def startup_import_graph(entry_modules: Iterable[str], root: str | Path | None = None) -> dict[str, set[str]]:
+    """从入口模块出发的静态导入图：{仓库内模块: 它直接导入的外部顶层包}。"""
+    root = Path(root) if root is not None else Path(__file__).resolve().parents[1]
+    graph: dict[str, set[str]] = {}
+    pending = list(entry_modules)
+    while pending:
+        module = pending.pop()
+        if module in graph:
+            continue
+        path = _module_file(root, module)
+        if path is None:
+            continue
+        external: set[str] = set()
+        graph[module] = external
+        for name in _top_level_imports(path, module):
+            parts = name.split(".")
+            if _module_file(root, parts[0]) is None:
+                external.add(parts[0])
+                continue
+            for index in range(1, len(parts) + 1):
+                candidate = ".".join(parts[:index])
+                if candidate not in graph and _module_file(root, candidate) is not None:
+                    pending.append(candidate)
+    return graph
+
+
+def heavy_startup_imports(entry_modules: Iterable[str], root: str | Path | None = None) -> dict[str, list[str]]:
+    """{重型包: 在启动导入图中直接导入它的模块}；为空表示启动路径是干净的。"""
+    leaks: dict[str, list[str]] = {}
+    for module, external in startup_import_graph(entry_modules, root).items():
+        for name in external & HEAVY_MODULES:
+            leaks.setdefault(name, []).append(module)
+    return {name: sorted(modules) for name, modules in sorted(leaks.items())}
@@ -2,8 +2,25 @@ from __future__ import annotations
 
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    column,
+    func,
+    select,
+    table,
+    text,
+)
 from shiyou_db.database import build_engine_from_url
+from shiyou_db.keyed_sync import sync_keyed_rows
+from shiyou_db.local_mirror import MirrorSource, mirror_for, refresh_mirror
+from shiyou_db.migrations import ensure_migrations, register_migration
 from shiyou_db.runtime_db import get_mysql_url
 
 
@@ -18,198 +35,212 @@ def _create_mysql_engine(mysql_url: str | None = None):
     return build_engine_from_url(raw_url)
 
 
-def ensure_oilfield_env_schema(mysql_url: str | None = None) -> None:
-    engine = _create_mysql_engine(mysql_url)
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS oilfield_env_profile (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    branch VARCHAR(100) NOT NULL,
-                    op_company VARCHAR(100) NOT NULL,
-                    oilfield VARCHAR(100) NOT NULL,
-                    version_no INT NOT NULL DEFAULT 1,
-                    remark VARCHAR(255) DEFAULT NULL,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    UNIQUE KEY uk_oilfield_env_profile (branch, op_company, oilfield, version_no)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+def _migrate_oilfield_env_schema(conn) -> None:
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS oilfield_env_profile (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                branch VARCHAR(100) NOT NULL,
+                op_company VARCHAR(100) NOT NULL,
+                oilfield VARCHAR(100) NOT NULL,
+                version_no INT NOT NULL DEFAULT 1,
+                remark VARCHAR(255) DEFAULT NULL,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                UNIQUE KEY uk_oilfield_env_profile (branch, op_company, oilfield, version_no)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS oilfield_water_level_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    group_name VARCHAR(50) DEFAULT NULL,
-                    item_name VARCHAR(100) NOT NULL,
-                    value DECIMAL(10, 3) NOT NULL,
-                    unit VARCHAR(20) NOT NULL DEFAULT 'm',
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_water_level_profile (profile_id),
-                    KEY idx_water_level_sort (profile_id, sort_order),
-                    KEY idx_water_level_group (profile_id, group_name),
-                    CONSTRAINT fk_water_level_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS oilfield_water_level_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                group_name VARCHAR(50) DEFAULT NULL,
+                item_name VARCHAR(100) NOT NULL,
+                value DECIMAL(10, 3) NOT NULL,
+                unit VARCHAR(20) NOT NULL DEFAULT 'm',
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_water_level_profile (profile_id),
+                KEY idx_water_level_sort (profile_id, sort_order),
+                KEY idx_water_level_group (profile_id, group_name),
+                CONSTRAINT fk_water_level_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS oilfield_wind_param_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    group_name VARCHAR(100) NOT NULL,
-                    item_name VARCHAR(50) NOT NULL,
-                    return_period INT NOT NULL,
-                    value DECIMAL(10, 3) NOT NULL,
-                    unit VARCHAR(20) NOT NULL DEFAULT 'm/s',
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_wind_profile (profile_id),
-                    KEY idx_wind_sort (profile_id, sort_order),
-                    KEY idx_wind_group (profile_id, group_name),
-                    KEY idx_wind_period (profile_id, return_period),
-                    CONSTRAINT fk_wind_param_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS oilfield_wind_param_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                group_name VARCHAR(100) NOT NULL,
+                item_name VARCHAR(50) NOT NULL,
+                return_period INT NOT NULL,
+                value DECIMAL(10, 3) NOT NULL,
+                unit VARCHAR(20) NOT NULL DEFAULT 'm/s',
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_wind_profile (profile_id),
+                KEY idx_wind_sort (profile_id, sort_order),
+                KEY idx_wind_group (profile_id, group_name),
+                KEY idx_wind_period (profile_id, return_period),
+                CONSTRAINT fk_wind_param_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS oilfield_wave_param_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    group_name VARCHAR(100) NOT NULL,
-                    item_name VARCHAR(100) NOT NULL,
-                    return_period INT NOT NULL,
-                    value DECIMAL(10, 3) NOT NULL,
-                    unit VARCHAR(20) NOT NULL,
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_wave_profile (profile_id),
-                    KEY idx_wave_sort (profile_id, sort_order),
-                    KEY idx_wave_group (profile_id, group_name),
-                    KEY idx_wave_period (profile_id, return_period),
-                    CONSTRAINT fk_wave_param_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS oilfield_wave_param_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                group_name VARCHAR(100) NOT NULL,
+                item_name VARCHAR(100) NOT NULL,
+                return_period INT NOT NULL,
+                value DECIMAL(10, 3) NOT NULL,
+                unit VARCHAR(20) NOT NULL,
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_wave_profile (profile_id),
+                KEY idx_wave_sort (profile_id, sort_order),
+                KEY idx_wave_group (profile_id, group_name),
+                KEY idx_wave_period (profile_id, return_period),
+                CONSTRAINT fk_wave_param_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS oilfield_current_param_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    group_name VARCHAR(100) NOT NULL,
-                    item_name VARCHAR(100) NOT NULL,
-                    return_period INT NOT NULL,
-                    value DECIMAL(10, 3) NOT NULL,
-                    unit VARCHAR(20) NOT NULL DEFAULT 'm/s',
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_current_profile (profile_id),
-                    KEY idx_current_sort (profile_id, sort_order),
-                    KEY idx_current_group (profile_id, group_name),
-                    KEY idx_current_period (profile_id, return_period),
-                    CONSTRAINT fk_current_param_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS oilfield_current_param_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                group_name VARCHAR(100) NOT NULL,
+                item_name VARCHAR(100) NOT NULL,
+                return_period INT NOT NULL,
+                value DECIMAL(10, 3) NOT NULL,
+                unit VARCHAR(20) NOT NULL DEFAULT 'm/s',
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_current_profile (profile_id),
+                KEY idx_current_sort (profile_id, sort_order),
+                KEY idx_current_group (profile_id, group_name),
+                KEY idx_current_period (profile_id, return_period),
+                CONSTRAINT fk_current_param_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS platform_strength_splash_zone_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    facility_code VARCHAR(100) NOT NULL,
-                    upper_limit_m DECIMAL(10, 3) DEFAULT NULL,
-                    lower_limit_m DECIMAL(10, 3) DEFAULT NULL,
-                    corrosion_allowance_mm_per_y DECIMAL(10, 3) DEFAULT NULL,
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_ps_splash_profile (profile_id),
-                    KEY idx_ps_splash_facility (profile_id, facility_code),
-                    CONSTRAINT fk_ps_splash_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS platform_strength_splash_zone_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                facility_code VARCHAR(100) NOT NULL,
+                upper_limit_m DECIMAL(10, 3) DEFAULT NULL,
+                lower_limit_m DECIMAL(10, 3) DEFAULT NULL,
+                corrosion_allowance_mm_per_y DECIMAL(10, 3) DEFAULT NULL,
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_ps_splash_profile (profile_id),
+                KEY idx_ps_splash_facility (profile_id, facility_code),
+                CONSTRAINT fk_ps_splash_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS platform_strength_pile_info_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    facility_code VARCHAR(100) NOT NULL,
-                    pile_head_id VARCHAR(50) DEFAULT NULL,
-                    scour_depth_m DECIMAL(10, 3) DEFAULT NULL,
-                    compressive_capacity_t DECIMAL(10, 3) DEFAULT NULL,
-                    uplift_capacity_t DECIMAL(10, 3) DEFAULT NULL,
-                    submerged_weight_t DECIMAL(10, 3) DEFAULT NULL,
-                    is_display_row TINYINT(1) NOT NULL DEFAULT 0,
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_ps_pile_profile (profile_id),
-                    KEY idx_ps_pile_facility (profile_id, facility_code),
-                    KEY idx_ps_pile_head (profile_id, facility_code, pile_head_id),
-                    CONSTRAINT fk_ps_pile_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS platform_strength_pile_info_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                facility_code VARCHAR(100) NOT NULL,
+                pile_head_id VARCHAR(50) DEFAULT NULL,
+                scour_depth_m DECIMAL(10, 3) DEFAULT NULL,
+                compressive_capacity_t DECIMAL(10, 3) DEFAULT NULL,
+                uplift_capacity_t DECIMAL(10, 3) DEFAULT NULL,
+                submerged_weight_t DECIMAL(10, 3) DEFAULT NULL,
+                is_display_row TINYINT(1) NOT NULL DEFAULT 0,
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_ps_pile_profile (profile_id),
+                KEY idx_ps_pile_facility (profile_id, facility_code),
+                KEY idx_ps_pile_head (profile_id, facility_code, pile_head_id),
+                CONSTRAINT fk_ps_pile_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS platform_strength_marine_growth_item (
-                    id BIGINT PRIMARY KEY AUTO_INCREMENT,
-                    profile_id BIGINT NOT NULL,
-                    facility_code VARCHAR(100) NOT NULL,
-                    layer_no INT NOT NULL DEFAULT 0,
-                    upper_limit_m DECIMAL(10, 3) DEFAULT NULL,
-                    lower_limit_m DECIMAL(10, 3) DEFAULT NULL,
-                    thickness_mm DECIMAL(10, 3) DEFAULT NULL,
-                    density_t_per_m3 DECIMAL(10, 3) DEFAULT NULL,
-                    sort_order INT NOT NULL DEFAULT 0,
-                    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    KEY idx_ps_marine_profile (profile_id),
-                    KEY idx_ps_marine_facility (profile_id, facility_code),
-                    KEY idx_ps_marine_layer (profile_id, facility_code, layer_no),
-                    CONSTRAINT fk_ps_marine_profile
-                        FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
-                        ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-                """
-            )
+    )
+    conn.execute(
+        text(
+            """
+            CREATE TABLE IF NOT EXISTS platform_strength_marine_growth_item (
+                id BIGINT PRIMARY KEY AUTO_INCREMENT,
+                profile_id BIGINT NOT NULL,
+                facility_code VARCHAR(100) NOT NULL,
+                layer_no INT NOT NULL DEFAULT 0,
+                upper_limit_m DECIMAL(10, 3) DEFAULT NULL,
+                lower_limit_m DECIMAL(10, 3) DEFAULT NULL,
+                thickness_mm DECIMAL(10, 3) DEFAULT NULL,
+                density_t_per_m3 DECIMAL(10, 3) DEFAULT NULL,
+                sort_order INT NOT NULL DEFAULT 0,
+                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                KEY idx_ps_marine_profile (profile_id),
+                KEY idx_ps_marine_facility (profile_id, facility_code),
+                KEY idx_ps_marine_layer (profile_id, facility_code, layer_no),
+                CONSTRAINT fk_ps_marine_profile
+                    FOREIGN KEY (profile_id) REFERENCES oilfield_env_profile(id)
+                    ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+            """
         )
-        _ensure_platform_strength_pile_columns(conn)
+    )
+    _ensure_platform_strength_pile_columns(conn)
+
+
+def _startup_engine():
+    return _create_mysql_engine() if _default_mysql_url() else None
+
+
+OILFIELD_ENV_MIGRATION = register_migration(
+    "oilfield_env",
+    1,
+    _migrate_oilfield_env_schema,
+    engine_factory=_startup_engine,
+)
+
+
+def ensure_oilfield_env_schema(mysql_url: str | None = None) -> None:
+    ensure_migrations(_create_mysql_engine(mysql_url), OILFIELD_ENV_MIGRATION.name)
 
 
 def _mysql_column_exists(conn, table_name: str, column_name: str) -> bool:
@@ -435,8 +466,63 @@ def get_env_profile_id(
     return int(row[0]) if row else None
 
 
+# 桌面端本地镜像的表结构：只含读取用到的列，见 services/reference_mirror.py。
+_MIRROR_METADATA = MetaData()
+MIRRORED_ITEM_TABLES = (
+    "oilfield_water_level_item",
+    "oilfield_wind_param_item",
+    "oilfield_wave_param_item",
+    "oilfield_current_param_item",
+)
+
+
+def _mirror_table(table_name: str) -> Table:
+    columns = [
+        Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True),
+        Column("profile_id", BigInteger, nullable=False, index=True),
+        Column("group_name", String(100)),
+        Column("item_name", String(100)),
+        Column("value", Float),
+        Column("unit", String(20)),
+        Column("sort_order", Integer),
+        Column("updated_at", DateTime),
+    ]
+    if table_name != "oilfield_water_level_item":
+        columns.insert(4, Column("return_period", Integer))
+    return Table(table_name, _MIRROR_METADATA, *columns)
+
+
+_MIRROR_TABLES = {name: _mirror_table(name) for name in MIRRORED_ITEM_TABLES}
+
+
+def _table_signature(table_name: str):
+    # 这些表不经 ORM 写入，没有变更版本；行数、id 之和与最后修改时间任一变化即重新同步。
+    def signature(conn) -> list[Any]:
+        mirrored = _MIRROR_TABLES[table_name]
+        return list(
+            conn.execute(
+                select(func.count(), func.coalesce(func.sum(mirrored.c.id), 0), func.max(mirrored.c.updated_at))
+            ).one()
+        )
+
+    return signature
+
+
+def oilfield_mirror_sources() -> list[MirrorSource]:
+    return [
+        MirrorSource(name, mirrored, _startup_engine, _table_signature(name))
+        for name, mirrored in _MIRROR_TABLES.items()
+    ]
+
+
+def _item_read_engine(table_name: str, mysql_url: str | None):
+    # 默认库的参数表优先读本地镜像；镜像未启用或未同步时读远端。
+    mirror = mirror_for(table_name) if mysql_url is None else None
+    return mirror.engine if mirror is not None else _create_mysql_engine(mysql_url)
+
+
 def load_water_level_items(profile_id: int, mysql_url: str | None = None) -> list[dict[str, Any]]:
-    engine = _create_mysql_engine(mysql_url)
+    engine = _item_read_engine("oilfield_water_level_item", mysql_url)
     sql = text(
         """
         SELECT group_name, item_name, value, unit, sort_order
@@ -450,27 +536,24 @@ def load_water_level_items(profile_id: int, mysql_url: str | None = None) -> lis
     return [dict(row) for row in rows]
 
 
+_WATER_LEVEL_COLUMNS = ("id", "profile_id", "group_name", "item_name", "value", "unit", "sort_order")
+_METRIC_COLUMNS = ("id", "profile_id", "group_name", "item_name", "return_period", "value", "unit", "sort_order")
+
+
+def _item_table(table_name: str, column_names: tuple[str, ...]):
+    return table(table_name, *(column(name) for name in column_names))
+
+
 def replace_water_level_items(
     profile_id: int,
     items: list[dict[str, Any]],
     mysql_url: str | None = None,
 ) -> None:
     engine = _create_mysql_engine(mysql_url)
-    delete_sql = text("DELETE FROM oilfield_water_level_item WHERE profile_id = :profile_id")
-    insert_sql = text(
-        """
-        INSERT INTO oilfield_water_level_item (
-            profile_id, group_name, item_name, value, unit, sort_order
-        ) VALUES (
-            :profile_id, :group_name, :item_name, :value, :unit, :sort_order
-        )
-        """
-    )
     payload = []
     for item in items:
         payload.append(
             {
-                "profile_id": int(profile_id),
                 "group_name": _normalize_text(item.get("group_name", "")) or None,
                 "item_name": _normalize_text(item.get("item_name", "")),
                 "value": item.get("value"),
@@ -478,14 +561,21 @@ def replace_water_level_items(
                 "sort_order": int(item.get("sort_order", 0) or 0),
             }
         )
+    # 按分组+项目名与现有行配对，只写有变化的行。
     with engine.begin() as conn:
-        conn.execute(delete_sql, {"profile_id": int(profile_id)})
-        if payload:
-            conn.execute(insert_sql, payload)
+        sync_keyed_rows(
+            conn,
+            _item_table("oilfield_water_level_item", _WATER_LEVEL_COLUMNS),
+            {"profile_id": int(profile_id)},
+            payload,
+            key_columns=("group_name", "item_name"),
+        )
+    if mysql_url is None:
+        refresh_mirror("oilfield_water_level_item")
 
 
 def load_metric_items(table_name: str, profile_id: int, mysql_url: str | None = None) -> list[dict[str, Any]]:
-    engine = _create_mysql_engine(mysql_url)
+    engine = _item_read_engine(table_name, mysql_url)
     sql = text(
         f"""
         SELECT group_name, item_name, return_period, value, unit, sort_order
@@ -506,21 +596,10 @@ def replace_metric_items(
     mysql_url: str | None = None,
 ) -> None:
     engine = _create_mysql_engine(mysql_url)
-    delete_sql = text(f"DELETE FROM {table_name} WHERE profile_id = :profile_id")
-    insert_sql = text(
-        f"""
-        INSERT INTO {table_name} (
-            profile_id, group_name, item_name, return_period, value, unit, sort_order
-        ) VALUES (
-            :profile_id, :group_name, :item_name, :return_period, :value, :unit, :sort_order
-        )
-        """
-    )
     payload = []
     for item in items:
         payload.append(
             {
-                "profile_id": int(profile_id),
                 "group_name": _normalize_text(item.get("group_name", "")),
                 "item_name": _normalize_text(item.get("item_name", "")),
                 "return_period": int(item.get("return_period", 0) or 0),
@@ -529,10 +608,17 @@ def replace_metric_items(
                 "sort_order": int(item.get("sort_order", 0) or 0),
             }
         )
+    # 按分组+项目名+重现期与现有行配对，只写有变化的行。
     with engine.begin() as conn:
-        conn.execute(delete_sql, {"profile_id": int(profile_id)})
-        if payload:
-            conn.execute(insert_sql, payload)
+        sync_keyed_rows(
+            conn,
+            _item_table(table_name, _METRIC_COLUMNS),
+            {"profile_id": int(profile_id)},
+            payload,
+            key_columns=("group_name", "item_name", "return_period"),
+        )
+    if mysql_url is None:
+        refresh_mirror(table_name)
 
 
 def _normalize_facility_code(value: Any) -> str:
@@ -630,8 +716,9 @@ def load_platform_strength_pile_items(
         ORDER BY sort_order, id
         """
     )
+    # 桩基列由 oilfield_env 迁移补齐，每个进程只检查一次。
+    ensure_migrations(engine, OILFIELD_ENV_MIGRATION.name)
     with engine.begin() as conn:
-        _ensure_platform_strength_pile_columns(conn)
         rows = conn.execute(
             sql,
             {
@@ -681,8 +768,9 @@ def replace_platform_strength_pile_items(
         }
         for item in items
     ]
+    # 桩基列由 oilfield_env 迁移补齐，每个进程只检查一次。
+    ensure_migrations(engine, OILFIELD_ENV_MIGRATION.name)
     with engine.begin() as conn:
-        _ensure_platform_strength_pile_columns(conn)
         conn.execute(
             delete_sql,
             {"profile_id": int(profile_id), "facility_code": normalized_facility_code},
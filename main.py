@@ -4,9 +4,14 @@
 import sys
 import os
 import ctypes
-import threading
+import multiprocessing
 
-from PyQt5.QtCore import Qt
+from core.import_profiler import install_import_profiler, log_startup_report, mark_startup
+
+# 设置 SHIYOU_IMPORT_PROFILE=1 时统计各模块导入耗时，须在导入 PyQt 和页面模块之前安装。
+install_import_profiler()
+
+from PyQt5.QtCore import Qt, QEvent
 from PyQt5.QtGui import QPixmap, QIcon, QFont, QFontDatabase, QColor, QBrush
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -17,6 +22,7 @@ from PyQt5.QtWidgets import (
 from core.auth import AuthService, UserSession
 from core.dialog_utils import exec_dialog_safely
 from core.message_boxes import ask_yes_no
+from services.preheat_scheduler import PreheatScheduler, PreheatTask, lazy_call, note_user_activity, user_idle
 from pages.nav_config import NAV_CONFIG
 
 # 业务页面 / 对话框
@@ -120,6 +126,36 @@ def maybe_run_auxiliary_worker() -> int | None:
 
 # ==========================================
 
+_USER_ACTIVITY_EVENTS = (QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.Wheel)
+
+
+def _startup_preheat_tasks() -> list[PreheatTask]:
+    """主窗口显示后的后台预热任务；迁移先行，其余依赖迁移、彼此并发。"""
+    return [
+        PreheatTask("schema_migrations", lazy_call("services.schema_migrations", "run_startup_migrations"), priority=100),
+        PreheatTask(
+            "reference_mirror",
+            lazy_call("services.reference_mirror", "start_reference_mirror"),
+            priority=50,
+            depends_on=("schema_migrations",),
+        ),
+        PreheatTask(
+            "oilfield_top_data",
+            lazy_call("pages.oilfield_water_level_page", "preheat_oilfield_top_data"),
+            priority=20,
+            depends_on=("schema_migrations",),
+            pages=("pages.oilfield_water_level_page",),
+        ),
+        PreheatTask(
+            "platform_load_data",
+            lazy_call("services.platform_load_preheat", "preheat_platform_load_data"),
+            priority=10,
+            depends_on=("schema_migrations",),
+            pages=("pages.platform_load_information_page",),
+        ),
+    ]
+
+
 class MainWindow(QMainWindow):
     def __init__(self, auth_service: AuthService, session: UserSession | None = None):
         super().__init__()
@@ -157,7 +193,9 @@ class MainWindow(QMainWindow):
         self.current_platform_label: QLabel | None = None
         self.current_platform_font_ratio: float = 0.0125
         self._startup_preheat_started = False
+        self._preheat_scheduler = PreheatScheduler(_startup_preheat_tasks(), idle_check=user_idle)
         self.init_ui()
+        QApplication.instance().installEventFilter(self)
         QTimer.singleShot(1200, self._schedule_startup_preheat)
 
     def require_login(self) -> bool:
@@ -359,6 +397,9 @@ class MainWindow(QMainWindow):
 
         # 信号连接
         self.nav_tree.itemClicked.connect(self.on_nav_item_clicked)
+        self.nav_tree.setMouseTracking(True)
+        self.nav_tree.itemEntered.connect(self._hint_preheat_for_item)
+        self.nav_tree.currentItemChanged.connect(self._hint_preheat_for_item)
         if self.nav_search is not None:
             self.nav_search.textChanged.connect(self.filter_nav_tree)
 
@@ -371,28 +412,21 @@ class MainWindow(QMainWindow):
         if self._startup_preheat_started:
             return
         self._startup_preheat_started = True
+        self._preheat_scheduler.start()
 
-        def worker() -> None:
-            try:
-                from services.preheat_scheduler import PreheatTask, run_preheat_tasks
-                from services.platform_load_preheat import preheat_platform_load_data
-                from pages.oilfield_water_level_page import preheat_oilfield_top_data
-
-                run_preheat_tasks(
-                    [
-                        PreheatTask("oilfield_top_data", preheat_oilfield_top_data),
-                        PreheatTask("platform_load_data", preheat_platform_load_data),
-                    ],
-                    pause_seconds=0.2,
-                )
-            except Exception:
-                pass
+    def _hint_preheat_for_item(self, item: QTreeWidgetItem | None, *_args) -> None:
+        """导航指向某个页面（悬停、键盘选中）时，先预热该页面要用的数据。"""
+        if item is None:
+            return
+        page_cls = item.data(0, Qt.UserRole)
+        module_name = getattr(page_cls, "module_name", None) or getattr(page_cls, "__module__", "")
+        if module_name:
+            self._preheat_scheduler.prioritize_page(module_name)
 
-        threading.Thread(
-            target=worker,
-            name="startup-preheat-queue",
-            daemon=True,
-        ).start()
+    def eventFilter(self, watched, event):
+        if event.type() in _USER_ACTIVITY_EVENTS:
+            note_user_activity()
+        return super().eventFilter(watched, event)
 
     def create_header(self) -> QWidget:
         header = QFrame()
@@ -881,6 +915,7 @@ def main():
     os.environ.setdefault("QT_OPENGL", "software")
 
     app = QApplication(sys.argv)
+    mark_startup("qapplication_created")
     app_icon = load_app_icon()
     if not app_icon.isNull():
         app.setWindowIcon(app_icon)
@@ -890,6 +925,7 @@ def main():
         QMessageBox.critical(None, "数据库连接失败", f"初始化用户认证服务失败：\n{exc}")
         sys.exit(1)
 
+    mark_startup("auth_service_ready")
     login_dialog = LoginDialog(auth_service=auth_service)
     if not app_icon.isNull():
         login_dialog.setWindowIcon(app_icon)
@@ -898,10 +934,14 @@ def main():
 
     window = MainWindow(auth_service, login_dialog.session)
     window.showMaximized()
+    mark_startup("main_window_shown")
+    log_startup_report()
     sys.exit(app.exec_())
 
 
 if __name__ == "__main__":
+    # 打包版中 psilst 段落解析等进程池的子进程由本入口拉起，须先交给 multiprocessing 处理。
+    multiprocessing.freeze_support()
     worker_exit_code = maybe_run_auxiliary_worker()
     if worker_exit_code is not None:
         sys.exit(worker_exit_code)
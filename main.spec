@@ -57,10 +57,23 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
+    # xlrd / openpyxl 由 pandas.read_excel 按引擎名动态导入，静态分析找不到，需保留在 hiddenimports。
+    # 以下包桌面端从不导入：fastapi / starlette / uvicorn 只用于 server/ 服务端；其余是 pandas 的
+    # 可选依赖，装在构建环境里时会被 PyInstaller 一并收进包里。
     excludes=[
         'PyQt6',
         'PySide2',
         'PySide6',
+        'fastapi',
+        'starlette',
+        'uvicorn',
+        'IPython',
+        'notebook',
+        'pytest',
+        'scipy',
+        'pyarrow',
+        'numba',
+        'tables',
     ],
     noarchive=False,
     optimize=0,
@@ -135,6 +135,7 @@ class _DocManRecordPageWorker(QObject):
         category_query: str,
         discipline_query: str,
         logical_path_prefixes: Optional[List[str]],
+        cursor: Optional[dict] = None,
     ):
         super().__init__()
         self._token = int(token)
@@ -147,6 +148,7 @@ class _DocManRecordPageWorker(QObject):
         self._category_query = category_query
         self._discipline_query = discipline_query
         self._logical_path_prefixes = list(logical_path_prefixes or [])
+        self._cursor = dict(cursor) if cursor else None
 
     def run(self) -> None:
         try:
@@ -160,6 +162,7 @@ class _DocManRecordPageWorker(QObject):
                 category_query=self._category_query,
                 discipline_query=self._discipline_query,
                 logical_path_prefixes=self._logical_path_prefixes,
+                cursor=self._cursor,
             )
         except Exception as exc:
             self.failed.emit(self._token, str(exc))
@@ -676,6 +679,7 @@ class DocManWidget(QFrame):
         self._current_page = 0
         self._db_total_rows = 0
         self._db_total_pages = 1
+        self._db_page_keys = None
         self._display_profile = "generic"
         self._path_root_label = ""
         self._display_path_segments: List[str] = []
@@ -937,6 +941,7 @@ class DocManWidget(QFrame):
         self._db_list_mode = bool(db_list_mode)
         self._db_total_rows = 0
         self._db_total_pages = 1
+        self._db_page_keys = None
         self._records = [dict(rec) for rec in records] if not self._db_list_mode else [
             dict(rec) for rec in records if self._record_has_content(rec)
         ]
@@ -1187,12 +1192,29 @@ class DocManWidget(QFrame):
             self._discipline_filter_options = list(page_data.get("discipline_options") or [])
             self._db_total_rows = int(page_data.get("total") or 0)
             self._current_page = int(page_data.get("page") or 0)
+            self._remember_db_page_keys(page_data)
             page_size = self._page_size_for_total(self._db_total_rows)
             self._db_total_pages = max(1, (self._db_total_rows + page_size - 1) // page_size)
         except FileBackendError:
             pass
 
-    def _start_record_page_load(self, token: int | None = None) -> None:
+    def _remember_db_page_keys(self, page_data: dict) -> None:
+        page_keys = page_data.get("page_keys")
+        self._db_page_keys = (self._current_page, page_keys[0], page_keys[1]) if page_keys else None
+
+    def _adjacent_page_cursor(self, target_page: int) -> Optional[dict]:
+        """按当前页首尾记录的排序键生成相邻页游标，翻页时不必再走 OFFSET。"""
+        page_keys = getattr(self, "_db_page_keys", None)
+        if not page_keys:
+            return None
+        page, first_key, last_key = page_keys
+        if target_page == page + 1 and last_key:
+            return {"page": target_page, "after": last_key}
+        if target_page == page - 1 and first_key:
+            return {"page": target_page, "before": first_key}
+        return None
+
+    def _start_record_page_load(self, token: int | None = None, cursor: Optional[dict] = None) -> None:
         if not is_file_db_configured():
             return
         load_token = self._context_load_token if token is None else int(token)
@@ -1209,6 +1231,7 @@ class DocManWidget(QFrame):
             category_query=self._category_query,
             discipline_query=self._discipline_query,
             logical_path_prefixes=self._logical_path_prefixes,
+            cursor=cursor,
         )
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
@@ -1235,6 +1258,7 @@ class DocManWidget(QFrame):
             self._discipline_filter_options = list(page_data.get("discipline_options") or [])
             self._db_total_rows = int(page_data.get("total") or 0)
             self._current_page = int(page_data.get("page") or 0)
+            self._remember_db_page_keys(page_data)
             page_size = self._page_size_for_total(self._db_total_rows)
             self._db_total_pages = max(1, (self._db_total_rows + page_size - 1) // page_size)
         self._set_db_loading(False)
@@ -2247,7 +2271,7 @@ class DocManWidget(QFrame):
             return
         self._current_page -= 1
         if self._db_list_mode:
-            self._start_record_page_load()
+            self._start_record_page_load(cursor=self._adjacent_page_cursor(self._current_page))
             return
         self.refresh()
 
@@ -2256,7 +2280,7 @@ class DocManWidget(QFrame):
             return
         self._current_page += 1
         if self._db_list_mode:
-            self._start_record_page_load()
+            self._start_record_page_load(cursor=self._adjacent_page_cursor(self._current_page))
             return
         self.refresh()
 
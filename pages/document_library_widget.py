@@ -341,22 +341,6 @@ class DocumentLibraryWidget(QFrame):
             document_title_query=name,
         )
 
-    @staticmethod
-    def _record_matches_query(record: dict, code_query: str, name_query: str) -> bool:
-        code_text = " ".join(
-            str(record.get(key) or "")
-            for key in ("document_code", "logical_path", "filename")
-        ).lower()
-        name_text = " ".join(
-            str(record.get(key) or "")
-            for key in ("document_title", "filename", "logical_path")
-        ).lower()
-        if code_query and code_query not in code_text:
-            return False
-        if name_query and name_query not in name_text:
-            return False
-        return True
-
     def set_facility_code(self, code: str) -> None:
         new_code = (code or "").strip()
         if new_code == self.facility_code and self._current_context_signature is not None:
@@ -77,7 +77,7 @@ def _normalize_profile(raw_profile: dict[str, Any]) -> dict[str, str]:
 def _load_platform_profiles_from_source() -> list[dict[str, str]]:
     selected_profiles: list[dict[str, str]] = []
     try:
-        summary_source = load_platform_summary_source()
+        summary_source = load_platform_summary_source(include_snapshot=False)
         selected_profiles = _normalize_profiles(summary_source.profiles)
     except Exception:
         selected_profiles = []
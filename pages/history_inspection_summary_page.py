@@ -758,16 +758,6 @@ class HistoryInspectionSummaryPage(BasePage):
         self.pages["search"] = page
         self.stack.addWidget(page)
 
-    @staticmethod
-    def _record_matches_query(record: dict, code_query: str, name_query: str) -> bool:
-        code_text = " ".join(str(record.get(key) or "") for key in ("document_code", "logical_path", "filename")).lower()
-        name_text = " ".join(str(record.get(key) or "") for key in ("document_title", "filename", "logical_path")).lower()
-        if code_query and code_query not in code_text:
-            return False
-        if name_query and name_query not in name_text:
-            return False
-        return True
-
     # ------------------------------------------------------------------
     # 首页：四个文件夹
     # ------------------------------------------------------------------
@@ -42,7 +42,7 @@ from services.file_db_adapter import (
     list_rebuild_directories,
     list_files_by_prefix,
     resolve_storage_path,
-    upload_file,
+    upload_files,
 )
 
 # ✅ 直接复用 ConstructionDocsWidget 的文件夹UI与交互（FolderButton / folder_grid / PathBar 等）
@@ -142,54 +142,70 @@ class _ModelFileUploadWorker(QObject):
         self._cancelled = True
 
     def run(self) -> None:
-        results: list[dict] = []
-        ok_count = 0
-        first_error = ""
-        canceled = False
         total = len(self._tasks)
+        items: list[dict] = []
+        for task in self._tasks:
+            delete_record_ids = list(task.get("delete_record_ids") or [])
+            if task.get("delete_record_id") is not None:
+                delete_record_ids.append(task.get("delete_record_id"))
+            items.append(
+                {
+                    "local_path": str(task.get("file_path") or "").strip(),
+                    "file_type_code": str(task.get("file_type_code") or "model"),
+                    "module_code": "model_files",
+                    "logical_path": str(task.get("logical_path") or ""),
+                    "facility_code": str(task.get("facility_code") or "").strip() or None,
+                    "category_name": str(task.get("category") or "").strip(),
+                    "work_condition": str(task.get("work_condition") or ""),
+                    "remark": str(task.get("remark") or ""),
+                    "delete_record_ids": [int(record_id) for record_id in delete_record_ids],
+                }
+            )
+        self.progress.emit(0, f"正在上传 {total} 个文件...")
         try:
-            for index, task in enumerate(self._tasks, start=1):
-                if self._cancelled:
-                    canceled = True
-                    break
-                file_path = str(task.get("file_path") or "").strip()
-                self.progress.emit(index - 1, f"正在上传 {index}/{total}：{os.path.basename(file_path)}")
-                try:
-                    delete_record_ids = list(task.get("delete_record_ids") or [])
-                    if task.get("delete_record_id") is not None:
-                        delete_record_ids.append(task.get("delete_record_id"))
-                    for record_id in delete_record_ids:
-                        hard_delete_record(int(record_id))
-                    result = upload_file(
-                        file_path,
-                        file_type_code=str(task.get("file_type_code") or "model"),
-                        module_code="model_files",
-                        logical_path=str(task.get("logical_path") or ""),
-                        facility_code=str(task.get("facility_code") or "").strip() or None,
-                        category_name=str(task.get("category") or "").strip(),
-                        work_condition=str(task.get("work_condition") or ""),
-                        remark=str(task.get("remark") or ""),
-                    )
-                    results.append({"task": task, "result": result})
-                    ok_count += 1
-                except Exception as exc:
-                    if not first_error:
-                        first_error = str(exc)
-                self.progress.emit(index, f"已完成 {index}/{total}")
+            # 文件并发复制，被替换的旧记录和新记录在同一事务内删除/写入。
+            batch = upload_files(
+                items,
+                is_cancelled=lambda: self._cancelled,
+                on_progress=self._emit_batch_progress,
+            )
         except Exception as exc:
             self.failed.emit(self._token, str(exc))
             return
+        results = [
+            {"task": self._tasks[entry["index"]], "result": entry["record"]}
+            for entry in batch.get("results") or []
+        ]
+        errors = list(batch.get("errors") or [])
         self.finished.emit(
             self._token,
             {
                 "results": results,
-                "ok_count": ok_count,
-                "first_error": first_error,
-                "canceled": canceled,
+                "ok_count": len(results),
+                "first_error": str(errors[0].get("error") or "") if errors else "",
+                "canceled": bool(batch.get("canceled")),
                 "total": total,
+                "bytes": int(batch.get("bytes") or 0),
+                "seconds": float(batch.get("seconds") or 0.0),
             },
         )
 
+    def _emit_batch_progress(self, progress: dict) -> None:
+        done = int(progress.get("done") or 0)
+        total = int(progress.get("total") or 0)
+        self.progress.emit(
+            done,
+            f"已完成 {done}/{total}，{_format_upload_rate(progress.get('bytes'), progress.get('seconds'))}",
+        )
+
+
+def _format_upload_rate(total_bytes: object, seconds: object) -> str:
+    megabytes = float(total_bytes or 0) / (1024 * 1024)
+    elapsed = float(seconds or 0.0)
+    if elapsed <= 0:
+        return f"{megabytes:.1f} MB"
+    return f"{megabytes:.1f} MB，{megabytes / elapsed:.1f} MB/s"
+
 
 class _ModelFileDeleteWorker(QObject):
     progress = pyqtSignal(int, str)
@@ -1797,7 +1813,11 @@ class ModelFilesDocsWidget(QWidget):
         if first_error:
             QMessageBox.warning(self, "上传完成但存在失败", f"成功上传 {ok_count} 个文件。\n首个失败原因：{first_error}")
             return
-        QMessageBox.information(self, "上传成功", "上传成功" if ok_count == 1 else f"成功上传 {ok_count} 个文件。")
+        if ok_count == 1:
+            QMessageBox.information(self, "上传成功", "上传成功")
+            return
+        rate_text = _format_upload_rate(data.get("bytes"), data.get("seconds"))
+        QMessageBox.information(self, "上传成功", f"成功上传 {ok_count} 个文件（{rate_text}）。")
 
     def _create_model_file_operation_progress(self, title: str, label: str, total_steps: int) -> QProgressDialog:
         progress = QProgressDialog(label, "取消", 0, max(1, int(total_steps or 1)), self)
@@ -16,7 +16,6 @@ from PyQt5.QtCore import QObject, Qt, QThread, pyqtSignal
 from core.base_page import BasePage
 from core.dropdown_bar import DropdownBar
 from core.table_clipboard import TableClipboardController
-from pages.read_table_xls import ReadTableXls
 from feasibility_analysis_services.oilfield_env_service import (
     get_env_profile_id,
     load_env_profiles,
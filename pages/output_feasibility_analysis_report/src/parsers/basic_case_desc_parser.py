@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block
 
@@ -27,7 +27,7 @@ ROW_PATTERN = re.compile(
 )
 
 
-def parse_basic_case_desc(lines: list[str]) -> list[BasicCaseDescRow]:
+def parse_basic_case_desc(lines: Sequence[str]) -> list[BasicCaseDescRow]:
     """
     解析:
     ** SEASTATE BASIC LOAD CASE DESCRIPTIONS **
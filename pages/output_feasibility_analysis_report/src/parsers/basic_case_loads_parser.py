@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block
 
@@ -54,7 +54,7 @@ def _to_float(value: str) -> float:
     return float(value.strip())
 
 
-def parse_basic_case_loads(lines: list[str]) -> list[BasicCaseLoadRow]:
+def parse_basic_case_loads(lines: Sequence[str]) -> list[BasicCaseLoadRow]:
     """
     解析:
     ****** SEASTATE BASIC LOAD CASE SUMMARY ******
@@ -114,7 +114,7 @@ def parse_basic_case_loads(lines: list[str]) -> list[BasicCaseLoadRow]:
     return rows
 
 
-def validate_basic_case_loads_against_desc(lines: list[str]) -> None:
+def validate_basic_case_loads_against_desc(lines: Sequence[str]) -> None:
     from .basic_case_desc_parser import parse_basic_case_desc
 
     desc_rows = parse_basic_case_desc(lines)
@@ -1,27 +1,176 @@
 from __future__ import annotations
 
-from typing import Iterable
+import re
+from bisect import bisect_left
+from typing import Iterable, Iterator, Sequence, overload
+
+from .psilst_reader import PsilstLines
+
+
+class HeaderIndex:
+    """
+    psilst 标题行索引：marker -> 包含该 marker 的行号（升序）。
+
+    命中行随查询向后增量补齐：已扫描过的范围只做二分查找，未扫描的部分才
+    继续向后找，同一 marker 整份清单最多扫描一遍。校验、各段落解析和分页
+    循环反复定位同一批标题时不再从头扫描；PsilstLines 直接在映射字节上查找。
+    """
+
+    def __init__(self, lines: Sequence[str]) -> None:
+        self._lines = lines
+        self._hits: dict[str, list[int]] = {}
+        # marker 在 [0, scanned) 行内的命中已全部记录在 _hits 中。
+        self._scanned: dict[str, int] = {}
+        self._prefix_positions: dict[str, list[int]] = {}
+        self._pattern_positions: dict[tuple[str, int], list[int]] = {}
+
+    def _scan(self, marker: str, start: int, stop: int) -> int:
+        lines = self._lines
+        if isinstance(lines, PsilstLines):
+            return lines.find_line([marker], start, stop)
+        for index in range(start, stop):
+            if marker in lines[index]:
+                return index
+        return -1
+
+    def _find(self, marker: str, start: int, stop: int) -> int:
+        hits = self._hits.setdefault(marker, [])
+        position = bisect_left(hits, start)
+        if position < len(hits):
+            return hits[position] if hits[position] < stop else -1
+
+        scanned = self._scanned.get(marker, 0)
+        found = -1
+        while scanned < stop:
+            hit = self._scan(marker, scanned, stop)
+            if hit == -1:
+                scanned = stop
+                break
+            hits.append(hit)
+            scanned = hit + 1
+            if hit >= start:
+                found = hit
+                break
+        self._scanned[marker] = max(scanned, self._scanned.get(marker, 0))
+        return found
+
+    def find(self, marker: str, start: int = 0) -> int:
+        """从 start 起首个包含 marker 的行号；找不到返回 -1。"""
+        return self._find(marker, max(0, start), len(self._lines))
+
+    def find_any(self, markers: Iterable[str], start: int = 0) -> int:
+        """从 start 起首个包含任一 marker 的行号；找不到返回 -1。"""
+        best = -1
+        for marker in markers:
+            # 已有更近的命中时，其余 marker 只需扫描到该行为止。
+            hit = self._find(marker, max(0, start), len(self._lines) if best == -1 else best)
+            if hit != -1:
+                best = hit
+        return best
+
+    def positions(self, marker: str) -> list[int]:
+        """包含 marker 的全部行号。"""
+        self._find(marker, len(self._lines), len(self._lines))
+        return self._hits[marker]
+
+    def prefix_positions(self, prefix: str) -> list[int]:
+        """去掉行首空白后以 prefix 开头的全部行号。"""
+        found = self._prefix_positions.get(prefix)
+        if found is None:
+            lines = self._lines
+            found = [index for index in self.positions(prefix) if lines[index].lstrip().startswith(prefix)]
+            self._prefix_positions[prefix] = found
+        return found
+
+    def pattern_positions(self, pattern: str | re.Pattern[str]) -> list[int]:
+        """pattern.search 命中的全部行号。"""
+        compiled = re.compile(pattern)
+        key = (compiled.pattern, compiled.flags)
+        found = self._pattern_positions.get(key)
+        if found is None:
+            found = self._pattern_positions[key] = [
+                index for index, line in enumerate(self._lines) if compiled.search(line)
+            ]
+        return found
+
+    @staticmethod
+    def _next(found: list[int], start: int) -> int:
+        position = bisect_left(found, max(0, start))
+        return found[position] if position < len(found) else -1
+
+    def find_prefix(self, prefix: str, start: int = 0) -> int:
+        return self._next(self.prefix_positions(prefix), start)
+
+    def find_pattern(self, pattern: str | re.Pattern[str], start: int = 0) -> int:
+        return self._next(self.pattern_positions(pattern), start)
+
+
+class IndexedLines(Sequence[str]):
+    """
+    附带 HeaderIndex 的行序列，内容与原序列逐行一致。
+
+    一份清单包装一次后交给各解析器，find_first_index / find_next_index /
+    extract_block 会自动走索引；切片返回原序列的切片。
+    """
+
+    def __init__(self, lines: Sequence[str]) -> None:
+        self.lines = lines
+        self.header_index = HeaderIndex(lines)
+
+    def __reduce__(self):
+        # 索引可随时重建，跨进程只传原序列（PsilstLines 只传路径）。
+        return (IndexedLines, (self.lines,))
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, index):
+        return self.lines[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.lines)
+
+
+def index_lines(lines: Sequence[str]) -> IndexedLines:
+    """为一份清单建立（或沿用已有的）标题索引。"""
+    if isinstance(lines, IndexedLines):
+        return lines
+    return IndexedLines(lines)
 
 
 def contains_marker(line: str, marker: str) -> bool:
     return marker in line
 
 
-def find_first_index(lines: list[str], marker: str, start: int = 0) -> int:
+def find_first_index(lines: Sequence[str], marker: str, start: int = 0) -> int:
     """
     找到首个包含 marker 的行号；找不到返回 -1。
     """
+    if isinstance(lines, IndexedLines):
+        return lines.header_index.find(marker, start)
+    if isinstance(lines, PsilstLines):
+        return lines.find_line([marker], start)
     for i in range(start, len(lines)):
         if marker in lines[i]:
             return i
     return -1
 
 
-def find_next_index(lines: list[str], markers: Iterable[str], start: int) -> int:
+def find_next_index(lines: Sequence[str], markers: Iterable[str], start: int) -> int:
     """
     从 start 开始，找到首个命中任意 marker 的行号；找不到返回 -1。
     """
     marker_list = list(markers)
+    if isinstance(lines, IndexedLines):
+        return lines.header_index.find_any(marker_list, start)
+    if isinstance(lines, PsilstLines):
+        return lines.find_line(marker_list, start)
     for i in range(start, len(lines)):
         line = lines[i]
         for marker in marker_list:
@@ -31,7 +180,7 @@ def find_next_index(lines: list[str], markers: Iterable[str], start: int) -> int
 
 
 def extract_block(
-    lines: list[str],
+    lines: Sequence[str],
     start_marker: str,
     end_markers: list[str] | None = None,
     include_start: bool = True,
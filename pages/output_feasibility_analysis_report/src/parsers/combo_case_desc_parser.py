@@ -4,7 +4,7 @@
 
 from __future__ import annotations
 
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block
 
@@ -47,7 +47,7 @@ def _parse_vba_detail_part(line: str) -> str:
     return f"{load_label}*{factor:.3f}"
 
 
-def parse_combo_case_desc(lines: list[str]) -> list[ComboCaseDescRow]:
+def parse_combo_case_desc(lines: Sequence[str]) -> list[ComboCaseDescRow]:
     """
     解析 SACS 的 SEASTATE COMBINED LOAD CASES 块。
 
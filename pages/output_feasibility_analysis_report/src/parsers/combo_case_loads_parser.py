@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block
 
@@ -52,7 +52,7 @@ def _to_float(value: str) -> float:
     return float(value.strip())
 
 
-def parse_combo_case_loads(lines: list[str]) -> list[ComboCaseLoadRow]:
+def parse_combo_case_loads(lines: Sequence[str]) -> list[ComboCaseLoadRow]:
     block = extract_block(
         lines=lines,
         start_marker=START_MARKER,
@@ -99,7 +99,7 @@ def parse_combo_case_loads(lines: list[str]) -> list[ComboCaseLoadRow]:
     return rows
 
 
-def validate_combo_case_loads_against_desc(lines: list[str]) -> None:
+def validate_combo_case_loads_against_desc(lines: Sequence[str]) -> None:
     from .combo_case_desc_parser import parse_combo_case_desc
 
     desc_rows = parse_combo_case_desc(lines)
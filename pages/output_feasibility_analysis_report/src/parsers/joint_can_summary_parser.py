@@ -5,9 +5,9 @@
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
-from .block_utils import find_next_index, join_block
+from .block_utils import find_first_index, find_next_index, join_block
 
 
 NUM = r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[Ee][+-]?\d+)?"
@@ -203,24 +203,21 @@ def _parse_rows(block_lines: list[str]) -> list[JointCanSummaryRow]:
     return rows
 
 
-def _extract_unity_check_block(lines: list[str]) -> list[str]:
-    for index, line in enumerate(lines):
-        if START_MARKER not in line:
-            continue
-
+def _extract_unity_check_block(lines: Sequence[str]) -> list[str]:
+    index = find_first_index(lines, START_MARKER)
+    while index != -1:
         lookahead = lines[index + 1 : index + 4]
-        if not any("(UNITY CHECK ORDER)" in item.upper() for item in lookahead):
-            continue
-
-        end_idx = find_next_index(lines, END_MARKERS, index + 1)
-        if end_idx == -1:
-            return lines[index:]
-        return lines[index:end_idx]
+        if any("(UNITY CHECK ORDER)" in item.upper() for item in lookahead):
+            end_idx = find_next_index(lines, END_MARKERS, index + 1)
+            if end_idx == -1:
+                return list(lines[index:])
+            return list(lines[index:end_idx])
+        index = find_first_index(lines, START_MARKER, index + 1)
 
     return []
 
 
-def parse_joint_can_summary(lines: list[str]) -> JointCanSummaryResult:
+def parse_joint_can_summary(lines: Sequence[str]) -> JointCanSummaryResult:
     block_lines = _extract_unity_check_block(lines)
 
     raw_block = join_block(block_lines)
@@ -11,7 +11,7 @@
 
 from __future__ import annotations
 
-from typing import Literal, TypedDict
+from typing import Literal, Sequence, TypedDict
 
 
 ConditionType = Literal["operation", "extreme"]
@@ -67,7 +67,7 @@ def _parse_row(line: str) -> LoadCaseStatusRow | None:
     }
 
 
-def parse_load_case_status(lines: list[str]) -> LoadCaseStatusResult:
+def parse_load_case_status(lines: Sequence[str]) -> LoadCaseStatusResult:
     rows: list[LoadCaseStatusRow] = []
     active = False
 
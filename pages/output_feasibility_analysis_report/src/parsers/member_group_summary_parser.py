@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block, join_block
 
@@ -159,7 +159,7 @@ def _parse_rows(block_lines: list[str]) -> list[MemberGroupSummaryRow]:
     return rows
 
 
-def parse_member_group_summary(lines: list[str]) -> MemberGroupSummaryResult:
+def parse_member_group_summary(lines: Sequence[str]) -> MemberGroupSummaryResult:
     block_lines = extract_block(
         lines=lines,
         start_marker=START_MARKER,
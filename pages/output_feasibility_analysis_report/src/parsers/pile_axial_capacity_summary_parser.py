@@ -4,7 +4,7 @@
 
 from __future__ import annotations
 
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block, join_block
 
@@ -120,7 +120,7 @@ def _parse_rows(block_lines: list[str]) -> list[PileAxialCapacitySummaryRow]:
     return rows
 
 
-def parse_pile_axial_capacity_summary(lines: list[str]) -> PileAxialCapacitySummaryResult:
+def parse_pile_axial_capacity_summary(lines: Sequence[str]) -> PileAxialCapacitySummaryResult:
     block_lines = extract_block(
         lines=lines,
         start_marker=START_MARKER,
@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 import re
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 from .block_utils import extract_block, join_block
 
@@ -142,7 +142,7 @@ def _parse_rows(block_lines: list[str]) -> list[PileGroupSummaryRow]:
     return rows
 
 
-def parse_pile_group_summary(lines: list[str]) -> PileGroupSummaryResult:
+def parse_pile_group_summary(lines: Sequence[str]) -> PileGroupSummaryResult:
     block_lines = extract_block(
         lines=lines,
         start_marker=START_MARKER,
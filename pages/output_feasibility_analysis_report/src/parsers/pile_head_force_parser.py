@@ -10,7 +10,7 @@
 
 from __future__ import annotations
 
-from typing import TypedDict
+from typing import Sequence, TypedDict
 
 
 class PileHeadForceRow(TypedDict):
@@ -61,7 +61,7 @@ def _parse_row(line: str, load_case: str) -> PileHeadForceRow | None:
     }
 
 
-def parse_pile_head_forces(lines: list[str]) -> PileHeadForceResult:
+def parse_pile_head_forces(lines: Sequence[str]) -> PileHeadForceResult:
     rows: list[PileHeadForceRow] = []
     current_case = ""
     current_block_is_target = False
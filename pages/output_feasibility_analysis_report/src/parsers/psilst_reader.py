@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import mmap
 import os
-from typing import List
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Sequence, Union, overload
+
+# 映射后的 psilst 内容；空文件无法 mmap，用 b"" 代替。
+PsilstBuffer = Union[bytes, mmap.mmap]
 
 _FACTOR_SEARCH_CHUNK_SIZE = 1024 * 1024
 _FACTOR_MARKER_OVERLAP = 4096
@@ -10,135 +17,136 @@ _FACTOR_FORCE_SECTION_MAX_BYTES = 600_000
 _FACTOR_FORCE_HEADER_LOOKAHEAD_BYTES = 20_000
 _FACTOR_SUMMARY_SECTION_MAX_BYTES = 1_000_000
 _FALLBACK_EDGE_BYTES = 2 * 1024 * 1024
+_LINE_INDEX_BLOCK_BYTES = 64 * 1024
+_LINE_WINDOW_BYTES = 1024 * 1024
+
 
+@contextmanager
+def open_psilst_buffer(path: str) -> Iterator[PsilstBuffer]:
+    """只读映射 psilst 文件。
 
-def _find_factor_bytes_marker(path: str, marker: bytes, start: int = 0) -> int:
+    同一次报告生成中完整行读取和 UI 关键段落读取共用这一份映射，
+    文件只从磁盘读一遍；各段落按需切片，不会整体载入内存。
+    """
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield b""
+            return
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def _find_factor_bytes_marker(data: PsilstBuffer, marker: bytes, start: int = 0) -> int:
     marker_upper = marker.upper()
     marker_length = len(marker_upper)
     overlap = max(marker_length + 16, _FACTOR_MARKER_OVERLAP)
     offset = max(0, int(start or 0))
     previous_tail = b""
+    size = len(data)
+
+    while offset < size:
+        chunk = data[offset : offset + _FACTOR_SEARCH_CHUNK_SIZE]
+        window = previous_tail + chunk
+        index = window.upper().find(marker_upper)
+        if index != -1:
+            return offset - len(previous_tail) + index
+        previous_tail = window[-overlap:]
+        offset += len(chunk)
+    return -1
 
-    with open(path, "rb") as handle:
-        handle.seek(offset)
-        while True:
-            chunk = handle.read(_FACTOR_SEARCH_CHUNK_SIZE)
-            if not chunk:
-                return -1
-            data = previous_tail + chunk
-            index = data.upper().find(marker_upper)
-            if index != -1:
-                return offset - len(previous_tail) + index
-            previous_tail = data[-overlap:]
-            offset += len(chunk)
-
-
-def _iter_factor_bytes_marker_positions(path: str, marker: bytes, start: int = 0):
+
+def _iter_factor_bytes_marker_positions(data: PsilstBuffer, marker: bytes, start: int = 0):
     marker_upper = marker.upper()
     marker_length = len(marker_upper)
     overlap = max(marker_length + 16, _FACTOR_MARKER_OVERLAP)
     offset = max(0, int(start or 0))
     previous_tail = b""
+    size = len(data)
 
-    with open(path, "rb") as handle:
-        handle.seek(offset)
+    while offset < size:
+        chunk = data[offset : offset + _FACTOR_SEARCH_CHUNK_SIZE]
+        window = previous_tail + chunk
+        window_upper = window.upper()
+        search_from = 0
         while True:
-            chunk = handle.read(_FACTOR_SEARCH_CHUNK_SIZE)
-            if not chunk:
-                return
-            data = previous_tail + chunk
-            data_upper = data.upper()
-            search_from = 0
-            while True:
-                index = data_upper.find(marker_upper, search_from)
-                if index == -1:
-                    break
-                position = offset - len(previous_tail) + index
-                if position >= start:
-                    yield position
-                search_from = index + marker_length
-            previous_tail = data[-overlap:]
-            offset += len(chunk)
-
-
-def _read_factor_bytes_range(path: str, start: int, end: int) -> bytes:
-    with open(path, "rb") as handle:
-        handle.seek(max(0, int(start)))
-        return handle.read(max(0, int(end) - int(start)))
+            index = window_upper.find(marker_upper, search_from)
+            if index == -1:
+                break
+            position = offset - len(previous_tail) + index
+            if position >= start:
+                yield position
+            search_from = index + marker_length
+        previous_tail = window[-overlap:]
+        offset += len(chunk)
 
 
-def _find_next_form_feed(path: str, start: int, end: int) -> int:
-    offset = max(0, int(start or 0))
-    end = max(offset, int(end))
+def _read_factor_bytes_range(data: PsilstBuffer, start: int, end: int) -> bytes:
+    start = max(0, int(start))
+    return bytes(data[start : max(start, int(end))])
 
-    with open(path, "rb") as handle:
-        handle.seek(offset)
-        while offset < end:
-            chunk = handle.read(min(_FACTOR_SEARCH_CHUNK_SIZE, end - offset))
-            if not chunk:
-                return -1
-            index = chunk.find(b"\x0c")
-            if index != -1:
-                return offset + index
-            offset += len(chunk)
 
-    return -1
+def _find_next_form_feed(data: PsilstBuffer, start: int, end: int) -> int:
+    offset = max(0, int(start or 0))
+    end = min(max(offset, int(end)), len(data))
+    if offset >= end:
+        return -1
+    return data.find(b"\x0c", offset, end)
 
 
-def _find_line_start_before(path: str, position: int) -> int:
+def _find_line_start_before(data: PsilstBuffer, position: int) -> int:
     position = max(0, int(position or 0))
     search_start = max(0, position - _FACTOR_MARKER_OVERLAP)
-    data = _read_factor_bytes_range(path, search_start, position)
-    line_break = max(data.rfind(b"\n"), data.rfind(b"\r"))
+    window = data[search_start:position]
+    line_break = max(window.rfind(b"\n"), window.rfind(b"\r"))
     if line_break == -1:
         return search_start
     return search_start + line_break + 1
 
 
-def _read_factor_form_feed_sections(path: str, markers: List[bytes], file_size: int) -> List[bytes]:
+def _read_factor_form_feed_sections(data: PsilstBuffer, markers: List[bytes], file_size: int) -> List[bytes]:
     chunks: List[bytes] = []
 
     for marker in markers:
-        for marker_pos in _iter_factor_bytes_marker_positions(path, marker):
-            section_start = _find_line_start_before(path, marker_pos)
+        for marker_pos in _iter_factor_bytes_marker_positions(data, marker):
+            section_start = _find_line_start_before(data, marker_pos)
             max_section_end = min(file_size, section_start + _FACTOR_SUMMARY_SECTION_MAX_BYTES)
-            form_feed_pos = _find_next_form_feed(path, section_start + 1, max_section_end)
+            form_feed_pos = _find_next_form_feed(data, section_start + 1, max_section_end)
             section_end = form_feed_pos if form_feed_pos != -1 else max_section_end
-            chunks.append(_read_factor_bytes_range(path, section_start, section_end))
+            chunks.append(_read_factor_bytes_range(data, section_start, section_end))
 
     return chunks
 
 
 def _read_factor_marker_ranges(
-    path: str,
+    data: PsilstBuffer,
     section_markers: List[tuple[bytes, List[bytes]]],
     file_size: int,
 ) -> List[bytes]:
     chunks: List[bytes] = []
 
     for start_marker, end_markers in section_markers:
-        marker_pos = _find_factor_bytes_marker(path, start_marker)
+        marker_pos = _find_factor_bytes_marker(data, start_marker)
         if marker_pos == -1:
             continue
-        section_start = _find_line_start_before(path, marker_pos)
+        section_start = _find_line_start_before(data, marker_pos)
         end_candidates = [
             end_pos
             for end_marker in end_markers
-            for end_pos in [_find_factor_bytes_marker(path, end_marker, marker_pos + len(start_marker))]
+            for end_pos in [_find_factor_bytes_marker(data, end_marker, marker_pos + len(start_marker))]
             if end_pos != -1
         ]
         section_end = min(end_candidates) if end_candidates else file_size
-        chunks.append(_read_factor_bytes_range(path, section_start, section_end))
+        chunks.append(_read_factor_bytes_range(data, section_start, section_end))
 
     return chunks
 
 
-def _read_factor_force_chunks(path: str, start: int, file_size: int) -> List[bytes]:
+def _read_factor_force_chunks(data: PsilstBuffer, start: int, file_size: int) -> List[bytes]:
     chunks: List[bytes] = []
-    try:
-        force_positions = list(_iter_factor_bytes_marker_positions(path, b"FINAL PILE HEAD FORCES", start))
-    except OSError:
-        return chunks
+    force_positions = list(_iter_factor_bytes_marker_positions(data, b"FINAL PILE HEAD FORCES", start))
     if not force_positions:
         return chunks
 
@@ -146,10 +154,10 @@ def _read_factor_force_chunks(path: str, start: int, file_size: int) -> List[byt
         next_force_start = force_positions[index + 1] if index + 1 < len(force_positions) else file_size
         section_end = min(next_force_start, force_start + _FACTOR_FORCE_SECTION_MAX_BYTES, file_size)
         lookahead_end = min(section_end, force_start + _FACTOR_FORCE_HEADER_LOOKAHEAD_BYTES, file_size)
-        header = _read_factor_bytes_range(path, force_start, lookahead_end).upper()
+        header = _read_factor_bytes_range(data, force_start, lookahead_end).upper()
         if b"PILE HEAD COORDINATES" not in header:
             continue
-        chunks.append(_read_factor_bytes_range(path, force_start, section_end))
+        chunks.append(_read_factor_bytes_range(data, force_start, section_end))
     return chunks
 
 
@@ -162,14 +170,14 @@ def _decode_factor_chunks(chunks: List[bytes]) -> List[str]:
     return [line.rstrip() for line in text.split("\n")]
 
 
-def _read_result_factor_marker_lines(path: str) -> List[str]:
-    file_size = os.path.getsize(path)
+def _read_result_factor_marker_lines(data: PsilstBuffer) -> List[str]:
+    file_size = len(data)
     chunks: List[bytes] = []
 
-    status_start = _find_factor_bytes_marker(path, b"**** LOAD CASE STATUS REPORT")
-    load_cases_start = _find_factor_bytes_marker(path, b"***** SEASTATE COMBINED LOAD CASES *****")
+    status_start = _find_factor_bytes_marker(data, b"**** LOAD CASE STATUS REPORT")
+    load_cases_start = _find_factor_bytes_marker(data, b"***** SEASTATE COMBINED LOAD CASES *****")
     axial_start = _find_factor_bytes_marker(
-        path,
+        data,
         b"S O I L  M A X I M U M  A X I A L  C A P A C I T Y  S U M M A R Y",
         max(status_start, 0),
     )
@@ -180,19 +188,19 @@ def _read_result_factor_marker_lines(path: str) -> List[str]:
         early_end_candidates: List[int] = []
         if axial_start != -1:
             for marker in (b"SACS LOAD CASE REPORT", b"PST VERSION"):
-                marker_pos = _find_factor_bytes_marker(path, marker, axial_start)
+                marker_pos = _find_factor_bytes_marker(data, marker, axial_start)
                 if marker_pos != -1:
                     early_end_candidates.append(marker_pos)
         if load_cases_start != -1:
-            marker_pos = _find_factor_bytes_marker(path, b"SACS LOAD CASE REPORT", load_cases_start)
+            marker_pos = _find_factor_bytes_marker(data, b"SACS LOAD CASE REPORT", load_cases_start)
             if marker_pos != -1:
                 early_end_candidates.append(marker_pos)
         early_end = min(early_end_candidates) if early_end_candidates else min(file_size, max(early_starts) + 800_000)
-        chunks.append(_read_factor_bytes_range(path, early_start, early_end))
+        chunks.append(_read_factor_bytes_range(data, early_start, early_end))
 
     chunks.extend(
         _read_factor_marker_ranges(
-            path,
+            data,
             [
                 (
                     b"SEASTATE BASIC LOAD CASE DESCRIPTIONS",
@@ -229,7 +237,7 @@ def _read_result_factor_marker_lines(path: str) -> List[str]:
 
     chunks.extend(
         _read_factor_form_feed_sections(
-            path,
+            data,
             [
                 b"M E M B E R  G R O U P  S U M M A R Y",
                 b"J O I N T   C A N   S U M M A R Y",
@@ -238,7 +246,7 @@ def _read_result_factor_marker_lines(path: str) -> List[str]:
             file_size,
         )
     )
-    chunks.extend(_read_factor_force_chunks(path, max(status_start, 0), file_size))
+    chunks.extend(_read_factor_force_chunks(data, max(status_start, 0), file_size))
     return _decode_factor_chunks(chunks)
 
 
@@ -258,46 +266,222 @@ def _normalise_text_to_lines(text: str) -> List[str]:
     return [line.rstrip() for line in text.split("\n")]
 
 
-def _read_full_lines_streaming(path: str) -> List[str]:
+def _decode_psilst_line(raw: bytes) -> str:
+    # 清单绝大多数行是纯 ASCII，直接解码，跳过多编码尝试和 BOM 替换。
+    if raw.isascii():
+        return raw.decode("ascii").rstrip("\r\n").replace("\t", "    ")
+    line = _decode_psilst_bytes(raw).rstrip("\r\n")
+    return line.replace("\ufeff", "").replace("\t", "    ")
+
+
+def _decode_psilst_window(raw: bytes) -> List[str]:
+    """解码由整行组成的一段字节，结果与逐行 `_decode_psilst_line` 一致。"""
+    if not raw:
+        return []
+    if raw.isascii():
+        parts = raw.decode("ascii").replace("\t", "    ").split("\n")
+        if raw.endswith(b"\n"):
+            parts.pop()
+        return [part.rstrip("\r") for part in parts]
+    parts = raw.split(b"\n")
+    if raw.endswith(b"\n"):
+        parts.pop()
+    return [_decode_psilst_line(part) for part in parts]
+
+
+def _read_full_lines_streaming(data: PsilstBuffer) -> List[str]:
     # 小文件兼容旧版 read_lines：返回完整行列表。
-    # 用二进制逐行读，避免 read()+split() 产生额外大内存峰值。
+    # 逐行从映射中切片解码，避免 read()+split() 产生额外大内存峰值。
     lines: List[str] = []
-    with open(path, "rb") as handle:
-        for raw in handle:
-            line = _decode_psilst_bytes(raw).rstrip("\r\n")
-            lines.append(line.replace("\ufeff", "").replace("\t", "    "))
+    size = len(data)
+    start = 0
+    while start < size:
+        end = data.find(b"\n", start)
+        end = size if end == -1 else end + 1
+        lines.append(_decode_psilst_line(data[start:end]))
+        start = end
     return lines
 
 
-def read_lines(path: str) -> List[str]:
-    """兼容 report_service 旧接口。
+def _full_read_limit_bytes() -> int:
+    try:
+        return int(os.environ.get("SHIYOU_PSILST_FULL_READ_LIMIT_MB", "64")) * 1024 * 1024
+    except Exception:
+        return 64 * 1024 * 1024
+
+
+class PsilstLines(Sequence[str]):
+    """按需解码的 psilst 行序列。
+
+    与完整读入的行列表逐行一致，但只保存每 64KB 的换行计数：
+    - 迭代时按约 1MB 的整行窗口流式解码；
+    - 切片只解码对应区段，extract_block 取段落时内存与段落大小成正比；
+    - find_line 先在字节上查找 marker，再回到解码后的行确认。
 
-    旧版 report_service 会同时 import read_lines 和 read_ui_analysis_lines。
-    v11 只保留 read_ui_analysis_lines，导致 ImportError。
+    传入 buffer 时借用调用方的映射，须在映射关闭前用完；只传 path 时自行映射
+    文件并持有到 close() 或对象释放，期间文件被删除（POSIX）也不影响已有视图。
+    带 path 时可 pickle，子进程中按 path 重新打开。
+    """
 
-    小文件：返回完整行列表，保持旧行为。
-    大文件：返回 UI 关键段落，避免 psilst.M1 过大触发 MemoryError。
+    def __init__(self, path: str | None = None, buffer: PsilstBuffer | None = None) -> None:
+        if path is None and buffer is None:
+            raise ValueError("PsilstLines needs a path or a buffer")
+        self._path = path
+        self._owned: mmap.mmap | None = None
+        if buffer is None:
+            with open(str(path), "rb") as handle:
+                if os.fstat(handle.fileno()).st_size == 0:
+                    buffer = b""
+                else:
+                    buffer = self._owned = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer: PsilstBuffer = buffer
+        self._size = len(buffer)
+        block_line_counts = array("Q")
+        newline_count = 0
+        for block_start in range(0, self._size, _LINE_INDEX_BLOCK_BYTES):
+            block_line_counts.append(newline_count)
+            block_end = min(self._size, block_start + _LINE_INDEX_BLOCK_BYTES)
+            newline_count += buffer[block_start:block_end].count(b"\n")
+        has_tail = self._size > 0 and buffer[self._size - 1 : self._size] != b"\n"
+        self._block_line_counts = block_line_counts
+        self._newline_count = newline_count
+        self._length = newline_count + (1 if has_tail else 0)
+
+    @contextmanager
+    def _mapped(self) -> Iterator[PsilstBuffer]:
+        if self._owned is not None and self._owned.closed:
+            raise ValueError("PsilstLines is closed")
+        yield self._buffer
+
+    def close(self) -> None:
+        """释放自行建立的文件映射；借用的 buffer 由调用方关闭。"""
+        if self._owned is not None:
+            self._owned.close()
+
+    def __del__(self) -> None:
+        owned = getattr(self, "_owned", None)
+        if owned is not None:
+            owned.close()
+
+    def __reduce__(self):
+        if self._path is None:
+            raise TypeError("PsilstLines without a path cannot be pickled")
+        return (PsilstLines, (self._path,))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _line_start(self, data: PsilstBuffer, index: int) -> int:
+        """第 index 行起始字节位置；index == len 时返回文件末尾。"""
+        if index <= 0:
+            return 0
+        if index > self._newline_count:
+            return self._size
+        newline_index = index - 1
+        block = bisect_right(self._block_line_counts, newline_index) - 1
+        position = block * _LINE_INDEX_BLOCK_BYTES
+        for _ in range(newline_index - self._block_line_counts[block] + 1):
+            position = data.find(b"\n", position) + 1
+        return position
+
+    def _line_at_offset(self, data: PsilstBuffer, offset: int) -> int:
+        block = offset // _LINE_INDEX_BLOCK_BYTES
+        block_start = block * _LINE_INDEX_BLOCK_BYTES
+        return self._block_line_counts[block] + data[block_start:offset].count(b"\n")
+
+    def _decode_range(self, data: PsilstBuffer, start: int, stop: int) -> List[str]:
+        if start >= stop:
+            return []
+        return _decode_psilst_window(data[self._line_start(data, start) : self._line_start(data, stop)])
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            with self._mapped() as data:
+                if step == 1:
+                    return self._decode_range(data, start, stop)
+                return [self._decode_range(data, item, item + 1)[0] for item in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("psilst line index out of range")
+        with self._mapped() as data:
+            return self._decode_range(data, index, index + 1)[0]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._mapped() as data:
+            position = 0
+            while position < self._size:
+                if position + _LINE_WINDOW_BYTES >= self._size:
+                    window_end = self._size
+                else:
+                    window_end = data.rfind(b"\n", position, position + _LINE_WINDOW_BYTES) + 1
+                    if window_end <= position:
+                        window_end = data.find(b"\n", position) + 1 or self._size
+                yield from _decode_psilst_window(data[position:window_end])
+                position = window_end
+
+    def find_line(self, markers: Iterable[str], start: int = 0, stop: int | None = None) -> int:
+        """在 [start, stop) 行内找首个包含任一 marker 的行号；找不到返回 -1。"""
+        marker_list = list(markers)
+        start = max(0, start)
+        stop = self._length if stop is None else min(stop, self._length)
+        if start >= stop:
+            return -1
+        if not all(marker and marker.isascii() for marker in marker_list):
+            for index, line in enumerate(self[start:stop], start):
+                if any(marker in line for marker in marker_list):
+                    return index
+            return -1
+
+        encoded = [marker.encode("ascii") for marker in marker_list]
+        with self._mapped() as data:
+            offset = self._line_start(data, start)
+            end = self._line_start(data, stop)
+            while offset < end:
+                hits = [hit for hit in (data.find(marker, offset, end) for marker in encoded) if hit != -1]
+                if not hits:
+                    return -1
+                index = self._line_at_offset(data, min(hits))
+                line = self._decode_range(data, index, index + 1)[0]
+                if any(marker in line for marker in marker_list):
+                    return index
+                offset = self._line_start(data, index + 1)
+        return -1
+
+
+def read_lines(path: str, buffer: PsilstBuffer | None = None) -> Sequence[str]:
+    """读取 psilst 全部行，大小文件结果逐行一致。
+
+    - 传入 buffer（open_psilst_buffer 的映射）时返回其上的按需解码视图，须在映射关闭前用完；
+    - 不超过 SHIYOU_PSILST_FULL_READ_LIMIT_MB（默认 64MB）的文件直接返回完整行列表；
+    - 更大的文件返回按需解码视图（PsilstLines），内存随所取段落大小增长，而不是整个文件。
     """
     path = os.path.normpath(str(path or "").strip())
     if not path or not os.path.isfile(path):
         return []
 
-    try:
-        max_full_bytes = int(os.environ.get("SHIYOU_PSILST_FULL_READ_LIMIT_MB", "64")) * 1024 * 1024
-    except Exception:
-        max_full_bytes = 64 * 1024 * 1024
+    if buffer is not None:
+        return PsilstLines(path, buffer)
 
     try:
         file_size = os.path.getsize(path)
     except OSError:
         return []
 
-    if file_size <= max_full_bytes:
-        return _read_full_lines_streaming(path)
+    if file_size <= _full_read_limit_bytes():
+        with open_psilst_buffer(path) as mapped:
+            return _read_full_lines_streaming(mapped)
+    return PsilstLines(path)
 
-    return read_ui_analysis_lines(path)
 
-def read_ui_analysis_lines(path: str) -> List[str]:
+def read_ui_analysis_lines(path: str, buffer: PsilstBuffer | None = None) -> List[str]:
     """读取可行性评估 UI 解析需要的 psilst 关键段落。
 
     原实现一次性读取完整 psilst.M1 并 split，结果文件很大时会触发
@@ -308,15 +492,19 @@ def read_ui_analysis_lines(path: str) -> List[str]:
     if not path or not os.path.isfile(path):
         return []
 
-    try:
-        marker_lines = _read_result_factor_marker_lines(path)
-        if marker_lines:
-            return marker_lines
-    except OSError:
-        pass
+    if buffer is None:
+        with open_psilst_buffer(path) as mapped:
+            return _read_ui_analysis_lines_from_buffer(mapped)
+    return _read_ui_analysis_lines_from_buffer(buffer)
+
+
+def _read_ui_analysis_lines_from_buffer(data: PsilstBuffer) -> List[str]:
+    marker_lines = _read_result_factor_marker_lines(data)
+    if marker_lines:
+        return marker_lines
 
-    file_size = os.path.getsize(path)
-    head = _read_factor_bytes_range(path, 0, min(file_size, _FALLBACK_EDGE_BYTES))
+    file_size = len(data)
+    head = _read_factor_bytes_range(data, 0, min(file_size, _FALLBACK_EDGE_BYTES))
     tail_start = max(0, file_size - _FALLBACK_EDGE_BYTES)
-    tail = _read_factor_bytes_range(path, tail_start, file_size)
+    tail = _read_factor_bytes_range(data, tail_start, file_size)
     return _decode_factor_chunks([head, tail])
@@ -0,0 +1,115 @@
+"""
+psilst 段落并行解析。
+
+各段落解析器互不依赖，只读同一份行列表。行数较多时把行列表编码后放进
+共享内存（只读），进程池中每个任务附着同一块内存、解码后运行一个解析器；
+按需解码的 PsilstLines 则只传文件路径，由子进程自行映射。
+结果按传入顺序合并，与串行执行完全一致。
+
+行数较少或进程池不可用时直接串行执行：进程启动和导入的固定
+开销在常规清单上大于解析本身。
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Mapping, Sequence
+
+from .block_utils import IndexedLines
+from .psilst_reader import PsilstLines
+
+SectionParser = Callable[[Sequence[str]], Any]
+
+_DEFAULT_PARALLEL_MIN_LINES = 200_000
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+def _parallel_workers(section_count: int) -> int:
+    # 打包版入口 main.py 已调用 multiprocessing.freeze_support，子进程不会重新拉起主程序。
+    configured = _env_int("SHIYOU_PSILST_PARSE_WORKERS", os.cpu_count() or 1)
+    return max(1, min(section_count, configured))
+
+
+def _is_picklable(parser: SectionParser) -> bool:
+    try:
+        pickle.dumps(parser)
+    except Exception:
+        return False
+    return True
+
+
+def _lazy_view(lines: Sequence[str]) -> PsilstLines | None:
+    base = lines.lines if isinstance(lines, IndexedLines) else lines
+    return base if isinstance(base, PsilstLines) else None
+
+
+def _run_shared_section(shm_name: str, size: int, parser: SectionParser) -> Any:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        lines = bytes(shm.buf[:size]).decode("utf-8", errors="surrogatepass").split("\n")
+    finally:
+        shm.close()
+    return parser(lines)
+
+
+def _parse_sections_in_pool(
+    lines: Sequence[str],
+    parsers: Mapping[str, SectionParser],
+    workers: int,
+) -> dict[str, Any]:
+    if _lazy_view(lines) is not None:
+        # 按需解码视图只 pickle 文件路径，子进程各自映射同一文件。
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {key: pool.submit(parser, lines) for key, parser in parsers.items()}
+            return {key: futures[key].result() for key in parsers}
+
+    payload = "\n".join(lines).encode("utf-8", errors="surrogatepass")
+    size = len(payload)
+    # 共享内存大小可能按页向上取整，子进程只按 size 截取。
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+    try:
+        shm.buf[:size] = payload
+        del payload
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                key: pool.submit(_run_shared_section, shm.name, size, parser)
+                for key, parser in parsers.items()
+            }
+            return {key: futures[key].result() for key in parsers}
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def parse_sections(lines: Sequence[str], parsers: Mapping[str, SectionParser]) -> dict[str, Any]:
+    """对同一份行列表运行多个段落解析器，返回 {key: 解析结果}，顺序与 parsers 一致。
+
+    行数达到 SHIYOU_PSILST_PARALLEL_MIN_LINES（默认 20 万行）时使用进程池，
+    进程数由 SHIYOU_PSILST_PARSE_WORKERS 控制（默认 CPU 核数）。解析器自身抛出的
+    异常原样向上抛出；进程池无法启动时退回串行。
+    """
+    workers = _parallel_workers(len(parsers))
+    min_lines = _env_int("SHIYOU_PSILST_PARALLEL_MIN_LINES", _DEFAULT_PARALLEL_MIN_LINES)
+    if (
+        workers > 1
+        and lines
+        and len(lines) >= min_lines
+        and all(_is_picklable(parser) for parser in parsers.values())
+        and (_lazy_view(lines) is None or _is_picklable(_lazy_view(lines)))
+    ):
+        try:
+            return _parse_sections_in_pool(lines, parsers, workers)
+        except (BrokenProcessPool, OSError):
+            pass
+
+    return {key: parser(lines) for key, parser in parsers.items()}
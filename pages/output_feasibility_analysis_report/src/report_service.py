@@ -7,6 +7,7 @@ from typing import Any, Mapping
 
 from src.chapter_1_3_builder import build_chapter_1_3_context
 from src.parsers.basic_case_desc_parser import parse_basic_case_desc
+from src.parsers.block_utils import index_lines
 from src.parsers.basic_case_loads_parser import (
     parse_basic_case_loads,
     validate_basic_case_loads_against_desc,
@@ -27,7 +28,8 @@ from src.parsers.pile_head_capacity_summary_builder import build_pile_head_capac
 from src.parsers.pile_head_force_parser import parse_pile_head_forces
 from src.parsers.pile_group_summary_builder import build_pile_group_summary
 from src.parsers.pile_group_summary_parser import parse_pile_group_summary
-from src.parsers.psilst_reader import read_lines, read_ui_analysis_lines
+from src.parsers.psilst_reader import PsilstBuffer, open_psilst_buffer, read_lines, read_ui_analysis_lines
+from src.parsers.section_pool import parse_sections
 from src.path_config_loader import get_report_defaults
 from src.parsers.summary_builder import build_analysis_summary
 from src.pdf_converter import convert_docx_to_pdf
@@ -153,6 +155,7 @@ def _build_platform_evaluation_conclusion_section(
 def build_analysis_results_for_ui(
     factor_path: str,
     pile_capacity_input_rows: list[Mapping[str, Any]] | None = None,
+    buffer: PsilstBuffer | None = None,
 ) -> dict[str, Any]:
     factor_file = Path(factor_path)
     if not factor_file.exists():
@@ -160,20 +163,33 @@ def build_analysis_results_for_ui(
             f"无法读取文件: {factor_file} (exists={factor_file.exists()}, absolute={factor_file.resolve(strict=False)})"
         )
 
-    lines = read_ui_analysis_lines(factor_path)
+    lines = index_lines(read_ui_analysis_lines(factor_path, buffer=buffer))
 
-    member_group_summary = parse_member_group_summary(lines)
+    # 各段落解析互不依赖，可并行；builder 依赖解析结果，仍按原顺序串行。
+    sections = parse_sections(
+        lines,
+        {
+            "member_group_summary": parse_member_group_summary,
+            "joint_can_summary": parse_joint_can_summary,
+            "pile_group_summary": parse_pile_group_summary,
+            "load_case_status": parse_load_case_status,
+            "pile_head_forces": parse_pile_head_forces,
+            "pile_axial_capacity": parse_pile_axial_capacity_summary,
+        },
+    )
+
+    member_group_summary = sections["member_group_summary"]
     member_summary = build_member_summary(member_group_summary)
 
-    joint_can_summary = parse_joint_can_summary(lines)
+    joint_can_summary = sections["joint_can_summary"]
     joint_summary = build_joint_can_summary(joint_can_summary)
 
-    pile_group_summary = parse_pile_group_summary(lines)
+    pile_group_summary = sections["pile_group_summary"]
     pile_summary = build_pile_group_summary(pile_group_summary)
 
-    load_case_status = parse_load_case_status(lines)
-    pile_head_forces = parse_pile_head_forces(lines)
-    pile_axial_capacity = parse_pile_axial_capacity_summary(lines)
+    load_case_status = sections["load_case_status"]
+    pile_head_forces = sections["pile_head_forces"]
+    pile_axial_capacity = sections["pile_axial_capacity"]
     if pile_capacity_input_rows is not None or pile_head_forces.get("rows"):
         pile_axial_capacity_summary = build_pile_head_capacity_summary(
             pile_head_forces,
@@ -223,23 +239,36 @@ def generate_report(
             f"无法读取文件: {factor_file} (exists={factor_file.exists()}, absolute={factor_file.resolve(strict=False)})"
         )
 
-    lines = read_lines(factor_path)
-
-    validate_basic_case_loads_against_desc(lines)
-    validate_combo_case_loads_against_desc(lines)
-
-    basic_case_desc_rows = parse_basic_case_desc(lines)
-    basic_case_load_rows = parse_basic_case_loads(lines)
-    combo_case_desc_rows = parse_combo_case_desc(lines)
-    combo_case_load_rows = parse_combo_case_loads(lines)
-
-    if analysis_results_override is not None:
-        analysis_results = deepcopy(dict(analysis_results_override))
-    else:
-        analysis_results = build_analysis_results_for_ui(
-            factor_path,
-            pile_capacity_input_rows=pile_capacity_input_rows,
+    # 完整行和 UI 关键段落共用同一份只读映射，文件只读一遍。
+    with open_psilst_buffer(factor_path) as buffer:
+        # 校验和各段落解析反复定位同一批标题，标题索引只建一次。
+        lines = index_lines(read_lines(factor_path, buffer=buffer))
+
+        validate_basic_case_loads_against_desc(lines)
+        validate_combo_case_loads_against_desc(lines)
+
+        load_case_sections = parse_sections(
+            lines,
+            {
+                "basic_case_desc": parse_basic_case_desc,
+                "basic_case_loads": parse_basic_case_loads,
+                "combo_case_desc": parse_combo_case_desc,
+                "combo_case_loads": parse_combo_case_loads,
+            },
         )
+        basic_case_desc_rows = load_case_sections["basic_case_desc"]
+        basic_case_load_rows = load_case_sections["basic_case_loads"]
+        combo_case_desc_rows = load_case_sections["combo_case_desc"]
+        combo_case_load_rows = load_case_sections["combo_case_loads"]
+
+        if analysis_results_override is not None:
+            analysis_results = deepcopy(dict(analysis_results_override))
+        else:
+            analysis_results = build_analysis_results_for_ui(
+                factor_path,
+                pile_capacity_input_rows=pile_capacity_input_rows,
+                buffer=buffer,
+            )
     analysis_summary = analysis_results["analysis_summary"]
     member_group_summary = analysis_results["member_group_summary"]
     member_summary = analysis_results["member_summary"]
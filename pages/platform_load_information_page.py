@@ -50,6 +50,11 @@ from services.inspection_business_db_adapter import (
     replace_platform_load_information_items,
 )
 import services.platform_load_preheat as platform_load_preheat
+from services.result_factor_scanner import (
+    DEFAULT_NUM_PATTERN,
+    get_cached_result_factor_values,
+    scan_result_factor_files,
+)
 
 # 上部组块分项目计算表页面（右键重量/重心单元格跳转编辑）
 try:
@@ -74,12 +79,6 @@ except ImportError:
     pd = None
 
 
-RESULT_FACTOR_KEYS = [
-    "op_Fx", "op_Fy", "op_Fz", "op_Mx", "op_My", "op_Mz",
-    "ext_Fx", "ext_Fy", "ext_Fz", "ext_Mx", "ext_My", "ext_Mz",
-    "Fx", "Fy", "Fz", "Mx", "My", "Mz", "操作工况", "极端工况",
-]
-
 OVERALL_ASSESSMENT_COL = 25
 VISIBLE_LOAD_COLUMN_COUNT = 27
 REBUILD_DIRECTORY_ID_INDEX = VISIBLE_LOAD_COLUMN_COUNT
@@ -104,11 +103,6 @@ def _is_psilst_result_file(path: object) -> bool:
     return bool(file_name and file_name.startswith("psilst"))
 
 
-_FACTOR_SEARCH_CHUNK_SIZE = 1024 * 1024
-_FACTOR_FORCE_HEADER_LOOKAHEAD_BYTES = 16 * 1024
-_FACTOR_FORCE_SECTION_MAX_BYTES = 256 * 1024
-
-
 def _history_rebuild_project_values(project: Dict[str, object]) -> Tuple[str, str, str]:
     name = str(project.get("project_name") or project.get("directory_name") or "").strip()
     date = str(project.get("project_year") or "").strip()
@@ -222,397 +216,36 @@ def _select_chart_xticks(values: List[int], max_tick_count: int = 8) -> List[int
     return selected
 
 
+class ResultFactorBatchReadWorker(QObject):
+    """批量读取结果文件：多行共用同一文件时只扫描一次，每个文件完成即逐行回传。"""
 
-def _find_factor_bytes_marker(path: str, marker: bytes, start: int = 0) -> int:
-    marker_length = len(marker)
-    overlap = max(marker_length - 1, 0)
-    with open(path, "rb") as handle:
-        handle.seek(start)
-        offset = start
-        previous_tail = b""
-        while True:
-            chunk = handle.read(_FACTOR_SEARCH_CHUNK_SIZE)
-            if not chunk:
-                return -1
-            data = previous_tail + chunk
-            index = data.find(marker)
-            if index != -1:
-                return offset - len(previous_tail) + index
-            previous_tail = data[-overlap:] if overlap else b""
-            offset += len(chunk)
-
-
-def _iter_factor_bytes_marker_positions(path: str, marker: bytes, start: int = 0):
-    marker_length = len(marker)
-    overlap = max(marker_length - 1, 0)
-    with open(path, "rb") as handle:
-        handle.seek(start)
-        offset = start
-        previous_tail = b""
-        while True:
-            chunk = handle.read(_FACTOR_SEARCH_CHUNK_SIZE)
-            if not chunk:
-                return
-            data = previous_tail + chunk
-            search_from = 0
-            while True:
-                index = data.find(marker, search_from)
-                if index == -1:
-                    break
-                position = offset - len(previous_tail) + index
-                if position >= start:
-                    yield position
-                search_from = index + marker_length
-            previous_tail = data[-overlap:] if overlap else b""
-            offset += len(chunk)
-
-
-def _read_factor_bytes_range(path: str, start: int, end: int) -> bytes:
-    with open(path, "rb") as handle:
-        handle.seek(start)
-        return handle.read(max(0, end - start))
-
-
-def _read_factor_force_chunks(path: str, start: int, file_size: int) -> List[bytes]:
-    chunks: List[bytes] = []
-    try:
-        force_positions = list(_iter_factor_bytes_marker_positions(path, b"FINAL PILE HEAD FORCES", start))
-    except OSError:
-        return chunks
-    if not force_positions:
-        return chunks
-
-    for index, force_start in enumerate(force_positions):
-        next_force_start = force_positions[index + 1] if index + 1 < len(force_positions) else file_size
-        section_end = min(next_force_start, force_start + _FACTOR_FORCE_SECTION_MAX_BYTES, file_size)
-        lookahead_end = min(section_end, force_start + _FACTOR_FORCE_HEADER_LOOKAHEAD_BYTES, file_size)
-        header = _read_factor_bytes_range(path, force_start, lookahead_end)
-        if b"PILE HEAD COORDINATES" not in header:
-            continue
-        chunks.append(_read_factor_bytes_range(path, force_start, section_end))
-    return chunks
-
-
-def _decode_factor_chunks(chunks: List[bytes]) -> List[str]:
-    text = "\n".join(chunk.decode("latin-1", errors="ignore") for chunk in chunks)
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = text.replace("\ufeff", "").replace("\t", "    ")
-    return [line.rstrip() for line in text.split("\n")]
-
-
-def _read_result_factor_marker_lines(path: str) -> List[str]:
-    file_size = os.path.getsize(path)
-    chunks: List[bytes] = []
-
-    status_start = _find_factor_bytes_marker(path, b"**** LOAD CASE STATUS REPORT")
-    load_cases_start = _find_factor_bytes_marker(path, b"***** SEASTATE COMBINED LOAD CASES *****")
-    axial_start = _find_factor_bytes_marker(
-        path,
-        b"S O I L  M A X I M U M  A X I A L  C A P A C I T Y  S U M M A R Y",
-        max(status_start, 0),
-    )
-
-    early_starts = [pos for pos in (status_start, load_cases_start, axial_start) if pos != -1]
-    if early_starts:
-        early_start = min(early_starts)
-        early_end_candidates = []
-        if axial_start != -1:
-            for marker in (b"SACS LOAD CASE REPORT", b"PST VERSION"):
-                marker_pos = _find_factor_bytes_marker(path, marker, axial_start)
-                if marker_pos != -1:
-                    early_end_candidates.append(marker_pos)
-        if load_cases_start != -1:
-            marker_pos = _find_factor_bytes_marker(path, b"SACS LOAD CASE REPORT", load_cases_start)
-            if marker_pos != -1:
-                early_end_candidates.append(marker_pos)
-        early_end = min(early_end_candidates) if early_end_candidates else min(file_size, max(early_starts) + 800_000)
-        chunks.append(_read_factor_bytes_range(path, early_start, early_end))
-
-    chunks.extend(_read_factor_force_chunks(path, max(status_start, 0), file_size))
-
-    if not chunks:
-        return []
-    return _decode_factor_chunks(chunks)
-
-
-def _factor_to_float(value: object) -> Optional[float]:
-    text = str(value).strip().replace(",", "")
-    if not text or text in ("\\", "/"):
-        return None
-    try:
-        return float(text)
-    except Exception:
-        return None
-
-
-def _fmt_result_load_value(value: object) -> str:
-    fv = _factor_to_float(value)
-    return f"{fv:.0f}" if fv is not None else (str(value) if value else "")
-
-
-def _fmt_result_safety_value(value: object) -> str:
-    fv = _factor_to_float(value)
-    return f"{fv:.2f}" if fv is not None else (str(value) if value else "")
+    row_finished = pyqtSignal(int, str, dict)
+    row_failed = pyqtSignal(int, str, str)
+    finished = pyqtSignal()
 
+    def __init__(self, row_paths: List[Tuple[int, str]], num_pat: str):
+        super().__init__()
+        self.row_paths = [(row, os.path.normpath(path)) for row, path in row_paths]
+        self.num_pat = num_pat
 
-def _pick_max_abs_loads_by_type(rows: List[Dict[str, object]], case_type: str) -> Dict[str, str]:
-    fields = [("fx", "Fx"), ("fy", "Fy"), ("fz", "Fz"), ("mx", "Mx"), ("my", "My"), ("mz", "Mz")]
-    out: Dict[str, str] = {}
-    typed_rows = [row for row in rows if row.get("case_type") == case_type]
-    for field_key, out_key in fields:
-        best_row = None
-        best_abs = -1.0
-        for row in typed_rows:
-            value = row.get(field_key)
-            if value is None:
+    def _emit_rows(self, path: str, outcome: object) -> None:
+        for row, row_path in self.row_paths:
+            if row_path != path:
                 continue
-            abs_value = abs(float(value))
-            if abs_value > best_abs:
-                best_abs = abs_value
-                best_row = row
-        if best_row is not None:
-            out[out_key] = _fmt_result_load_value(best_row.get(field_key))
-    return out
-
-
-def _parse_result_factor_stream(path: str, num_pat: str) -> Dict[str, object]:
-    try:
-        marker_lines = _read_result_factor_marker_lines(path)
-    except OSError:
-        marker_lines = []
-    if marker_lines:
-        marker_result = _parse_result_factor_lines(marker_lines, num_pat)
-        op_load_keys = ["op_Fx", "op_Fy", "op_Fz", "op_Mx", "op_My", "op_Mz"]
-        ext_load_keys = ["ext_Fx", "ext_Fy", "ext_Fz", "ext_Mx", "ext_My", "ext_Mz"]
-        has_complete_loads = all(str(marker_result.get(k, "")).strip() for k in op_load_keys) or all(
-            str(marker_result.get(k, "")).strip() for k in ext_load_keys
-        )
-        has_complete_safety = all(str(marker_result.get(k, "")).strip() for k in ["操作工况", "极端工况"])
-        if has_complete_loads or has_complete_safety:
-            marker_result["_read_mode"] = "fast_marker"
-            return marker_result
-
-    last_error: Optional[Exception] = None
-    for enc in ["utf-8", "gb18030", "gbk", "latin-1"]:
-        try:
-            with open(path, "r", encoding=enc) as handle:
-                result = _parse_result_factor_lines(handle, num_pat)
-                result["_read_mode"] = "stream_fallback"
-                return result
-        except UnicodeDecodeError as exc:
-            last_error = exc
-            continue
-    if last_error:
-        raise last_error
-    return {}
-
-
-def _parse_result_factor_lines(lines, num_pat: str) -> Dict[str, object]:
-    result: Dict[str, object] = {}
-    load_rows: List[Dict[str, object]] = []
-    case_types: Dict[str, str] = {}
-    pile_capacities: Dict[str, Dict[str, float]] = {}
-    pile_force_rows: List[Tuple[str, str, float]] = []
-    fallback_loads: Dict[str, str] = {}
-    fallback_safety: Dict[str, str] = {}
-
-    reading_load_cases = False
-    load_skip = 0
-    current_load: Optional[Dict[str, object]] = None
-
-    reading_pile_capacity = False
-    pile_capacity_skip = 0
-
-    force_state = "normal"
-    force_load_case = ""
-    force_header_scan = 0
-    force_skip = 0
-
-    for raw in lines:
-        line = raw.replace("\x0c", "")
-
-        for key in ["Fx", "Fy", "Fz", "Mx", "My", "Mz"]:
-            if key not in fallback_loads:
-                m_load = re.search(rf"(?i)\b{key}\b.*?\b({num_pat})\b", line)
-                if m_load:
-                    fallback_loads[key] = _fmt_result_load_value(m_load.group(1))
-        if "操作工况" not in fallback_safety:
-            m_op = re.search(rf"(?im)操作工况.*?({num_pat})", line)
-            if m_op:
-                fallback_safety["操作工况"] = _fmt_result_safety_value(m_op.group(1))
-        if "极端工况" not in fallback_safety:
-            m_ex = re.search(rf"(?im)极端工况.*?({num_pat})", line)
-            if m_ex:
-                fallback_safety["极端工况"] = _fmt_result_safety_value(m_ex.group(1))
-
-        m_type = re.match(
-            r"^\s*\d+\s+([A-Z0-9]+)\s+\S+\s+\S+\s+\S+\s+([-+]?\d+(?:\.\d+)?)\s+([-+]?\d+(?:\.\d+)?)\s*$",
-            line,
-        )
-        if m_type:
-            load_case = m_type.group(1).strip()
-            amod_value = _factor_to_float(m_type.group(3))
-            if load_case and amod_value is not None:
-                case_types[load_case] = "Extreme" if abs(amod_value - 1.33) < 1e-6 else "Operation"
-
-        if "***** SEASTATE COMBINED LOAD CASES *****" in raw:
-            reading_load_cases = True
-            load_skip = 6
-            current_load = None
-        elif reading_load_cases:
-            if load_skip > 0:
-                load_skip -= 1
-            elif "*****" in raw and "SEASTATE COMBINED LOAD CASES" not in raw:
-                reading_load_cases = False
-                current_load = None
-            elif line.strip():
-                prefix = line[:12].strip()
-                if prefix.isdigit():
-                    current_load = {
-                        "load_case": line[14:18].strip(),
-                        "fx": None,
-                        "fy": None,
-                        "fz": None,
-                        "mx": None,
-                        "my": None,
-                        "mz": None,
-                    }
-                    load_rows.append(current_load)
-                elif current_load is not None and "TOTAL" in line[:28] and line.strip()[-1:].isdigit():
-                    current_load["fx"] = _factor_to_float(line[28:42].strip())
-                    current_load["fy"] = _factor_to_float(line[42:55].strip())
-                    current_load["fz"] = _factor_to_float(line[55:68].strip())
-                    current_load["mx"] = _factor_to_float(line[68:81].strip())
-                    current_load["my"] = _factor_to_float(line[81:94].strip())
-                    current_load["mz"] = _factor_to_float(line[94:107].strip())
-
-        if "S O I L  M A X I M U M  A X I A L  C A P A C I T Y  S U M M A R Y" in raw:
-            reading_pile_capacity = True
-            pile_capacity_skip = 6
-        elif reading_pile_capacity:
-            if pile_capacity_skip > 0:
-                pile_capacity_skip -= 1
-            elif "*****" in raw and "S O I L  M A X I M U M" not in raw:
-                reading_pile_capacity = False
-            elif line.strip():
-                pile_id = line[:4].strip()
-                if pile_id:
-                    pile_capacities[pile_id] = {
-                        "weight": _factor_to_float(line[21:28].strip()) or 0.0,
-                        "comb_capacity": abs(_factor_to_float(line[34:44].strip()) or 0.0),
-                        "ten_capacity": abs(_factor_to_float(line[76:86].strip()) or 0.0),
-                    }
-
-        if "FINAL PILE HEAD FORCES" in raw:
-            force_state = "scan_header"
-            force_load_case = raw.strip()[-4:]
-            force_header_scan = 4
-            force_skip = 0
-            continue
-        if force_state == "scan_header":
-            if "PILE HEAD COORDINATES" in raw:
-                force_state = "skip_header"
-                force_skip = 5
+            if isinstance(outcome, Exception):
+                self.row_failed.emit(row, path, str(outcome))
             else:
-                force_header_scan -= 1
-                if force_header_scan <= 0:
-                    force_state = "normal"
-            continue
-        if force_state == "skip_header":
-            force_skip -= 1
-            if force_skip <= 0:
-                force_state = "read_forces"
-            continue
-        if force_state == "read_forces":
-            if "\x0c" in raw:
-                force_state = "normal"
-                continue
-            if "STRUCTURAL COORDINATES" in raw or "FINAL PILE HEAD FORCES" in raw:
-                force_state = "normal"
-                continue
-            if not line.strip():
-                continue
-            pile_tokens = line[:10].split()
-            pile_id = pile_tokens[0].strip() if pile_tokens else ""
-            force_value = _factor_to_float(line[:33][-14:].strip())
-            if "P" in pile_id.upper() and force_load_case and force_value is not None:
-                pile_force_rows.append((pile_id, force_load_case, force_value))
-
-    load_rows = [row for row in load_rows if row.get("load_case")]
-    for row in load_rows:
-        row["case_type"] = case_types.get(str(row.get("load_case") or ""), "")
-
-    operation_loads = _pick_max_abs_loads_by_type(load_rows, "Operation")
-    if operation_loads:
-        result.update({f"op_{key}": value for key, value in operation_loads.items() if str(value or "").strip()})
-    extreme_loads = _pick_max_abs_loads_by_type(load_rows, "Extreme")
-    if extreme_loads:
-        result.update({f"ext_{key}": value for key, value in extreme_loads.items() if str(value or "").strip()})
-    result.update(extreme_loads or operation_loads)
-
-    pile_forces: Dict[str, Dict[str, List[float]]] = {}
-    for pile_id, load_case, force_value in pile_force_rows:
-        case_type = case_types.get(load_case, "")
-        if not case_type:
-            continue
-        pile_bucket = pile_forces.setdefault(pile_id, {"Operation": [], "Extreme": []})
-        pile_bucket.setdefault(case_type, []).append(force_value)
-
-    minima: Dict[str, Optional[float]] = {"Operation": None, "Extreme": None}
-    for pile_id, capacities in pile_capacities.items():
-        force_groups = pile_forces.get(pile_id)
-        if not force_groups:
-            continue
-        weight = capacities.get("weight", 0.0)
-        comb_capacity = capacities.get("comb_capacity", 0.0)
-        ten_capacity = capacities.get("ten_capacity", 0.0)
-        for case_type in ("Operation", "Extreme"):
-            values = force_groups.get(case_type, [])
-            if not values:
-                continue
-            case_sfs: List[float] = []
-            max_compression = min(values)
-            if comb_capacity > 0:
-                denom = abs(max_compression) + weight
-                if denom > 0:
-                    case_sfs.append(comb_capacity / denom)
-            max_tension = max(values)
-            if max_tension >= 0 and ten_capacity > 0:
-                denom = max_tension - weight
-                if denom > 0:
-                    case_sfs.append(ten_capacity / denom)
-            if case_sfs:
-                best = min(case_sfs)
-                current = minima[case_type]
-                minima[case_type] = best if current is None else min(current, best)
-
-    if minima["Operation"] is not None:
-        result["操作工况"] = _fmt_result_safety_value(minima["Operation"])
-    if minima["Extreme"] is not None:
-        result["极端工况"] = _fmt_result_safety_value(minima["Extreme"])
-
-    if not any(str(result.get(k, "")).strip() for k in RESULT_FACTOR_KEYS):
-        result.update(fallback_loads)
-        result.update(fallback_safety)
-    return result
-
-
-class ResultFactorReadWorker(QObject):
-    finished = pyqtSignal(int, str, dict)
-    failed = pyqtSignal(int, str, str)
-
-    def __init__(self, row: int, path: str, num_pat: str):
-        super().__init__()
-        self.row = row
-        self.path = path
-        self.num_pat = num_pat
+                self.row_finished.emit(row, path, dict(outcome))
 
     def run(self) -> None:
         try:
-            values = _parse_result_factor_stream(self.path, self.num_pat)
-            self.finished.emit(self.row, self.path, values)
-        except Exception as exc:
-            self.failed.emit(self.row, self.path, str(exc))
+            scan_result_factor_files(
+                [path for _, path in self.row_paths],
+                self.num_pat,
+                on_result=self._emit_rows,
+            )
+        finally:
+            self.finished.emit()
 
 
 class PlatformLoadDataWorker(QObject):
@@ -1418,7 +1051,7 @@ class PlatformLoadInformationPage(BasePage):
         super().__init__("", parent)
         self.data_dir = first_existing_path("data")
         self.output_data_dir = external_path("data")
-        self._num_pat = r"[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+        self._num_pat = DEFAULT_NUM_PATTERN
 
         # === 红色字段 Excel 导入（仅当前行）===
         self.result_excel_path: Optional[str] = None
@@ -1427,9 +1060,8 @@ class PlatformLoadInformationPage(BasePage):
         self._row_radio_group: Optional[QButtonGroup] = None
         # 缓存子计算表用户输入的数据
         self._uppercalc_saved_data: Dict[tuple[int, int], dict] = {}
-        self._result_factor_cache: Dict[tuple[str, float], Dict[str, object]] = {}
         self._result_factor_thread: Optional[QThread] = None
-        self._result_factor_worker: Optional[ResultFactorReadWorker] = None
+        self._result_factor_worker: Optional[ResultFactorBatchReadWorker] = None
         self._result_factor_progress: Optional[QProgressDialog] = None
         self._platform_load_thread: Optional[QThread] = None
         self._platform_load_worker: Optional[PlatformLoadDataWorker] = None
@@ -2462,17 +2094,18 @@ class PlatformLoadInformationPage(BasePage):
 
     def refresh_from_rebuild_projects(self) -> None:
         """Refresh when history rebuild projects change in the file-management page."""
+        facility_code = self._get_top_value("设施编码").strip()
         if getattr(self, "_has_unsaved_changes", False):
             if not ask_yes_no(
                 self,
                 "刷新平台载荷信息",
                 "历次改造项目已变化，是否保存当前平台载荷信息并刷新？",
             ):
-                platform_load_preheat.clear_platform_load_data_cache()
+                platform_load_preheat.clear_platform_load_data_cache(facility_code)
                 return
             if not self._on_save(show_message=False):
                 return
-        platform_load_preheat.clear_platform_load_data_cache()
+        platform_load_preheat.clear_platform_load_data_cache(facility_code)
         self._show_platform_data_loading_placeholder()
         self._start_async_current_platform_load()
 
@@ -2687,14 +2320,14 @@ class PlatformLoadInformationPage(BasePage):
             QMessageBox.warning(self, "读取失败", "请选择文件名前缀为 psilst 的结果文件。")
             return
 
-        values = self._get_cached_result_factor_values(path)
+        values = get_cached_result_factor_values(path, self._num_pat)
         if values is not None:
             self._apply_result_factor_values(row, path, values)
             return
 
-        self._start_result_factor_read_thread(row, path)
+        self._start_result_factor_read_thread([(row, path)])
 
-    def _start_result_factor_read_thread(self, row: int, path: str) -> None:
+    def _start_result_factor_read_thread(self, row_paths: List[Tuple[int, str]]) -> None:
         if self._result_factor_thread is not None:
             QMessageBox.information(self, "提示", "正在读取结果文件，请稍候。")
             return
@@ -2707,15 +2340,13 @@ class PlatformLoadInformationPage(BasePage):
         progress.show()
 
         thread = QThread(self)
-        worker = ResultFactorReadWorker(row, os.path.normpath(path), self._num_pat)
+        worker = ResultFactorBatchReadWorker(row_paths, self._num_pat)
         worker.moveToThread(thread)
         thread.started.connect(worker.run)
-        worker.finished.connect(self._on_result_factor_read_finished)
-        worker.failed.connect(self._on_result_factor_read_failed)
+        worker.row_finished.connect(self._on_result_factor_read_finished)
+        worker.row_failed.connect(self._on_result_factor_read_failed)
         worker.finished.connect(worker.deleteLater)
-        worker.failed.connect(worker.deleteLater)
         worker.finished.connect(thread.quit)
-        worker.failed.connect(thread.quit)
         thread.finished.connect(thread.deleteLater)
         thread.finished.connect(self._clear_result_factor_thread)
 
@@ -2732,12 +2363,6 @@ class PlatformLoadInformationPage(BasePage):
         self._result_factor_progress = None
 
     def _on_result_factor_read_finished(self, row: int, path: str, values: Dict[str, object]) -> None:
-        try:
-            normalized = os.path.normpath(path)
-            cache_key = (normalized, os.path.getmtime(normalized))
-            self._result_factor_cache = {cache_key: dict(values)}
-        except OSError:
-            pass
         self._apply_result_factor_values(row, path, values)
 
     def _on_result_factor_read_failed(self, row: int, path: str, error: str) -> None:
@@ -3297,15 +2922,6 @@ class PlatformLoadInformationPage(BasePage):
         result.update(self._compute_vba_style_min_pile_safety(text))
         return result
 
-    def _get_cached_result_factor_values(self, path: str) -> Optional[Dict[str, object]]:
-        normalized = os.path.normpath(path)
-        mtime = os.path.getmtime(normalized)
-        cache_key = (normalized, mtime)
-        cached = self._result_factor_cache.get(cache_key)
-        if cached is not None:
-            return dict(cached)
-        return None
-
     def _read_result_factor_generic(self, path: str) -> Dict[str, object]:
         text = self._read_text_file_with_fallback(path)
         res = self._extract_vba_style_result_values(text)
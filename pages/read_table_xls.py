@@ -4,11 +4,13 @@
 from __future__ import annotations
 
 import os
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 
-import pandas as pd
 from core.app_paths import external_path, first_existing_path
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ReadTableXls:
     """从《platform_total.xls》读取并提取下拉框选项（可复用）。"""
@@ -28,7 +30,7 @@ class ReadTableXls:
     }
 
     def __init__(self):
-        self.df: Optional[pd.DataFrame] = None
+        self.df: Optional["pd.DataFrame"] = None
         self._resolved_cols: Dict[str, Optional[str]] = {}
 
     def default_excel_path(self) -> str:
@@ -41,7 +43,10 @@ class ReadTableXls:
             return p2
         return external_path("data", self.EXCEL_NAME)
 
-    def load(self, excel_path: Optional[str] = None, header: int = 1) -> pd.DataFrame:
+    def load(self, excel_path: Optional[str] = None, header: int = 1) -> "pd.DataFrame":
+        # pandas 较重，启动预热会用到本模块，只在真正读表时再导入。
+        import pandas as pd
+
         path = excel_path or self.default_excel_path()
         if not os.path.exists(path):
             raise FileNotFoundError(f"未找到 Excel：{path}")
@@ -98,6 +103,8 @@ class ReadTableXls:
         if v is None:
             return ""
         try:
+            import pandas as pd
+
             if pd.isna(v):
                 return ""
         except Exception:
@@ -24,9 +24,12 @@ from pages.hover_tip_table import HoverTipTable
 from core.base_page import BasePage
 from services.inspection_business_db_adapter import (
     load_platform_load_information_items,
+    load_platform_load_metrics,
     save_platform_load_summary_snapshot,
 )
 from services.platform_summary_source import load_platform_summary_source
+from shiyou_db.platform_summary import LATEST_LOAD_FIELDS, OVERALL_ASSESSMENT_COUNT
+from shiyou_db.query_profiler import query_scope
 
 
 
@@ -346,6 +349,7 @@ class SummaryInformationTablePage(BasePage):
             return p2
         return os.path.join(self.output_data_dir, self.EXCEL_NAME)  # 默认返回外部 data 路径（用于报错提示）
 
+    @query_scope("summary_information.refresh")
     def refresh_from_file_summary_page(self):
         profiles = self._profiles_from_open_file_summary_page()
         if profiles is None:
@@ -357,7 +361,11 @@ class SummaryInformationTablePage(BasePage):
 
         rows = []
         if profiles:
-            rows = [self._build_summary_row(profile, index) for index, profile in enumerate(profiles, start=1)]
+            load_metrics = self._load_platform_load_metrics()
+            rows = [
+                self._build_summary_row(profile, index, load_metrics)
+                for index, profile in enumerate(profiles, start=1)
+            ]
         self._apply_data(rows)
 
     def refresh_from_database(self, show_warning: bool = True):
@@ -381,12 +389,35 @@ class SummaryInformationTablePage(BasePage):
         return None
 
     def _profiles_from_saved_platform_summary_snapshot(self) -> List[Dict[str, Any]]:
-        return load_platform_summary_source(snapshot_key="latest").profiles
+        return load_platform_summary_source(snapshot_key="latest", include_snapshot=False).profiles
 
-    def _build_summary_row(self, profile: Dict[str, Any], index: int) -> List[str]:
+    def _load_platform_load_metrics(self) -> Dict[str, Dict[str, str]] | None:
+        """一次查询取全部平台的载荷指标；规范化表不可用时返回 None，逐平台读取载荷信息。"""
+        try:
+            return load_platform_load_metrics()
+        except Exception:
+            return None
+
+    def _build_summary_row(
+        self,
+        profile: Dict[str, Any],
+        index: int,
+        load_metrics: Dict[str, Dict[str, str]] | None = None,
+    ) -> List[str]:
         facility_code = str(profile.get("facility_code") or "").strip()
-        load_rows = load_platform_load_information_items(facility_code) if facility_code else []
-        latest = self._pick_latest_load_row(load_rows)
+        if load_metrics is not None:
+            metrics = load_metrics.get(facility_code) or {}
+            latest = None
+            if metrics:
+                latest = {field: metrics.get(f"latest_{field}", "") for field in LATEST_LOAD_FIELDS}
+            overall_count = int(metrics.get(OVERALL_ASSESSMENT_COUNT) or 0)
+        else:
+            load_rows = load_platform_load_information_items(facility_code) if facility_code else []
+            latest = self._pick_latest_load_row(load_rows)
+            overall_count = sum(
+                1 for row in load_rows
+                if str(row.get("overall_assessment") or "").strip() not in ("", "\\", "/", "否", "0")
+            )
         latest_weight = self._to_float((latest or {}).get("total_weight_mt"))
         delta_weight = self._to_float((latest or {}).get("weight_delta_mt"))
 
@@ -394,11 +425,6 @@ class SummaryInformationTablePage(BasePage):
         if latest_weight not in (None, 0) and delta_weight is not None:
             change_rate = self._fmt_number(delta_weight / latest_weight * 100)
 
-        overall_count = sum(
-            1 for row in load_rows
-            if str(row.get("overall_assessment") or "").strip() not in ("", "\\", "/", "否", "0")
-        )
-
         return [
             str(index),
             str(profile.get("branch") or ""),
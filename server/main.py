@@ -1,9 +1,11 @@
 # server/main.py
 from __future__ import annotations
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
 from server.routers import health, strategy, images, reports, feasibility, files
+from services.schema_migrations import run_startup_migrations
+from shiyou_db.query_profiler import query_scope
 
 
 app = FastAPI(
@@ -11,6 +13,21 @@ app = FastAPI(
     version="1.0.0",
 )
 
+
+@app.on_event("startup")
+def _run_schema_migrations() -> None:
+    # 建表、加列在启动时一次完成，接口里的读写只执行数据查询。
+    for name, message in run_startup_migrations().items():
+        print(f"[server] schema migration {name} failed: {message}")
+
+
+@app.middleware("http")
+async def _profile_request_queries(request: Request, call_next):
+    # 开启 SHIYOU_SQL_PROFILE 时，按请求统计同形状语句的执行次数，发现疑似 N+1。
+    with query_scope(f"{request.method} {request.url.path}"):
+        return await call_next(request)
+
+
 app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(strategy.router, prefix="/api/strategy", tags=["strategy"])
 app.include_router(images.router, prefix="/api/images", tags=["images"])
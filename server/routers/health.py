@@ -1,15 +1,54 @@
 # server/routers/health.py
 from __future__ import annotations
 
-from fastapi import APIRouter
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+
+from shiyou_db.query_profiler import query_report
+from shiyou_db.replicas import replica_status
 
 
 router = APIRouter()
 
+_LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def require_diagnostics_access(
+    request: Request,
+    x_shiyou_diagnostics_token: str = Header(default=""),
+) -> None:
+    """诊断接口的访问控制。
+
+    设置 SHIYOU_DIAGNOSTICS_TOKEN 时请求头 X-Shiyou-Diagnostics-Token 必须与之一致；
+    未设置时只允许本机访问。SQL 形状和副本地址不对外暴露。
+    """
+    expected = os.environ.get("SHIYOU_DIAGNOSTICS_TOKEN", "").strip()
+    if expected:
+        if not hmac.compare_digest(x_shiyou_diagnostics_token.strip().encode(), expected.encode()):
+            raise HTTPException(status_code=403, detail="诊断接口需要有效的访问令牌。")
+        return
+    host = request.client.host if request.client else ""
+    if host not in _LOOPBACK_HOSTS:
+        raise HTTPException(status_code=403, detail="诊断接口仅允许本机访问。")
+
 
 @router.get("/health")
 def health():
     return {
         "status": "ok",
         "message": "Shiyou backend is running",
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/health/db-hotspots", dependencies=[Depends(require_diagnostics_access)])
+def db_hotspots(limit: int = 20):
+    """SQL 热点与疑似 N+1 列表，需设置 SHIYOU_SQL_PROFILE=1 才会采集。"""
+    return query_report(limit)
+
+
+@router.get("/health/db-replicas", dependencies=[Depends(require_diagnostics_access)])
+def db_replicas():
+    """只读副本的最近一次延迟探测结果；未配置副本时为空列表。"""
+    return {"replicas": replica_status()}
@@ -15,8 +15,8 @@ from server.task_manager import get_task, submit_task
 from services.special_strategy_runtime import (
     check_special_strategy_manual_fill_rows,
     finalize_special_strategy_calculation,
-    list_result_run_history,
     load_result_bundle,
+    page_result_run_history,
     prepare_special_strategy_calculation,
     run_special_strategy_calculation,
 )
@@ -270,12 +270,18 @@ def get_strategy_task(task_id: str):
 
 
 @router.get("/history/{facility_code}")
-def get_strategy_history(facility_code: str, limit: int = 20):
-    rows = list_result_run_history(facility_code, limit=limit)
+def get_strategy_history(
+    facility_code: str,
+    limit: int = 20,
+    before_run_id: int | None = None,
+    status: str | None = None,
+):
+    rows = page_result_run_history(facility_code, limit=limit, before_run_id=before_run_id, status=status)
     return _json_safe({
         "facility_code": facility_code,
         "count": len(rows),
         "items": rows,
+        "next_before_run_id": rows[-1]["run_id"] if len(rows) >= max(1, limit) else None,
     })
 
 
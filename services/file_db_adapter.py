@@ -3,11 +3,18 @@ from __future__ import annotations
 import json
 import os
 import sys
+import time
+from collections import OrderedDict
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from threading import RLock
+from typing import Any, Callable
 
+from shiyou_db.change_versions import FACILITY_PROFILE_SCOPE, PLATFORM_LOAD_SCOPE, REBUILD_DIRECTORY_SCOPE
 from shiyou_db.config import resolve_config_path
+from shiyou_db.local_mirror import refresh_mirror
+from shiyou_db.query_profiler import query_scope
+from services.reference_mirror import DOCUMENT_CATEGORIES, REBUILD_DIRECTORIES, reference_service
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 PROJECT_PARENT = PROJECT_ROOT.parent
@@ -20,32 +27,191 @@ class FileBackendError(RuntimeError):
     pass
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
 _UNSET = object()
-_LIST_FILES_CACHE: dict[tuple[Any, ...], list[dict[str, Any]]] = {}
-_REBUILD_DIRECTORIES_CACHE: dict[tuple[Any, ...], list[dict[str, Any]]] = {}
+FILE_CACHE_MAX_ENTRIES = max(1, _env_int("SHIYOU_FILE_CACHE_ENTRIES", 256))
+# 两次读取变更版本号之间的最短间隔；本进程写入后立即重读，不受此限制。
+FILE_VERSION_CHECK_SECONDS = max(0, _env_int("SHIYOU_FILE_VERSION_CHECK_MS", 2000)) / 1000.0
+
+
+def _copy_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [dict(row) for row in rows]
+
+
+class _ScopedQueryCache:
+    """按查询形状缓存结果的有界 LRU。
+
+    每条缓存带写入时所属范围的版本签名，读取时签名不一致即视为过期；
+    写操作只让涉及的 (模块, 设施, 类别) 范围失效，其余缓存继续命中。
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[Any, ...], tuple[Any, list[dict[str, Any]]]] = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key: tuple[Any, ...], signature: Any) -> list[dict[str, Any]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_rows(entry[1])
+
+    def put(self, key: tuple[Any, ...], signature: Any, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (signature, _copy_rows(rows))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_LIST_FILES_CACHE = _ScopedQueryCache(FILE_CACHE_MAX_ENTRIES)
+_REBUILD_DIRECTORIES_CACHE = _ScopedQueryCache(FILE_CACHE_MAX_ENTRIES)
+_FILE_FACETS_CACHE = _ScopedQueryCache(FILE_CACHE_MAX_ENTRIES)
+_CHANGE_VERSIONS: dict[str, tuple[float, dict[tuple[str, str, str], int] | None]] = {}
+_CHANGE_VERSIONS_LOCK = RLock()
 
 
 def _cache_config_key(config_path: str | None = None) -> str:
     return str(Path(config_path).resolve()) if config_path else ""
 
 
-def _copy_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    return [dict(row) for row in rows]
+def _normalize_versions(versions: dict[tuple[str, str, str], int]) -> dict[tuple[str, str, str], int]:
+    return {tuple(str(part or "").casefold() for part in scope): int(version) for scope, version in versions.items()}
+
+
+def _current_change_versions(config_path: str | None = None) -> dict[tuple[str, str, str], int] | None:
+    """返回数据库中的变更版本号，间隔内复用上次结果；库里没有版本表时返回 None。"""
+    config_key = _cache_config_key(config_path)
+    now = time.monotonic()
+    with _CHANGE_VERSIONS_LOCK:
+        state = _CHANGE_VERSIONS.get(config_key)
+    if state is not None and now - state[0] < FILE_VERSION_CHECK_SECONDS:
+        return state[1]
+    versions = None
+    try:
+        service = _get_service(config_path)
+        if hasattr(service, "file_change_versions"):
+            versions = _normalize_versions(service.file_change_versions())
+    except Exception:
+        versions = None
+    with _CHANGE_VERSIONS_LOCK:
+        _CHANGE_VERSIONS[config_key] = (now, versions)
+    return versions
+
+
+def _change_signature(
+    config_path: str | None,
+    module_code: str | None,
+    facility_code: str | None = None,
+    category_name: str | None = None,
+) -> int | None:
+    """范围内版本号之和；未指定的维度按通配处理。版本号只增不减，任一相关写入都会改变签名。"""
+    versions = _current_change_versions(config_path)
+    if versions is None:
+        return None
+    return _versions_signature(versions, module_code, facility_code, category_name)
+
+
+def _versions_signature(
+    versions: dict[tuple[str, str, str], int],
+    module_code: str | None,
+    facility_code: str | None = None,
+    category_name: str | None = None,
+) -> int:
+    wanted = [str(value or "").strip().casefold() for value in (module_code, facility_code, category_name)]
+    return sum(
+        version
+        for scope, version in versions.items()
+        if all(not expected or part == expected for part, expected in zip(scope, wanted))
+    )
+
+
+def _read_with_signature(
+    config_path: str | None,
+    signature: int | None,
+    read: Callable[[Any], list[dict[str, Any]]],
+    *scope: str | None,
+) -> tuple[list[dict[str, Any]], int | None]:
+    """执行只读查询，返回 (结果, 存入缓存用的签名)。
+
+    查询可能落到落后的只读副本上：存入缓存的签名取自与数据同一个库的版本号，
+    副本落后时签名也是旧的，下次按主库版本号校验即过期，旧数据不会一直被当成最新。
+    """
+    service = _get_service(config_path)
+    reader = getattr(service, "read_change_versions", None)
+    if signature is None or reader is None:
+        return read(service), signature
+    with reader() as versions:
+        rows = read(service)
+    if versions is None:
+        return rows, signature
+    return rows, _versions_signature(_normalize_versions(versions), *scope)
+
+
+def _mark_change_versions_stale(config_path: str | None, *caches: _ScopedQueryCache) -> None:
+    # 下次读取时重查版本号，只有涉及范围的缓存会失效；没有版本表时只能整体清空。
+    config_key = _cache_config_key(config_path)
+    with _CHANGE_VERSIONS_LOCK:
+        state = _CHANGE_VERSIONS.pop(config_key, None)
+    if state is None or state[1] is None:
+        for cache in caches:
+            cache.clear()
+
+
+def _file_records_changed(config_path: str | None = None) -> None:
+    _mark_change_versions_stale(config_path, _LIST_FILES_CACHE, _FILE_FACETS_CACHE)
+
+
+def _rebuild_directories_changed(config_path: str | None = None) -> None:
+    _mark_change_versions_stale(config_path, _REBUILD_DIRECTORIES_CACHE)
+    if config_path is None:
+        refresh_mirror(REBUILD_DIRECTORIES)
 
 
 def _invalidate_file_list_cache() -> None:
     _LIST_FILES_CACHE.clear()
+    _FILE_FACETS_CACHE.clear()
 
 
 def _invalidate_rebuild_directory_cache() -> None:
     _REBUILD_DIRECTORIES_CACHE.clear()
 
 
+def file_cache_stats() -> dict[str, dict[str, int]]:
+    return {
+        "list_files": _LIST_FILES_CACHE.stats(),
+        "file_facets": _FILE_FACETS_CACHE.stats(),
+        "rebuild_directories": _REBUILD_DIRECTORIES_CACHE.stats(),
+    }
+
+
 def _invalidate_platform_load_cache() -> None:
     try:
         from services import platform_load_preheat
 
-        platform_load_preheat.clear_platform_load_data_cache()
+        platform_load_preheat.platform_load_data_changed()
     except Exception:
         pass
 
@@ -267,6 +433,8 @@ def list_files(
     discipline_query: str | None = None,
     limit: int | None = None,
     offset: int | None = None,
+    after_key: tuple | None = None,
+    before_key: tuple | None = None,
     config_path: str | None = None,
 ) -> list[dict[str, Any]]:
     prefix = str(logical_path_prefix or "").replace("\\", "/").strip().strip("/")
@@ -293,26 +461,39 @@ def list_files(
         discipline,
         "" if limit is None else int(limit),
         "" if offset is None else int(offset),
+        after_key,
+        before_key,
     )
-    cached = _LIST_FILES_CACHE.get(key)
+    # 签名要在查询之前取：查询期间发生的写入会让这条缓存下次直接失效，而不是被当成新数据。
+    signature = _change_signature(config_path, module_code, facility_code, category)
+    cached = _LIST_FILES_CACHE.get(key, signature)
     if cached is not None:
-        return _copy_rows(cached)
+        return cached
 
-    rows = _get_service(config_path).list_files(
-        file_type_code=file_type_code,
-        module_code=module_code,
-        logical_path=logical_path,
-        logical_path_prefix=prefix or None,
-        logical_path_prefixes=list(prefixes) or None,
-        facility_code=facility_code,
-        document_code_query=code_query or None,
-        document_title_query=title_query or None,
-        category_query=category or None,
-        discipline_query=discipline or None,
-        limit=limit,
-        offset=offset,
+    rows, signature = _read_with_signature(
+        config_path,
+        signature,
+        lambda service: service.list_files(
+            file_type_code=file_type_code,
+            module_code=module_code,
+            logical_path=logical_path,
+            logical_path_prefix=prefix or None,
+            logical_path_prefixes=list(prefixes) or None,
+            facility_code=facility_code,
+            document_code_query=code_query or None,
+            document_title_query=title_query or None,
+            category_query=category or None,
+            discipline_query=discipline or None,
+            limit=limit,
+            offset=offset,
+            after_key=after_key,
+            before_key=before_key,
+        ),
+        module_code,
+        facility_code,
+        category,
     )
-    _LIST_FILES_CACHE[key] = _copy_rows(rows)
+    _LIST_FILES_CACHE.put(key, signature, rows)
     return _copy_rows(rows)
 
 
@@ -351,6 +532,8 @@ def list_files_by_prefix(
     discipline_query: str | None = None,
     limit: int | None = None,
     offset: int | None = None,
+    after_key: tuple | None = None,
+    before_key: tuple | None = None,
     config_path: str | None = None,
 ) -> list[dict[str, Any]]:
     prefix = str(logical_path_prefix or "").replace("\\", "/").strip().strip("/")
@@ -365,6 +548,8 @@ def list_files_by_prefix(
         discipline_query=discipline_query,
         limit=limit,
         offset=offset,
+        after_key=after_key,
+        before_key=before_key,
         config_path=config_path,
     )
 
@@ -432,6 +617,69 @@ def count_files_by_prefix(
     )
 
 
+def list_file_facets(
+    *,
+    module_code: str | None = None,
+    logical_path_prefix: str | None = None,
+    logical_path_prefixes: list[str] | None = None,
+    facility_code: str | None = None,
+    document_code_query: str | None = None,
+    document_title_query: str | None = None,
+    config_path: str | None = None,
+) -> list[dict[str, Any]]:
+    prefix = str(logical_path_prefix or "").replace("\\", "/").strip().strip("/")
+    prefixes = tuple(
+        str(item or "").replace("\\", "/").strip().strip("/")
+        for item in (logical_path_prefixes or [])
+        if str(item or "").replace("\\", "/").strip().strip("/")
+    )
+    code_query = str(document_code_query or "").strip()
+    title_query = str(document_title_query or "").strip()
+    key = (
+        _cache_config_key(config_path),
+        module_code or "",
+        prefix,
+        prefixes,
+        facility_code or "",
+        code_query,
+        title_query,
+    )
+    signature = _change_signature(config_path, module_code, facility_code)
+    cached = _FILE_FACETS_CACHE.get(key, signature)
+    if cached is not None:
+        return cached
+
+    rows, signature = _read_with_signature(
+        config_path,
+        signature,
+        lambda service: service.list_file_facets(
+            module_code=module_code,
+            logical_path_prefix=prefix or None,
+            logical_path_prefixes=list(prefixes) or None,
+            facility_code=facility_code,
+            document_code_query=code_query or None,
+            document_title_query=title_query or None,
+        ),
+        module_code,
+        facility_code,
+    )
+    _FILE_FACETS_CACHE.put(key, signature, rows)
+    return _copy_rows(rows)
+
+
+def _facet_value_matches(value: object, expected: str) -> bool:
+    return not expected or str(value or "").strip().casefold() == expected.casefold()
+
+
+def _facet_options(facets: list[dict[str, Any]], field: str, **filters: str) -> list[str]:
+    values = {
+        str(facet.get(field) or "").strip()
+        for facet in facets
+        if all(_facet_value_matches(facet.get(name), expected) for name, expected in filters.items())
+    }
+    return sorted(value for value in values if value)
+
+
 def list_file_categories(
     *,
     file_type_code: str | None = None,
@@ -545,18 +793,36 @@ def upload_file(
         work_condition=work_condition,
         remark=remark,
     )
-    _invalidate_file_list_cache()
+    _file_records_changed(config_path)
+    return result
+
+
+def upload_files(
+    items: list[dict[str, Any]],
+    *,
+    max_workers: int | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+    on_progress: Callable[[dict[str, Any]], None] | None = None,
+    config_path: str | None = None,
+) -> dict[str, Any]:
+    result = _get_service(config_path).upload_files(
+        items,
+        max_workers=max_workers,
+        is_cancelled=is_cancelled,
+        on_progress=on_progress,
+    )
+    _file_records_changed(config_path)
     return result
 
 
 def soft_delete_record(record_id: int, *, config_path: str | None = None) -> None:
     _get_service(config_path).soft_delete(int(record_id))
-    _invalidate_file_list_cache()
+    _file_records_changed(config_path)
 
 
 def hard_delete_record(record_id: int, *, config_path: str | None = None) -> None:
     _get_service(config_path).hard_delete(int(record_id))
-    _invalidate_file_list_cache()
+    _file_records_changed(config_path)
 
 
 def update_file_record(
@@ -581,7 +847,7 @@ def update_file_record(
         result = _get_service(config_path).update_file_record(int(record_id), **kwargs)
     except Exception as exc:
         raise FileBackendError(str(exc)) from exc
-    _invalidate_file_list_cache()
+    _file_records_changed(config_path)
     return result
 
 
@@ -590,7 +856,8 @@ def list_document_categories(
     *,
     config_path: str | None = None,
 ) -> list[dict[str, Any]]:
-    return _get_service(config_path).list_document_categories(scope_code)
+    service = reference_service(DOCUMENT_CATEGORIES, config_path) or _get_service(config_path)
+    return service.list_document_categories(scope_code)
 
 
 def list_rebuild_directories(
@@ -599,15 +866,32 @@ def list_rebuild_directories(
     project_type: str | None = None,
     config_path: str | None = None,
 ) -> list[dict[str, Any]]:
+    local_service = reference_service(REBUILD_DIRECTORIES, config_path)
+    if local_service is not None:
+        # 本地镜像已同步：直接查本地库，不再为校验缓存去远端读版本号。
+        return local_service.list_rebuild_directories(facility_code, project_type)
     key = (_cache_config_key(config_path), facility_code or "", project_type or "")
-    cached = _REBUILD_DIRECTORIES_CACHE.get(key)
+    signature = _change_signature(config_path, REBUILD_DIRECTORY_SCOPE, facility_code)
+    cached = _REBUILD_DIRECTORIES_CACHE.get(key, signature)
     if cached is not None:
-        return _copy_rows(cached)
+        return cached
     rows = _get_service(config_path).list_rebuild_directories(facility_code, project_type)
-    _REBUILD_DIRECTORIES_CACHE[key] = _copy_rows(rows)
+    _REBUILD_DIRECTORIES_CACHE.put(key, signature, rows)
     return _copy_rows(rows)
 
 
+def platform_data_signature(facility_code: str, config_path: str | None = None) -> tuple[int, int, int] | None:
+    """设施改造目录、平台载荷信息与设施档案的版本签名，供平台载荷预热缓存判断是否过期；没有版本表时返回 None。"""
+    versions = _current_change_versions(config_path)
+    if versions is None:
+        return None
+    return (
+        _versions_signature(versions, REBUILD_DIRECTORY_SCOPE, facility_code, None),
+        _versions_signature(versions, PLATFORM_LOAD_SCOPE, facility_code, None),
+        _versions_signature(versions, FACILITY_PROFILE_SCOPE, None, None),
+    )
+
+
 def create_rebuild_directory(
     facility_code: str,
     *,
@@ -626,7 +910,7 @@ def create_rebuild_directory(
         project_year=project_year,
         summary_text=summary_text,
     )
-    _invalidate_rebuild_directory_cache()
+    _rebuild_directories_changed(config_path)
     _invalidate_platform_load_cache()
     return result
 
@@ -647,7 +931,7 @@ def update_rebuild_directory(
         project_year=project_year,
         summary_text=summary_text,
     )
-    _invalidate_rebuild_directory_cache()
+    _rebuild_directories_changed(config_path)
     _invalidate_platform_load_cache()
     return result
 
@@ -658,7 +942,7 @@ def delete_rebuild_directory(
     config_path: str | None = None,
 ) -> None:
     _get_service(config_path).delete_rebuild_directory(int(directory_id))
-    _invalidate_rebuild_directory_cache()
+    _rebuild_directories_changed(config_path)
     _invalidate_platform_load_cache()
 
 
@@ -676,9 +960,9 @@ def delete_rebuild_directory_with_files(
         logical_path_prefix=logical_path_prefix,
         facility_code=facility_code,
     )
-    _invalidate_rebuild_directory_cache()
+    _rebuild_directories_changed(config_path)
     _invalidate_platform_load_cache()
-    _invalidate_file_list_cache()
+    _file_records_changed(config_path)
     return deleted
 
 
@@ -710,7 +994,7 @@ def soft_delete_storage_path(
             row_id = row.get("id")
             if row_id is not None:
                 _get_service(config_path).soft_delete(int(row_id))
-                _invalidate_file_list_cache()
+                _file_records_changed(config_path)
                 return True
     return False
 
@@ -743,7 +1027,7 @@ def hard_delete_storage_path(
             row_id = row.get("id")
             if row_id is not None:
                 _get_service(config_path).hard_delete(int(row_id))
-                _invalidate_file_list_cache()
+                _file_records_changed(config_path)
                 return True
     return False
 
@@ -763,7 +1047,7 @@ def soft_delete_files_by_prefix(
         file_type_code=file_type_code,
     )
     if deleted:
-        _invalidate_file_list_cache()
+        _file_records_changed(config_path)
     return deleted
 
 
@@ -892,6 +1176,7 @@ def load_docman_record_list(
     return records
 
 
+@query_scope("docman.load_record_page")
 def load_docman_record_page(
     path_segments: list[str],
     *,
@@ -903,8 +1188,15 @@ def load_docman_record_page(
     category_query: str | None = None,
     discipline_query: str | None = None,
     logical_path_prefixes: list[str] | None = None,
+    cursor: dict[str, Any] | None = None,
     config_path: str | None = None,
 ) -> dict[str, Any]:
+    """读取文档管理列表的一页。
+
+    总数和类别/专业筛选项来自一次按 (类别, 专业) 分组的查询，按筛选条件缓存，
+    写操作时随列表缓存一起失效。cursor 为 {"page": 目标页, "after"/"before": page_key}，
+    由相邻页返回的 page_keys 得到；命中时按 keyset 定位，翻到多深都不需要 OFFSET。
+    """
     prefix = build_docman_logical_prefix(path_segments)
     prefixes = [
         str(item or "").replace("\\", "/").strip().strip("/")
@@ -913,49 +1205,25 @@ def load_docman_record_page(
     ]
     safe_page = max(0, int(page or 0))
     requested_page_size = 30 if page_size is None else int(page_size)
-    if prefixes:
-        total = count_files(
-            module_code=DOC_MAN_MODULE_CODE,
-            logical_path_prefixes=prefixes,
-            facility_code=facility_code,
-            document_code_query=document_code_query,
-            document_title_query=document_title_query,
-            category_query=category_query,
-            discipline_query=discipline_query,
-            config_path=config_path,
-        )
-    else:
-        total = count_files_by_prefix(
-            module_code=DOC_MAN_MODULE_CODE,
-            logical_path_prefix=prefix,
-            facility_code=facility_code,
-            document_code_query=document_code_query,
-            document_title_query=document_title_query,
-            category_query=category_query,
-            discipline_query=discipline_query,
-            config_path=config_path,
-        )
-    category_options = list_file_categories(
+    category = str(category_query or "").strip()
+    discipline = str(discipline_query or "").strip()
+    facets = list_file_facets(
         module_code=DOC_MAN_MODULE_CODE,
-        logical_path_prefix=prefix,
+        logical_path_prefix=None if prefixes else prefix,
         logical_path_prefixes=prefixes,
         facility_code=facility_code,
         document_code_query=document_code_query,
         document_title_query=document_title_query,
-        category_query=None,
-        discipline_query=discipline_query,
         config_path=config_path,
     )
-    discipline_options = list_file_disciplines(
-        module_code=DOC_MAN_MODULE_CODE,
-        logical_path_prefix=prefix,
-        logical_path_prefixes=prefixes,
-        facility_code=facility_code,
-        document_code_query=document_code_query,
-        document_title_query=document_title_query,
-        category_query=category_query,
-        config_path=config_path,
+    total = sum(
+        int(facet.get("count") or 0)
+        for facet in facets
+        if _facet_value_matches(facet.get("category_name"), category)
+        and _facet_value_matches(facet.get("discipline_name"), discipline)
     )
+    category_options = _facet_options(facets, "category_name", discipline_name=discipline)
+    discipline_options = _facet_options(facets, "discipline_name", category_name=category)
     if requested_page_size <= 0:
         safe_page_size = max(1, total)
         safe_page = 0
@@ -964,32 +1232,29 @@ def load_docman_record_page(
         max_page = max(0, (total - 1) // safe_page_size) if total else 0
         safe_page = min(safe_page, max_page)
     offset = safe_page * safe_page_size
+    list_kwargs: dict[str, Any] = {
+        "module_code": DOC_MAN_MODULE_CODE,
+        "facility_code": facility_code,
+        "document_code_query": document_code_query,
+        "document_title_query": document_title_query,
+        "category_query": category_query,
+        "discipline_query": discipline_query,
+        "limit": safe_page_size,
+        "config_path": config_path,
+    }
     if prefixes:
-        rows = list_files(
-            module_code=DOC_MAN_MODULE_CODE,
-            logical_path_prefixes=prefixes,
-            facility_code=facility_code,
-            document_code_query=document_code_query,
-            document_title_query=document_title_query,
-            category_query=category_query,
-            discipline_query=discipline_query,
-            limit=safe_page_size,
-            offset=offset,
-            config_path=config_path,
-        )
+        list_kwargs["logical_path_prefixes"] = prefixes
     else:
-        rows = list_files_by_prefix(
-            module_code=DOC_MAN_MODULE_CODE,
-            logical_path_prefix=prefix,
-            facility_code=facility_code,
-            document_code_query=document_code_query,
-            document_title_query=document_title_query,
-            category_query=category_query,
-            discipline_query=discipline_query,
-            limit=safe_page_size,
-            offset=offset,
-            config_path=config_path,
+        list_kwargs["logical_path_prefix"] = prefix
+    rows: list[dict[str, Any]] = []
+    if cursor and int(cursor.get("page", -1)) == safe_page and (cursor.get("after") or cursor.get("before")):
+        rows = list_files(
+            after_key=tuple(cursor["after"]) if cursor.get("after") else None,
+            before_key=None if cursor.get("after") else tuple(cursor["before"]),
+            **list_kwargs,
         )
+    if not rows:
+        rows = list_files(offset=offset, **list_kwargs)
     records = [
         _docman_record_from_file_row(row, offset + index, config_path=config_path)
         for index, row in enumerate(rows, start=1)
@@ -999,6 +1264,7 @@ def load_docman_record_page(
         "total": total,
         "page": safe_page,
         "page_size": safe_page_size,
+        "page_keys": (rows[0].get("page_key"), rows[-1].get("page_key")) if rows else None,
         "category_options": category_options,
         "discipline_options": discipline_options,
     }
@@ -1085,7 +1351,7 @@ def replace_docman_list_file(
     service = _get_service(config_path)
     if record_id is not None:
         service.hard_delete(int(record_id))
-        _invalidate_file_list_cache()
+        _file_records_changed(config_path)
     return upload_file(
         local_path,
         file_type_code=infer_file_type_code(local_path, category),
@@ -1122,7 +1388,7 @@ def replace_docman_file(
         row_id = row.get("id")
         if row_id is not None:
             service.hard_delete(int(row_id))
-            _invalidate_file_list_cache()
+            _file_records_changed(config_path)
     return upload_file(
         local_path,
         file_type_code=infer_file_type_code(local_path, category),
@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Any
 
 from shiyou_db.config import resolve_config_path
+from shiyou_db.local_mirror import refresh_mirror
+from services.reference_mirror import FACILITY_PROFILES, reference_service
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 PROJECT_PARENT = PROJECT_ROOT.parent
@@ -65,14 +67,18 @@ def save_facility_profile(
     *,
     config_path: str | None = None,
 ) -> dict[str, Any]:
-    return _get_service(config_path).upsert_facility_profile(facility_code, **payload)
+    result = _get_service(config_path).upsert_facility_profile(facility_code, **payload)
+    if config_path is None:
+        refresh_mirror(FACILITY_PROFILES)
+    return result
 
 
 def list_facility_profiles(
     *,
     config_path: str | None = None,
 ) -> list[dict[str, Any]]:
-    return _get_service(config_path).list_facility_profiles()
+    service = reference_service(FACILITY_PROFILES, config_path) or _get_service(config_path)
+    return service.list_facility_profiles()
 
 
 def load_platform_summary_snapshot(
@@ -83,6 +89,30 @@ def load_platform_summary_snapshot(
     return _get_service(config_path).load_platform_summary_snapshot(snapshot_key=snapshot_key)
 
 
+def load_platform_summary_profiles(
+    *,
+    snapshot_key: str = "latest",
+    config_path: str | None = None,
+) -> list[dict[str, Any]] | None:
+    return _get_service(config_path).list_platform_summary_profiles(snapshot_key=snapshot_key)
+
+
+def load_platform_load_metrics(
+    facility_codes: list[str] | None = None,
+    *,
+    config_path: str | None = None,
+) -> dict[str, dict[str, str]] | None:
+    return _get_service(config_path).list_platform_load_metrics(facility_codes)
+
+
+def aggregate_platform_summary_metric(
+    metric: str,
+    *,
+    config_path: str | None = None,
+) -> dict[str, Any]:
+    return _get_service(config_path).aggregate_platform_summary_metric(metric)
+
+
 def save_platform_summary_snapshot(
     columns: list[str],
     rows: list[list[str]],
@@ -1,21 +1,191 @@
 # -*- coding: utf-8 -*-
+"""
+平台载荷信息页的数据预热缓存。
+
+- 按设施缓存最近使用的 SHIYOU_PLATFORM_LOAD_CACHE_ENTRIES（默认 8）个平台，总大小超过
+  SHIYOU_PLATFORM_LOAD_CACHE_MB（默认 64）时按最久未用淘汰，切换回最近看过的平台直接命中；
+- 存入时把整份数据转成只读的 FrozenDict / FrozenList（仍是 dict / list 的子类），取出时
+  不再 deepcopy，命中只是一次字典查找；调用方需要修改时用 thaw_payload 取可写副本；
+- 每条缓存带存入时的变更版本签名（设施的改造目录 + 平台载荷信息 + 设施档案），其他客户端修改后签名
+  不一致即视为过期；库里没有版本表时，本进程的写入仍会清掉对应缓存。
+"""
 from __future__ import annotations
 
+import os
+import sys
+from collections import OrderedDict
 from copy import deepcopy
 from threading import Event, RLock
-from typing import Dict
+from typing import Any, Dict
 
 from pages.file_management_platforms import default_platform
-from services.file_db_adapter import list_rebuild_directories
+from services.file_db_adapter import list_rebuild_directories, platform_data_signature
 from services.inspection_business_db_adapter import (
     load_facility_profile,
     load_platform_load_information_items,
 )
 
-_PLATFORM_LOAD_DATA_CACHE: Dict[str, Dict[str, object]] = {}
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+PLATFORM_LOAD_CACHE_MAX_ENTRIES = max(1, _env_int("SHIYOU_PLATFORM_LOAD_CACHE_ENTRIES", 8))
+PLATFORM_LOAD_CACHE_MAX_BYTES = max(1, _env_int("SHIYOU_PLATFORM_LOAD_CACHE_MB", 64)) * 1024 * 1024
+
+_UNSET = object()
+
+
+def _read_only(self, *_args, **_kwargs):
+    raise TypeError("缓存中的平台载荷数据是只读的，请先用 thaw_payload 取得副本")
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw_payload(self)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw_payload(self)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> tuple[Any, int]:
+    """返回 (只读副本, 估算字节数)。"""
+    if isinstance(value, dict):
+        size = sys.getsizeof(value)
+        items = {}
+        for key, item in value.items():
+            frozen, item_size = _freeze(item)
+            items[key] = frozen
+            size += sys.getsizeof(key) + item_size
+        return FrozenDict(items), size
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        items = []
+        for item in value:
+            frozen, item_size = _freeze(item)
+            items.append(frozen)
+            size += item_size
+        return (FrozenList(items) if isinstance(value, list) else tuple(items)), size
+    return value, sys.getsizeof(value)
+
+
+def thaw_payload(payload: Any) -> Any:
+    """取得可修改的普通 dict / list 副本。"""
+    if isinstance(payload, dict):
+        return {key: thaw_payload(item) for key, item in payload.items()}
+    if isinstance(payload, list):
+        return [thaw_payload(item) for item in payload]
+    if isinstance(payload, tuple):
+        return tuple(thaw_payload(item) for item in payload)
+    return deepcopy(payload)
+
+
+class _PlatformLoadCache:
+    """按设施编码的有界 LRU，同时限制条数和估算的总字节数。"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        # code -> (版本签名, 只读数据, 估算字节数)
+        self._entries: OrderedDict[str, tuple[Any, FrozenDict, int]] = OrderedDict()
+        self._lock = RLock()
+
+    def __contains__(self, code: str) -> bool:
+        with self._lock:
+            return code in self._entries
+
+    def get(self, code: str, signature: Any = _UNSET) -> FrozenDict | None:
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None or (signature is not _UNSET and entry[0] != signature):
+                if entry is not None:
+                    self._drop(code)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(code)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, code: str, signature: Any, payload: Dict[str, object]) -> FrozenDict:
+        frozen, size = _freeze(payload)
+        with self._lock:
+            if code in self._entries:
+                self._drop(code)
+            self._entries[code] = (signature, frozen, size)
+            self.total_bytes += size
+            # 单条超过上限时仍保留最新一条，当前页面总要能命中。
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return frozen
+
+    def _drop(self, code: str) -> None:
+        _signature, _payload, size = self._entries.pop(code)
+        self.total_bytes -= size
+
+    def discard(self, predicate) -> None:
+        with self._lock:
+            for code in [code for code, entry in self._entries.items() if predicate(code, entry[0])]:
+                self._drop(code)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_PLATFORM_LOAD_DATA_CACHE = _PlatformLoadCache(PLATFORM_LOAD_CACHE_MAX_ENTRIES, PLATFORM_LOAD_CACHE_MAX_BYTES)
 _PLATFORM_LOAD_DATA_CACHE_LOCK = RLock()
-_PLATFORM_LOAD_DATA_PREHEAT_DONE = Event()
-_PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS = False
+# 正在预热的设施 -> 完成事件；同一设施并发预热时后来者等待先到者。
+_PLATFORM_LOAD_DATA_PREHEATING: Dict[str, Event] = {}
+
+
+def _signature(facility_code: str) -> Any:
+    try:
+        return platform_data_signature(facility_code)
+    except Exception:
+        return None
 
 
 def load_platform_load_payload(facility_code: str, defaults: Dict[str, str]) -> Dict[str, object]:
@@ -40,60 +210,75 @@ def load_platform_load_payload(facility_code: str, defaults: Dict[str, str]) ->
     }
 
 
-def clear_platform_load_data_cache() -> None:
-    global _PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS
-
+def clear_platform_load_data_cache(facility_code: str | None = None) -> None:
+    code = str(facility_code or "").strip()
     with _PLATFORM_LOAD_DATA_CACHE_LOCK:
-        _PLATFORM_LOAD_DATA_CACHE.clear()
-        _PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS = False
-        _PLATFORM_LOAD_DATA_PREHEAT_DONE.clear()
+        if code:
+            _PLATFORM_LOAD_DATA_CACHE.discard(lambda cached_code, _signature: cached_code == code)
+        else:
+            _PLATFORM_LOAD_DATA_CACHE.clear()
+            for done in _PLATFORM_LOAD_DATA_PREHEATING.values():
+                done.set()
+            _PLATFORM_LOAD_DATA_PREHEATING.clear()
+
+
+def platform_load_data_changed() -> None:
+    """本进程改了改造目录等数据后调用：带版本签名的缓存在读取时自行校验，只清掉无法校验的。"""
+    _PLATFORM_LOAD_DATA_CACHE.discard(lambda _code, signature: signature is None)
+
+
+def platform_load_cache_stats() -> dict[str, int]:
+    return _PLATFORM_LOAD_DATA_CACHE.stats()
 
 
 def get_platform_load_data_cache(facility_code: str) -> Dict[str, object] | None:
+    """返回只读的缓存数据（不复制）；版本已变化或未缓存时返回 None。"""
     code = str(facility_code or "").strip()
     if not code:
         return None
-    with _PLATFORM_LOAD_DATA_CACHE_LOCK:
-        payload = _PLATFORM_LOAD_DATA_CACHE.get(code)
-        return deepcopy(payload) if payload is not None else None
+    return _PLATFORM_LOAD_DATA_CACHE.get(code, _signature(code))
 
 
-def store_platform_load_data_cache(payload: Dict[str, object]) -> None:
+def store_platform_load_data_cache(payload: Dict[str, object], *, signature: Any = _UNSET) -> Dict[str, object] | None:
     code = str(payload.get("facility_code") or "").strip()
     if not code:
-        return
-    with _PLATFORM_LOAD_DATA_CACHE_LOCK:
-        _PLATFORM_LOAD_DATA_CACHE[code] = deepcopy(payload)
-
+        return None
+    if signature is _UNSET:
+        signature = _signature(code)
+    return _PLATFORM_LOAD_DATA_CACHE.put(code, signature, payload)
 
-def preheat_platform_load_data(force: bool = False) -> bool:
-    global _PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS
 
+def preheat_platform_load_data(force: bool = False, facility_code: str | None = None) -> bool:
     platform_defaults = dict(default_platform())
+    if facility_code:
+        platform_defaults["facility_code"] = facility_code
     facility_code = str(platform_defaults.get("facility_code") or "").strip()
     if not facility_code:
         return False
 
+    # 先取签名再读数据：读取期间发生的写入会让这条缓存在下次读取时判为过期。
+    signature = _signature(facility_code)
     with _PLATFORM_LOAD_DATA_CACHE_LOCK:
-        if facility_code in _PLATFORM_LOAD_DATA_CACHE and not force:
+        if not force and _PLATFORM_LOAD_DATA_CACHE.get(facility_code, signature) is not None:
             return True
-        if _PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS and not force:
+        running = _PLATFORM_LOAD_DATA_PREHEATING.get(facility_code)
+        if running is not None and not force:
             should_wait = True
         else:
             should_wait = False
-            _PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS = True
-            _PLATFORM_LOAD_DATA_PREHEAT_DONE.clear()
+            running = _PLATFORM_LOAD_DATA_PREHEATING[facility_code] = Event()
 
     if should_wait:
-        return _PLATFORM_LOAD_DATA_PREHEAT_DONE.wait(3)
+        return running.wait(3)
 
     try:
         payload = load_platform_load_payload(facility_code, platform_defaults)
-        store_platform_load_data_cache(payload)
+        store_platform_load_data_cache(payload, signature=signature)
         return True
     except Exception:
         return False
     finally:
         with _PLATFORM_LOAD_DATA_CACHE_LOCK:
-            _PLATFORM_LOAD_DATA_PREHEAT_IN_PROGRESS = False
-            _PLATFORM_LOAD_DATA_PREHEAT_DONE.set()
+            if _PLATFORM_LOAD_DATA_PREHEATING.get(facility_code) is running:
+                del _PLATFORM_LOAD_DATA_PREHEATING[facility_code]
+        running.set()
@@ -1,18 +1,53 @@
 # -*- coding: utf-8 -*-
+"""
+启动预热任务调度。
+
+run_preheat_tasks 逐个顺序执行（保留给简单场景）。桌面端启动用 PreheatScheduler：
+
+- 任务可声明依赖（depends_on）和优先级（priority），依赖完成后按优先级取任务；
+  依赖失败的任务记为 skipped；
+- 最多 SHIYOU_PREHEAT_WORKERS（默认 2）个任务并发执行；
+- 不再在任务之间固定 sleep：用户正在操作（最近 SHIYOU_PREHEAT_IDLE_MS 内有键盘/鼠标
+  输入）时暂缓启动新任务，空闲后继续；连续暂缓超过 SHIYOU_PREHEAT_MAX_DEFER_MS
+  则照常执行，避免一直操作时缓存永远不热；
+- 用户在导航栏指向某个页面时 prioritize_page 把该页面用到的任务（及其依赖）提到最前，
+  这些任务不受空闲限制。
+
+每个任务的排队等待和执行耗时记在 PreheatResult 中，结束时打印一行 [preheat] 汇总。
+"""
 from __future__ import annotations
 
+import os
+import threading
 import time
 from dataclasses import dataclass
-from typing import Callable, Literal
+from importlib import import_module
+from typing import Callable, Iterable, Literal
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
 
 
-PreheatStatus = Literal["done", "failed"]
+PREHEAT_WORKERS = max(1, _env_int("SHIYOU_PREHEAT_WORKERS", 2))
+PREHEAT_IDLE_SECONDS = max(0, _env_int("SHIYOU_PREHEAT_IDLE_MS", 300)) / 1000.0
+PREHEAT_MAX_DEFER_SECONDS = max(0, _env_int("SHIYOU_PREHEAT_MAX_DEFER_MS", 10000)) / 1000.0
+_IDLE_POLL_SECONDS = 0.1
+
+PreheatStatus = Literal["done", "failed", "skipped"]
 
 
 @dataclass(frozen=True)
 class PreheatTask:
     name: str
     run: Callable[[], object]
+    priority: int = 0
+    depends_on: tuple[str, ...] = ()
+    # 用到该任务预热结果的页面模块，导航指向这些页面时提前执行。
+    pages: tuple[str, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -20,6 +55,30 @@ class PreheatResult:
     name: str
     status: PreheatStatus
     error: str = ""
+    wait_ms: float = 0.0
+    duration_ms: float = 0.0
+
+
+def lazy_call(module_name: str, attr: str) -> Callable[[], object]:
+    """任务执行时才导入模块，启动阶段不为预热任务付出导入开销。"""
+
+    def run() -> object:
+        return getattr(import_module(module_name), attr)()
+
+    run.__qualname__ = f"lazy_call({module_name}.{attr})"
+    return run
+
+
+_LAST_USER_ACTIVITY = float("-inf")
+
+
+def note_user_activity() -> None:
+    global _LAST_USER_ACTIVITY
+    _LAST_USER_ACTIVITY = time.monotonic()
+
+
+def user_idle() -> bool:
+    return time.monotonic() - _LAST_USER_ACTIVITY >= PREHEAT_IDLE_SECONDS
 
 
 def run_preheat_tasks(
@@ -30,14 +89,198 @@ def run_preheat_tasks(
 ) -> list[PreheatResult]:
     results: list[PreheatResult] = []
     total = len(tasks)
+    started_at = time.perf_counter()
     for index, task in enumerate(tasks):
+        task_started = time.perf_counter()
+        wait_ms = (task_started - started_at) * 1000.0
         try:
             task.run()
         except Exception as exc:
-            results.append(PreheatResult(task.name, "failed", type(exc).__name__))
+            status, error = "failed", type(exc).__name__
         else:
-            results.append(PreheatResult(task.name, "done"))
+            status, error = "done", ""
+        duration_ms = (time.perf_counter() - task_started) * 1000.0
+        results.append(PreheatResult(task.name, status, error, wait_ms, duration_ms))
 
         if pause_seconds > 0 and index < total - 1:
             sleep(pause_seconds)
     return results
+
+
+class PreheatScheduler:
+    def __init__(
+        self,
+        tasks: Iterable[PreheatTask],
+        *,
+        max_workers: int | None = None,
+        idle_check: Callable[[], bool] | None = None,
+        max_defer_seconds: float | None = None,
+    ):
+        self._tasks = {task.name: task for task in tasks}
+        self._order = {name: index for index, name in enumerate(self._tasks)}
+        self._check_dependencies()
+        self.max_workers = max(1, int(max_workers or PREHEAT_WORKERS))
+        self._idle_check = idle_check
+        self._max_defer_seconds = PREHEAT_MAX_DEFER_SECONDS if max_defer_seconds is None else max_defer_seconds
+        self._cond = threading.Condition(threading.RLock())
+        self._pending = set(self._tasks)
+        self._running: set[str] = set()
+        self._boosted: set[str] = set()
+        self._results: dict[str, PreheatResult] = {}
+        self._completed: list[str] = []
+        self._started_at: float | None = None
+        self._threads: list[threading.Thread] = []
+
+    def _check_dependencies(self) -> None:
+        for task in self._tasks.values():
+            missing = [name for name in task.depends_on if name not in self._tasks]
+            if missing:
+                raise ValueError(f"预热任务 {task.name} 依赖未知任务：{', '.join(missing)}")
+        visiting: set[str] = set()
+        visited: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"预热任务依赖存在循环：{name}")
+            visiting.add(name)
+            for dependency in self._tasks[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._tasks:
+            visit(name)
+
+    # ---------------- 调整优先级 ---------------- #
+    def prioritize(self, name: str) -> bool:
+        """把任务及其未完成的依赖提到最前；返回是否有任务被提前。"""
+        with self._cond:
+            boosted = self._boost(name)
+            if boosted:
+                self._cond.notify_all()
+            return boosted
+
+    def _boost(self, name: str) -> bool:
+        task = self._tasks.get(name)
+        if task is None or name not in self._pending:
+            return False
+        self._boosted.add(name)
+        for dependency in task.depends_on:
+            self._boost(dependency)
+        return True
+
+    def prioritize_page(self, module_name: str) -> list[str]:
+        """导航指向某页面时调用，返回被提前的任务名。"""
+        names = [name for name, task in self._tasks.items() if module_name in task.pages]
+        return [name for name in names if self.prioritize(name)]
+
+    # ---------------- 执行 ---------------- #
+    def start(self) -> "PreheatScheduler":
+        with self._cond:
+            if self._started_at is not None:
+                return self
+            self._started_at = time.perf_counter()
+        for index in range(min(self.max_workers, len(self._tasks))):
+            thread = threading.Thread(target=self._worker, name=f"startup-preheat-{index}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        return self
+
+    def run(self) -> list[PreheatResult]:
+        """启动并阻塞等待全部任务结束。"""
+        self.start()
+        self.wait()
+        return self.results()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._running, timeout)
+
+    def results(self) -> list[PreheatResult]:
+        """按完成顺序返回结果。"""
+        with self._cond:
+            return [self._results[name] for name in self._completed]
+
+    def _finish(self, result: PreheatResult) -> None:
+        self._pending.discard(result.name)
+        self._running.discard(result.name)
+        self._boosted.discard(result.name)
+        self._results[result.name] = result
+        self._completed.append(result.name)
+        # 最后结束的可能是执行完的任务，也可能是因依赖失败被跳过的任务；两条路径都经过这里，
+        # 在锁内判断，汇总只打印一次，且 wait() 返回时已经打印。
+        if not self._pending and not self._running:
+            self._log_summary(time.perf_counter())
+        self._cond.notify_all()
+
+    def _next_ready(self, *, boosted_only: bool) -> PreheatTask | None:
+        ready: list[PreheatTask] = []
+        for name in list(self._pending):
+            task = self._tasks[name]
+            dependency_results = [self._results.get(dependency) for dependency in task.depends_on]
+            failed = [item.name for item in dependency_results if item is not None and item.status != "done"]
+            if failed:
+                self._finish(PreheatResult(name, "skipped", f"依赖未完成：{', '.join(failed)}"))
+                continue
+            if all(item is not None for item in dependency_results):
+                if not boosted_only or name in self._boosted:
+                    ready.append(task)
+        if not ready:
+            return None
+        return max(ready, key=lambda task: (task.name in self._boosted, task.priority, -self._order[task.name]))
+
+    def _take_task(self) -> PreheatTask | None:
+        deferred_since: float | None = None
+        with self._cond:
+            while self._pending:
+                task = self._next_ready(boosted_only=True)
+                if task is None:
+                    idle = self._idle_check is None or self._idle_check()
+                    if not idle:
+                        now = time.monotonic()
+                        deferred_since = now if deferred_since is None else deferred_since
+                        idle = now - deferred_since >= self._max_defer_seconds
+                    if idle:
+                        task = self._next_ready(boosted_only=False)
+                    elif self._next_ready(boosted_only=False) is not None:
+                        self._cond.wait(_IDLE_POLL_SECONDS)
+                        continue
+                if task is not None:
+                    self._pending.discard(task.name)
+                    self._running.add(task.name)
+                    return task
+                if not self._pending:
+                    break
+                self._cond.wait()
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            task = self._take_task()
+            if task is None:
+                return
+            task_started = time.perf_counter()
+            try:
+                task.run()
+            except Exception as exc:
+                status, error = "failed", type(exc).__name__
+            else:
+                status, error = "done", ""
+            finished = time.perf_counter()
+            result = PreheatResult(
+                task.name,
+                status,
+                error,
+                wait_ms=(task_started - self._started_at) * 1000.0,
+                duration_ms=(finished - task_started) * 1000.0,
+            )
+            with self._cond:
+                self._finish(result)
+
+    def _log_summary(self, finished: float) -> None:
+        parts = ", ".join(
+            f"{item.name}={item.status} {item.duration_ms:.0f}ms (+{item.wait_ms:.0f}ms)" for item in self.results()
+        )
+        print(f"[preheat] all tasks finished in {(finished - self._started_at) * 1000.0:.0f}ms: {parts}")
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import os
+import weakref
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import func, select
+
+from shiyou_db.change_versions import DOCUMENT_CATEGORY_SCOPE, FACILITY_PROFILE_SCOPE, REBUILD_DIRECTORY_SCOPE
+from shiyou_db.local_mirror import MirrorSource, ReferenceMirror, mirror_for, set_active_mirror
+from shiyou_db.models import DocumentCategory, DocumentRebuildDirectory, FacilityProfile, FileChangeVersion
+
+DOCUMENT_CATEGORIES = DocumentCategory.__tablename__
+REBUILD_DIRECTORIES = DocumentRebuildDirectory.__tablename__
+FACILITY_PROFILES = FacilityProfile.__tablename__
+
+_LOCAL_SERVICES: "weakref.WeakKeyDictionary[ReferenceMirror, Any]" = weakref.WeakKeyDictionary()
+
+
+def _file_db_engine():
+    from services.file_db_adapter import _get_service
+
+    return _get_service().engine
+
+
+def _versioned_signature(model, scope_module: str):
+    # ORM 写入会累加变更版本；行数和最后修改时间兜住绕过 ORM 的脚本写入。
+    def signature(conn) -> list[Any]:
+        versions = conn.execute(
+            select(func.count(), func.coalesce(func.sum(FileChangeVersion.version), 0)).where(
+                FileChangeVersion.module_code == scope_module
+            )
+        ).one()
+        table_state = conn.execute(select(func.count(), func.max(model.updated_at))).one()
+        return [*versions, *table_state]
+
+    return signature
+
+
+def _reference_sources() -> list[MirrorSource]:
+    from feasibility_analysis_services.oilfield_env_service import oilfield_mirror_sources
+
+    return [
+        MirrorSource(
+            DOCUMENT_CATEGORIES,
+            DocumentCategory.__table__,
+            _file_db_engine,
+            _versioned_signature(DocumentCategory, DOCUMENT_CATEGORY_SCOPE),
+        ),
+        MirrorSource(
+            REBUILD_DIRECTORIES,
+            DocumentRebuildDirectory.__table__,
+            _file_db_engine,
+            _versioned_signature(DocumentRebuildDirectory, REBUILD_DIRECTORY_SCOPE),
+        ),
+        MirrorSource(
+            FACILITY_PROFILES,
+            FacilityProfile.__table__,
+            _file_db_engine,
+            _versioned_signature(FacilityProfile, FACILITY_PROFILE_SCOPE),
+        ),
+        *oilfield_mirror_sources(),
+    ]
+
+
+def default_mirror_path() -> Path:
+    configured = os.environ.get("SHIYOU_LOCAL_MIRROR", "").strip()
+    if configured:
+        return Path(configured)
+    from core.app_paths import external_path
+
+    return Path(external_path("data", "cache", "reference_mirror.sqlite3"))
+
+
+def start_reference_mirror(path: str | Path | None = None) -> ReferenceMirror | None:
+    """桌面端启动时调用：打开本地镜像并启动后台同步。SHIYOU_LOCAL_MIRROR=0 时不启用。"""
+    if os.environ.get("SHIYOU_LOCAL_MIRROR", "").strip() == "0":
+        return None
+    mirror = set_active_mirror(ReferenceMirror(path or default_mirror_path(), _reference_sources()))
+    mirror.start()
+    return mirror
+
+
+def reference_service(name: str, config_path: str | None = None):
+    """镜像中该表就绪时，返回绑定本地库的 FileMetadataService；否则返回 None，调用方读远端。"""
+    if config_path is not None:
+        return None
+    mirror = mirror_for(name)
+    if mirror is None:
+        return None
+    service = _LOCAL_SERVICES.get(mirror)
+    if service is None:
+        from shiyou_db import FileMetadataService
+
+        service = FileMetadataService.from_engine(mirror.engine, mirror.session_factory, mirror.path.parent)
+        _LOCAL_SERVICES[mirror] = service
+    return service
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import importlib
+
+# 登记了库表迁移的模块；导入时完成登记，启动时统一执行。
+MIGRATION_MODULES = (
+    "services.special_strategy_state_db",
+    "feasibility_analysis_services.oilfield_env_service",
+)
+
+
+def run_startup_migrations() -> dict[str, str]:
+    """服务端、桌面端启动时执行一次全部迁移，返回 {迁移或模块名: 错误信息}。"""
+    from shiyou_db.migrations import run_registered_migrations
+
+    failures: dict[str, str] = {}
+    for module_name in MIGRATION_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as exc:
+            failures[module_name] = str(exc)
+    failures.update(run_registered_migrations())
+    return failures
@@ -3,11 +3,21 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from threading import RLock
 from typing import Any
 
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import inspect, text
 
+from shiyou_db.current_files import (
+    CURRENT_SACINP,
+    LATEST_SACINP,
+    LATEST_SEAINP,
+    current_file_pointers_ready,
+    current_sacinp_score,
+)
+from shiyou_db.database import build_engine_from_url
 from shiyou_db.runtime_db import get_mysql_url, get_storage_root, get_echo_sql
+from shiyou_db.search_index import search_candidate_sql, search_index_ready
 
 
 FILE_TABLE_CANDIDATES = [
@@ -18,17 +28,30 @@ FILE_TABLE_CANDIDATES = [
     "sys_file",
 ]
 
+# 表名和列只在进程内探测一次；库结构由启动时的迁移维护，运行期间不再变化。
+_SCHEMA_CACHE_LOCK = RLock()
+_FILE_TABLE_CACHE: dict[str, str] = {}
+_TABLE_COLUMNS_CACHE: dict[tuple[str, str], frozenset[str]] = {}
+
+
+def _clear_schema_cache_for_tests() -> None:
+    with _SCHEMA_CACHE_LOCK:
+        _FILE_TABLE_CACHE.clear()
+        _TABLE_COLUMNS_CACHE.clear()
+
 
 def _engine():
-    return create_engine(
-        get_mysql_url(),
-        echo=get_echo_sql(),
-        pool_pre_ping=True,
-        pool_recycle=3600,
-    )
+    # 复用按 URL 缓存的引擎和连接池，单次指针查询不必每次重新建连接。
+    return build_engine_from_url(get_mysql_url(), echo=get_echo_sql())
 
 
 def _detect_file_table() -> str:
+    url = get_mysql_url()
+    with _SCHEMA_CACHE_LOCK:
+        cached = _FILE_TABLE_CACHE.get(url)
+    if cached is not None:
+        return cached
+
     engine = _engine()
     with engine.connect() as conn:
         inspector = inspect(conn)
@@ -36,6 +59,8 @@ def _detect_file_table() -> str:
 
     for name in FILE_TABLE_CANDIDATES:
         if name in tables:
+            with _SCHEMA_CACHE_LOCK:
+                _FILE_TABLE_CACHE[url] = name
             return name
 
     raise RuntimeError(
@@ -45,10 +70,17 @@ def _detect_file_table() -> str:
 
 
 def _table_columns(table_name: str) -> set[str]:
-    engine = _engine()
-    with engine.connect() as conn:
-        inspector = inspect(conn)
-        return {col["name"] for col in inspector.get_columns(table_name)}
+    key = (get_mysql_url(), table_name)
+    with _SCHEMA_CACHE_LOCK:
+        cached = _TABLE_COLUMNS_CACHE.get(key)
+    if cached is None:
+        engine = _engine()
+        with engine.connect() as conn:
+            inspector = inspect(conn)
+            cached = frozenset(col["name"] for col in inspector.get_columns(table_name))
+        with _SCHEMA_CACHE_LOCK:
+            _TABLE_COLUMNS_CACHE[key] = cached
+    return set(cached)
 
 
 def resolve_storage_path(path_text: str | Path) -> Path:
@@ -66,7 +98,8 @@ def resolve_storage_path(path_text: str | Path) -> Path:
         raise ValueError("文件路径为空")
 
     text_value = text_value.replace("\\", "/")
-    storage_root = Path(get_storage_root()).expanduser().resolve()
+    # get_storage_root 返回的已是解析过的绝对路径，且随配置缓存，这里不再访问文件系统。
+    storage_root = Path(get_storage_root())
 
     raw = Path(text_value)
 
@@ -208,61 +241,40 @@ def find_latest_file_record(
     return _row_to_dict(row)
 
 
-def _record_text(record: dict[str, Any], keys: tuple[str, ...]) -> str:
-    return " ".join(str(record.get(key) or "") for key in keys).strip()
+def _current_file_pointer_record(facility_code: str, file_kind: str) -> tuple[bool, dict[str, Any] | None]:
+    """按 current_file_pointers 一次主键查询取记录。
 
-
-def _current_sacinp_score(record: dict[str, Any], facility_code: str) -> int:
-    path_text = _record_text(
-        record,
-        (
-            "storage_path",
-            "relative_path",
-            "file_path",
-            "path",
-            "absolute_path",
-            "local_path",
-        ),
+    返回 (指针可用, 记录)；指针表不存在或尚未回填时返回 (False, None)，调用方退回扫描。
+    """
+    code = str(facility_code or "").strip()
+    if not code:
+        return False, None
+    engine = _engine()
+    sql = text(
+        "SELECT r.* FROM current_file_pointers p "
+        "JOIN file_records r ON r.id = p.record_id "
+        "WHERE p.facility_code = :facility_code AND p.file_kind = :file_kind"
     )
-    name_text = _record_text(record, ("file_name", "original_name", "filename", "name"))
-    logical_path = str(record.get("logical_path") or "")
-    module_code = str(record.get("module_code") or "")
-
-    display_name = (name_text or Path(path_text).name).strip()
-    name_low = display_name.lower()
-    path_low = path_text.lower().replace("\\", "/")
-    logical_low = logical_path.lower().replace("\\", "/")
-    code_low = str(facility_code or "").strip().lower()
-
-    if not name_low.startswith("sacinp"):
-        return -1
-    if name_low.startswith("seainp"):
-        return -1
-    if name_low == "sacinp.m1" or path_low.endswith("/sacinp.m1"):
-        return -1
-    if "历史改造" in logical_path or "自动计算" in logical_path or "/结果/" in logical_low:
-        return -1
-
-    score = 0
-    if module_code == "model_files":
-        score += 200
-    if code_low and (code_low in path_low or code_low in logical_low):
-        score += 300
-    if "当前模型" in logical_path:
-        score += 500
-    if "结构模型" in logical_path:
-        score += 300
-    if "用户上传" in logical_path:
-        score += 50
-    if name_low == "sacinp.jknew":
-        score += 1000
-    elif name_low.startswith("sacinp"):
-        score += 400
-    return score
+    try:
+        with engine.connect() as conn:
+            row = conn.execute(sql, {"facility_code": code, "file_kind": file_kind}).mappings().first()
+    except Exception:
+        return False, None
+    if row is not None:
+        return True, dict(row)
+    return current_file_pointers_ready(engine), None
 
 
 def get_current_sacinp_record(facility_code: str) -> dict[str, Any]:
     """返回当前平台当前原模型结构文件，避免误选历史改造 M1 或结果目录文件。"""
+    pointer_ready, record = _current_file_pointer_record(facility_code, CURRENT_SACINP)
+    if record is not None:
+        return record
+    if pointer_ready:
+        raise FileNotFoundError(
+            f"未在数据库中找到平台 {facility_code} 的当前原模型 sacinp 文件记录。"
+        )
+
     table = _detect_file_table()
     columns = _table_columns(table)
 
@@ -304,6 +316,13 @@ def get_current_sacinp_record(facility_code: str) -> dict[str, Any]:
         conditions.append("(module_code = :module_code OR module_code IS NULL OR module_code = '')")
         params["module_code"] = "model_files"
 
+    engine = _engine()
+    if table == "file_records" and search_index_ready(engine):
+        # 评分只接受文件名以 sacinp 开头的记录，文件名在切片索引内，可先按索引缩小候选。
+        candidate_sql = search_candidate_sql("sacinp", params)
+        if candidate_sql:
+            conditions.append(candidate_sql)
+
     where_sql = ""
     if conditions:
         where_sql = " AND " + " AND ".join(conditions)
@@ -319,12 +338,12 @@ def get_current_sacinp_record(facility_code: str) -> dict[str, Any]:
         sql += f"ORDER BY {order_sql} "
     sql += "LIMIT 200"
 
-    with _engine().connect() as conn:
+    with engine.connect() as conn:
         rows = [dict(row) for row in conn.execute(text(sql), params).mappings().all()]
 
     candidates: list[tuple[int, dict[str, Any]]] = []
     for record in rows:
-        score = _current_sacinp_score(record, code)
+        score = current_sacinp_score(record, code)
         if score >= 0:
             candidates.append((score, record))
 
@@ -338,11 +357,13 @@ def get_current_sacinp_record(facility_code: str) -> dict[str, Any]:
 
 
 def get_latest_sacinp_record(facility_code: str) -> dict[str, Any]:
-    record = find_latest_file_record(
-        facility_code=facility_code,
-        keyword="sacinp",
-        category_keywords=["模型文件", "结构模型"],
-    )
+    pointer_ready, record = _current_file_pointer_record(facility_code, LATEST_SACINP)
+    if record is None and not pointer_ready:
+        record = find_latest_file_record(
+            facility_code=facility_code,
+            keyword="sacinp",
+            category_keywords=["模型文件", "结构模型"],
+        )
     if not record:
         raise FileNotFoundError(
             f"未在数据库中找到平台 {facility_code} 的 sacinp 模型文件记录。"
@@ -355,6 +376,9 @@ def get_latest_sacinp_path(facility_code: str) -> Path:
 
 
 def get_latest_seainp_record(facility_code: str) -> dict[str, Any] | None:
+    pointer_ready, record = _current_file_pointer_record(facility_code, LATEST_SEAINP)
+    if record is not None or pointer_ready:
+        return record
     return find_latest_file_record(
         facility_code=facility_code,
         keyword="seainp",
@@ -95,8 +95,16 @@ def _time_matches(row_time: Any, target_time: str) -> bool:
     return row_norm == target_norm
 
 
-def _load_snapshot_payload(facility_code: str, run_id: int | None = None) -> dict[str, Any] | None:
-    snapshot = load_strategy_result_snapshot_by_run(int(run_id)) if run_id else load_latest_strategy_result_snapshot(facility_code)
+def _load_snapshot_payload(
+    facility_code: str,
+    run_id: int | None = None,
+    tables: tuple[str, ...] | None = None,
+) -> dict[str, Any] | None:
+    snapshot = (
+        load_strategy_result_snapshot_by_run(int(run_id), tables=tables)
+        if run_id
+        else load_latest_strategy_result_snapshot(facility_code, tables=tables)
+    )
     if not snapshot:
         return None
     payload = snapshot.get("result_json")
@@ -143,7 +151,8 @@ def _candidate_pipeline_paths(facility_code: str, run_id: int | None = None) ->
         print("[InspectionOverlay] load run workbook path failed:", exc)
 
     try:
-        snapshot_payload = _load_snapshot_payload(code, run_id=run_id)
+        # 这里只需要 state 中的工作簿路径，不取明细表。
+        snapshot_payload = _load_snapshot_payload(code, run_id=run_id, tables=())
         path = _extract_workbook_path_from_run_payload(snapshot_payload)
         if path:
             candidates.append(path)
@@ -353,7 +362,11 @@ def _load_context_overlay_fallback(
     run_id: int | None,
     display_year: str,
 ) -> dict[str, Any]:
-    payload = _load_snapshot_payload(facility_code, run_id=run_id)
+    payload = _load_snapshot_payload(
+        facility_code,
+        run_id=run_id,
+        tables=("context", "member_inspection_strategy_rows", "node_inspection_strategy_rows"),
+    )
     if not payload:
         return _empty_overlay(facility_code, run_id, display_year, _norm_time_label(display_year))
 
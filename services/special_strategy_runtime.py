@@ -7,6 +7,7 @@ import json
 import os
 import re
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -22,7 +23,7 @@ from services.file_db_adapter import (
 )
 from pages.file_management_platforms import find_platform
 from services.special_strategy_state_db import (
-    list_strategy_runs,
+    list_strategy_run_index,
     load_latest_strategy_result_snapshot,
     load_latest_strategy_run,
     load_strategy_result_snapshot_by_run,
@@ -490,6 +491,33 @@ def _prune_runtime_artifacts(facility_code: str, keep_latest: int = MAX_RUNTIME_
                 pass
 
 
+_PRUNE_LOCK = threading.Lock()
+_PRUNE_PENDING: set[str] = set()
+
+
+def _schedule_runtime_artifact_prune(facility_code: str) -> None:
+    """在后台线程按保留策略清理旧的运行产物，计算返回不再等待磁盘/共享盘删除。
+
+    同一平台已有清理排队时不重复启动。
+    """
+    code = normalize_facility_code(facility_code)
+    with _PRUNE_LOCK:
+        if code in _PRUNE_PENDING:
+            return
+        _PRUNE_PENDING.add(code)
+
+    def worker() -> None:
+        try:
+            _prune_runtime_artifacts(code)
+        except Exception as exc:
+            print(f"[special_strategy] prune runtime artifacts failed for {code}: {exc}")
+        finally:
+            with _PRUNE_LOCK:
+                _PRUNE_PENDING.discard(code)
+
+    threading.Thread(target=worker, name=f"special-strategy-prune-{code}", daemon=True).start()
+
+
 def load_base_config(facility_code: str) -> dict[str, Any]:
     code = normalize_facility_code(facility_code)
     path = _common_config_path()
@@ -1350,9 +1378,9 @@ def _context_from_result_snapshot(
     target_run_id = run_id or _state_db_run_id(state)
     snapshot = None
     if target_run_id is not None:
-        snapshot = load_strategy_result_snapshot_by_run(target_run_id)
+        snapshot = load_strategy_result_snapshot_by_run(target_run_id, tables=("context",))
     if snapshot is None and run_id is None:
-        snapshot = load_latest_strategy_result_snapshot(code)
+        snapshot = load_latest_strategy_result_snapshot(code, tables=("context",))
     if not snapshot or not isinstance(snapshot.get("result_json"), dict):
         return None
     payload = snapshot["result_json"]
@@ -1371,10 +1399,11 @@ def _detail_rows_from_result_snapshot(
     code = normalize_facility_code(facility_code)
     target_run_id = run_id or _state_db_run_id(state)
     snapshot = None
+    detail_tables = ("member_risk_rows_full", "node_risk_rows_full")
     if target_run_id is not None:
-        snapshot = load_strategy_result_snapshot_by_run(target_run_id)
+        snapshot = load_strategy_result_snapshot_by_run(target_run_id, tables=detail_tables)
     if snapshot is None and run_id is None:
-        snapshot = load_latest_strategy_result_snapshot(code)
+        snapshot = load_latest_strategy_result_snapshot(code, tables=detail_tables)
     payload = (snapshot or {}).get("result_json")
     if not isinstance(payload, dict):
         return {"member": [], "node": []}
@@ -1814,7 +1843,7 @@ def finalize_special_strategy_calculation(
     state["db_snapshot_id"] = snapshot_id
     _write_json(paths["state_json"], state)
     _write_json(latest_paths["state_json"], state)
-    _prune_runtime_artifacts(code)
+    _schedule_runtime_artifact_prune(code)
     result_bundle["state"] = state
     return result_bundle
 
@@ -1888,8 +1917,22 @@ def load_latest_result_bundle(facility_code: str) -> dict[str, Any] | None:
 
 
 def list_result_run_history(facility_code: str, limit: int = 50) -> list[dict[str, Any]]:
+    return page_result_run_history(facility_code, limit=limit)
+
+
+def page_result_run_history(
+    facility_code: str,
+    limit: int = 50,
+    *,
+    before_run_id: int | None = None,
+    status: str | None = None,
+) -> list[dict[str, Any]]:
+    """运行历史分页，读轻量索引表；before_run_id 为上一页最后一行的 id。
+
+    完整结果用 load_result_bundle(facility_code, run_id) 按需读取。
+    """
     code = normalize_facility_code(facility_code)
-    return list_strategy_runs(code, limit=limit)
+    return list_strategy_run_index(code, limit=limit, before_run_id=before_run_id, status=status)
 
 
 def generate_special_strategy_report(
@@ -2050,5 +2093,5 @@ def generate_special_strategy_report(
         update_strategy_report(int(state_run_id), output_report=str(report_output_path))
     if not run_id:
         _write_json(paths["state_json"], state)
-    _prune_runtime_artifacts(code)
+    _schedule_runtime_artifact_prune(code)
     return report_output_path
@@ -0,0 +1,124 @@
+"""
+特检策略结果快照的列式压缩格式。
+
+以前整份结果（context 和各类明细行）序列化成一段 JSON 存进 result_json，明细表每一行
+都重复一遍列名，读取时不管用不用得到都要整段取回再解析。列式格式把结果拆成两部分：
+
+- 表头：去掉明细表后的结果骨架（state、context 中的标量字段等），明细表的位置换成
+  {"__table__": 表名} 占位，仍存 result_json，很小；
+- 明细表：结果中的 "字典列表"（顶层及 context 下一层）按列存储 —— 列名只写一次，
+  每列一个值数组，再 zlib 压缩，每张表一行存进 special_strategy_result_tables。
+
+读取时可以只取需要的表（例如结果页只要 context，明细导出只要 member/node 明细）。
+各行字段不一致的表按行存储（同样压缩），保证原样还原。
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+COLUMNAR_FORMAT = "columnar-v1"
+TABLE_MARKER = "__table__"
+
+ENCODING_COLUMNS = "columns"
+ENCODING_ROWS = "rows"
+
+_COMPRESS_LEVEL = 6
+# 只把足够大的字典列表拆成独立的表，零碎的小列表留在表头里。
+_MIN_TABLE_ROWS = 2
+_MAX_DEPTH = 2
+
+
+@dataclass(frozen=True)
+class EncodedTable:
+    name: str
+    row_count: int
+    columns: list[str]
+    encoding: str
+    data: bytes
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _is_table(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) >= _MIN_TABLE_ROWS
+        and all(isinstance(row, dict) for row in value)
+    )
+
+
+def encode_table(name: str, rows: list[dict[str, Any]]) -> EncodedTable:
+    columns: list[str] = []
+    seen: set[str] = set()
+    for row in rows:
+        for key in row:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+    uniform = all(len(row) == len(columns) for row in rows)
+    if uniform and all(isinstance(key, str) for key in columns):
+        body = [[row[column] for row in rows] for column in columns]
+        encoding = ENCODING_COLUMNS
+    else:
+        body = rows
+        columns = [str(column) for column in columns]
+        encoding = ENCODING_ROWS
+    return EncodedTable(name, len(rows), columns, encoding, zlib.compress(_dumps(body), _COMPRESS_LEVEL))
+
+
+def decode_table(encoding: str, columns: list[str], data: bytes) -> list[dict[str, Any]]:
+    body = json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+    if encoding == ENCODING_ROWS:
+        return list(body)
+    return [dict(zip(columns, values)) for values in zip(*body)] if body else []
+
+
+def split_result_tables(payload: dict[str, Any]) -> tuple[dict[str, Any], list[EncodedTable]]:
+    """把结果拆成 (表头骨架, 压缩后的明细表列表)。"""
+    tables: list[EncodedTable] = []
+
+    def strip(value: dict[str, Any], prefix: str, depth: int) -> dict[str, Any]:
+        skeleton: dict[str, Any] = {}
+        for key, item in value.items():
+            name = f"{prefix}{key}"
+            if _is_table(item):
+                tables.append(encode_table(name, item))
+                skeleton[key] = {TABLE_MARKER: name}
+            elif isinstance(item, dict) and depth < _MAX_DEPTH:
+                skeleton[key] = strip(item, f"{name}.", depth + 1)
+            else:
+                skeleton[key] = item
+        return skeleton
+
+    return strip(payload, "", 1), tables
+
+
+def table_selected(name: str, wanted: Iterable[str] | None) -> bool:
+    """wanted 为 None 表示全部；否则按表名或 "前缀." 匹配（"context" 选中 context 下的所有表）。"""
+    if wanted is None:
+        return True
+    return any(name == item or name.startswith(f"{item}.") for item in wanted)
+
+
+def merge_result_tables(skeleton: dict[str, Any], tables: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    """把取回的明细表放回骨架；未取回的表对应的键被去掉。"""
+
+    def fill(value: dict[str, Any]) -> dict[str, Any]:
+        merged: dict[str, Any] = {}
+        for key, item in value.items():
+            if isinstance(item, dict) and set(item) == {TABLE_MARKER}:
+                if item[TABLE_MARKER] in tables:
+                    merged[key] = tables[item[TABLE_MARKER]]
+            elif isinstance(item, dict):
+                merged[key] = fill(item)
+            else:
+                merged[key] = item
+        return merged
+
+    return fill(skeleton)
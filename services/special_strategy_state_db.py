@@ -6,10 +6,19 @@ import sys
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from shiyou_db.config import resolve_config_path
+from shiyou_db.migrations import ensure_migrations, register_migration
+
+from services.special_strategy_snapshot_codec import (
+    COLUMNAR_FORMAT,
+    decode_table,
+    merge_result_tables,
+    split_result_tables,
+    table_selected,
+)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -48,6 +57,21 @@ def _get_engine(config_path: str | None = None):
         raise SpecialStrategyStateError(f"Cannot initialize strategy state database engine: {exc}") from exc
 
 
+@lru_cache(maxsize=2)
+def _get_read_router(config_path: str | None = None):
+    _get_engine(config_path)
+    from shiyou_db.config import load_settings
+    from shiyou_db.replicas import get_replica_router
+
+    resolved = str(Path(config_path).resolve()) if config_path else str(DEFAULT_DB_CONFIG.resolve())
+    return get_replica_router(load_settings(resolved))
+
+
+def _get_read_engine(config_path: str | None = None):
+    """历史列表等只读查询用的引擎：配置了只读副本时按延迟选副本，否则即主库引擎。"""
+    return _get_read_router(config_path).read_engine()
+
+
 def is_strategy_state_db_configured(config_path: str | None = None) -> bool:
     path = Path(config_path) if config_path else DEFAULT_DB_CONFIG
     return path.exists()
@@ -98,8 +122,7 @@ def _create_index_if_missing(
     )
 
 
-def ensure_strategy_run_table(config_path: str | None = None) -> None:
-    engine = _get_engine(config_path)
+def _create_strategy_run_table(conn) -> None:
     ddl = """
     CREATE TABLE IF NOT EXISTS special_strategy_runs (
         id BIGINT PRIMARY KEY AUTO_INCREMENT,
@@ -120,19 +143,17 @@ def ensure_strategy_run_table(config_path: str | None = None) -> None:
         ("ix_special_strategy_runs_facility", ("facility_code",)),
         ("ix_special_strategy_runs_facility_updated", ("facility_code", "updated_at")),
     ]
-    with engine.begin() as conn:
-        conn.execute(text(ddl))
-        for index_name, columns in index_specs:
-            _create_index_if_missing(
-                conn,
-                table_name="special_strategy_runs",
-                index_name=index_name,
-                columns=columns,
-            )
+    conn.execute(text(ddl))
+    for index_name, columns in index_specs:
+        _create_index_if_missing(
+            conn,
+            table_name="special_strategy_runs",
+            index_name=index_name,
+            columns=columns,
+        )
 
 
-def ensure_strategy_result_table(config_path: str | None = None) -> None:
-    engine = _get_engine(config_path)
+def _create_strategy_result_table(conn) -> None:
     ddl = """
     CREATE TABLE IF NOT EXISTS special_strategy_result_snapshots (
         id BIGINT PRIMARY KEY AUTO_INCREMENT,
@@ -148,15 +169,218 @@ def ensure_strategy_result_table(config_path: str | None = None) -> None:
         ("ix_special_strategy_result_facility_updated", ("facility_code", "updated_at")),
         ("ix_special_strategy_result_run_id", ("run_id",)),
     ]
-    with engine.begin() as conn:
-        conn.execute(text(ddl))
-        for index_name, columns in index_specs:
-            _create_index_if_missing(
-                conn,
-                table_name="special_strategy_result_snapshots",
-                index_name=index_name,
-                columns=columns,
+    conn.execute(text(ddl))
+    for index_name, columns in index_specs:
+        _create_index_if_missing(
+            conn,
+            table_name="special_strategy_result_snapshots",
+            index_name=index_name,
+            columns=columns,
+        )
+
+
+def _add_column_if_missing(conn, *, table_name: str, column_name: str, ddl: str) -> None:
+    table_name = _validate_sql_identifier(table_name)
+    column_name = _validate_sql_identifier(column_name)
+    exists = conn.execute(
+        text(
+            """
+            SELECT COUNT(1)
+            FROM information_schema.columns
+            WHERE table_schema = DATABASE()
+              AND table_name = :table_name
+              AND column_name = :column_name
+            """
+        ),
+        {"table_name": table_name, "column_name": column_name},
+    ).scalar()
+    if int(exists or 0) > 0:
+        return
+    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"))
+
+
+def _create_strategy_result_table_store(conn) -> None:
+    """列式快照的明细表：每张表一行，列名 + zlib 压缩的列数据，可按表名单独读取。"""
+    _add_column_if_missing(
+        conn,
+        table_name="special_strategy_result_snapshots",
+        column_name="result_format",
+        ddl="VARCHAR(20) NULL",
+    )
+    ddl = """
+    CREATE TABLE IF NOT EXISTS special_strategy_result_tables (
+        id BIGINT PRIMARY KEY AUTO_INCREMENT,
+        snapshot_id BIGINT NOT NULL,
+        table_name VARCHAR(200) NOT NULL,
+        row_count INT NOT NULL DEFAULT 0,
+        columns_json LONGTEXT NULL,
+        encoding VARCHAR(20) NOT NULL,
+        data LONGBLOB NOT NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+    conn.execute(text(ddl))
+    _create_index_if_missing(
+        conn,
+        table_name="special_strategy_result_tables",
+        index_name="ix_ss_result_tables_snapshot",
+        columns=("snapshot_id", "table_name"),
+    )
+
+
+def _create_strategy_risk_image_table(conn) -> None:
+    """特检策略图片记录表。
+
+    用于保存页面自动导出的图片路径及其关联信息：平台、run_id、页面、年份、立面等。
+    """
+    ddl = """
+    CREATE TABLE IF NOT EXISTS special_strategy_risk_images (
+        id BIGINT PRIMARY KEY AUTO_INCREMENT,
+        run_id BIGINT NULL,
+        facility_code VARCHAR(100) NOT NULL,
+        page_code VARCHAR(100) NOT NULL,
+        image_type VARCHAR(80) NOT NULL,
+        year_label VARCHAR(50) NULL,
+        row_name VARCHAR(100) NOT NULL,
+        image_path VARCHAR(1000) NOT NULL,
+        image_name VARCHAR(255) NOT NULL,
+        remark VARCHAR(255) NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+    """
+    index_specs = [
+        ("ix_ss_risk_images_facility", ("facility_code",)),
+        ("ix_ss_risk_images_run", ("run_id",)),
+        ("ix_ss_risk_images_page", ("page_code",)),
+    ]
+    conn.execute(text(ddl))
+    for index_name, columns in index_specs:
+        _create_index_if_missing(
+            conn,
+            table_name="special_strategy_risk_images",
+            index_name=index_name,
+            columns=columns,
+        )
+
+
+_RUN_INDEX_DDL = """
+CREATE TABLE IF NOT EXISTS special_strategy_run_index (
+    run_id BIGINT PRIMARY KEY,
+    facility_code VARCHAR(100) NOT NULL,
+    status VARCHAR(50) NOT NULL DEFAULT 'completed',
+    snapshot_id BIGINT NULL,
+    member_count INT NULL,
+    node_count INT NULL,
+    summary_json TEXT NULL,
+    intermediate_workbook VARCHAR(500) NULL,
+    output_report VARCHAR(500) NULL,
+    created_at DATETIME NULL,
+    updated_at DATETIME NULL,
+    report_generated_at DATETIME NULL
+)
+"""
+
+
+def _create_strategy_run_index_table(conn) -> None:
+    """运行历史索引：每次计算一行，只有列表需要的字段和几个汇总指标，不含大 JSON。"""
+    conn.execute(text(_RUN_INDEX_DDL))
+    for index_name, columns in (
+        ("ix_ss_run_index_facility_run", ("facility_code", "run_id")),
+        ("ix_ss_run_index_facility_status", ("facility_code", "status", "run_id")),
+    ):
+        _create_index_if_missing(
+            conn,
+            table_name="special_strategy_run_index",
+            index_name=index_name,
+            columns=columns,
+        )
+    _backfill_strategy_run_index(conn)
+
+
+_INDEX_RUN_SQL = """
+    INSERT INTO special_strategy_run_index (
+        run_id,
+        facility_code,
+        status,
+        intermediate_workbook,
+        output_report,
+        created_at,
+        updated_at,
+        report_generated_at
+    )
+    SELECT
+        r.id,
+        r.facility_code,
+        r.status,
+        r.intermediate_workbook,
+        r.output_report,
+        r.created_at,
+        r.updated_at,
+        r.report_generated_at
+    FROM special_strategy_runs r
+    """
+
+
+def _backfill_strategy_run_index(conn) -> int:
+    """为索引表建立前已有的运行补索引行，并关联各运行最新的结果快照；可重复执行。"""
+    inserted = conn.execute(
+        text(
+            _INDEX_RUN_SQL
+            + """
+            WHERE NOT EXISTS (
+                SELECT 1 FROM special_strategy_run_index i WHERE i.run_id = r.id
+            )
+            """
+        )
+    ).rowcount
+    conn.execute(
+        text(
+            """
+            UPDATE special_strategy_run_index
+            SET snapshot_id = (
+                SELECT MAX(s.id)
+                FROM special_strategy_result_snapshots s
+                WHERE s.run_id = special_strategy_run_index.run_id
             )
+            WHERE snapshot_id IS NULL
+            """
+        )
+    )
+    return max(int(inserted or 0), 0)
+
+
+def _migrate_strategy_state_schema(conn) -> None:
+    _create_strategy_run_table(conn)
+    _create_strategy_result_table(conn)
+    _create_strategy_result_table_store(conn)
+    _create_strategy_risk_image_table(conn)
+    _create_strategy_run_index_table(conn)
+
+
+def _startup_engine():
+    return _get_engine() if is_strategy_state_db_configured() else None
+
+
+STRATEGY_STATE_MIGRATION = register_migration(
+    "special_strategy_state",
+    3,
+    _migrate_strategy_state_schema,
+    engine_factory=_startup_engine,
+)
+
+
+def _ensure_strategy_state_schema(config_path: str | None = None) -> None:
+    # 每个进程每个库只检查一次 schema_migrations，之后的读写只执行数据查询。
+    ensure_migrations(_get_engine(config_path), STRATEGY_STATE_MIGRATION.name)
+
+
+def ensure_strategy_run_table(config_path: str | None = None) -> None:
+    _ensure_strategy_state_schema(config_path)
+
+
+def ensure_strategy_result_table(config_path: str | None = None) -> None:
+    _ensure_strategy_state_schema(config_path)
 
 
 def _json_dumps(value: Any) -> str | None:
@@ -216,7 +440,9 @@ def save_strategy_run(
                 "status": status,
             },
         )
-        return int(result.lastrowid or 0)
+        run_id = int(result.lastrowid or 0)
+        conn.execute(text(_INDEX_RUN_SQL + " WHERE r.id = :run_id"), {"run_id": run_id})
+        return run_id
 
 
 def load_latest_strategy_run(facility_code: str, config_path: str | None = None) -> dict[str, Any] | None:
@@ -283,7 +509,7 @@ def list_strategy_runs(
     if not is_strategy_state_db_configured(config_path):
         return []
     ensure_strategy_run_table(config_path)
-    engine = _get_engine(config_path)
+    engine = _get_read_engine(config_path)
     sql = text(
         """
         SELECT *
@@ -321,17 +547,25 @@ def update_strategy_report(
         WHERE id = :run_id
         """
     )
+    index_sql = text(
+        """
+        UPDATE special_strategy_run_index
+        SET output_report = :output_report,
+            report_generated_at = :report_generated_at,
+            updated_at = :updated_at
+        WHERE run_id = :run_id
+        """
+    )
     now = datetime.utcnow()
+    params = {
+        "run_id": int(run_id),
+        "output_report": output_report,
+        "report_generated_at": now,
+        "updated_at": now,
+    }
     with engine.begin() as conn:
-        conn.execute(
-            sql,
-            {
-                "run_id": int(run_id),
-                "output_report": output_report,
-                "report_generated_at": now,
-                "updated_at": now,
-            },
-        )
+        conn.execute(sql, params)
+        conn.execute(index_sql, params)
 
 
 def save_strategy_result_snapshot(
@@ -341,18 +575,41 @@ def save_strategy_result_snapshot(
     run_id: int | None = None,
     config_path: str | None = None,
 ) -> int:
+    """保存结果快照：明细表按列压缩单独存放，result_json 只存去掉明细后的骨架。"""
     ensure_strategy_result_table(config_path)
     engine = _get_engine(config_path)
+    skeleton, tables = split_result_tables(result_payload)
     sql = text(
         """
         INSERT INTO special_strategy_result_snapshots (
             run_id,
             facility_code,
-            result_json
+            result_json,
+            result_format
         ) VALUES (
             :run_id,
             :facility_code,
-            :result_json
+            :result_json,
+            :result_format
+        )
+        """
+    )
+    table_sql = text(
+        """
+        INSERT INTO special_strategy_result_tables (
+            snapshot_id,
+            table_name,
+            row_count,
+            columns_json,
+            encoding,
+            data
+        ) VALUES (
+            :snapshot_id,
+            :table_name,
+            :row_count,
+            :columns_json,
+            :encoding,
+            :data
         )
         """
     )
@@ -362,10 +619,29 @@ def save_strategy_result_snapshot(
             {
                 "run_id": int(run_id) if run_id else None,
                 "facility_code": facility_code,
-                "result_json": json.dumps(result_payload, ensure_ascii=False, default=str),
+                "result_json": json.dumps(skeleton, ensure_ascii=False, default=str),
+                "result_format": COLUMNAR_FORMAT,
             },
         )
-        return int(result.lastrowid or 0)
+        snapshot_id = int(result.lastrowid or 0)
+        if run_id:
+            _index_snapshot_summary(conn, int(run_id), snapshot_id, result_payload)
+        if tables:
+            conn.execute(
+                table_sql,
+                [
+                    {
+                        "snapshot_id": snapshot_id,
+                        "table_name": table.name,
+                        "row_count": table.row_count,
+                        "columns_json": json.dumps(table.columns, ensure_ascii=False),
+                        "encoding": table.encoding,
+                        "data": table.data,
+                    }
+                    for table in tables
+                ],
+            )
+        return snapshot_id
 
 
 _RESULT_JSON_CHUNK_CHARS = 256 * 1024
@@ -414,17 +690,160 @@ def _load_result_json_for_snapshot(conn, snapshot_id: int) -> dict[str, Any] | N
         return None
 
 
+_SUMMARY_CONTEXT_KEYS = (
+    "member_inspection_total",
+    "member_inspection_total_II",
+    "member_inspection_total_III",
+    "member_inspection_total_IV",
+)
+
+
+def _index_snapshot_summary(conn, run_id: int, snapshot_id: int, result_payload: dict[str, Any]) -> None:
+    context = result_payload.get("context") if isinstance(result_payload.get("context"), dict) else {}
+    summary = {key: context[key] for key in _SUMMARY_CONTEXT_KEYS if context.get(key) not in (None, "")}
+    member_rows = result_payload.get("member_risk_rows_full")
+    node_rows = result_payload.get("node_risk_rows_full")
+    conn.execute(
+        text(
+            """
+            UPDATE special_strategy_run_index
+            SET snapshot_id = :snapshot_id,
+                member_count = :member_count,
+                node_count = :node_count,
+                summary_json = :summary_json
+            WHERE run_id = :run_id
+            """
+        ),
+        {
+            "run_id": run_id,
+            "snapshot_id": snapshot_id,
+            "member_count": len(member_rows) if isinstance(member_rows, list) else None,
+            "node_count": len(node_rows) if isinstance(node_rows, list) else None,
+            "summary_json": json.dumps(summary, ensure_ascii=False, default=str) if summary else None,
+        },
+    )
+
+
+def list_strategy_run_index(
+    facility_code: str,
+    *,
+    limit: int = 50,
+    before_run_id: int | None = None,
+    status: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    config_path: str | None = None,
+) -> list[dict[str, Any]]:
+    """按 run_id 倒序分页列出运行历史索引。
+
+    before_run_id 为上一页最后一行的 run_id（keyset 翻页）；status、since、until 按状态和
+    创建时间筛选。每行带 id（即 run_id，兼容原历史列表）、快照 id、汇总指标和产物路径，
+    完整结果按需用 load_strategy_result_snapshot_by_run 读取。
+    """
+    if not is_strategy_state_db_configured(config_path):
+        return []
+    ensure_strategy_run_table(config_path)
+    engine = _get_read_engine(config_path)
+    conditions = ["facility_code = :facility_code"]
+    params: dict[str, Any] = {"facility_code": facility_code, "limit_count": max(1, int(limit))}
+    if before_run_id is not None:
+        conditions.append("run_id < :before_run_id")
+        params["before_run_id"] = int(before_run_id)
+    if status:
+        conditions.append("status = :status")
+        params["status"] = str(status)
+    if since is not None:
+        conditions.append("created_at >= :since")
+        params["since"] = since
+    if until is not None:
+        conditions.append("created_at < :until")
+        params["until"] = until
+    sql = text(
+        f"""
+        SELECT run_id, facility_code, status, snapshot_id, member_count, node_count, summary_json,
+               intermediate_workbook, output_report, created_at, updated_at, report_generated_at
+        FROM special_strategy_run_index
+        WHERE {" AND ".join(conditions)}
+        ORDER BY run_id DESC
+        LIMIT :limit_count
+        """
+    )
+    with engine.connect() as conn:
+        rows = conn.execute(sql, params).mappings().all()
+    items = []
+    for row in rows:
+        item = dict(row)
+        raw_summary = item.pop("summary_json", None)
+        try:
+            item["summary"] = json.loads(raw_summary) if raw_summary else {}
+        except Exception:
+            item["summary"] = {}
+        item["id"] = item["run_id"]
+        items.append(item)
+    return items
+
+
+def _load_result_tables(conn, snapshot_id: int, tables: Iterable[str] | None) -> dict[str, list[dict[str, Any]]]:
+    wanted = None if tables is None else tuple(str(name) for name in tables)
+    if wanted is not None and not wanted:
+        return {}
+    conditions = ["snapshot_id = :snapshot_id"]
+    params: dict[str, Any] = {"snapshot_id": int(snapshot_id)}
+    binds = []
+    if wanted is not None:
+        # "context" 也选中 "context.xxx"；LIKE 中的 _ 会多匹配，取回后再用 table_selected 精确过滤。
+        matches = ["table_name IN :table_names"]
+        params["table_names"] = list(wanted)
+        binds.append(bindparam("table_names", expanding=True))
+        for index, name in enumerate(wanted):
+            matches.append(f"table_name LIKE :table_prefix_{index}")
+            params[f"table_prefix_{index}"] = f"{name}.%"
+        conditions.append(f"({' OR '.join(matches)})")
+    sql = text(
+        f"""
+        SELECT table_name, columns_json, encoding, data
+        FROM special_strategy_result_tables
+        WHERE {" AND ".join(conditions)}
+        """
+    ).bindparams(*binds)
+    loaded: dict[str, list[dict[str, Any]]] = {}
+    for row in conn.execute(sql, params).mappings():
+        name = str(row["table_name"])
+        if not table_selected(name, wanted):
+            continue
+        loaded[name] = decode_table(str(row["encoding"]), json.loads(row["columns_json"] or "[]"), row["data"])
+    return loaded
+
+
+def _load_snapshot_result(conn, row: Any, tables: Iterable[str] | None) -> dict[str, Any]:
+    payload = dict(row)
+    result_format = payload.pop("result_format", None)
+    result_json = _load_result_json_for_snapshot(conn, int(payload["id"]))
+    if result_format == COLUMNAR_FORMAT and isinstance(result_json, dict):
+        result_json = merge_result_tables(result_json, _load_result_tables(conn, int(payload["id"]), tables))
+    payload["result_json"] = result_json
+    return payload
+
+
 def load_latest_strategy_result_snapshot(
     facility_code: str,
     config_path: str | None = None,
+    *,
+    tables: Iterable[str] | None = None,
 ) -> dict[str, Any] | None:
+    """读取平台最新的结果快照。
+
+    tables 为 None 时取回全部明细表；否则只取指定的表（按表名或前缀，如 "context"、
+    "member_risk_rows_full"），其余明细表的键不出现在 result_json 中。旧格式快照
+    总是整份返回。
+    """
     if not is_strategy_state_db_configured(config_path):
         return None
     ensure_strategy_result_table(config_path)
     engine = _get_engine(config_path)
     sql = text(
         """
-        SELECT id, run_id, facility_code, created_at, updated_at
+        SELECT id, run_id, facility_code, created_at, updated_at, result_format
         FROM special_strategy_result_snapshots
         WHERE facility_code = :facility_code
         ORDER BY id DESC
@@ -435,14 +854,14 @@ def load_latest_strategy_result_snapshot(
         row = conn.execute(sql, {"facility_code": facility_code}).mappings().first()
         if row is None:
             return None
-        payload = dict(row)
-        payload["result_json"] = _load_result_json_for_snapshot(conn, int(payload["id"]))
-    return payload
+        return _load_snapshot_result(conn, row, tables)
 
 
 def load_strategy_result_snapshot_by_run(
     run_id: int,
     config_path: str | None = None,
+    *,
+    tables: Iterable[str] | None = None,
 ) -> dict[str, Any] | None:
     if not is_strategy_state_db_configured(config_path):
         return None
@@ -450,7 +869,7 @@ def load_strategy_result_snapshot_by_run(
     engine = _get_engine(config_path)
     sql = text(
         """
-        SELECT id, run_id, facility_code, created_at, updated_at
+        SELECT id, run_id, facility_code, created_at, updated_at, result_format
         FROM special_strategy_result_snapshots
         WHERE run_id = :run_id
         ORDER BY id DESC
@@ -461,50 +880,15 @@ def load_strategy_result_snapshot_by_run(
         row = conn.execute(sql, {"run_id": int(run_id)}).mappings().first()
         if row is None:
             return None
-        payload = dict(row)
-        payload["result_json"] = _load_result_json_for_snapshot(conn, int(payload["id"]))
-    return payload
+        return _load_snapshot_result(conn, row, tables)
 
 
 # =========================
 # 特检策略立面/风险图图片记录
 # =========================
 def ensure_strategy_risk_image_table(config_path: str | None = None) -> None:
-    """创建特检策略图片记录表。
-
-    用于保存页面自动导出的图片路径及其关联信息：平台、run_id、页面、年份、立面等。
-    """
-    engine = _get_engine(config_path)
-    ddl = """
-    CREATE TABLE IF NOT EXISTS special_strategy_risk_images (
-        id BIGINT PRIMARY KEY AUTO_INCREMENT,
-        run_id BIGINT NULL,
-        facility_code VARCHAR(100) NOT NULL,
-        page_code VARCHAR(100) NOT NULL,
-        image_type VARCHAR(80) NOT NULL,
-        year_label VARCHAR(50) NULL,
-        row_name VARCHAR(100) NOT NULL,
-        image_path VARCHAR(1000) NOT NULL,
-        image_name VARCHAR(255) NOT NULL,
-        remark VARCHAR(255) NULL,
-        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-        updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-    )
-    """
-    index_specs = [
-        ("ix_ss_risk_images_facility", ("facility_code",)),
-        ("ix_ss_risk_images_run", ("run_id",)),
-        ("ix_ss_risk_images_page", ("page_code",)),
-    ]
-    with engine.begin() as conn:
-        conn.execute(text(ddl))
-        for index_name, columns in index_specs:
-            _create_index_if_missing(
-                conn,
-                table_name="special_strategy_risk_images",
-                index_name=index_name,
-                columns=columns,
-            )
+    """确保特检策略图片记录表存在。"""
+    _ensure_strategy_state_schema(config_path)
 
 
 def save_strategy_risk_image(
@@ -0,0 +1,125 @@
+"""
+文件数据的变更版本号。
+
+FileRecord / DocumentRebuildDirectory 每次经 ORM 写入时，在同一事务里把受影响的
+(模块, 设施, 类别) 行的 version 加一；提交失败则版本号一起回滚。客户端只需读这张
+小表就能判断自己缓存的列表是否过期，不同进程、服务端之间无需互相通知。
+
+文档重建目录没有模块和类别，按 REBUILD_DIRECTORY_SCOPE + 设施记版本，平台载荷信息
+同样按 PLATFORM_LOAD_SCOPE + 设施记版本；设施档案和
+文档类别整表记一个版本（FACILITY_PROFILE_SCOPE / DOCUMENT_CATEGORY_SCOPE），供桌面端
+本地镜像判断是否需要重新同步。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session, attributes
+
+from .database import build_upsert
+from .models import (
+    DocumentCategory,
+    DocumentRebuildDirectory,
+    FacilityProfile,
+    FileChangeVersion,
+    FileRecord,
+    PlatformLoadInformationItem,
+)
+
+REBUILD_DIRECTORY_SCOPE = "#rebuild_directories"
+FACILITY_PROFILE_SCOPE = "#facility_profiles"
+PLATFORM_LOAD_SCOPE = "#platform_load_items"
+DOCUMENT_CATEGORY_SCOPE = "#document_categories"
+
+ChangeScope = tuple[str, str, str]
+
+
+def _text(value: object) -> str:
+    return str(value or "").strip()
+
+
+def _history_values(target, field: str) -> list[str]:
+    history = attributes.get_history(target, field)
+    values = [*history.added, *history.unchanged, *history.deleted]
+    return [_text(value) for value in values] or [_text(getattr(target, field, None))]
+
+
+def _target_scopes(target) -> set[ChangeScope]:
+    """返回对象写入前后涉及的全部范围；改了类别或设施的记录，新旧两侧都要失效。"""
+    if isinstance(target, FileRecord):
+        return {
+            (module, facility, category)
+            for module in _history_values(target, "module_code")
+            for facility in _history_values(target, "facility_code")
+            for category in _history_values(target, "category_name")
+        }
+    if isinstance(target, DocumentRebuildDirectory):
+        return {(REBUILD_DIRECTORY_SCOPE, facility, "") for facility in _history_values(target, "facility_code")}
+    if isinstance(target, PlatformLoadInformationItem):
+        return {(PLATFORM_LOAD_SCOPE, facility, "") for facility in _history_values(target, "facility_code")}
+    if isinstance(target, FacilityProfile):
+        return {(FACILITY_PROFILE_SCOPE, "", "")}
+    if isinstance(target, DocumentCategory):
+        return {(DOCUMENT_CATEGORY_SCOPE, "", "")}
+    return set()
+
+
+def bump_change_versions(connection, scopes) -> None:
+    # 固定顺序加锁，两个事务同时改多个范围时不会互相等待成死锁。
+    ordered = sorted(set(scopes))
+    if not ordered:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {"module_code": module, "facility_code": facility, "category_name": category, "version": 1, "updated_at": now}
+        for module, facility, category in ordered
+    ]
+    statement = build_upsert(
+        connection.dialect.name,
+        FileChangeVersion,
+        rows,
+        key_columns=[FileChangeVersion.module_code, FileChangeVersion.facility_code, FileChangeVersion.category_name],
+        updates={"version": FileChangeVersion.version + 1, "updated_at": now},
+    )
+    if statement is not None:
+        connection.execute(statement)
+        return
+    for row in rows:
+        result = connection.execute(
+            update(FileChangeVersion)
+            .where(FileChangeVersion.module_code == row["module_code"])
+            .where(FileChangeVersion.facility_code == row["facility_code"])
+            .where(FileChangeVersion.category_name == row["category_name"])
+            .values(version=FileChangeVersion.version + 1, updated_at=now)
+        )
+        if not result.rowcount:
+            connection.execute(FileChangeVersion.__table__.insert().values(**row))
+
+
+def load_change_versions(engine) -> dict[ChangeScope, int]:
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(
+                FileChangeVersion.module_code,
+                FileChangeVersion.facility_code,
+                FileChangeVersion.category_name,
+                FileChangeVersion.version,
+            )
+        ).all()
+    return {(row[0], row[1], row[2]): int(row[3]) for row in rows}
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_scopes(session: Session, _flush_context) -> None:
+    scopes: set[ChangeScope] = set()
+    for target in session.new:
+        scopes |= _target_scopes(target)
+    for target in session.deleted:
+        scopes |= _target_scopes(target)
+    for target in session.dirty:
+        if session.is_modified(target, include_collections=False):
+            scopes |= _target_scopes(target)
+    if scopes:
+        bump_change_versions(session.connection(), scopes)
@@ -62,6 +62,9 @@ class AppSettings:
     storage_root: str
     pool: DatabasePoolSettings = field(default_factory=DatabasePoolSettings)
     storage_share: StorageShareSettings = field(default_factory=StorageShareSettings)
+    # 只读副本：缺省的连接项沿用主库；为空时所有读写都走主库。
+    replicas: tuple[DatabaseSettings, ...] = ()
+    replica_max_lag_seconds: int = 5
     echo_sql: bool = False
     enable_3d_preview: bool = True
 
@@ -88,6 +91,27 @@ def resolve_config_path(config_path: str | None = None) -> Path:
     return candidates[0]
 
 
+def _replica_settings(primary: dict, replicas_raw) -> tuple[DatabaseSettings, ...]:
+    replicas: list[DatabaseSettings] = []
+    for item in replicas_raw or []:
+        if isinstance(item, str):
+            item = {"host": item}
+        if not isinstance(item, dict) or not str(item.get("host") or "").strip():
+            continue
+        merged = {**primary, **item}
+        replicas.append(
+            DatabaseSettings(
+                host=str(merged["host"]).strip(),
+                port=int(merged.get("port", 3306)),
+                user=merged["user"],
+                password=merged.get("password", ""),
+                database=merged["database"],
+                charset=merged.get("charset", "utf8mb4"),
+            )
+        )
+    return tuple(replicas)
+
+
 def load_settings(config_path: str | None = None) -> AppSettings:
     path = resolve_config_path(config_path)
     if not path.exists():
@@ -128,6 +152,8 @@ def load_settings(config_path: str | None = None) -> AppSettings:
             password=str(share_raw.get("password") or "").strip(),
             force_reconnect=bool(share_raw.get("force_reconnect", False)),
         ),
+        replicas=_replica_settings(db, raw.get("database_replicas")),
+        replica_max_lag_seconds=max(0, int(raw.get("replica_max_lag_seconds", 5))),
         echo_sql=bool(raw.get("echo_sql", False)),
         enable_3d_preview=bool(raw.get("enable_3d_preview", True)),
         sacs_analysis_engine_exe=str(raw.get("sacs_analysis_engine_exe", "") or "").strip(),
@@ -0,0 +1,314 @@
+"""
+每个设施关键文件的当前指针。
+
+模型下载、风险查看、图片导出都要找 "某平台当前的 sacinp / 最新的 seainp"，原做法是
+多列 LIKE 扫描后在 Python 里打分。这里把选择结果存进 current_file_pointers，
+FileRecord 经 ORM 写入时在同一事务里只重算受影响设施、受影响种类的指针，
+读取方一次主键查询即可。选取规则与 services/server_file_service.py 原有逻辑一致，
+另外排除了已软删除的记录。
+
+已有数据由 rebuild_current_file_pointers 回填，完成后在 search_index_states 记一行；
+未回填时读取方退回原来的扫描。
+"""
+
+from __future__ import annotations
+
+import weakref
+from datetime import datetime
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable
+
+from sqlalchemy import delete, event, or_, select, update
+from sqlalchemy.orm import Session, attributes
+
+from .database import build_upsert
+from .models import CurrentFilePointer, FileRecord, SearchIndexState
+
+CURRENT_SACINP = "current_sacinp"
+LATEST_SACINP = "latest_sacinp"
+LATEST_SEAINP = "latest_seainp"
+POINTERS_STATE = "current_file_pointers"
+
+_PATH_KEYS = ("storage_path", "relative_path", "file_path", "path", "absolute_path", "local_path")
+_NAME_KEYS = ("file_name", "original_name", "filename", "name")
+_LATEST_KEYWORD_KEYS = (*_NAME_KEYS, *_PATH_KEYS[:4], "logical_path", "category_name", "file_type_code", "module_code", "remark")
+_LATEST_CATEGORY_KEYS = ("category_name", "file_type_code", "module_code", "logical_path", "remark")
+_RECORD_FIELDS = ("original_name", "storage_path", "logical_path", "category_name", "module_code", "remark")
+
+_READY_CACHE: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+_READY_LOCK = RLock()
+
+
+def _record_text(record: dict[str, Any], keys: tuple[str, ...]) -> str:
+    return " ".join(str(record.get(key) or "") for key in keys).strip()
+
+
+def current_sacinp_score(record: dict[str, Any], facility_code: str) -> int:
+    """当前原模型 sacinp 的打分；返回负数表示不是候选（历史改造 M1、结果目录等）。"""
+    path_text = _record_text(record, _PATH_KEYS)
+    name_text = _record_text(record, _NAME_KEYS)
+    logical_path = str(record.get("logical_path") or "")
+    module_code = str(record.get("module_code") or "")
+
+    display_name = (name_text or Path(path_text).name).strip()
+    name_low = display_name.lower()
+    path_low = path_text.lower().replace("\\", "/")
+    logical_low = logical_path.lower().replace("\\", "/")
+    code_low = str(facility_code or "").strip().lower()
+
+    if not name_low.startswith("sacinp"):
+        return -1
+    if name_low.startswith("seainp"):
+        return -1
+    if name_low == "sacinp.m1" or path_low.endswith("/sacinp.m1"):
+        return -1
+    if "历史改造" in logical_path or "自动计算" in logical_path or "/结果/" in logical_low:
+        return -1
+
+    score = 0
+    if module_code == "model_files":
+        score += 200
+    if code_low and (code_low in path_low or code_low in logical_low):
+        score += 300
+    if "当前模型" in logical_path:
+        score += 500
+    if "结构模型" in logical_path:
+        score += 300
+    if "用户上传" in logical_path:
+        score += 50
+    if name_low == "sacinp.jknew":
+        score += 1000
+    elif name_low.startswith("sacinp"):
+        score += 400
+    return score
+
+
+def _contains_any(record: dict[str, Any], keys: tuple[str, ...], keywords: tuple[str, ...]) -> bool:
+    texts = [str(record.get(key) or "").casefold() for key in keys]
+    return any(keyword.casefold() in text for keyword in keywords for text in texts)
+
+
+def _latest_rule(keyword: str, category_keywords: tuple[str, ...]):
+    # 与 find_latest_file_record 相同：关键字或类别关键字命中任一列即为候选，取最近更新的一条。
+    def rank(record: dict[str, Any], _facility_code: str):
+        if _contains_any(record, _LATEST_KEYWORD_KEYS, (keyword,)) or _contains_any(
+            record, _LATEST_CATEGORY_KEYS, category_keywords
+        ):
+            return (record.get("updated_at") or datetime.min, record.get("id") or 0)
+        return None
+
+    def candidates():
+        columns = [getattr(FileRecord, key) for key in _LATEST_KEYWORD_KEYS if hasattr(FileRecord, key)]
+        category_columns = [getattr(FileRecord, key) for key in _LATEST_CATEGORY_KEYS if hasattr(FileRecord, key)]
+        return or_(
+            *(column.like(f"%{keyword}%") for column in columns),
+            *(column.like(f"%{item}%") for item in category_keywords for column in category_columns),
+        )
+
+    return rank, candidates
+
+
+_CURRENT_SACINP_MODULES = ("model_files", "")
+
+
+def _current_sacinp_rank(record: dict[str, Any], facility_code: str):
+    # 与原扫描的 `module_code = 'model_files' OR module_code IS NULL OR module_code = ''` 一致，
+    # 其他模块（如文档管理）里名为 sacinp 的文件不参与当前模型的选择。
+    if str(record.get("module_code") or "") not in _CURRENT_SACINP_MODULES:
+        return None
+    score = current_sacinp_score(record, facility_code)
+    if score < 0:
+        return None
+    return (score, record.get("updated_at") or datetime.min, record.get("id") or 0)
+
+
+FILE_KIND_RULES: dict[str, tuple[Callable[[dict[str, Any], str], Any], Callable[[], Any]]] = {
+    CURRENT_SACINP: (
+        _current_sacinp_rank,
+        lambda: FileRecord.original_name.like("sacinp%")
+        & or_(
+            FileRecord.module_code.in_(_CURRENT_SACINP_MODULES),
+            FileRecord.module_code.is_(None),
+        ),
+    ),
+    LATEST_SACINP: _latest_rule("sacinp", ("模型文件", "结构模型")),
+    LATEST_SEAINP: _latest_rule("seainp", ("环境文件", "海洋环境", "SEA")),
+}
+
+
+def _matching_kinds(record: dict[str, Any], facility_code: str) -> set[str]:
+    return {kind for kind, (rank, _candidates) in FILE_KIND_RULES.items() if rank(record, facility_code) is not None}
+
+
+def lock_current_file_pointers(connection, facility_code: str, kinds) -> None:
+    """写占位行拿到设施指针行的排他锁。
+
+    ORM 写入在 before_flush 里、插入 FileRecord 之前调用：同一设施并发写入的事务在这里
+    排队，后到者还没插入自己的记录，前者的加锁读取不会等它，不会形成互相等待的死锁。
+    """
+    code = str(facility_code or "").strip()
+    kinds = sorted(set(kinds or ()))
+    if not code or not kinds:
+        return
+    now = datetime.utcnow()
+    statement = build_upsert(
+        connection.dialect.name,
+        CurrentFilePointer,
+        [{"facility_code": code, "file_kind": kind, "record_id": 0, "updated_at": now} for kind in kinds],
+        key_columns=[CurrentFilePointer.facility_code, CurrentFilePointer.file_kind],
+        updates={"updated_at": now},
+    )
+    if statement is not None:
+        connection.execute(statement)
+
+
+def _recompute_current_file_pointers(connection, code: str, kinds: list[str]) -> None:
+    now = datetime.utcnow()
+    # 指针行锁已在手：加锁读取读到的是最新提交的数据，不会用旧快照覆盖掉更合适的指针。
+    conditions = [FILE_KIND_RULES[kind][1]() for kind in kinds]
+    rows = connection.execute(
+        select(FileRecord.id, FileRecord.updated_at, *(getattr(FileRecord, field) for field in _RECORD_FIELDS))
+        .where(FileRecord.facility_code == code)
+        .where(FileRecord.is_deleted.is_(False))
+        .where(or_(*conditions))
+        .with_for_update(read=True)
+    ).mappings().all()
+
+    for kind in kinds:
+        rank = FILE_KIND_RULES[kind][0]
+        ranked = [(key, row["id"]) for row in rows if (key := rank(dict(row), code)) is not None]
+        pointer = (CurrentFilePointer.facility_code == code) & (CurrentFilePointer.file_kind == kind)
+        if not ranked:
+            connection.execute(delete(CurrentFilePointer).where(pointer))
+            continue
+        record_id = max(ranked)[1]
+        # 支持 upsert 的方言已有占位行；其余方言没有占位行，更新不到时再插入。
+        result = connection.execute(update(CurrentFilePointer).where(pointer).values(record_id=record_id, updated_at=now))
+        if not result.rowcount:
+            connection.execute(
+                CurrentFilePointer.__table__.insert().values(
+                    facility_code=code, file_kind=kind, record_id=record_id, updated_at=now
+                )
+            )
+
+
+def refresh_current_file_pointers(connection, facility_code: str, kinds=None) -> None:
+    """在 connection 所在事务里重算一个设施的指针。"""
+    code = str(facility_code or "").strip()
+    kinds = sorted(set(kinds or FILE_KIND_RULES))
+    if not code or not kinds:
+        return
+    lock_current_file_pointers(connection, code, kinds)
+    _recompute_current_file_pointers(connection, code, kinds)
+
+
+def current_file_pointers_ready(engine) -> bool:
+    with _READY_LOCK:
+        if _READY_CACHE.get(engine):
+            return True
+    try:
+        with engine.connect() as conn:
+            ready = (
+                conn.execute(select(SearchIndexState.name).where(SearchIndexState.name == POINTERS_STATE)).first()
+                is not None
+            )
+    except Exception:
+        return False
+    # 只缓存就绪状态：其他进程回填完成后，本进程下一次读取即可改走指针。
+    if ready:
+        with _READY_LOCK:
+            _READY_CACHE[engine] = True
+    return ready
+
+
+def _clear_current_file_pointers_ready_cache() -> None:
+    with _READY_LOCK:
+        _READY_CACHE.clear()
+
+
+def rebuild_current_file_pointers(engine) -> int:
+    """逐设施重算全部指针，返回处理的设施数。"""
+    with engine.connect() as conn:
+        facilities = {
+            str(value or "").strip()
+            for (value,) in conn.execute(
+                select(FileRecord.facility_code).where(FileRecord.is_deleted.is_(False)).distinct()
+            ).all()
+        }
+        facilities |= {
+            str(value or "").strip()
+            for (value,) in conn.execute(select(CurrentFilePointer.facility_code).distinct()).all()
+        }
+    facilities.discard("")
+    for code in sorted(facilities):
+        with engine.begin() as conn:
+            refresh_current_file_pointers(conn, code)
+
+    with Session(bind=engine) as session:
+        with session.begin():
+            state = session.get(SearchIndexState, POINTERS_STATE)
+            if state is None:
+                session.add(SearchIndexState(name=POINTERS_STATE, built_at=datetime.utcnow()))
+            else:
+                state.built_at = datetime.utcnow()
+    with _READY_LOCK:
+        _READY_CACHE[engine] = True
+    return len(facilities)
+
+
+def _record_states(target: FileRecord) -> list[tuple[str, dict[str, Any]]]:
+    """返回记录写入前、后两份 (设施, 字段) 快照，两侧涉及的指针都要重算。"""
+    fields = ("facility_code", "updated_at", "id", *_RECORD_FIELDS)
+    current = {field: getattr(target, field, None) for field in fields}
+    previous = dict(current)
+    for field in fields:
+        history = attributes.get_history(target, field)
+        if history.deleted:
+            previous[field] = history.deleted[0]
+    return [(str(state["facility_code"] or "").strip(), state) for state in (previous, current)]
+
+
+_PENDING_POINTERS_KEY = "current_file_pointers.locked"
+
+
+def _touched_pointers(session: Session) -> dict[str, set[str]]:
+    touched: dict[str, set[str]] = {}
+    targets = [*session.new, *session.deleted]
+    targets += [target for target in session.dirty if session.is_modified(target, include_collections=False)]
+    for target in targets:
+        if not isinstance(target, FileRecord):
+            continue
+        for facility_code, state in _record_states(target):
+            kinds = _matching_kinds(state, facility_code)
+            if facility_code and kinds:
+                touched.setdefault(facility_code, set()).update(kinds)
+    return touched
+
+
+@event.listens_for(Session, "before_flush")
+def _lock_flushing_pointers(session: Session, _flush_context, _instances) -> None:
+    touched = _touched_pointers(session)
+    if not touched:
+        return
+    # 固定按设施排序加锁，两个事务同时写多个设施时加锁顺序一致。
+    connection = session.connection()
+    for facility_code in sorted(touched):
+        lock_current_file_pointers(connection, facility_code, touched[facility_code])
+    session.info[_PENDING_POINTERS_KEY] = touched
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_flushed_pointers(session: Session, _flush_context) -> None:
+    touched = session.info.pop(_PENDING_POINTERS_KEY, {})
+    # 其他 before_flush 监听器在本监听器之后才改动的记录，在这里补锁。
+    for facility_code, kinds in _touched_pointers(session).items():
+        missing = kinds - touched.get(facility_code, set())
+        if missing:
+            lock_current_file_pointers(session.connection(), facility_code, missing)
+            touched.setdefault(facility_code, set()).update(missing)
+    if not touched:
+        return
+    connection = session.connection()
+    for facility_code in sorted(touched):
+        _recompute_current_file_pointers(connection, facility_code, sorted(touched[facility_code]))
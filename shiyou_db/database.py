@@ -7,6 +7,7 @@ from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from .config import AppSettings, DatabasePoolSettings, load_settings
+from .query_profiler import install_query_hooks
 
 Base = declarative_base()
 
@@ -23,6 +24,17 @@ def _clear_engine_cache_for_tests() -> None:
         engine.dispose()
 
 
+def dispose_engines_for_url(sqlalchemy_url: str) -> int:
+    """释放按该 URL 缓存的引擎（配置切换数据库后调用），返回释放的数量。"""
+    with _ENGINE_CACHE_LOCK:
+        keys = [key for key in _ENGINE_CACHE if key[0] == sqlalchemy_url]
+        engines = [_ENGINE_CACHE.pop(key) for key in keys]
+
+    for engine in engines:
+        engine.dispose()
+    return len(engines)
+
+
 def _is_sqlite_url(sqlalchemy_url: str) -> bool:
     return str(sqlalchemy_url).lower().startswith("sqlite")
 
@@ -93,6 +105,7 @@ def _get_or_create_engine(
             return engine
 
         engine = create_engine(sqlalchemy_url, **_build_engine_kwargs(sqlalchemy_url, echo=echo, pool=pool))
+        install_query_hooks(engine)
         _ENGINE_CACHE[cache_key] = engine
         return engine
 
@@ -114,6 +127,30 @@ def build_engine_from_url(
     return _get_or_create_engine(sqlalchemy_url, echo=echo, pool=pool)
 
 
+def build_upsert(dialect_name: str, model, rows: list[dict], *, key_columns: list, updates: dict | list[str]):
+    """按方言生成 "插入，主键冲突则更新" 语句；不支持的方言返回 None，由调用方先更新再插入。
+
+    updates 为字典时按给定值更新；为列名列表时，冲突行的这些列取本次插入的值。
+    """
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(model).values(rows)
+        if not isinstance(updates, dict):
+            updates = {name: statement.inserted[name] for name in updates}
+        return statement.on_duplicate_key_update(**updates)
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    statement = dialect_insert(model).values(rows)
+    if not isinstance(updates, dict):
+        updates = {name: statement.excluded[name] for name in updates}
+    return statement.on_conflict_do_update(index_elements=key_columns, set_=updates)
+
+
 def build_session_factory(settings: AppSettings):
     engine = build_engine(settings)
     return sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
@@ -0,0 +1,126 @@
+"""
+按业务键做差异同步的批量替换。
+
+"整组替换" 类接口（检测结论、平台载荷信息、油田环境参数等）原先先删掉范围内的全部
+行再逐行插入，只改一个单元格也要重写整组数据、重新分配自增 id。sync_keyed_rows
+读出范围内的现有行，按业务键与新数据配对：内容一致的行不动，内容有变化的行按主键
+批量 upsert（MySQL 为 INSERT ... ON DUPLICATE KEY UPDATE），新增行批量插入，多余
+的行按主键批量删除。全部语句在调用方传入的同一连接（同一事务）上执行。
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Sequence
+
+from sqlalchemy import and_, bindparam, delete, insert, select, update
+
+from .database import build_upsert
+
+SYNC_BATCH_SIZE = 500
+
+_NUMBER_TYPES = (int, float, Decimal)
+
+
+@dataclass
+class KeyedSyncResult:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+def _normalized(value: Any) -> Any:
+    # DECIMAL 列读回来是 Decimal，界面传入的多为 float/int，统一后再比较。
+    if isinstance(value, _NUMBER_TYPES) and not isinstance(value, bool):
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            return value
+    return value
+
+
+def _same_value(old: Any, new: Any) -> bool:
+    if _normalized(old) == _normalized(new):
+        return True
+    if isinstance(old, _NUMBER_TYPES) and isinstance(new, str):
+        try:
+            return Decimal(str(old)) == Decimal(new.strip())
+        except InvalidOperation:
+            return False
+    return False
+
+
+def _batches(items: list, batch_size: int):
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def sync_keyed_rows(
+    connection,
+    table,
+    scope: dict[str, Any],
+    rows: Sequence[dict[str, Any]],
+    *,
+    key_columns: Sequence[str],
+    touch: dict[str, Any] | None = None,
+    batch_size: int = SYNC_BATCH_SIZE,
+) -> KeyedSyncResult:
+    """把 table 中 scope 范围内的行同步为 rows，返回各类变更的行数。
+
+    table 须有自增主键 id，rows 各行的列须一致，scope 中的列由本函数补齐。业务键重复时
+    按出现顺序与现有行一一配对。touch 只写入被更新的行（如 ORM 表的 updated_at）。
+    """
+    columns = table.c
+    payload = [{**row, **scope} for row in rows]
+    value_names = [name for name in (payload[0] if payload else {}) if name not in scope]
+    selected = list(dict.fromkeys([*key_columns, *value_names]))
+
+    existing: dict[tuple, deque] = defaultdict(deque)
+    statement = (
+        select(columns.id, *(columns[name] for name in selected))
+        .where(and_(*(columns[name] == value for name, value in scope.items())))
+        .order_by(columns.id)
+    )
+    for record in connection.execute(statement).mappings():
+        existing[tuple(_normalized(record[name]) for name in key_columns)].append(record)
+
+    result = KeyedSyncResult()
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    for row in payload:
+        matches = existing.get(tuple(_normalized(row.get(name)) for name in key_columns))
+        if not matches:
+            inserts.append(row)
+            continue
+        record = matches.popleft()
+        if all(_same_value(record[name], row[name]) for name in value_names):
+            result.unchanged += 1
+        else:
+            updates.append({"id": record["id"], **row, **(touch or {})})
+    stale_ids = [record["id"] for matches in existing.values() for record in matches]
+
+    for batch in _batches(stale_ids, batch_size):
+        connection.execute(delete(table).where(columns.id.in_(batch)))
+    if updates:
+        update_names = [name for name in updates[0] if name != "id"]
+        for batch in _batches(updates, batch_size):
+            upsert = build_upsert(
+                connection.dialect.name, table, batch, key_columns=["id"], updates=update_names
+            )
+            if upsert is not None:
+                connection.execute(upsert)
+                continue
+            connection.execute(
+                update(table).where(columns.id == bindparam("_id")),
+                [{"_id": row["id"], **{name: row[name] for name in update_names}} for row in batch],
+            )
+    for batch in _batches(inserts, batch_size):
+        connection.execute(insert(table), batch)
+
+    result.inserted = len(inserts)
+    result.updated = len(updates)
+    result.deleted = len(stale_ids)
+    return result
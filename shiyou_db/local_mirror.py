@@ -0,0 +1,201 @@
+"""
+桌面端参考数据的本地 SQLite 镜像。
+
+文档类别、改造目录、设施档案、油田环境参数等表改动很少，但桌面端每次切换页面都要去
+远端 MySQL 读一遍，现场链路延迟高时每次导航都被往返拖慢。ReferenceMirror 把这些表
+整表复制到本地 SQLite：
+
+- 后台线程每隔 SHIYOU_MIRROR_SYNC_MS（默认 30 秒）读一次各表的远端版本签名，签名变了
+  才重新拉取该表，并在本地一个事务里整表替换；
+- 读取方在镜像就绪时直接查本地库，查询语句与远端相同；
+- 写入仍直接写远端，写完调用 refresh_mirror：涉及的表立即作废、读取改走远端，并唤醒
+  后台线程尽快重新同步，保证本进程读到自己的写入；批量逐条写入也只触发一次拉取。
+
+远端读取不持锁，作废不必等慢链路上的拉取结束；每张表有一个代号，作废或另一次同步
+落库都会让它加一，拉取结束时代号已变就丢弃这次结果，不会把写入前的数据写回本地。
+
+本地库里记着每张表上次同步的签名，重启后不等首次同步即可从本地读取。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, Text, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from .database import build_engine_from_url
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+MIRROR_SYNC_SECONDS = max(1, _env_int("SHIYOU_MIRROR_SYNC_MS", 30000)) / 1000.0
+_INSERT_BATCH_SIZE = 500
+
+_STATE_METADATA = MetaData()
+_MIRROR_STATE = Table(
+    "mirror_sync_state",
+    _STATE_METADATA,
+    Column("name", String(100), primary_key=True),
+    Column("signature", Text, nullable=True),
+    Column("synced_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class MirrorSource:
+    name: str
+    table: Table
+    # 远端引擎；返回 None 表示远端未配置，跳过同步。
+    engine_factory: Callable[[], Any]
+    # 在远端连接上计算版本签名，签名不变时不重新拉取。
+    signature: Callable[[Any], Any]
+
+
+def _signature_text(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str, sort_keys=True)
+
+
+class ReferenceMirror:
+    def __init__(self, path: str | Path, sources: list[MirrorSource]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.engine = build_engine_from_url(f"sqlite:///{self.path.as_posix()}")
+        self.session_factory = sessionmaker(bind=self.engine, autoflush=False, autocommit=False, expire_on_commit=False)
+        self.sources = {source.name: source for source in sources}
+        self.last_errors: dict[str, str] = {}
+        self._lock = RLock()
+        self._generations: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        _MIRROR_STATE.create(self.engine, checkfirst=True)
+        for source in sources:
+            source.table.create(self.engine, checkfirst=True)
+        with self.engine.connect() as conn:
+            self._signatures = {
+                name: signature for name, signature in conn.execute(select(_MIRROR_STATE.c.name, _MIRROR_STATE.c.signature))
+            }
+
+    def ready(self, name: str) -> bool:
+        """该表至少同步过一次，可以从本地读取。"""
+        return name in self._signatures
+
+    def sync(self, *names: str) -> dict[str, bool]:
+        """同步指定的表（默认全部），返回 {表名: 是否重新拉取}；单表失败不影响其他表。"""
+        changed: dict[str, bool] = {}
+        for name in names or tuple(self.sources):
+            source = self.sources[name]
+            try:
+                changed[name] = self._sync_source(source)
+                self.last_errors.pop(name, None)
+            except Exception as exc:
+                self.last_errors[name] = str(exc)
+                changed[name] = False
+        return changed
+
+    def _sync_source(self, source: MirrorSource) -> bool:
+        remote = source.engine_factory()
+        if remote is None:
+            return False
+        with self._lock:
+            generation = self._generations.get(source.name, 0)
+            known = self._signatures.get(source.name)
+        with remote.connect() as conn:
+            signature = _signature_text(source.signature(conn))
+            if known == signature:
+                return False
+            rows = [dict(row) for row in conn.execute(select(source.table)).mappings()]
+        with self._lock:
+            if self._generations.get(source.name, 0) != generation:
+                # 拉取期间被作废或已有更新的同步落库，这次读到的可能是旧数据。
+                return False
+            self._generations[source.name] = generation + 1
+            with self.engine.begin() as local:
+                local.execute(delete(source.table))
+                for start in range(0, len(rows), _INSERT_BATCH_SIZE):
+                    local.execute(insert(source.table), rows[start : start + _INSERT_BATCH_SIZE])
+                local.execute(delete(_MIRROR_STATE).where(_MIRROR_STATE.c.name == source.name))
+                local.execute(
+                    insert(_MIRROR_STATE).values(name=source.name, signature=signature, synced_at=datetime.utcnow())
+                )
+            self._signatures[source.name] = signature
+        return True
+
+    def invalidate(self, name: str) -> None:
+        """丢掉本地副本的就绪状态，读取方改走远端，直到下次同步成功。
+
+        正在拉取的同步（可能读到写入前的数据）在落库前发现代号已变，会丢弃结果。
+        """
+        with self._lock:
+            self._generations[name] = self._generations.get(name, 0) + 1
+            self._signatures.pop(name, None)
+            with self.engine.begin() as local:
+                local.execute(delete(_MIRROR_STATE).where(_MIRROR_STATE.c.name == name))
+
+    def start(self, interval: float = MIRROR_SYNC_SECONDS) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def worker() -> None:
+            while not self._stop.is_set():
+                self.sync()
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=worker, name="reference-mirror-sync", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+
+_ACTIVE_MIRROR: ReferenceMirror | None = None
+_ACTIVE_LOCK = RLock()
+
+
+def set_active_mirror(mirror: ReferenceMirror | None) -> ReferenceMirror | None:
+    global _ACTIVE_MIRROR
+    with _ACTIVE_LOCK:
+        previous, _ACTIVE_MIRROR = _ACTIVE_MIRROR, mirror
+    if previous is not None and previous is not mirror:
+        previous.stop()
+    return mirror
+
+
+def mirror_for(name: str) -> ReferenceMirror | None:
+    """返回可以回答该表读取的镜像；未启用或尚未同步时返回 None，读取方走远端。"""
+    mirror = _ACTIVE_MIRROR
+    if mirror is None or not mirror.ready(name):
+        return None
+    return mirror
+
+
+def refresh_mirror(*names: str) -> None:
+    """写入远端后调用：作废涉及的表，并唤醒后台线程重新同步。"""
+    mirror = _ACTIVE_MIRROR
+    if mirror is None:
+        return
+    wanted = [name for name in names if name in mirror.sources]
+    for name in wanted:
+        mirror.invalidate(name)
+    if wanted:
+        mirror.wake()
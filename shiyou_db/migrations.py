@@ -0,0 +1,115 @@
+"""
+按版本号执行的库表迁移。
+
+各模块用 register_migration 登记自己的建表/加列步骤和版本号，步骤须可重复执行。
+ensure_migrations 在每个进程里对每个引擎只真正检查一次：读 schema_migrations 中
+记录的版本，落后才执行迁移并写回版本号；之后的调用只是一次集合查找，热点的
+读写函数不再为建表检查多跑元数据查询。服务端和桌面端启动时调用
+run_registered_migrations 一次完成全部迁移。
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from threading import RLock
+from typing import Any, Callable
+
+from sqlalchemy import select
+
+from .database import build_upsert
+from .models import SchemaMigration
+
+
+@dataclass(frozen=True)
+class Migration:
+    name: str
+    version: int
+    apply: Callable[[Any], None]
+    # 启动时取迁移目标库的引擎；返回 None 表示该库未配置，跳过。
+    engine_factory: Callable[[], Any] | None = None
+
+
+_MIGRATIONS: dict[str, Migration] = {}
+_MIGRATION_LOCK = RLock()
+# 引擎 -> 已确认为最新的迁移名；弱引用引擎，引擎释放后条目随之消失，不会被复用的 id 误命中。
+_MIGRATED: "weakref.WeakKeyDictionary[Any, set[str]]" = weakref.WeakKeyDictionary()
+
+
+def register_migration(
+    name: str,
+    version: int,
+    apply: Callable[[Any], None],
+    *,
+    engine_factory: Callable[[], Any] | None = None,
+) -> Migration:
+    migration = Migration(name, int(version), apply, engine_factory)
+    with _MIGRATION_LOCK:
+        _MIGRATIONS[name] = migration
+    return migration
+
+
+def _clear_migration_cache_for_tests() -> None:
+    with _MIGRATION_LOCK:
+        _MIGRATED.clear()
+
+
+def _record_version(conn, migration: Migration) -> None:
+    now = datetime.utcnow()
+    row = {"name": migration.name, "version": migration.version, "applied_at": now}
+    statement = build_upsert(
+        conn.dialect.name,
+        SchemaMigration,
+        [row],
+        key_columns=[SchemaMigration.name],
+        updates={"version": migration.version, "applied_at": now},
+    )
+    if statement is None:
+        conn.execute(SchemaMigration.__table__.delete().where(SchemaMigration.name == migration.name))
+        statement = SchemaMigration.__table__.insert().values(**row)
+    conn.execute(statement)
+
+
+def ensure_migrations(engine, *names: str) -> None:
+    """确保 engine 上的指定迁移（默认全部已登记的迁移）已执行到最新版本。"""
+    names = names or tuple(_MIGRATIONS)
+    done = _MIGRATED.get(engine)
+    if done is not None and done.issuperset(names):
+        return
+    with _MIGRATION_LOCK:
+        done = _MIGRATED.setdefault(engine, set())
+        pending = [name for name in names if name not in done]
+        if not pending:
+            return
+        with engine.begin() as conn:
+            SchemaMigration.__table__.create(conn, checkfirst=True)
+            recorded = {
+                name: int(version or 0)
+                for name, version in conn.execute(select(SchemaMigration.name, SchemaMigration.version)).all()
+            }
+        for name in pending:
+            migration = _MIGRATIONS[name]
+            if recorded.get(name, 0) < migration.version:
+                # 迁移失败不记版本也不进缓存，下次调用会重试。
+                with engine.begin() as conn:
+                    migration.apply(conn)
+                    _record_version(conn, migration)
+            done.add(name)
+
+
+def run_registered_migrations() -> dict[str, str]:
+    """对所有带 engine_factory 的迁移执行一次，返回 {迁移名: 错误信息}。"""
+    failures: dict[str, str] = {}
+    with _MIGRATION_LOCK:
+        migrations = list(_MIGRATIONS.values())
+    for migration in migrations:
+        if migration.engine_factory is None:
+            continue
+        try:
+            engine = migration.engine_factory()
+            if engine is not None:
+                ensure_migrations(engine, migration.name)
+        except Exception as exc:
+            failures[migration.name] = str(exc)
+    return failures
@@ -6,6 +6,7 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -16,6 +17,9 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
 
+# SQLite 只有 INTEGER PRIMARY KEY 会自增，本地库和测试库中按 INTEGER 建表。
+BIGINT_ID = BigInteger().with_variant(Integer, "sqlite")
+
 
 class FileType(Base):
     __tablename__ = "file_types"
@@ -35,7 +39,7 @@ class FileType(Base):
 class FileRecord(Base):
     __tablename__ = "file_records"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     original_name: Mapped[str] = mapped_column(String(255), nullable=False)
     stored_name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_ext: Mapped[str | None] = mapped_column(String(20), nullable=True)
@@ -83,11 +87,72 @@ Index(
     FileRecord.is_deleted,
     FileRecord.logical_path,
 )
+Index(
+    "ix_file_records_module_deleted_uploaded",
+    FileRecord.module_code,
+    FileRecord.is_deleted,
+    FileRecord.uploaded_at,
+    FileRecord.updated_at,
+    FileRecord.id,
+)
 Index("ix_file_records_hash", FileRecord.file_hash)
+Index("ix_file_records_storage_rel_path", FileRecord.storage_rel_path)
 Index("ix_file_records_document_code", FileRecord.document_code)
 Index("ix_file_records_recognition", FileRecord.recognition_status)
 
 
+class FileSearchGram(Base):
+    __tablename__ = "file_search_grams"
+
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
+    gram: Mapped[str] = mapped_column(String(3), nullable=False)
+    record_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class SchemaMigration(Base):
+    """各模块库表迁移已执行到的版本号。"""
+
+    __tablename__ = "schema_migrations"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class SearchIndexState(Base):
+    __tablename__ = "search_index_states"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    built_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class FileChangeVersion(Base):
+    """按 (模块, 设施, 类别) 记录文件数据的变更次数，客户端据此判断列表缓存是否过期。"""
+
+    __tablename__ = "file_change_versions"
+
+    module_code: Mapped[str] = mapped_column(String(100), primary_key=True)
+    facility_code: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    category_name: Mapped[str] = mapped_column(String(255), primary_key=True, default="")
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=1)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class CurrentFilePointer(Base):
+    """每个设施每类关键文件（当前 sacinp、最新 seainp 等）当前指向的文件记录。"""
+
+    __tablename__ = "current_file_pointers"
+
+    facility_code: Mapped[str] = mapped_column(String(100), primary_key=True)
+    file_kind: Mapped[str] = mapped_column(String(50), primary_key=True)
+    record_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+Index("ix_file_search_grams_gram_record", FileSearchGram.gram, FileSearchGram.record_id)
+Index("ix_file_search_grams_record", FileSearchGram.record_id)
+
+
 class DocumentCategory(Base):
     __tablename__ = "document_categories"
 
@@ -108,7 +173,7 @@ class DocumentCategory(Base):
 class DocumentRebuildDirectory(Base):
     __tablename__ = "document_rebuild_directories"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     facility_code: Mapped[str] = mapped_column(String(100), nullable=False)
     project_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
     seq_no: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
@@ -160,7 +225,7 @@ class FacilityProfile(Base):
 class InspectionProject(Base):
     __tablename__ = "inspection_projects"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     facility_code: Mapped[str] = mapped_column(String(100), nullable=False)
     project_type: Mapped[str] = mapped_column(String(50), nullable=False)
     project_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -182,7 +247,7 @@ class InspectionProject(Base):
 class InspectionFinding(Base):
     __tablename__ = "inspection_findings"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("inspection_projects.id"), nullable=False)
     item_code: Mapped[str | None] = mapped_column(String(255), nullable=True)
     item_type: Mapped[str | None] = mapped_column(String(50), nullable=True)
@@ -199,7 +264,7 @@ class InspectionFinding(Base):
 class PlatformLoadInformationItem(Base):
     __tablename__ = "platform_load_information_items"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     facility_code: Mapped[str] = mapped_column(String(100), nullable=False)
     rebuild_directory_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     seq_no: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -237,7 +302,7 @@ class PlatformLoadInformationItem(Base):
 class PlatformLoadSummarySnapshot(Base):
     __tablename__ = "platform_load_summary_snapshots"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     snapshot_key: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     snapshot_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     rows_json: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -249,7 +314,7 @@ class PlatformLoadSummarySnapshot(Base):
 class PlatformSummarySnapshot(Base):
     __tablename__ = "platform_summary_snapshots"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     snapshot_key: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     snapshot_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     columns_json: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -259,6 +324,21 @@ class PlatformSummarySnapshot(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class PlatformSummaryMetric(Base):
+    """平台汇总的规范化存储：每个 (来源, 设施, 指标) 一行，来源见 shiyou_db/platform_summary.py。"""
+
+    __tablename__ = "platform_summary_metrics"
+
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
+    source: Mapped[str] = mapped_column(String(120), nullable=False)
+    facility_code: Mapped[str] = mapped_column(String(100), nullable=False, default="")
+    metric: Mapped[str] = mapped_column(String(100), nullable=False)
+    row_no: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    value_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    value_number: Mapped[float | None] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class AuthRole(Base):
     __tablename__ = "auth_roles"
 
@@ -277,7 +357,7 @@ class AuthRole(Base):
 class AuthUser(Base):
     __tablename__ = "auth_users"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     display_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
     employee_no: Mapped[str | None] = mapped_column(String(100), nullable=True)
@@ -302,7 +382,7 @@ class AuthUser(Base):
 class AuthLoginLog(Base):
     __tablename__ = "auth_login_logs"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BIGINT_ID, primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(ForeignKey("auth_users.id"), nullable=True)
     username: Mapped[str] = mapped_column(String(100), nullable=False)
     success: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
@@ -320,6 +400,13 @@ Index("ix_inspection_findings_project_sort", InspectionFinding.project_id, Inspe
 Index("ix_platform_load_information_facility_sort", PlatformLoadInformationItem.facility_code, PlatformLoadInformationItem.sort_order)
 Index("ix_platform_load_summary_snapshots_key", PlatformLoadSummarySnapshot.snapshot_key)
 Index("ix_platform_summary_snapshots_key", PlatformSummarySnapshot.snapshot_key)
+Index("ix_platform_summary_metrics_facility", PlatformSummaryMetric.source, PlatformSummaryMetric.facility_code)
+Index(
+    "ix_platform_summary_metrics_metric",
+    PlatformSummaryMetric.source,
+    PlatformSummaryMetric.metric,
+    PlatformSummaryMetric.value_number,
+)
 Index("ix_auth_users_role", AuthUser.role_code)
 Index("ix_auth_users_active", AuthUser.is_active, AuthUser.is_deleted)
 Index("ix_auth_login_logs_user", AuthLoginLog.user_id)
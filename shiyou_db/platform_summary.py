@@ -0,0 +1,269 @@
+"""
+平台汇总信息的规范化存储。
+
+平台汇总快照（platform_summary_snapshots）是整张表的 JSON 块，汇总信息表、文件管理的
+平台列表只用到其中几个档案字段，却每次都要取出并解码整块快照；汇总信息表还要对每个
+平台单独查一遍载荷信息，再在 Python 里挑最新一行。这里把两类数据拆到
+platform_summary_metrics 中 "每个设施每个指标一行"：
+
+- 保存快照时，按 PROFILE_FIELD_ALIASES 解出的档案字段写入 source = "snapshot:<key>"；
+- 替换某设施的载荷信息时，只重算该设施的载荷指标，写入 source = "platform_load"。
+
+写入都经 sync_keyed_rows 做差异同步，只改变化的行；读取方一次带索引的查询即可取到全部
+平台的字段，数值指标可直接在库里聚合。已有数据由 rebuild_platform_summary_metrics 回填，
+完成后在 search_index_states 记一行；未回填时读取方退回原来的整块读取。
+"""
+
+from __future__ import annotations
+
+import json
+import weakref
+from datetime import datetime
+from threading import RLock
+from typing import Any, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .keyed_sync import KeyedSyncResult, sync_keyed_rows
+from .models import PlatformLoadInformationItem, PlatformSummaryMetric, PlatformSummarySnapshot, SearchIndexState
+
+LOAD_SOURCE = "platform_load"
+METRICS_STATE = "platform_summary_metrics"
+
+PROFILE_FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "facility_code": ("设施编码", "设施编号", "平台编码", "平台编号", "编码"),
+    "facility_name": ("设施名称", "平台名称"),
+    "branch": ("分公司", "所属分公司"),
+    "op_company": ("作业公司", "所属作业单元", "所属作业公司", "作业单元", "作业单位"),
+    "oilfield": ("油气田", "所属油（气）田", "所属油气田"),
+    "facility_type": ("设施类型", "平台类型"),
+    "category": ("分类", "平台分类"),
+    "start_time": ("投产时间", "投产日期", "投产年月"),
+    "design_life": ("设计年限", "设计寿命"),
+}
+
+# 载荷指标取自 "最新" 一行（按 sort_order / seq_no 取最大），与汇总信息表原有口径一致。
+LATEST_LOAD_FIELDS = (
+    "total_weight_mt",
+    "weight_delta_mt",
+    "weight_limit_mt",
+    "center_xyz",
+    "center_radius_m",
+    "safety_op",
+    "safety_extreme",
+)
+OVERALL_ASSESSMENT_COUNT = "overall_assessment_count"
+LOAD_ITEM_COUNT = "item_count"
+_NO_ASSESSMENT = ("", "\\", "/", "否", "0")
+
+_READY_CACHE: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+_READY_LOCK = RLock()
+
+
+def snapshot_source(snapshot_key: str = "latest") -> str:
+    return f"snapshot:{(snapshot_key or 'latest').strip() or 'latest'}"
+
+
+def _to_number(value: Any) -> float | None:
+    text = str(value or "").strip().replace(",", "")
+    if not text or text in ("\\", "/"):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _alias_value(source: dict[str, str], aliases: tuple[str, ...]) -> str:
+    for alias in aliases:
+        value = str(source.get(alias) or "").strip()
+        if value:
+            return value
+    return ""
+
+
+def profiles_from_snapshot_rows(columns: Iterable[Any], rows: Iterable[Any]) -> list[dict[str, Any]]:
+    """把快照的表头和行解成档案字段；各字段都为空的行跳过。"""
+    headers = [str(col or "").strip() for col in columns or []]
+    profiles: list[dict[str, Any]] = []
+    for row in rows or []:
+        values = list(row) if isinstance(row, list) else []
+        source = {headers[index]: str(values[index] or "").strip() for index in range(min(len(headers), len(values)))}
+        profile = {field_name: _alias_value(source, aliases) for field_name, aliases in PROFILE_FIELD_ALIASES.items()}
+        if any(str(value or "").strip() for value in profile.values()):
+            profiles.append(profile)
+    return profiles
+
+
+def load_metrics_from_items(items: list[dict[str, Any]]) -> dict[str, str]:
+    """由某设施的载荷信息行（按 sort_order、id 排好序）计算载荷指标。"""
+    latest = sorted(items, key=lambda row: int(row.get("sort_order") or row.get("seq_no") or 0))[-1] if items else {}
+    metrics = {f"latest_{field}": str(latest.get(field) or "") for field in LATEST_LOAD_FIELDS}
+    metrics[OVERALL_ASSESSMENT_COUNT] = str(
+        sum(1 for row in items if str(row.get("overall_assessment") or "").strip() not in _NO_ASSESSMENT)
+    )
+    metrics[LOAD_ITEM_COUNT] = str(len(items))
+    return metrics
+
+
+def _metric_row(metric: str, value: Any, **fields: Any) -> dict[str, Any]:
+    text = str(value or "")
+    return {**fields, "metric": metric, "value_text": text, "value_number": _to_number(text)}
+
+
+def sync_profile_metrics(connection, snapshot_key: str, columns: list[str], rows: list[list[str]]) -> KeyedSyncResult:
+    """快照保存后同步档案字段；与快照写入共用同一事务。"""
+    metric_rows = [
+        _metric_row(field_name, value, facility_code=profile["facility_code"], row_no=row_no)
+        for row_no, profile in enumerate(profiles_from_snapshot_rows(columns, rows), start=1)
+        for field_name, value in profile.items()
+    ]
+    return sync_keyed_rows(
+        connection,
+        PlatformSummaryMetric.__table__,
+        {"source": snapshot_source(snapshot_key)},
+        metric_rows,
+        key_columns=("facility_code", "metric"),
+        touch={"updated_at": datetime.utcnow()},
+    )
+
+
+def sync_load_metrics(connection, facility_code: str) -> KeyedSyncResult:
+    """按某设施当前的载荷信息重算其载荷指标。"""
+    code = (facility_code or "").strip()
+    items = [
+        dict(row)
+        for row in connection.execute(
+            select(PlatformLoadInformationItem)
+            .where(PlatformLoadInformationItem.facility_code == code)
+            .order_by(PlatformLoadInformationItem.sort_order.asc(), PlatformLoadInformationItem.id.asc())
+        ).mappings()
+    ]
+    metric_rows = [_metric_row(metric, value) for metric, value in load_metrics_from_items(items).items()] if items else []
+    return sync_keyed_rows(
+        connection,
+        PlatformSummaryMetric.__table__,
+        {"source": LOAD_SOURCE, "facility_code": code},
+        metric_rows,
+        key_columns=("metric",),
+        touch={"updated_at": datetime.utcnow()},
+    )
+
+
+def platform_summary_metrics_ready(engine) -> bool:
+    with _READY_LOCK:
+        if _READY_CACHE.get(engine):
+            return True
+    try:
+        with engine.connect() as conn:
+            ready = (
+                conn.execute(select(SearchIndexState.name).where(SearchIndexState.name == METRICS_STATE)).first()
+                is not None
+            )
+    except Exception:
+        return False
+    if ready:
+        with _READY_LOCK:
+            _READY_CACHE[engine] = True
+    return ready
+
+
+def _clear_platform_summary_ready_cache() -> None:
+    with _READY_LOCK:
+        _READY_CACHE.clear()
+
+
+def rebuild_platform_summary_metrics(engine) -> int:
+    """由全部快照和载荷信息回填规范化表，返回处理的快照数与设施数之和。"""
+    with engine.connect() as conn:
+        snapshots = conn.execute(
+            select(PlatformSummarySnapshot.snapshot_key, PlatformSummarySnapshot.columns_json, PlatformSummarySnapshot.rows_json)
+        ).all()
+        facilities = {
+            str(value or "").strip()
+            for (value,) in conn.execute(select(PlatformLoadInformationItem.facility_code).distinct()).all()
+        }
+        facilities |= {
+            str(value or "").strip()
+            for (value,) in conn.execute(
+                select(PlatformSummaryMetric.facility_code).where(PlatformSummaryMetric.source == LOAD_SOURCE).distinct()
+            ).all()
+        }
+    facilities.discard("")
+
+    for snapshot_key, columns_json, rows_json in snapshots:
+        try:
+            columns = json.loads(columns_json or "[]")
+            rows = json.loads(rows_json or "[]")
+        except Exception:
+            columns, rows = [], []
+        with engine.begin() as conn:
+            sync_profile_metrics(conn, snapshot_key, columns, rows)
+    for code in sorted(facilities):
+        with engine.begin() as conn:
+            sync_load_metrics(conn, code)
+
+    with Session(bind=engine) as session:
+        with session.begin():
+            state = session.get(SearchIndexState, METRICS_STATE)
+            if state is None:
+                session.add(SearchIndexState(name=METRICS_STATE, built_at=datetime.utcnow()))
+            else:
+                state.built_at = datetime.utcnow()
+    with _READY_LOCK:
+        _READY_CACHE[engine] = True
+    return len(snapshots) + len(facilities)
+
+
+def load_profiles(connection, snapshot_key: str = "latest") -> list[dict[str, Any]]:
+    """一次查询取出快照中全部平台的档案字段，顺序与快照行一致。"""
+    profiles: dict[int, dict[str, Any]] = {}
+    statement = (
+        select(PlatformSummaryMetric.row_no, PlatformSummaryMetric.metric, PlatformSummaryMetric.value_text)
+        .where(PlatformSummaryMetric.source == snapshot_source(snapshot_key))
+        .order_by(PlatformSummaryMetric.row_no.asc())
+    )
+    for row_no, metric, value in connection.execute(statement).all():
+        profile = profiles.setdefault(row_no, {field_name: "" for field_name in PROFILE_FIELD_ALIASES})
+        if metric in profile:
+            profile[metric] = value or ""
+    return list(profiles.values())
+
+
+def load_facility_metrics(
+    connection,
+    source: str = LOAD_SOURCE,
+    *,
+    facility_codes: Iterable[str] | None = None,
+    metrics: Iterable[str] | None = None,
+) -> dict[str, dict[str, str]]:
+    """返回 {设施编码: {指标: 文本值}}。"""
+    statement = select(
+        PlatformSummaryMetric.facility_code, PlatformSummaryMetric.metric, PlatformSummaryMetric.value_text
+    ).where(PlatformSummaryMetric.source == source)
+    if facility_codes is not None:
+        statement = statement.where(PlatformSummaryMetric.facility_code.in_([str(code).strip() for code in facility_codes]))
+    if metrics is not None:
+        statement = statement.where(PlatformSummaryMetric.metric.in_(list(metrics)))
+    result: dict[str, dict[str, str]] = {}
+    for code, metric, value in connection.execute(statement).all():
+        result.setdefault(code, {})[metric] = value or ""
+    return result
+
+
+def aggregate_metric(connection, metric: str, source: str = LOAD_SOURCE) -> dict[str, Any]:
+    """在库里对某个数值指标做聚合，走 (source, metric, value_number) 索引。"""
+    value = PlatformSummaryMetric.value_number
+    count, total, minimum, maximum = connection.execute(
+        select(func.count(value), func.sum(value), func.min(value), func.max(value)).where(
+            PlatformSummaryMetric.source == source, PlatformSummaryMetric.metric == metric
+        )
+    ).one()
+    return {
+        "count": int(count or 0),
+        "sum": total,
+        "min": minimum,
+        "max": maximum,
+        "avg": (total / count) if count else None,
+    }
@@ -0,0 +1,211 @@
+"""
+SQL 语句耗时统计与 N+1 检测。
+
+database 建引擎时挂上 before/after_cursor_execute 钩子。开启后（环境变量
+SHIYOU_SQL_PROFILE=1 或调用 enable_query_profiling），每条语句的耗时
+都按 "归一化 SQL"（字面量、参数、IN 列表替换成 ?）累计。
+
+query_scope 标出一次接口请求或一次界面操作：作用域内同一形状的语句执行次数达到
+SHIYOU_SQL_N_PLUS_ONE（默认 10）次，退出时记为疑似 N+1 并打印；单条语句超过
+SHIYOU_SQL_SLOW_MS（默认 200ms）记为慢查询。query_hotspots 按累计耗时给出热点列表，
+设置 SHIYOU_SQL_PROFILE_REPORT 时进程退出前把报告写成 JSON 文件。
+未开启时钩子只做一次布尔判断。
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from threading import RLock
+from typing import Any, Iterator
+
+from sqlalchemy import event
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+SLOW_QUERY_MS = _env_int("SHIYOU_SQL_SLOW_MS", 200)
+N_PLUS_ONE_THRESHOLD = _env_int("SHIYOU_SQL_N_PLUS_ONE", 10)
+
+_LITERAL_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+"), "?"),
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*"), "(?)"),
+)
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement: str) -> str:
+    """把语句归一化为形状：同一查询不同参数得到相同结果。"""
+    text = str(statement or "")
+    for pattern, replacement in _LITERAL_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+@dataclass
+class _ShapeStats:
+    shape: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_count: int = 0
+    n_plus_one_scopes: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _Scope:
+    name: str
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+_ENABLED = os.environ.get("SHIYOU_SQL_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+_STATS: dict[str, _ShapeStats] = {}
+_SUSPECTS: list[dict[str, Any]] = []
+_STATS_LOCK = RLock()
+_CURRENT_SCOPE: ContextVar[_Scope | None] = ContextVar("shiyou_query_scope", default=None)
+
+
+def enable_query_profiling(enabled: bool = True) -> None:
+    global _ENABLED
+    _ENABLED = bool(enabled)
+
+
+def query_profiling_enabled() -> bool:
+    return _ENABLED
+
+
+def reset_query_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+        _SUSPECTS.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _ENABLED:
+        conn.info.setdefault("shiyou_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("shiyou_query_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+    # 不统计行数：SELECT 的 cursor.rowcount 在多数驱动上是 -1，结果行要等调用方取完才知道。
+    record_statement(statement, elapsed_ms)
+
+
+def record_statement(statement: str, elapsed_ms: float) -> None:
+    shape = normalize_sql(statement)
+    slow = elapsed_ms >= SLOW_QUERY_MS
+    with _STATS_LOCK:
+        stats = _STATS.get(shape)
+        if stats is None:
+            stats = _STATS[shape] = _ShapeStats(shape)
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        stats.slow_count += int(slow)
+    scope = _CURRENT_SCOPE.get()
+    if scope is not None:
+        scope.counts[shape] = scope.counts.get(shape, 0) + 1
+    if slow:
+        print(f"[sql] slow query {elapsed_ms:.0f}ms ({scope.name if scope else '-'}): {shape[:300]}")
+
+
+def install_query_hooks(engine) -> None:
+    """在引擎上挂计时钩子；重复调用无副作用。"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _close_scope(scope: _Scope) -> None:
+    suspects = {shape: count for shape, count in scope.counts.items() if count >= N_PLUS_ONE_THRESHOLD}
+    if not suspects:
+        return
+    with _STATS_LOCK:
+        for shape, count in suspects.items():
+            stats = _STATS.get(shape)
+            if stats is not None:
+                stats.n_plus_one_scopes[scope.name] = max(stats.n_plus_one_scopes.get(scope.name, 0), count)
+            if len(_SUSPECTS) < 200:
+                _SUSPECTS.append({"scope": scope.name, "shape": shape, "count": count})
+    for shape, count in sorted(suspects.items(), key=lambda item: -item[1]):
+        print(f"[sql] suspected N+1 in {scope.name}: {count}x {shape[:300]}")
+
+
+@contextmanager
+def query_scope(name: str) -> Iterator[None]:
+    """标出一次请求或界面操作，也可用作函数装饰器；嵌套时只有最外层作用域生效。"""
+    if not _ENABLED or _CURRENT_SCOPE.get() is not None:
+        yield
+        return
+    scope = _Scope(str(name or "-"))
+    token = _CURRENT_SCOPE.set(scope)
+    try:
+        yield
+    finally:
+        _CURRENT_SCOPE.reset(token)
+        _close_scope(scope)
+
+
+def query_hotspots(limit: int = 20) -> list[dict[str, Any]]:
+    """按累计耗时排序的语句热点；疑似 N+1 的语句附带出现的作用域及最大次数。"""
+    with _STATS_LOCK:
+        stats = sorted(_STATS.values(), key=lambda item: (item.total_ms, item.count), reverse=True)[: max(int(limit), 0)]
+        return [
+            {
+                "shape": item.shape,
+                "count": item.count,
+                "total_ms": round(item.total_ms, 3),
+                "avg_ms": round(item.total_ms / item.count, 3) if item.count else 0.0,
+                "max_ms": round(item.max_ms, 3),
+                "slow_count": item.slow_count,
+                "n_plus_one_scopes": dict(item.n_plus_one_scopes),
+            }
+            for item in stats
+        ]
+
+
+def suspected_n_plus_one() -> list[dict[str, Any]]:
+    with _STATS_LOCK:
+        return sorted((dict(item) for item in _SUSPECTS), key=lambda item: -item["count"])
+
+
+def query_report(limit: int = 20) -> dict[str, Any]:
+    return {
+        "enabled": _ENABLED,
+        "slow_query_ms": SLOW_QUERY_MS,
+        "n_plus_one_threshold": N_PLUS_ONE_THRESHOLD,
+        "hotspots": query_hotspots(limit),
+        "suspected_n_plus_one": suspected_n_plus_one()[:limit],
+    }
+
+
+def _write_report_at_exit() -> None:
+    target = os.environ.get("SHIYOU_SQL_PROFILE_REPORT", "").strip()
+    if not target or not _ENABLED:
+        return
+    try:
+        Path(target).write_text(json.dumps(query_report(50), ensure_ascii=False, indent=2), encoding="utf-8")
+    except Exception as exc:
+        print(f"[sql] write profile report failed: {exc}")
+
+
+atexit.register(_write_report_at_exit)
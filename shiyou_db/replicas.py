@@ -0,0 +1,231 @@
+"""
+只读副本路由。
+
+db_config.json 的 database_replicas 列出 MySQL 只读副本（缺省项沿用主库的连接信息）。
+文档列表、历史结果、汇总页这类读多写少的查询通过 build_read_session_factory 取会话，
+会话第一次执行语句时由 ReplicaRouter 选定引擎：
+
+- 轮流使用健康的副本；副本延迟每 SHIYOU_REPLICA_CHECK_MS（默认 5 秒）探测一次，
+  复制未运行、探测失败或延迟超过 replica_max_lag_seconds 的副本暂不使用；
+- 本进程在主库提交写入后的 SHIYOU_REPLICA_STICKY_MS（默认 2 秒）内读主库，
+  刚保存的数据不会因复制延迟而在列表里 "消失"；
+- 没有可用副本时回到主库。
+
+只读会话禁止 flush，误用为写入会直接报错而不是写到副本上。未配置副本时
+build_read_session_factory 返回普通的主库会话工厂，行为与以前一致。
+
+客户端缓存要求 "版本号与数据来自同一个库"：pin_read_engine 在其作用域内把只读会话
+固定到同一个引擎，调用方先在该引擎上读变更版本号再读数据，副本延迟时缓存的签名
+也是旧的，不会把旧数据记在新版本号名下。
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import RLock
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from .config import AppSettings
+from .database import build_engine, build_engine_from_url
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+REPLICA_CHECK_SECONDS = max(0, _env_int("SHIYOU_REPLICA_CHECK_MS", 5000)) / 1000.0
+REPLICA_STICKY_SECONDS = max(0, _env_int("SHIYOU_REPLICA_STICKY_MS", 2000)) / 1000.0
+
+_LAG_COLUMNS = ("Seconds_Behind_Source", "Seconds_Behind_Master")
+# MySQL 1227：缺少 REPLICATION CLIENT（或 SUPER）权限，读不到复制状态。
+_PRIVILEGE_ERROR_CODES = ("1227",)
+
+_PINNED_READ_ENGINE: ContextVar[Any] = ContextVar("shiyou_pinned_read_engine", default=None)
+
+
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+
+def replica_lag_seconds(engine) -> float | None:
+    """返回副本落后主库的秒数；复制未运行时返回 None。非 MySQL（测试用的 SQLite）视为无延迟。"""
+    if engine.dialect.name != "mysql":
+        return 0.0
+    errors: list[Exception] = []
+    with engine.connect() as conn:
+        for statement in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+            try:
+                row = conn.execute(text(statement)).mappings().first()
+            except Exception as exc:
+                errors.append(exc)
+                continue
+            if row is None:
+                return None
+            for column in _LAG_COLUMNS:
+                if column in row:
+                    value = row[column]
+                    return None if value is None else float(value)
+    if errors:
+        message = str(errors[-1])
+        if any(code in message for code in _PRIVILEGE_ERROR_CODES) or "privilege" in message.lower():
+            raise PermissionError(f"副本账号缺少 REPLICATION CLIENT 权限，无法探测复制延迟：{message}")
+        raise RuntimeError(f"读取复制状态失败：{message}")
+    return None
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary,
+        replicas: list,
+        *,
+        max_lag_seconds: float = 5,
+        lag_probe: Callable[[Any], float | None] = replica_lag_seconds,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_lag_seconds = float(max_lag_seconds)
+        self._lag_probe = lag_probe
+        self._lock = RLock()
+        self._next = 0
+        self._last_write = float("-inf")
+        # engine -> (探测时间, 延迟或 None, 错误信息)
+        self._health: dict[Any, tuple[float, float | None, str]] = {}
+        if self.replicas and not event.contains(primary, "commit", self._on_primary_commit):
+            event.listen(primary, "commit", self._on_primary_commit)
+
+    def _on_primary_commit(self, conn) -> None:
+        self.note_write()
+
+    def note_write(self) -> None:
+        self._last_write = time.monotonic()
+
+    def _probe(self, engine) -> tuple[float | None, str]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._health.get(engine)
+            if cached is not None and now - cached[0] < REPLICA_CHECK_SECONDS:
+                return cached[1], cached[2]
+        try:
+            lag, error = self._lag_probe(engine), ""
+            if lag is None:
+                error = "replication not running"
+        except Exception as exc:
+            lag, error = None, str(exc)
+        with self._lock:
+            previous = self._health.get(engine)
+            self._health[engine] = (now, lag, error)
+        if error and (previous is None or previous[2] != error):
+            print(f"[replicas] skip replica {engine.url.render_as_string(hide_password=True)}: {error}")
+        return lag, error
+
+    def _usable(self, engine) -> bool:
+        lag, error = self._probe(engine)
+        return not error and lag is not None and lag <= self.max_lag_seconds
+
+    def read_engine(self):
+        if not self.replicas or time.monotonic() - self._last_write < REPLICA_STICKY_SECONDS:
+            return self.primary
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+        for offset in range(len(self.replicas)):
+            engine = self.replicas[(start + offset) % len(self.replicas)]
+            if self._usable(engine):
+                return engine
+        return self.primary
+
+    def status(self) -> list[dict[str, Any]]:
+        with self._lock:
+            health = dict(self._health)
+        result = []
+        for engine in self.replicas:
+            checked_at, lag, error = health.get(engine, (None, None, "not checked"))
+            result.append(
+                {
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "lag_seconds": lag,
+                    "usable": not error and lag is not None and lag <= self.max_lag_seconds,
+                    "error": error,
+                }
+            )
+        return result
+
+
+class ReadOnlySession(Session):
+    """绑定 ReplicaRouter 的会话：首次执行时选定引擎，整个会话内不再切换。"""
+
+    def __init__(self, *args, router: ReplicaRouter, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._router = router
+        self._read_bind = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing:
+            raise ReadOnlySessionError("只读会话不能写入，请使用 session_factory")
+        if self._read_bind is None:
+            self._read_bind = _PINNED_READ_ENGINE.get() or self._router.read_engine()
+        return self._read_bind
+
+
+@contextmanager
+def pin_read_engine(router: ReplicaRouter) -> Iterator[Any]:
+    """作用域内（当前线程/协程）新建的只读会话都使用同一个引擎，返回该引擎。"""
+    engine = _PINNED_READ_ENGINE.get() or router.read_engine()
+    token = _PINNED_READ_ENGINE.set(engine)
+    try:
+        yield engine
+    finally:
+        _PINNED_READ_ENGINE.reset(token)
+
+
+_ROUTERS: dict[tuple, ReplicaRouter] = {}
+_ROUTERS_LOCK = RLock()
+
+
+def _clear_replica_routers_for_tests() -> None:
+    with _ROUTERS_LOCK:
+        _ROUTERS.clear()
+
+
+def get_replica_router(settings: AppSettings) -> ReplicaRouter:
+    """同一主库与副本组合在进程内共用一个路由器（共享健康状态和写入时间）。"""
+    replica_urls = tuple(replica.sqlalchemy_url for replica in settings.replicas)
+    key = (settings.database.sqlalchemy_url, replica_urls, settings.replica_max_lag_seconds)
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+        if router is None:
+            router = _ROUTERS[key] = ReplicaRouter(
+                build_engine(settings),
+                [build_engine_from_url(url, echo=settings.echo_sql, pool=settings.pool) for url in replica_urls],
+                max_lag_seconds=settings.replica_max_lag_seconds,
+            )
+        return router
+
+
+def build_read_session_factory(settings: AppSettings):
+    """只读查询用的会话工厂；未配置副本时就是主库的普通会话工厂。"""
+    if not settings.replicas:
+        return sessionmaker(bind=build_engine(settings), autoflush=False, autocommit=False, expire_on_commit=False)
+    return sessionmaker(
+        class_=ReadOnlySession,
+        router=get_replica_router(settings),
+        autoflush=False,
+        autocommit=False,
+        expire_on_commit=False,
+    )
+
+
+def replica_status() -> list[dict[str, Any]]:
+    with _ROUTERS_LOCK:
+        routers = list(_ROUTERS.values())
+    return [item for router in routers for item in router.status()]
@@ -3,12 +3,28 @@ from __future__ import annotations
 
 import json
 import os
+import time
 from pathlib import Path
+from threading import RLock
+from typing import Any, Callable
 from urllib.parse import quote_plus
 
 from .config import resolve_config_path
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+# 两次检查配置文件是否被修改之间的最短间隔；间隔内的读取不访问文件系统。
+DB_CONFIG_CHECK_SECONDS = max(0, _env_int("SHIYOU_DB_CONFIG_CHECK_MS", 5000)) / 1000.0
+
+ConfigListener = Callable[[dict | None, dict], None]
+
+
 def _project_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
@@ -28,8 +44,7 @@ def get_db_config_path() -> Path:
     return resolve_config_path()
 
 
-def load_db_config() -> dict:
-    cfg_path = get_db_config_path()
+def _read_db_config(cfg_path: Path) -> dict:
     if not cfg_path.exists():
         raise FileNotFoundError(
             f"未找到数据库配置文件: {cfg_path}\n"
@@ -48,6 +63,106 @@ def load_db_config() -> dict:
     return cfg
 
 
+class _RuntimeConfig:
+    """
+    进程内共享的运行时配置。
+
+    首次读取后缓存解析结果和由它派生的值（MySQL URL、存储根目录等）；之后按
+    DB_CONFIG_CHECK_SECONDS 间隔比对文件修改时间，文件变化或调用 reload 时重读，
+    内容变化时通知监听者（例如释放按旧 URL 建立的连接池）。
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._env_path: str | None = None
+        self._path: Path | None = None
+        self._signature: tuple[int, int] | None = None
+        self._config: dict | None = None
+        self._derived: dict[str, Any] = {}
+        self._checked_at = float("-inf")
+        self._listeners: list[ConfigListener] = []
+
+    def get(self) -> dict:
+        env_path = os.environ.get("SHIYOU_DB_CONFIG", "").strip()
+        with self._lock:
+            if (
+                self._config is not None
+                and env_path == self._env_path
+                and time.monotonic() - self._checked_at < DB_CONFIG_CHECK_SECONDS
+            ):
+                return self._config
+            return self._refresh(env_path, force=False)
+
+    def reload(self) -> dict:
+        with self._lock:
+            return self._refresh(os.environ.get("SHIYOU_DB_CONFIG", "").strip(), force=True)
+
+    def derived(self, name: str, factory: Callable[[dict], Any]) -> Any:
+        cfg = self.get()
+        with self._lock:
+            if name in self._derived and cfg is self._config:
+                return self._derived[name]
+        # 计算失败（配置缺项、目录无法创建）不缓存，下次调用重新计算。
+        value = factory(cfg)
+        with self._lock:
+            if cfg is self._config:
+                self._derived[name] = value
+        return value
+
+    def add_listener(self, listener: ConfigListener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def _refresh(self, env_path: str, *, force: bool) -> dict:
+        cfg_path = get_db_config_path()
+        try:
+            stat = cfg_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if not force and self._config is not None and cfg_path == self._path and signature == self._signature:
+            self._env_path = env_path
+            self._checked_at = time.monotonic()
+            return self._config
+
+        cfg = _read_db_config(cfg_path)
+        previous = self._config
+        self._env_path = env_path
+        self._path = cfg_path
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        if previous is not None and cfg == previous:
+            return previous
+
+        self._config = cfg
+        self._derived = {}
+        for listener in list(self._listeners):
+            try:
+                listener(previous, cfg)
+            except Exception as exc:
+                print(f"[runtime_db] config listener failed: {exc}")
+        return cfg
+
+
+_RUNTIME_CONFIG = _RuntimeConfig()
+
+
+def load_db_config() -> dict:
+    """返回缓存的配置；返回值在进程内共享，调用方不要修改。"""
+    return _RUNTIME_CONFIG.get()
+
+
+def reload_db_config() -> dict:
+    """立即重读配置文件；内容有变化时通知监听者。"""
+    return _RUNTIME_CONFIG.reload()
+
+
+def add_db_config_listener(listener: ConfigListener) -> None:
+    """登记配置变化回调 listener(旧配置或 None, 新配置)。"""
+    _RUNTIME_CONFIG.add_listener(listener)
+
+
 def get_mysql_url() -> str:
     """
     返回 SQLAlchemy 使用的 MySQL URL。
@@ -55,7 +170,10 @@ def get_mysql_url() -> str:
     注意：
     用户名和密码要做 URL 编码，否则密码里有 @ : / # 等特殊字符时会连接失败。
     """
-    cfg = load_db_config()
+    return _RUNTIME_CONFIG.derived("mysql_url", _build_mysql_url)
+
+
+def _build_mysql_url(cfg: dict) -> str:
     db = cfg["database"]
 
     host = str(db.get("host") or "127.0.0.1").strip()
@@ -86,7 +204,10 @@ def get_storage_root() -> str:
     程序读取时再拼接：
         D:/shiyou_file_storage + 相对路径
     """
-    cfg = load_db_config()
+    return _RUNTIME_CONFIG.derived("storage_root", _build_storage_root)
+
+
+def _build_storage_root(cfg: dict) -> str:
     root = str(cfg.get("storage_root", "")).strip()
     if not root:
         raise ValueError("db_config.json 中 storage_root 为空")
@@ -97,12 +218,11 @@ def get_storage_root() -> str:
 
 
 def get_storage_root_path() -> Path:
-    return Path(get_storage_root()).resolve()
+    return Path(get_storage_root())
 
 
 def get_echo_sql() -> bool:
-    cfg = load_db_config()
-    return bool(cfg.get("echo_sql", False))
+    return bool(load_db_config().get("echo_sql", False))
 
 
 def get_sacs_analysis_engine_exe() -> str:
@@ -112,7 +232,10 @@ def get_sacs_analysis_engine_exe() -> str:
     例如：
         D:/SACS/AnalysisEngine.exe
     """
-    cfg = load_db_config()
+    return _RUNTIME_CONFIG.derived("sacs_analysis_engine_exe", _build_sacs_analysis_engine_exe)
+
+
+def _build_sacs_analysis_engine_exe(cfg: dict) -> str:
     exe = str(cfg.get("sacs_analysis_engine_exe", "")).strip()
     if not exe:
         raise ValueError("db_config.json 中 sacs_analysis_engine_exe 为空")
@@ -125,4 +248,24 @@ def get_sacs_analysis_engine_exe() -> str:
 
 
 def get_sacs_analysis_engine_path() -> Path:
-    return Path(get_sacs_analysis_engine_exe()).resolve()
\ No newline at end of file
+    return Path(get_sacs_analysis_engine_exe())
+
+
+def _dispose_engines_for_previous_url(previous: dict | None, current: dict) -> None:
+    if previous is None:
+        return
+    try:
+        previous_url = _build_mysql_url(previous)
+    except Exception:
+        return
+    try:
+        current_url = _build_mysql_url(current)
+    except Exception:
+        current_url = ""
+    if previous_url != current_url:
+        from .database import dispose_engines_for_url
+
+        dispose_engines_for_url(previous_url)
+
+
+add_db_config_listener(_dispose_engines_for_previous_url)
@@ -0,0 +1,226 @@
+"""
+文件记录的 n-gram 检索索引。
+
+document_code / document_title / original_name / logical_path 四个字段折叠后按三字符
+切片写入 file_search_grams。包含查询 "%x%" 先用切片表求出同时含有 x 全部切片的
+记录 id，再由原 LIKE 条件精确校验，查询只触及候选记录而不是整表扫描。
+
+MySQL 默认排序规则不区分大小写和重音，LIKE 的命中范围比逐字符相等更宽，切片过滤
+只能放宽、不能漏掉记录：
+1. 入库和查询两侧都做兼容分解、去掉组合附加符和格式字符、casefold；
+2. 查询只用由 ASCII 字符和中日韩统一汉字组成的切片过滤，其余字符只交给 LIKE；
+3. 含其他文字字母或数字（如 ß、æ、希腊文、假名）的记录折叠后未必与 LIKE 一致，
+   额外写入 UNINDEXED_GRAM，任何查询都把它们列为候选。
+
+切片随 FileRecord 的 ORM 增删改自动维护；已有数据由 rebuild_search_index 回填，
+回填完成后在 search_index_states 记一行。没有这行记录（从未回填或回填失败）时
+检索退回纯 LIKE，结果不变，只是慢。
+"""
+
+from __future__ import annotations
+
+import unicodedata
+import weakref
+from datetime import datetime
+from threading import RLock
+
+from sqlalchemy import delete, event, func, inspect, insert, or_, select
+from sqlalchemy.orm import Session
+
+from .models import FileRecord, FileSearchGram, SearchIndexState
+
+GRAM_SIZE = 3
+MAX_QUERY_GRAMS = 8
+SEARCH_FIELDS = ("document_code", "document_title", "original_name", "logical_path")
+# 切片规则变化时换名，旧索引不再被认作就绪，启动时按新规则重建。
+FILE_RECORDS_INDEX = "file_records_v2"
+REBUILD_BATCH_SIZE = 2000
+# 含空白，不会与正常切片重复。
+UNINDEXED_GRAM = " * "
+# 组合附加符（重音）和格式字符（零宽空格等）在 MySQL 排序规则下不影响比较。
+_DROPPED_CATEGORIES = frozenset({"Mn", "Mc", "Me", "Cf"})
+
+_READY_CACHE: "weakref.WeakKeyDictionary[object, bool]" = weakref.WeakKeyDictionary()
+_READY_LOCK = RLock()
+
+
+def _is_cjk_ideograph(ch: str) -> bool:
+    return "\u4e00" <= ch <= "\u9fff" or "\u3400" <= ch <= "\u4dbf"
+
+
+def _decompose(value: object) -> str:
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    return "".join(ch for ch in text if unicodedata.category(ch) not in _DROPPED_CATEGORIES)
+
+
+def _fold(value: object) -> str:
+    return _decompose(value).casefold()
+
+
+def _folds_exactly(value: object) -> bool:
+    """折叠后的切片能否覆盖 LIKE 的全部命中：只含 ASCII、汉字和非字母数字字符。"""
+    return all(
+        ch.isascii() or _is_cjk_ideograph(ch) or unicodedata.category(ch)[0] not in "LN"
+        for ch in _decompose(value)
+    )
+
+
+def _text_grams(value: object) -> set[str]:
+    text = _fold(value)
+    grams = set()
+    for start in range(len(text) - GRAM_SIZE + 1):
+        gram = text[start : start + GRAM_SIZE]
+        # 含空白的切片不入库：MySQL 默认排序规则比较时忽略尾部空格。
+        if not any(ch.isspace() for ch in gram):
+            grams.add(gram)
+    return grams
+
+
+def record_grams(values) -> set[str]:
+    grams: set[str] = set()
+    for value in values:
+        grams |= _text_grams(value)
+        if not _folds_exactly(value):
+            grams.add(UNINDEXED_GRAM)
+    return grams
+
+
+def query_grams(query: str | None) -> list[str]:
+    """返回用于过滤的查询切片；查询短于三个字符时为空，调用方只用 LIKE。"""
+    grams = sorted(
+        gram for gram in _text_grams(query) if all(ch.isascii() or _is_cjk_ideograph(ch) for ch in gram)
+    )
+    if len(grams) <= MAX_QUERY_GRAMS:
+        return grams
+    step = len(grams) / MAX_QUERY_GRAMS
+    return [grams[int(index * step)] for index in range(MAX_QUERY_GRAMS)]
+
+
+def search_candidate_condition(column, query: str | None):
+    """返回 column IN (含全部查询切片的记录 id) 条件，无可用切片时返回 None。"""
+    grams = query_grams(query)
+    if not grams:
+        return None
+    candidates = (
+        select(FileSearchGram.record_id)
+        .where(FileSearchGram.gram.in_(grams))
+        .group_by(FileSearchGram.record_id)
+        .having(func.count(func.distinct(FileSearchGram.gram)) == len(grams))
+    )
+    unindexed = select(FileSearchGram.record_id).where(FileSearchGram.gram == UNINDEXED_GRAM)
+    return or_(column.in_(candidates), column.in_(unindexed))
+
+
+def search_candidate_sql(query: str | None, params: dict, *, id_column: str = "id") -> str | None:
+    """search_candidate_condition 的原生 SQL 版本，切片参数写入 params。"""
+    grams = query_grams(query)
+    if not grams:
+        return None
+    names = []
+    for index, gram in enumerate(grams):
+        name = f"search_gram_{index}"
+        params[name] = gram
+        names.append(f":{name}")
+    params["search_gram_unindexed"] = UNINDEXED_GRAM
+    return (
+        f"({id_column} IN (SELECT record_id FROM file_search_grams "
+        f"WHERE gram IN ({', '.join(names)}) GROUP BY record_id "
+        f"HAVING COUNT(DISTINCT gram) = {len(grams)}) "
+        f"OR {id_column} IN (SELECT record_id FROM file_search_grams WHERE gram = :search_gram_unindexed))"
+    )
+
+
+def search_index_ready(engine) -> bool:
+    with _READY_LOCK:
+        if _READY_CACHE.get(engine):
+            return True
+    try:
+        with engine.connect() as conn:
+            ready = (
+                conn.execute(
+                    select(SearchIndexState.name).where(SearchIndexState.name == FILE_RECORDS_INDEX)
+                ).first()
+                is not None
+            )
+    except Exception:
+        # 表不存在或没有权限时按未就绪处理，检索走 LIKE。
+        return False
+    # 只缓存就绪状态：其他进程回填完成后，本进程下一次检索即可改走索引。
+    if ready:
+        with _READY_LOCK:
+            _READY_CACHE[engine] = True
+    return ready
+
+
+def _clear_search_index_ready_cache() -> None:
+    with _READY_LOCK:
+        _READY_CACHE.clear()
+
+
+def _gram_rows(record_id: int, values) -> list[dict]:
+    return [{"gram": gram, "record_id": record_id} for gram in record_grams(values)]
+
+
+def rebuild_search_index(engine, *, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """按 id 分批重建全部文件记录的切片，返回处理的记录数。"""
+    processed = 0
+    last_id = 0
+    columns = [getattr(FileRecord, field) for field in SEARCH_FIELDS]
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(FileRecord.id, *columns)
+                .where(FileRecord.id > last_id)
+                .order_by(FileRecord.id.asc())
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            first_id = rows[0][0]
+            last_id = rows[-1][0]
+            conn.execute(
+                delete(FileSearchGram)
+                .where(FileSearchGram.record_id >= first_id)
+                .where(FileSearchGram.record_id <= last_id)
+            )
+            gram_rows = [item for row in rows for item in _gram_rows(row[0], row[1:])]
+            if gram_rows:
+                conn.execute(insert(FileSearchGram), gram_rows)
+        processed += len(rows)
+
+    with Session(bind=engine) as session:
+        with session.begin():
+            state = session.get(SearchIndexState, FILE_RECORDS_INDEX)
+            if state is None:
+                session.add(SearchIndexState(name=FILE_RECORDS_INDEX, built_at=datetime.utcnow()))
+            else:
+                state.built_at = datetime.utcnow()
+    with _READY_LOCK:
+        _READY_CACHE[engine] = True
+    return processed
+
+
+def _replace_record_grams(connection, target: FileRecord) -> None:
+    connection.execute(delete(FileSearchGram).where(FileSearchGram.record_id == target.id))
+    gram_rows = _gram_rows(target.id, (getattr(target, field) for field in SEARCH_FIELDS))
+    if gram_rows:
+        connection.execute(insert(FileSearchGram), gram_rows)
+
+
+@event.listens_for(FileRecord, "after_insert")
+def _index_inserted_record(_mapper, connection, target: FileRecord) -> None:
+    gram_rows = _gram_rows(target.id, (getattr(target, field) for field in SEARCH_FIELDS))
+    if gram_rows:
+        connection.execute(insert(FileSearchGram), gram_rows)
+
+
+@event.listens_for(FileRecord, "after_update")
+def _index_updated_record(_mapper, connection, target: FileRecord) -> None:
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in SEARCH_FIELDS):
+        _replace_record_grams(connection, target)
+
+
+@event.listens_for(FileRecord, "after_delete")
+def _index_deleted_record(_mapper, connection, target: FileRecord) -> None:
+    connection.execute(delete(FileSearchGram).where(FileSearchGram.record_id == target.id))
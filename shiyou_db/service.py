@@ -5,18 +5,39 @@ import json
 import os
 import re
 import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable
 
-from sqlalchemy import func, inspect, or_, select
+from sqlalchemy import and_, func, inspect, or_, select
 from sqlalchemy.orm import joinedload, sessionmaker
 
+from .change_versions import PLATFORM_LOAD_SCOPE, bump_change_versions, load_change_versions
 from .config import AppSettings, load_settings
+from .current_files import current_file_pointers_ready, rebuild_current_file_pointers
 from .database import Base, build_engine
 from .document_code_parser import parse_document_code_from_name
+from .keyed_sync import sync_keyed_rows
+from .replicas import build_read_session_factory, pin_read_engine
+from .platform_summary import (
+    LOAD_SOURCE,
+    aggregate_metric,
+    load_facility_metrics,
+    load_profiles,
+    platform_summary_metrics_ready,
+    rebuild_platform_summary_metrics,
+    sync_load_metrics,
+    sync_profile_metrics,
+)
+from .search_index import rebuild_search_index, search_candidate_condition, search_index_ready
 from .storage_share import ensure_storage_share_connected
 from .models import (
     AuthRole,
+    CurrentFilePointer,
     DocumentCategory,
     DocumentRebuildDirectory,
     FacilityProfile,
@@ -79,6 +100,23 @@ DEFAULT_DOCUMENT_CATEGORIES = [
 _UNSET = object()
 FILE_MANAGEMENT_MODULES = {"model_files", "doc_man"}
 ROW_SEGMENT_RE = re.compile(r"^row_\d+$", re.IGNORECASE)
+COPY_BUFFER_BYTES = 8 * 1024 * 1024
+DEFAULT_UPLOAD_WORKERS = 4
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+class _SharedBlobGone(Exception):
+    """入库事务中发现暂存时复用的存储文件已被回收；回滚后在事务外重新复制。"""
+
+    def __init__(self, entries: list[dict]):
+        super().__init__("shared stored file was removed")
+        self.entries = entries
 
 
 class FileMetadataService:
@@ -91,7 +129,11 @@ class FileMetadataService:
             autocommit=False,
             expire_on_commit=False,
         )
+        self.read_session_factory = build_read_session_factory(settings)
         self._ensure_schema()
+        self._ensure_search_index()
+        self._ensure_current_file_pointers()
+        self._ensure_platform_summary_metrics()
         self.storage_root = Path(settings.storage_root)
         ok, message = ensure_storage_share_connected(settings)
         if not ok:
@@ -101,6 +143,37 @@ class FileMetadataService:
     def from_config(cls, config_path: str | None = None) -> "FileMetadataService":
         return cls(load_settings(config_path))
 
+    @classmethod
+    def from_engine(
+        cls,
+        engine,
+        session_factory=None,
+        storage_root: str | Path | None = None,
+        *,
+        read_session_factory=None,
+    ) -> "FileMetadataService":
+        """绑定到已有引擎（如本地镜像库），不建表、不连接共享存储。
+
+        未指定 read_session_factory 时只读查询也走 session_factory。
+        """
+        service = cls.__new__(cls)
+        service.settings = None
+        service.engine = engine
+        service.session_factory = session_factory or sessionmaker(
+            bind=engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+        service.read_session_factory = read_session_factory or service.session_factory
+        service.storage_root = Path(storage_root) if storage_root is not None else Path(".")
+        return service
+
+    def _read_session(self):
+        """列表、统计类只读查询的会话：配置了只读副本时路由到副本。"""
+        factory = getattr(self, "read_session_factory", None) or self.session_factory
+        return factory()
+
     def _ensure_schema(self) -> None:
         Base.metadata.create_all(self.engine)
         inspector = inspect(self.engine)
@@ -140,6 +213,14 @@ class FileMetadataService:
                     "CREATE INDEX ix_file_records_module_facility_deleted_path "
                     "ON file_records (module_code, facility_code, is_deleted, logical_path)"
                 )
+            if "ix_file_records_storage_rel_path" not in file_indexes:
+                # 引用计数、共享复核按存储路径加锁读取，没有索引时会锁住整表扫描过的行。
+                statements.append("CREATE INDEX ix_file_records_storage_rel_path ON file_records (storage_rel_path)")
+            if "ix_file_records_module_deleted_uploaded" not in file_indexes:
+                statements.append(
+                    "CREATE INDEX ix_file_records_module_deleted_uploaded "
+                    "ON file_records (module_code, is_deleted, uploaded_at, updated_at, id)"
+                )
 
         if inspector.has_table("document_rebuild_directories"):
             rebuild_columns = {
@@ -201,6 +282,73 @@ class FileMetadataService:
                 for sql in load_statements:
                     conn.exec_driver_sql(sql)
 
+    def _ensure_search_index(self) -> None:
+        if search_index_ready(self.engine):
+            return
+        try:
+            rebuild_search_index(self.engine)
+        except Exception as exc:
+            print(f"[FileMetadataService] search index rebuild failed, falling back to LIKE search: {exc}")
+
+    def rebuild_search_index(self) -> int:
+        return rebuild_search_index(self.engine)
+
+    def _ensure_current_file_pointers(self) -> None:
+        if current_file_pointers_ready(self.engine):
+            return
+        try:
+            rebuild_current_file_pointers(self.engine)
+        except Exception as exc:
+            print(f"[FileMetadataService] current file pointer rebuild failed, falling back to scans: {exc}")
+
+    def rebuild_current_file_pointers(self) -> int:
+        return rebuild_current_file_pointers(self.engine)
+
+    def _ensure_platform_summary_metrics(self) -> None:
+        if platform_summary_metrics_ready(self.engine):
+            return
+        try:
+            rebuild_platform_summary_metrics(self.engine)
+        except Exception as exc:
+            print(f"[FileMetadataService] platform summary rebuild failed, falling back to snapshots: {exc}")
+
+    def rebuild_platform_summary_metrics(self) -> int:
+        return rebuild_platform_summary_metrics(self.engine)
+
+    def get_current_file_record(self, facility_code: str, file_kind: str) -> dict | None:
+        """按 (设施, 文件种类) 指针取当前文件记录，如 current_sacinp / latest_seainp。"""
+        code = (facility_code or "").strip()
+        if not code:
+            return None
+        with self.session_factory() as session:
+            row = session.execute(
+                select(FileRecord)
+                .join(CurrentFilePointer, CurrentFilePointer.record_id == FileRecord.id)
+                .where(CurrentFilePointer.facility_code == code)
+                .where(CurrentFilePointer.file_kind == file_kind)
+                .options(joinedload(FileRecord.file_type))
+            ).scalar_one_or_none()
+            return self._record_to_dict(row) if row is not None else None
+
+    def file_change_versions(self) -> dict[tuple[str, str, str], int]:
+        """返回各 (模块, 设施, 类别) 的变更版本号，客户端据此判断缓存的列表是否过期。"""
+        return load_change_versions(self.engine)
+
+    @contextmanager
+    def read_change_versions(self):
+        """缓存只读查询结果时使用：作用域内的只读查询与 yield 出的版本号来自同一个库。
+
+        副本落后时版本号也是旧的，调用方把结果记在这份版本号名下，下次按主库版本号
+        校验时自然过期，不会把副本上的旧数据当成新版本缓存起来。未配置副本时只读查询
+        就在主库上，yield None，调用方沿用已从主库取得的版本号。
+        """
+        router = getattr(getattr(self, "read_session_factory", None), "kw", {}).get("router")
+        if router is None:
+            yield None
+            return
+        with pin_read_engine(router) as engine:
+            yield load_change_versions(engine)
+
     def seed_file_types(self) -> None:
         with self.session_factory() as session:
             existing = {item.code: item for item in session.execute(select(FileType)).scalars().all()}
@@ -458,86 +606,382 @@ class FileMetadataService:
         work_condition: str | None = None,
         remark: str | None = None,
         source_modified_at: datetime | None = None,
+    ) -> dict:
+        prepared = self._prepare_upload(
+            local_path,
+            file_type_code=file_type_code,
+            module_code=module_code,
+            logical_path=logical_path,
+            facility_code=facility_code,
+            category_name=category_name,
+            work_condition=work_condition,
+            remark=remark,
+            source_modified_at=source_modified_at,
+        )
+        with self.session_factory() as session:
+            file_type_id = session.execute(
+                select(FileType.id).where(FileType.code == file_type_code)
+            ).scalar_one_or_none()
+        if file_type_id is None:
+            raise ValueError(f"Unknown file type code: {file_type_code}")
+
+        # 计算 sha256、复制文件都在事务之外完成；入库事务只复核引用并插入一行，
+        # 不会在共享盘读写期间占着行锁。
+        blob, source_hash = self._find_shared_blob(
+            prepared["source"],
+            module_code=module_code,
+            logical_path=prepared["logical_path"],
+            facility_code=prepared["facility_code"],
+            file_size=prepared["size"],
+        )
+        location = self._blob_location(blob, source_hash) if blob is not None else None
+        stored: dict | None = None
+        try:
+            if location is None:
+                stored = location = self._store_prepared(prepared)
+            while True:
+                with self.session_factory() as session:
+                    with session.begin():
+                        if stored is None and not self._shared_location_alive(session, location, []):
+                            record = None
+                        else:
+                            record = self._new_file_record(prepared, file_type_id, location)
+                            session.add(record)
+                    if record is not None:
+                        session.refresh(record)
+                        return self._record_to_dict(record)
+                # 复用的存储文件在查找之后已被回收：事务外重新复制后再入库。
+                stored = location = self._store_prepared(prepared)
+        except Exception:
+            if stored is not None:
+                self._discard_stored(stored)
+            raise
+
+    def upload_files(
+        self,
+        items: list[dict],
+        *,
+        max_workers: int | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+        on_progress: Callable[[dict], None] | None = None,
+    ) -> dict:
+        """批量上传：并发复制并计算 sha256，再在一个事务内删除被替换记录、插入全部新记录。
+
+        items 每项含 local_path 和 upload_file 的关键字参数，可另带 delete_record_ids
+        （本次替换掉的旧记录）。并发数默认取 SHIYOU_UPLOAD_WORKERS（默认 4）。
+        is_cancelled 返回真后尚未开始的文件不再上传，已复制完成的照常入库。
+        on_progress 每完成一个文件收到 {"done", "total", "bytes", "seconds"}。
+
+        返回 {"results": [{"index", "record"}], "errors": [{"index", "error"}],
+        "canceled", "total", "bytes", "seconds"}；单个文件失败不影响其他文件，
+        入库事务失败时已复制的文件全部清理并抛出异常。
+        """
+        started = time.perf_counter()
+        total = len(items)
+        if max_workers is None:
+            max_workers = _env_int("SHIYOU_UPLOAD_WORKERS", DEFAULT_UPLOAD_WORKERS)
+        max_workers = max(1, min(int(max_workers), total or 1))
+        with self.session_factory() as session:
+            codes = {str(item.get("file_type_code") or "") for item in items}
+            file_type_ids = {
+                row.code: row.id
+                for row in session.execute(select(FileType).where(FileType.code.in_(codes))).scalars().all()
+            }
+
+        staged: list[dict] = []
+        errors: list[dict] = []
+        progress = {"done": 0, "total": total, "bytes": 0, "seconds": 0.0}
+        canceled = False
+
+        def stage(index: int, item: dict) -> dict | None:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            file_type_code = str(item.get("file_type_code") or "")
+            if file_type_code not in file_type_ids:
+                raise ValueError(f"Unknown file type code: {file_type_code}")
+            prepared = self._prepare_upload(
+                str(item.get("local_path") or ""),
+                file_type_code=file_type_code,
+                module_code=str(item.get("module_code") or ""),
+                logical_path=item.get("logical_path"),
+                facility_code=item.get("facility_code"),
+                category_name=item.get("category_name"),
+                work_condition=item.get("work_condition"),
+                remark=item.get("remark"),
+                source_modified_at=item.get("source_modified_at"),
+            )
+            blob, source_hash = self._find_shared_blob(prepared["source"], file_size=prepared["size"], **self._target_kwargs(prepared))
+            entry = {
+                "index": index,
+                "prepared": prepared,
+                "file_type_id": file_type_ids[file_type_code],
+                "location": self._blob_location(blob, source_hash) if blob is not None else None,
+                "stored": None,
+                "pending": None,
+                "delete_record_ids": [int(value) for value in (item.get("delete_record_ids") or [])],
+            }
+            if entry["location"] is None:
+                self._stage_entry_file(entry)
+            return entry
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-upload") as pool:
+            futures = {pool.submit(stage, index, item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as exc:
+                    errors.append({"index": index, "error": str(exc)})
+                else:
+                    if entry is None:
+                        canceled = True
+                        continue
+                    staged.append(entry)
+                    progress["bytes"] += entry["prepared"]["size"]
+                progress["done"] += 1
+                progress["seconds"] = time.perf_counter() - started
+                if on_progress is not None:
+                    on_progress(dict(progress))
+
+        staged.sort(key=lambda entry: entry["index"])
+        try:
+            records = self._commit_staged_uploads(staged)
+        except Exception:
+            for entry in staged:
+                if entry["stored"] is not None:
+                    self._discard_stored(entry["stored"])
+                if entry["pending"] is not None:
+                    entry["pending"]["temp_path"].unlink(missing_ok=True)
+            raise
+        errors.sort(key=lambda error: error["index"])
+        return {
+            "results": [{"index": entry["index"], "record": record} for entry, record in zip(staged, records)],
+            "errors": errors,
+            "canceled": canceled,
+            "total": total,
+            "bytes": progress["bytes"],
+            "seconds": time.perf_counter() - started,
+        }
+
+    def _stage_entry_file(self, entry: dict) -> None:
+        """在事务外复制一条待入库的上传文件。
+
+        替换旧记录的文件先留在临时文件里：旧记录删除、其存储文件释放后才能沿用原文件名，
+        否则独占占名会落到 "sacinp (1).JKnew"，破坏按原名查找的磁盘回退逻辑。
+        """
+        pending = self._stage_file(entry["prepared"]["source"], **self._target_kwargs(entry["prepared"]))
+        if entry["delete_record_ids"]:
+            entry["pending"] = pending
+            entry["location"] = None
+        else:
+            entry["stored"] = entry["location"] = self._place_staged(pending)
+
+    def _commit_staged_uploads(self, staged: list[dict]) -> list[dict]:
+        if not staged:
+            return []
+        while True:
+            try:
+                return self._commit_staged_uploads_once(staged)
+            except _SharedBlobGone as gone:
+                # 复用的存储文件在暂存之后已被回收：事务已回滚，在事务外重新复制后重试。
+                for entry in gone.entries:
+                    self._stage_entry_file(entry)
+
+    def _commit_staged_uploads_once(self, staged: list[dict]) -> list[dict]:
+        unlink_paths: list[Path] = []
+        placements: list[tuple[dict, Path]] = []
+        with self.session_factory() as session:
+            with session.begin():
+                delete_ids = sorted({record_id for entry in staged for record_id in entry["delete_record_ids"]})
+                superseded = []
+                if delete_ids:
+                    superseded = (
+                        session.execute(
+                            select(FileRecord).where(FileRecord.id.in_(delete_ids)).with_for_update()
+                        )
+                        .scalars()
+                        .all()
+                    )
+                released = [(row.storage_rel_path, self._resolve_row_storage_path(row)) for row in superseded]
+                gone = [
+                    entry
+                    for entry in staged
+                    if entry["stored"] is None
+                    and entry["pending"] is None
+                    and not self._shared_location_alive(session, entry["location"], released)
+                ]
+                if gone:
+                    raise _SharedBlobGone(gone)
+                for row in superseded:
+                    session.delete(row)
+                session.flush()
+
+                # 被替换记录释放、且不再被其他记录（含本批复用）引用的存储文件。
+                reused = {entry["location"]["relative_path"] for entry in staged if entry["location"] is not None}
+                freed: dict[str, tuple[str, Path]] = {}
+                for storage_rel_path, target_path in released:
+                    if storage_rel_path in reused:
+                        continue
+                    if storage_rel_path and session.execute(
+                        select(func.count(FileRecord.id)).where(FileRecord.storage_rel_path == storage_rel_path)
+                    ).scalar_one():
+                        continue
+                    freed[self._path_key(target_path)] = (storage_rel_path, target_path)
+
+                records = []
+                for entry in staged:
+                    pending = entry["pending"]
+                    if pending is not None:
+                        reusable = freed.pop(self._path_key(self._preferred_stored_path(pending)), None)
+                        if reusable is None:
+                            entry["stored"] = entry["location"] = self._place_staged(pending)
+                            entry["pending"] = None
+                        else:
+                            # 沿用旧文件的路径，提交后再用临时文件原子覆盖。
+                            storage_rel_path, target = reusable
+                            entry["location"] = self._stored_location(target, pending["sha256"], storage_rel_path)
+                            placements.append((entry, target))
+                    record = self._new_file_record(entry["prepared"], entry["file_type_id"], entry["location"])
+                    session.add(record)
+                    records.append(record)
+                session.flush()
+                unlink_paths = [target_path for _rel, target_path in freed.values()]
+            results = []
+            for record in records:
+                session.refresh(record)
+                results.append(self._record_to_dict(record))
+
+        for entry, target in placements:
+            pending = entry.pop("pending")
+            entry["pending"] = None
+            try:
+                os.replace(pending["temp_path"], target)
+            except Exception as exc:
+                pending["temp_path"].unlink(missing_ok=True)
+                print(f"[FileMetadataService] replace stored file failed: {target}: {exc}")
+        for target_path in unlink_paths:
+            try:
+                target_path.unlink(missing_ok=True)
+            except Exception:
+                pass
+            self._cleanup_empty_parents(target_path.parent)
+        return results
+
+    def _shared_location_alive(self, session, location: dict, released: list[tuple[str | None, Path]]) -> bool:
+        storage_rel_path = location["relative_path"]
+        referenced = session.execute(
+            select(FileRecord.id).where(FileRecord.storage_rel_path == storage_rel_path).with_for_update()
+        ).first()
+        if referenced is None and storage_rel_path not in {rel for rel, _path in released}:
+            return False
+        return Path(location["absolute_path"]).is_file()
+
+    def _prepare_upload(
+        self,
+        local_path: str,
+        *,
+        file_type_code: str,
+        module_code: str,
+        logical_path: str | None,
+        facility_code: str | None,
+        category_name: str | None,
+        work_condition: str | None,
+        remark: str | None,
+        source_modified_at: datetime | None,
     ) -> dict:
         source = Path(local_path).expanduser().resolve()
         if not source.exists() or not source.is_file():
             raise FileNotFoundError(f"Local file not found: {source}")
 
-        normalized_facility = (facility_code or "").strip() or None
-        normalized_logical = self._normalize_logical_path(logical_path)
         normalized_category = (category_name or "").strip() or None
-        normalized_work_condition = (work_condition or "").strip() or None
-        stored = self._store_file(
-            source,
-            module_code=module_code,
-            logical_path=normalized_logical,
-            facility_code=normalized_facility,
-            category_name=normalized_category,
-        )
+        source_stat = source.stat()
         if source_modified_at is None:
-            source_modified_at = datetime.fromtimestamp(source.stat().st_mtime)
+            source_modified_at = datetime.fromtimestamp(source_stat.st_mtime)
         parsed_meta = parse_document_code_from_name(source.name)
         if normalized_category is None and parsed_meta.get("file_class_name"):
             normalized_category = str(parsed_meta.get("file_class_name") or "").strip() or None
         if normalized_category is None and module_code == "doc_man":
             normalized_category = "未分类/其他"
+        return {
+            "source": source,
+            "size": source_stat.st_size,
+            "file_type_code": file_type_code,
+            "module_code": module_code,
+            "logical_path": self._normalize_logical_path(logical_path),
+            "facility_code": (facility_code or "").strip() or None,
+            "category_name": normalized_category,
+            "work_condition": (work_condition or "").strip() or None,
+            "remark": (remark or "").strip() or None,
+            "source_modified_at": source_modified_at,
+            "parsed_meta": parsed_meta,
+        }
+
+    def _store_prepared(self, prepared: dict) -> dict:
+        return self._store_file(prepared["source"], category_name=prepared["category_name"], **self._target_kwargs(prepared))
+
+    @staticmethod
+    def _target_kwargs(prepared: dict) -> dict:
+        return {
+            "module_code": prepared["module_code"],
+            "logical_path": prepared["logical_path"],
+            "facility_code": prepared["facility_code"],
+        }
 
+    def _blob_location(self, blob: FileRecord, file_hash: str | None) -> dict:
+        return {
+            "stored_name": blob.stored_name,
+            "absolute_path": str(self._resolve_row_storage_path(blob)),
+            "relative_path": blob.storage_rel_path,
+            "sha256": file_hash,
+        }
+
+    def _discard_stored(self, stored: dict) -> None:
+        stored_path = Path(stored["absolute_path"])
         try:
-            with self.session_factory() as session:
-                with session.begin():
-                    file_type = session.execute(
-                        select(FileType).where(FileType.code == file_type_code)
-                    ).scalar_one_or_none()
-                    if file_type is None:
-                        raise ValueError(f"Unknown file type code: {file_type_code}")
-
-                    record = FileRecord(
-                        original_name=source.name,
-                        stored_name=stored["stored_name"],
-                        file_ext=source.suffix.lower().lstrip("."),
-                        file_type_id=file_type.id,
-                        module_code=module_code,
-                        logical_path=normalized_logical,
-                        facility_code=normalized_facility,
-                        storage_path=stored["absolute_path"],
-                        storage_rel_path=stored["relative_path"],
-                        file_size=stored["size"],
-                        file_hash=stored["sha256"],
-                        source_modified_at=source_modified_at,
-                        category_name=normalized_category,
-                        work_condition=normalized_work_condition,
-                        remark=(remark or "").strip() or None,
-                        document_code=(parsed_meta.get("document_code") or None),
-                        document_title=(parsed_meta.get("document_title") or None),
-                        design_stage_code=(parsed_meta.get("design_stage_code") or None),
-                        design_stage_name=(parsed_meta.get("design_stage_name") or None),
-                        discipline_code=(parsed_meta.get("discipline_code") or None),
-                        discipline_name=(parsed_meta.get("discipline_name") or None),
-                        file_class_code=(parsed_meta.get("file_class_code") or None),
-                        file_class_name=(parsed_meta.get("file_class_name") or None),
-                        asset_unit_code=(parsed_meta.get("asset_unit_code") or None),
-                        asset_unit_name=(parsed_meta.get("asset_unit_name") or None),
-                        module_unit_code=(parsed_meta.get("module_unit_code") or None),
-                        module_unit_name=(parsed_meta.get("module_unit_name") or None),
-                        drawing_no=(parsed_meta.get("drawing_no") or None),
-                        sub_sequence=(parsed_meta.get("sub_sequence") or None),
-                        recognition_status=(parsed_meta.get("recognition_status") or None),
-                        recognition_message=(parsed_meta.get("recognition_message") or None),
-                        is_deleted=False,
-                    )
-                    session.add(record)
-                session.refresh(record)
-                session.refresh(file_type)
-                return self._record_to_dict(record)
+            if stored_path.exists():
+                stored_path.unlink()
+                self._cleanup_empty_parents(stored_path.parent)
         except Exception:
-            stored_path = Path(stored["absolute_path"])
-            try:
-                if stored_path.exists():
-                    stored_path.unlink()
-                    self._cleanup_empty_parents(stored_path.parent)
-            except Exception:
-                pass
-            raise
+            pass
+
+    @staticmethod
+    def _new_file_record(prepared: dict, file_type_id: int, location: dict) -> FileRecord:
+        source = prepared["source"]
+        parsed_meta = prepared["parsed_meta"]
+        return FileRecord(
+            original_name=source.name,
+            stored_name=location["stored_name"],
+            file_ext=source.suffix.lower().lstrip("."),
+            file_type_id=file_type_id,
+            module_code=prepared["module_code"],
+            logical_path=prepared["logical_path"],
+            facility_code=prepared["facility_code"],
+            storage_path=location["absolute_path"],
+            storage_rel_path=location["relative_path"],
+            file_size=prepared["size"],
+            file_hash=location["sha256"],
+            source_modified_at=prepared["source_modified_at"],
+            category_name=prepared["category_name"],
+            work_condition=prepared["work_condition"],
+            remark=prepared["remark"],
+            document_code=(parsed_meta.get("document_code") or None),
+            document_title=(parsed_meta.get("document_title") or None),
+            design_stage_code=(parsed_meta.get("design_stage_code") or None),
+            design_stage_name=(parsed_meta.get("design_stage_name") or None),
+            discipline_code=(parsed_meta.get("discipline_code") or None),
+            discipline_name=(parsed_meta.get("discipline_name") or None),
+            file_class_code=(parsed_meta.get("file_class_code") or None),
+            file_class_name=(parsed_meta.get("file_class_name") or None),
+            asset_unit_code=(parsed_meta.get("asset_unit_code") or None),
+            asset_unit_name=(parsed_meta.get("asset_unit_name") or None),
+            module_unit_code=(parsed_meta.get("module_unit_code") or None),
+            module_unit_name=(parsed_meta.get("module_unit_name") or None),
+            drawing_no=(parsed_meta.get("drawing_no") or None),
+            sub_sequence=(parsed_meta.get("sub_sequence") or None),
+            recognition_status=(parsed_meta.get("recognition_status") or None),
+            recognition_message=(parsed_meta.get("recognition_message") or None),
+            is_deleted=False,
+        )
 
     def list_files(
         self,
@@ -555,66 +999,52 @@ class FileMetadataService:
         include_deleted: bool = False,
         limit: int | None = None,
         offset: int | None = None,
+        after_key: tuple | None = None,
+        before_key: tuple | None = None,
     ) -> list[dict]:
-        with self.session_factory() as session:
+        """按条件列出文件记录，按上传时间倒序。
+
+        after_key / before_key 为上一页末行或首行的 page_key，给出时按
+        (uploaded_at, updated_at, id) 定位翻页（keyset），不再依赖 OFFSET 扫过前面的行；
+        返回的每条记录都带 page_key 供下次翻页使用。
+        """
+        with self._read_session() as session:
             stmt = select(FileRecord).options(joinedload(FileRecord.file_type))
-            if file_type_code:
-                stmt = stmt.join(FileRecord.file_type).where(FileType.code == file_type_code)
-            if module_code:
-                stmt = stmt.where(FileRecord.module_code == module_code)
-            if logical_path:
-                stmt = stmt.where(FileRecord.logical_path == self._normalize_logical_path(logical_path))
-            elif logical_path_prefixes:
-                prefix_conditions = [
-                    condition
-                    for condition in (
-                        self._logical_path_prefix_condition(prefix)
-                        for prefix in logical_path_prefixes
-                    )
-                    if condition is not None
-                ]
-                if prefix_conditions:
-                    stmt = stmt.where(or_(*prefix_conditions))
-            elif logical_path_prefix:
-                prefix = self._normalize_logical_path(logical_path_prefix)
-                prefix_condition = self._logical_path_prefix_condition(prefix)
-                if prefix_condition is not None:
-                    stmt = stmt.where(prefix_condition)
-            if facility_code:
-                stmt = stmt.where(FileRecord.facility_code == facility_code)
-            code_pattern = self._contains_like_pattern(document_code_query)
-            if code_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_code.like(code_pattern, escape="\\"),
-                        FileRecord.logical_path.like(code_pattern, escape="\\"),
-                        FileRecord.original_name.like(code_pattern, escape="\\"),
-                    )
-                )
-            title_pattern = self._contains_like_pattern(document_title_query)
-            if title_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_title.like(title_pattern, escape="\\"),
-                        FileRecord.original_name.like(title_pattern, escape="\\"),
-                        FileRecord.logical_path.like(title_pattern, escape="\\"),
-                    )
-                )
-            category = str(category_query or "").strip()
-            if category:
-                stmt = stmt.where(FileRecord.category_name == category)
-            discipline = str(discipline_query or "").strip()
-            if discipline:
-                stmt = stmt.where(FileRecord.discipline_name == discipline)
-            if not include_deleted:
-                stmt = stmt.where(FileRecord.is_deleted.is_(False))
-            stmt = stmt.order_by(FileRecord.uploaded_at.desc(), FileRecord.updated_at.desc(), FileRecord.id.desc())
-            if offset is not None:
+            stmt = self._apply_file_filters(
+                stmt,
+                file_type_code=file_type_code,
+                module_code=module_code,
+                logical_path=logical_path,
+                logical_path_prefix=logical_path_prefix,
+                logical_path_prefixes=logical_path_prefixes,
+                facility_code=facility_code,
+                document_code_query=document_code_query,
+                document_title_query=document_title_query,
+                category_query=category_query,
+                discipline_query=discipline_query,
+                include_deleted=include_deleted,
+            )
+            sort_columns = (FileRecord.uploaded_at, FileRecord.updated_at, FileRecord.id)
+            reverse = before_key is not None and after_key is None
+            if after_key is not None:
+                stmt = stmt.where(self._keyset_condition(sort_columns, after_key, descending=True))
+            elif before_key is not None:
+                stmt = stmt.where(self._keyset_condition(sort_columns, before_key, descending=False))
+            if reverse:
+                stmt = stmt.order_by(*(column.asc() for column in sort_columns))
+            else:
+                stmt = stmt.order_by(*(column.desc() for column in sort_columns))
+            if offset is not None and after_key is None and before_key is None:
                 stmt = stmt.offset(max(0, int(offset)))
             if limit is not None:
                 stmt = stmt.limit(max(0, int(limit)))
             rows = session.execute(stmt).scalars().all()
-            return [self._record_to_dict(row) for row in rows]
+            if reverse:
+                rows = list(reversed(rows))
+            return [
+                {**self._record_to_dict(row), "page_key": (row.uploaded_at, row.updated_at, row.id)}
+                for row in rows
+            ]
 
     def count_files(
         self,
@@ -631,58 +1061,21 @@ class FileMetadataService:
         discipline_query: str | None = None,
         include_deleted: bool = False,
     ) -> int:
-        with self.session_factory() as session:
-            stmt = select(func.count(FileRecord.id))
-            if file_type_code:
-                stmt = stmt.join(FileRecord.file_type).where(FileType.code == file_type_code)
-            if module_code:
-                stmt = stmt.where(FileRecord.module_code == module_code)
-            if logical_path:
-                stmt = stmt.where(FileRecord.logical_path == self._normalize_logical_path(logical_path))
-            elif logical_path_prefixes:
-                prefix_conditions = [
-                    condition
-                    for condition in (
-                        self._logical_path_prefix_condition(prefix)
-                        for prefix in logical_path_prefixes
-                    )
-                    if condition is not None
-                ]
-                if prefix_conditions:
-                    stmt = stmt.where(or_(*prefix_conditions))
-            elif logical_path_prefix:
-                prefix = self._normalize_logical_path(logical_path_prefix)
-                prefix_condition = self._logical_path_prefix_condition(prefix)
-                if prefix_condition is not None:
-                    stmt = stmt.where(prefix_condition)
-            if facility_code:
-                stmt = stmt.where(FileRecord.facility_code == facility_code)
-            code_pattern = self._contains_like_pattern(document_code_query)
-            if code_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_code.like(code_pattern, escape="\\"),
-                        FileRecord.logical_path.like(code_pattern, escape="\\"),
-                        FileRecord.original_name.like(code_pattern, escape="\\"),
-                    )
-                )
-            title_pattern = self._contains_like_pattern(document_title_query)
-            if title_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_title.like(title_pattern, escape="\\"),
-                        FileRecord.original_name.like(title_pattern, escape="\\"),
-                        FileRecord.logical_path.like(title_pattern, escape="\\"),
-                    )
-                )
-            category = str(category_query or "").strip()
-            if category:
-                stmt = stmt.where(FileRecord.category_name == category)
-            discipline = str(discipline_query or "").strip()
-            if discipline:
-                stmt = stmt.where(FileRecord.discipline_name == discipline)
-            if not include_deleted:
-                stmt = stmt.where(FileRecord.is_deleted.is_(False))
+        with self._read_session() as session:
+            stmt = self._apply_file_filters(
+                select(func.count(FileRecord.id)),
+                file_type_code=file_type_code,
+                module_code=module_code,
+                logical_path=logical_path,
+                logical_path_prefix=logical_path_prefix,
+                logical_path_prefixes=logical_path_prefixes,
+                facility_code=facility_code,
+                document_code_query=document_code_query,
+                document_title_query=document_title_query,
+                category_query=category_query,
+                discipline_query=discipline_query,
+                include_deleted=include_deleted,
+            )
             return int(session.execute(stmt).scalar() or 0)
 
     def list_file_categories(
@@ -700,58 +1093,21 @@ class FileMetadataService:
         discipline_query: str | None = None,
         include_deleted: bool = False,
     ) -> list[str]:
-        with self.session_factory() as session:
-            stmt = select(FileRecord.category_name).distinct()
-            if file_type_code:
-                stmt = stmt.join(FileRecord.file_type).where(FileType.code == file_type_code)
-            if module_code:
-                stmt = stmt.where(FileRecord.module_code == module_code)
-            if logical_path:
-                stmt = stmt.where(FileRecord.logical_path == self._normalize_logical_path(logical_path))
-            elif logical_path_prefixes:
-                prefix_conditions = [
-                    condition
-                    for condition in (
-                        self._logical_path_prefix_condition(prefix)
-                        for prefix in logical_path_prefixes
-                    )
-                    if condition is not None
-                ]
-                if prefix_conditions:
-                    stmt = stmt.where(or_(*prefix_conditions))
-            elif logical_path_prefix:
-                prefix = self._normalize_logical_path(logical_path_prefix)
-                prefix_condition = self._logical_path_prefix_condition(prefix)
-                if prefix_condition is not None:
-                    stmt = stmt.where(prefix_condition)
-            if facility_code:
-                stmt = stmt.where(FileRecord.facility_code == facility_code)
-            code_pattern = self._contains_like_pattern(document_code_query)
-            if code_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_code.like(code_pattern, escape="\\"),
-                        FileRecord.logical_path.like(code_pattern, escape="\\"),
-                        FileRecord.original_name.like(code_pattern, escape="\\"),
-                    )
-                )
-            title_pattern = self._contains_like_pattern(document_title_query)
-            if title_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_title.like(title_pattern, escape="\\"),
-                        FileRecord.original_name.like(title_pattern, escape="\\"),
-                        FileRecord.logical_path.like(title_pattern, escape="\\"),
-                    )
-                )
-            category = str(category_query or "").strip()
-            if category:
-                stmt = stmt.where(FileRecord.category_name == category)
-            discipline = str(discipline_query or "").strip()
-            if discipline:
-                stmt = stmt.where(FileRecord.discipline_name == discipline)
-            if not include_deleted:
-                stmt = stmt.where(FileRecord.is_deleted.is_(False))
+        with self._read_session() as session:
+            stmt = self._apply_file_filters(
+                select(FileRecord.category_name).distinct(),
+                file_type_code=file_type_code,
+                module_code=module_code,
+                logical_path=logical_path,
+                logical_path_prefix=logical_path_prefix,
+                logical_path_prefixes=logical_path_prefixes,
+                facility_code=facility_code,
+                document_code_query=document_code_query,
+                document_title_query=document_title_query,
+                category_query=category_query,
+                discipline_query=discipline_query,
+                include_deleted=include_deleted,
+            )
             stmt = stmt.where(FileRecord.category_name.is_not(None)).order_by(FileRecord.category_name.asc())
             return [str(value or "").strip() for value in session.execute(stmt).scalars().all() if str(value or "").strip()]
 
@@ -769,58 +1125,132 @@ class FileMetadataService:
         category_query: str | None = None,
         include_deleted: bool = False,
     ) -> list[str]:
-        with self.session_factory() as session:
-            stmt = select(FileRecord.discipline_name).distinct()
-            if file_type_code:
-                stmt = stmt.join(FileRecord.file_type).where(FileType.code == file_type_code)
-            if module_code:
-                stmt = stmt.where(FileRecord.module_code == module_code)
-            if logical_path:
-                stmt = stmt.where(FileRecord.logical_path == self._normalize_logical_path(logical_path))
-            elif logical_path_prefixes:
-                prefix_conditions = [
-                    condition
-                    for condition in (
-                        self._logical_path_prefix_condition(prefix)
-                        for prefix in logical_path_prefixes
-                    )
-                    if condition is not None
-                ]
-                if prefix_conditions:
-                    stmt = stmt.where(or_(*prefix_conditions))
-            elif logical_path_prefix:
-                prefix = self._normalize_logical_path(logical_path_prefix)
-                prefix_condition = self._logical_path_prefix_condition(prefix)
-                if prefix_condition is not None:
-                    stmt = stmt.where(prefix_condition)
-            if facility_code:
-                stmt = stmt.where(FileRecord.facility_code == facility_code)
-            code_pattern = self._contains_like_pattern(document_code_query)
-            if code_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_code.like(code_pattern, escape="\\"),
-                        FileRecord.logical_path.like(code_pattern, escape="\\"),
-                        FileRecord.original_name.like(code_pattern, escape="\\"),
-                    )
-                )
-            title_pattern = self._contains_like_pattern(document_title_query)
-            if title_pattern:
-                stmt = stmt.where(
-                    or_(
-                        FileRecord.document_title.like(title_pattern, escape="\\"),
-                        FileRecord.original_name.like(title_pattern, escape="\\"),
-                        FileRecord.logical_path.like(title_pattern, escape="\\"),
-                    )
-                )
-            category = str(category_query or "").strip()
-            if category:
-                stmt = stmt.where(FileRecord.category_name == category)
-            if not include_deleted:
-                stmt = stmt.where(FileRecord.is_deleted.is_(False))
+        with self._read_session() as session:
+            stmt = self._apply_file_filters(
+                select(FileRecord.discipline_name).distinct(),
+                file_type_code=file_type_code,
+                module_code=module_code,
+                logical_path=logical_path,
+                logical_path_prefix=logical_path_prefix,
+                logical_path_prefixes=logical_path_prefixes,
+                facility_code=facility_code,
+                document_code_query=document_code_query,
+                document_title_query=document_title_query,
+                category_query=category_query,
+                include_deleted=include_deleted,
+            )
             stmt = stmt.where(FileRecord.discipline_name.is_not(None)).order_by(FileRecord.discipline_name.asc())
             return [str(value or "").strip() for value in session.execute(stmt).scalars().all() if str(value or "").strip()]
 
+    def list_file_facets(
+        self,
+        *,
+        file_type_code: str | None = None,
+        module_code: str | None = None,
+        logical_path: str | None = None,
+        logical_path_prefix: str | None = None,
+        logical_path_prefixes: list[str] | None = None,
+        facility_code: str | None = None,
+        document_code_query: str | None = None,
+        document_title_query: str | None = None,
+        include_deleted: bool = False,
+    ) -> list[dict]:
+        """一次分组查询返回 (类别, 专业) 组合的记录数。
+
+        类别、专业筛选项和各种筛选组合下的总数都可由结果在内存中算出，
+        免去分别执行 count / distinct 类别 / distinct 专业三次查询。
+        """
+        with self._read_session() as session:
+            stmt = self._apply_file_filters(
+                select(FileRecord.category_name, FileRecord.discipline_name, func.count(FileRecord.id)),
+                file_type_code=file_type_code,
+                module_code=module_code,
+                logical_path=logical_path,
+                logical_path_prefix=logical_path_prefix,
+                logical_path_prefixes=logical_path_prefixes,
+                facility_code=facility_code,
+                document_code_query=document_code_query,
+                document_title_query=document_title_query,
+                include_deleted=include_deleted,
+            )
+            stmt = stmt.group_by(FileRecord.category_name, FileRecord.discipline_name)
+            return [
+                {"category_name": category_name, "discipline_name": discipline_name, "count": int(count or 0)}
+                for category_name, discipline_name, count in session.execute(stmt).all()
+            ]
+
+    def _apply_file_filters(
+        self,
+        stmt,
+        *,
+        file_type_code: str | None = None,
+        module_code: str | None = None,
+        logical_path: str | None = None,
+        logical_path_prefix: str | None = None,
+        logical_path_prefixes: list[str] | None = None,
+        facility_code: str | None = None,
+        document_code_query: str | None = None,
+        document_title_query: str | None = None,
+        category_query: str | None = None,
+        discipline_query: str | None = None,
+        include_deleted: bool = False,
+    ):
+        if file_type_code:
+            stmt = stmt.join(FileRecord.file_type).where(FileType.code == file_type_code)
+        if module_code:
+            stmt = stmt.where(FileRecord.module_code == module_code)
+        if logical_path:
+            stmt = stmt.where(FileRecord.logical_path == self._normalize_logical_path(logical_path))
+        elif logical_path_prefixes:
+            prefix_conditions = [
+                condition
+                for condition in (
+                    self._logical_path_prefix_condition(prefix)
+                    for prefix in logical_path_prefixes
+                )
+                if condition is not None
+            ]
+            if prefix_conditions:
+                stmt = stmt.where(or_(*prefix_conditions))
+        elif logical_path_prefix:
+            prefix = self._normalize_logical_path(logical_path_prefix)
+            prefix_condition = self._logical_path_prefix_condition(prefix)
+            if prefix_condition is not None:
+                stmt = stmt.where(prefix_condition)
+        if facility_code:
+            stmt = stmt.where(FileRecord.facility_code == facility_code)
+        for condition in (
+            self._document_query_condition(
+                document_code_query,
+                (FileRecord.document_code, FileRecord.logical_path, FileRecord.original_name),
+            ),
+            self._document_query_condition(
+                document_title_query,
+                (FileRecord.document_title, FileRecord.original_name, FileRecord.logical_path),
+            ),
+        ):
+            if condition is not None:
+                stmt = stmt.where(condition)
+        category = str(category_query or "").strip()
+        if category:
+            stmt = stmt.where(FileRecord.category_name == category)
+        discipline = str(discipline_query or "").strip()
+        if discipline:
+            stmt = stmt.where(FileRecord.discipline_name == discipline)
+        if not include_deleted:
+            stmt = stmt.where(FileRecord.is_deleted.is_(False))
+        return stmt
+
+    @staticmethod
+    def _keyset_condition(columns: tuple, key: tuple, *, descending: bool):
+        # (a, b, c) < (x, y, z) 展开为 a < x OR (a = x AND (b < y OR (b = y AND c < z)))，
+        # 各数据库都能按排序索引定位。
+        condition = None
+        for column, value in reversed(list(zip(columns, key))):
+            beyond = column < value if descending else column > value
+            condition = beyond if condition is None else or_(beyond, and_(column == value, condition))
+        return condition
+
     def download_file(self, record_id: int, target_dir: str, *, download_name: str | None = None) -> str:
         with self.session_factory() as session:
             row = session.get(FileRecord, record_id)
@@ -874,13 +1304,17 @@ class FileMetadataService:
 
     def hard_delete(self, record_id: int) -> None:
         with self.session_factory() as session:
-            row = session.get(FileRecord, int(record_id))
-            if row is None:
-                raise ValueError(f"File record not found: {record_id}")
-            target_path = self._resolve_row_storage_path(row)
-            session.delete(row)
-            session.commit()
+            with session.begin():
+                row = session.get(FileRecord, int(record_id), with_for_update=True)
+                if row is None:
+                    raise ValueError(f"File record not found: {record_id}")
+                target_path = self._resolve_row_storage_path(row)
+                # 存储文件被多条记录引用时只删记录，最后一条引用删除时才回收文件。
+                still_referenced = self._blob_reference_count(session, row) > 1
+                session.delete(row)
 
+        if still_referenced:
+            return
         if target_path and target_path.exists():
             try:
                 target_path.unlink()
@@ -1109,21 +1543,26 @@ class FileMetadataService:
             project = session.get(InspectionProject, int(project_id))
             if project is None:
                 raise ValueError(f"Inspection project not found: {project_id}")
-            for row in session.execute(
-                select(InspectionFinding).where(InspectionFinding.project_id == int(project_id))
-            ).scalars().all():
-                session.delete(row)
-            for index, item in enumerate(rows, start=1):
-                finding = InspectionFinding(
-                    project_id=int(project_id),
-                    item_code=(item.get("item_code") or item.get("node") or "").strip() or None,
-                    item_type=(item.get("item_type") or "").strip() or None,
-                    risk_level=(item.get("risk_level") or item.get("level") or "").strip() or None,
-                    conclusion=(item.get("conclusion") or "").strip() or None,
-                    sort_order=int(item.get("sort_order") or index),
-                    is_deleted=False,
-                )
-                session.add(finding)
+            findings = [
+                {
+                    "item_code": (item.get("item_code") or item.get("node") or "").strip() or None,
+                    "item_type": (item.get("item_type") or "").strip() or None,
+                    "risk_level": (item.get("risk_level") or item.get("level") or "").strip() or None,
+                    "conclusion": (item.get("conclusion") or "").strip() or None,
+                    "sort_order": int(item.get("sort_order") or index),
+                    "is_deleted": False,
+                }
+                for index, item in enumerate(rows, start=1)
+            ]
+            # 按节点编号与现有结论配对，只写有变化的行。
+            sync_keyed_rows(
+                session.connection(),
+                InspectionFinding.__table__,
+                {"project_id": int(project_id)},
+                findings,
+                key_columns=("item_code", "item_type"),
+                touch={"updated_at": datetime.utcnow()},
+            )
             session.commit()
         return self.list_inspection_findings(int(project_id))
 
@@ -1145,18 +1584,13 @@ class FileMetadataService:
         if not code:
             raise ValueError("facility_code is required")
         with self.session_factory() as session:
-            for row in session.execute(
-                select(PlatformLoadInformationItem).where(PlatformLoadInformationItem.facility_code == code)
-            ).scalars().all():
-                session.delete(row)
-
+            items = []
             for index, item in enumerate(rows, start=1):
                 rebuild_directory_id = None
                 rebuild_directory_raw = str(item.get("rebuild_directory_id") or "").strip()
                 if rebuild_directory_raw:
                     rebuild_directory_id = int(float(rebuild_directory_raw))
-                record = PlatformLoadInformationItem(
-                    facility_code=code,
+                record = dict(
                     rebuild_directory_id=rebuild_directory_id,
                     seq_no=int(item.get("seq_no") or item.get("seq") or item.get("sort_order") or index - 1),
                     project_name=(item.get("project_name") or "").strip() or None,
@@ -1187,7 +1621,19 @@ class FileMetadataService:
                     assessment_org=(item.get("assessment_org") or "").strip() or None,
                     sort_order=int(item.get("sort_order") or index),
                 )
-                session.add(record)
+                items.append(record)
+            # 按改造目录和序号与现有行配对，只写有变化的行。
+            sync_keyed_rows(
+                session.connection(),
+                PlatformLoadInformationItem.__table__,
+                {"facility_code": code},
+                items,
+                key_columns=("rebuild_directory_id", "seq_no"),
+                touch={"updated_at": datetime.utcnow()},
+            )
+            sync_load_metrics(session.connection(), code)
+            # sync_keyed_rows 走 Core 语句，不经过 after_flush，这里显式给该设施记版本。
+            bump_change_versions(session.connection(), {(PLATFORM_LOAD_SCOPE, code, "")})
 
             session.commit()
         return self.list_platform_load_information_items(code)
@@ -1220,7 +1666,7 @@ class FileMetadataService:
 
     def load_platform_summary_snapshot(self, snapshot_key: str = "latest") -> dict | None:
         key = (snapshot_key or "latest").strip() or "latest"
-        with self.session_factory() as session:
+        with self._read_session() as session:
             record = session.execute(
                 select(PlatformSummarySnapshot).where(
                     PlatformSummarySnapshot.snapshot_key == key
@@ -1255,10 +1701,29 @@ class FileMetadataService:
             record.rows_json = json.dumps(normalized_rows, ensure_ascii=False)
             record.row_count = len(normalized_rows)
             record.updated_at = datetime.utcnow()
+            sync_profile_metrics(session.connection(), key, normalized_columns, normalized_rows)
             session.commit()
             session.refresh(record)
             return self._platform_summary_snapshot_to_dict(record)
 
+    def list_platform_summary_profiles(self, snapshot_key: str = "latest") -> list[dict] | None:
+        """从规范化表一次取出快照中全部平台的档案字段；尚未回填时返回 None。"""
+        if not platform_summary_metrics_ready(self.engine):
+            return None
+        with self._read_session() as session:
+            return load_profiles(session.connection(), snapshot_key)
+
+    def list_platform_load_metrics(self, facility_codes: list[str] | None = None) -> dict[str, dict[str, str]] | None:
+        """返回 {设施编码: {载荷指标: 值}}；尚未回填时返回 None。"""
+        if not platform_summary_metrics_ready(self.engine):
+            return None
+        with self._read_session() as session:
+            return load_facility_metrics(session.connection(), LOAD_SOURCE, facility_codes=facility_codes)
+
+    def aggregate_platform_summary_metric(self, metric: str, *, source: str = LOAD_SOURCE) -> dict:
+        with self._read_session() as session:
+            return aggregate_metric(session.connection(), metric, source)
+
     def _store_file(
         self,
         source: Path,
@@ -1268,6 +1733,19 @@ class FileMetadataService:
         facility_code: str | None,
         category_name: str | None,
     ) -> dict:
+        return self._place_staged(
+            self._stage_file(source, module_code=module_code, logical_path=logical_path, facility_code=facility_code)
+        )
+
+    def _stage_file(
+        self,
+        source: Path,
+        *,
+        module_code: str,
+        logical_path: str | None,
+        facility_code: str | None,
+    ) -> dict:
+        """边复制边计算 sha256，写入目标目录下的临时文件，尚不占用正式文件名。"""
         target_dir = self._build_target_dir(
             module_code=module_code,
             logical_path=logical_path,
@@ -1275,21 +1753,142 @@ class FileMetadataService:
         )
         target_dir.mkdir(parents=True, exist_ok=True)
 
-        stored_name = self._build_stored_name(
-            source.name,
-            target_dir=target_dir,
-            keep_readable=(module_code in FILE_MANAGEMENT_MODULES),
-        )
-        target = target_dir / stored_name
-        shutil.copy2(source, target)
+        # 共享盘上只读一遍源文件；改名为正式文件名前，正式文件名下不会出现写了一半的文件。
+        temp_path = target_dir / f".{uuid.uuid4().hex}.uploading"
+        try:
+            sha256 = self._copy_with_sha256(source, temp_path)
+            shutil.copystat(source, temp_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
         return {
-            "stored_name": stored_name,
+            "temp_path": temp_path,
+            "target_dir": target_dir,
+            "original_name": source.name,
+            "keep_readable": module_code in FILE_MANAGEMENT_MODULES,
+            "sha256": sha256,
+        }
+
+    def _place_staged(self, pending: dict) -> dict:
+        """占一个不重名的正式文件名，把临时文件原子改名过去。"""
+        target: Path | None = None
+        try:
+            target = self._claim_stored_path(
+                pending["original_name"],
+                target_dir=pending["target_dir"],
+                keep_readable=pending["keep_readable"],
+            )
+            os.replace(pending["temp_path"], target)
+        except BaseException:
+            pending["temp_path"].unlink(missing_ok=True)
+            if target is not None:
+                # 改名失败时去掉占位的空文件。
+                target.unlink(missing_ok=True)
+            raise
+        return self._stored_location(target, pending["sha256"])
+
+    def _preferred_stored_path(self, pending: dict) -> Path:
+        """不与现有文件冲突时该上传会用的存储路径。"""
+        name = next(self._stored_name_candidates(pending["original_name"], keep_readable=pending["keep_readable"]))
+        return pending["target_dir"] / name
+
+    def _stored_location(self, target: Path, sha256: str | None, relative_path: str | None = None) -> dict:
+        return {
+            "stored_name": target.name,
             "absolute_path": str(target.resolve()),
-            "relative_path": target.relative_to(self.storage_root).as_posix(),
-            "size": target.stat().st_size,
-            "sha256": self._sha256(target),
+            "relative_path": relative_path or target.relative_to(self.storage_root).as_posix(),
+            "sha256": sha256,
         }
 
+    @staticmethod
+    def _path_key(path: Path) -> str:
+        return os.path.normcase(str(Path(path).resolve()))
+
+    @staticmethod
+    def _copy_with_sha256(source: Path, target: Path) -> str:
+        digest = hashlib.sha256()
+        buffer = bytearray(COPY_BUFFER_BYTES)
+        view = memoryview(buffer)
+        with source.open("rb") as src, target.open("xb") as dst:
+            while True:
+                count = src.readinto(buffer)
+                if not count:
+                    break
+                chunk = view[:count]
+                digest.update(chunk)
+                dst.write(chunk)
+        return digest.hexdigest()
+
+    def _find_shared_blob(
+        self,
+        source: Path,
+        *,
+        module_code: str,
+        logical_path: str | None,
+        facility_code: str | None,
+        file_size: int,
+    ) -> tuple[FileRecord | None, str | None]:
+        """查找可直接引用的已入库文件：同一存储目录下同原始文件名，且 sha256 与大小一致。
+
+        限定同名是因为模型识别、打开方式都依赖存储文件名；限定存储目录（模块、平台、
+        逻辑路径决定的目录，file_management 的 row_N 行目录合并在类别目录下）则保证
+        共享盘上按目录浏览、扫描时每个目录都有自己的文件，历史改造目录不会指向当前
+        模型目录里的文件。这里不加锁（要读整个源文件算
+        sha256），入库事务里由 _shared_location_alive 加锁复核该存储文件仍被引用，
+        与 hard_delete 的引用计数互斥。没有同名同大小的候选时不读源文件，返回
+        (None, None)，由复制过程顺带计算 sha256。
+        """
+        stmt = (
+            select(FileRecord)
+            .where(FileRecord.file_size == file_size)
+            .where(FileRecord.module_code == module_code)
+            .where(FileRecord.original_name == source.name)
+            .where(FileRecord.file_hash.is_not(None))
+            .where(FileRecord.storage_rel_path.is_not(None))
+            .order_by(FileRecord.id.asc())
+        )
+        if facility_code:
+            stmt = stmt.where(FileRecord.facility_code == facility_code)
+        else:
+            stmt = stmt.where(FileRecord.facility_code.is_(None))
+        # 候选查询用完即归还连接，读源文件算 sha256 时不占数据库连接和事务。
+        with self.session_factory() as session:
+            rows = session.execute(stmt).scalars().all()
+        base_key = self._path_key(
+            self._storage_base_dir(module_code=module_code, logical_path=logical_path, facility_code=facility_code)
+        )
+        candidates = []
+        for row in rows:
+            path = self._resolve_row_storage_path(row)
+            # 非 file_management 模块的存储目录下还有一层按日期的子目录。
+            directory = path.parent if module_code in FILE_MANAGEMENT_MODULES else path.parent.parent
+            if self._path_key(directory) != base_key:
+                continue
+            try:
+                if path.is_file() and path.stat().st_size == file_size:
+                    candidates.append(row)
+            except OSError:
+                continue
+        if not candidates:
+            return None, None
+
+        file_hash = self._sha256(source)
+        for row in candidates:
+            if row.file_hash == file_hash:
+                return row, file_hash
+        return None, file_hash
+
+    def _blob_reference_count(self, session, row: FileRecord) -> int:
+        storage_rel = self._normalize_storage_rel_path(row.storage_rel_path)
+        if not storage_rel:
+            return 1
+        stmt = (
+            select(FileRecord.id)
+            .where(FileRecord.storage_rel_path == row.storage_rel_path)
+            .with_for_update()
+        )
+        return len(session.execute(stmt).scalars().all())
+
     def _build_target_dir(
         self,
         *,
@@ -1297,17 +1896,31 @@ class FileMetadataService:
         logical_path: str | None,
         facility_code: str | None,
     ) -> Path:
-        safe_module = self._safe_segment(module_code or "general")
-        logical_segments = self._storage_segments(
+        base_dir = self._storage_base_dir(
             module_code=module_code,
             logical_path=logical_path,
             facility_code=facility_code,
         )
         if module_code in FILE_MANAGEMENT_MODULES:
-            return self.storage_root / safe_module / Path(*logical_segments)
+            return base_dir
 
         day = datetime.utcnow().strftime("%Y%m%d")
-        return self.storage_root / safe_module / Path(*logical_segments) / day
+        return base_dir / day
+
+    def _storage_base_dir(
+        self,
+        *,
+        module_code: str,
+        logical_path: str | None,
+        facility_code: str | None,
+    ) -> Path:
+        safe_module = self._safe_segment(module_code or "general")
+        logical_segments = self._storage_segments(
+            module_code=module_code,
+            logical_path=logical_path,
+            facility_code=facility_code,
+        )
+        return self.storage_root / safe_module / Path(*logical_segments)
 
     def _storage_segments(
         self,
@@ -1327,28 +1940,49 @@ class FileMetadataService:
             logical_segments = logical_segments[:-1]
         return logical_segments or ["root"]
 
-    def _build_stored_name(self, original_name: str, *, target_dir: Path, keep_readable: bool) -> str:
+    def _claim_stored_path(self, original_name: str, *, target_dir: Path, keep_readable: bool) -> Path:
+        """以独占创建占住一个不重名的存储文件名并返回其路径。
+
+        O_EXCL 创建本身就是原子的存在性判断，并发上传同名文件时各自拿到不同名字，
+        无需先 exists() 探测再复制。
+        """
+        for candidate in self._stored_name_candidates(original_name, keep_readable=keep_readable):
+            target = target_dir / candidate
+            try:
+                fd = os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            return target
+        raise FileExistsError(f"No free stored name in {target_dir}")
+
+    def _stored_name_candidates(self, original_name: str, *, keep_readable: bool):
         original = str(original_name or "").strip() or "unnamed"
         if not keep_readable:
             stem, suffix = os.path.splitext(original)
-            return f"{self._safe_segment(stem)}_{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}{suffix.lower()}"
+            stamped = f"{self._safe_segment(stem)}_{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}"
+            yield f"{stamped}{suffix.lower()}"
+            for counter in range(1, 10000):
+                yield f"{stamped}_{counter}{suffix.lower()}"
+            return
 
         candidate = self._safe_filename(original)
         stem, suffix = os.path.splitext(candidate)
-        target = target_dir / candidate
-        counter = 1
-        while target.exists():
-            candidate = f"{stem} ({counter}){suffix}"
-            target = target_dir / candidate
-            counter += 1
-        return candidate
+        yield candidate
+        for counter in range(1, 100000):
+            yield f"{stem} ({counter}){suffix}"
 
     @staticmethod
     def _sha256(path: Path) -> str:
         digest = hashlib.sha256()
+        buffer = bytearray(COPY_BUFFER_BYTES)
+        view = memoryview(buffer)
         with path.open("rb") as fp:
-            for chunk in iter(lambda: fp.read(1024 * 1024), b""):
-                digest.update(chunk)
+            while True:
+                count = fp.readinto(buffer)
+                if not count:
+                    break
+                digest.update(view[:count])
         return digest.hexdigest()
 
     @staticmethod
@@ -1366,6 +2000,19 @@ class FileMetadataService:
         text = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
         return f"%{text}%"
 
+    def _document_query_condition(self, query: str | None, columns: tuple):
+        pattern = self._contains_like_pattern(query)
+        if not pattern:
+            return None
+        condition = or_(*(column.like(pattern, escape="\\") for column in columns))
+        # 切片索引先把候选缩到含全部查询切片的记录，LIKE 只做精确校验。
+        candidates = (
+            search_candidate_condition(FileRecord.id, str(query).strip())
+            if search_index_ready(self.engine)
+            else None
+        )
+        return condition if candidates is None else and_(candidates, condition)
+
     @classmethod
     def _logical_path_prefix_condition(cls, logical_path_prefix: str | None):
         prefix = cls._normalize_logical_path(logical_path_prefix)
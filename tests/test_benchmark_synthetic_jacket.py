@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPORT_MODULE_ROOT = PROJECT_ROOT / "pages" / "output_feasibility_analysis_report"
+for _path in (PROJECT_ROOT, REPORT_MODULE_ROOT):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from benchmarks.run_benchmarks import compare_with_baseline  # noqa: E402
+from benchmarks.synthetic_jacket import (  # noqa: E402
+    build_jacket_model,
+    iter_psilst_lines,
+    iter_sacinp_lines,
+    spec_for_preset,
+    write_synthetic_bundle,
+)
+from src.parsers.basic_case_loads_parser import validate_basic_case_loads_against_desc  # noqa: E402
+from src.parsers.combo_case_loads_parser import validate_combo_case_loads_against_desc  # noqa: E402
+from src.parsers.joint_can_summary_parser import parse_joint_can_summary  # noqa: E402
+from src.parsers.load_case_status_parser import parse_load_case_status  # noqa: E402
+from src.parsers.member_group_summary_parser import parse_member_group_summary  # noqa: E402
+from src.parsers.pile_axial_capacity_summary_parser import parse_pile_axial_capacity_summary  # noqa: E402
+from src.parsers.pile_group_summary_parser import parse_pile_group_summary  # noqa: E402
+from src.parsers.pile_head_force_parser import parse_pile_head_forces  # noqa: E402
+from src.parsers.psilst_reader import read_lines, read_ui_analysis_lines  # noqa: E402
+
+
+def test_synthetic_jacket_is_deterministic_and_uses_sacs_fixed_columns() -> None:
+    spec = spec_for_preset("small")
+    first = list(iter_sacinp_lines(build_jacket_model(spec)))
+    second = list(iter_sacinp_lines(build_jacket_model(spec)))
+    assert first == second
+    assert list(iter_psilst_lines(build_jacket_model(spec))) == list(iter_psilst_lines(build_jacket_model(spec)))
+
+    joint_line = next(line for line in first if line.startswith("JOINT ") and line[6:10].strip())
+    member_line = next(line for line in first if line.startswith("MEMBER ") and line[7:15].strip())
+    assert joint_line[6:10] == "000L"
+    assert float(joint_line[25:32]) == -100.0
+    assert (member_line[7:11], member_line[11:15], member_line[16:19]) == ("000L", "010L", "LG1")
+
+
+def test_synthetic_listing_sections_parse_with_full_and_marker_readers(tmp_path: Path) -> None:
+    spec = spec_for_preset("small", listing_target_bytes=256 * 1024)
+    bundle = write_synthetic_bundle(tmp_path, spec)
+    counts = bundle["counts"]
+
+    for lines in (read_lines(str(bundle["psilst"])), read_ui_analysis_lines(str(bundle["psilst"]))):
+        validate_basic_case_loads_against_desc(lines)
+        validate_combo_case_loads_against_desc(lines)
+        assert len(parse_load_case_status(lines)["rows"]) == counts.load_case_status_rows
+        assert len(parse_member_group_summary(lines)["rows"]) == counts.member_group_rows
+        assert len(parse_joint_can_summary(lines)["rows"]) == counts.joint_can_rows
+        assert len(parse_pile_group_summary(lines)["rows"]) == counts.pile_group_rows
+        assert len(parse_pile_head_forces(lines)["rows"]) == counts.pile_head_force_rows
+        assert len(parse_pile_axial_capacity_summary(lines)["rows"]) == counts.pile_axial_rows
+
+
+def test_compare_with_baseline_flags_only_relative_and_absolute_slowdowns() -> None:
+    baseline = {
+        "presets": {
+            "small": {
+                "stages": {
+                    "slow": {"status": "ok", "seconds_median": 1.0, "peak_mb": 10.0},
+                    "noise": {"status": "ok", "seconds_median": 0.001, "peak_mb": 0.1},
+                    "skipped": {"status": "skipped", "seconds_median": None, "peak_mb": None},
+                }
+            }
+        }
+    }
+    current = {
+        "preset": "small",
+        "stages": {
+            "slow": {"status": "ok", "seconds_median": 1.5, "peak_mb": 10.5},
+            "noise": {"status": "ok", "seconds_median": 0.003, "peak_mb": 0.3},
+            "skipped": {"status": "ok", "seconds_median": 5.0, "peak_mb": 5.0},
+        },
+    }
+
+    regressions = compare_with_baseline(current, baseline, threshold=0.2)
+
+    assert [(item["stage"], item["metric"]) for item in regressions] == [("slow", "seconds_median")]
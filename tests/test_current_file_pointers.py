@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import sessionmaker
+
+from services import server_file_service
+from shiyou_db import current_files, database, service as service_module
+from shiyou_db.models import CurrentFilePointer, FileRecord, FileType
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'files.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    with session_factory() as session:
+        session.add(FileType(code="model", name="结构模型"))
+        session.commit()
+
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = session_factory
+    file_service.storage_root = tmp_path / "storage"
+    file_service.rebuild_current_file_pointers()
+    yield file_service
+    current_files._clear_current_file_pointers_ready_cache()
+
+
+_CLOCK = [datetime(2026, 3, 1, 9, 0, 0)]
+
+
+def _add(file_service, name: str, logical_path: str, *, facility_code: str = "WC19-1D", **fields) -> int:
+    _CLOCK[0] += timedelta(minutes=1)
+    with file_service.session_factory() as session:
+        row = FileRecord(
+            original_name=name,
+            stored_name=name,
+            file_type_id=session.execute(select(FileType.id)).scalar_one(),
+            module_code=fields.pop("module_code", "model_files"),
+            logical_path=logical_path,
+            facility_code=facility_code,
+            storage_path=f"model_files/{facility_code}/{logical_path}/{name}",
+            uploaded_at=_CLOCK[0],
+            updated_at=_CLOCK[0],
+            **fields,
+        )
+        session.add(row)
+        session.commit()
+        return row.id
+
+
+def _scanned_choice(file_service, facility_code: str, kind: str) -> int | None:
+    # 不依赖指针表，按原有规则对全部未删除记录逐条打分。
+    rank = current_files.FILE_KIND_RULES[kind][0]
+    with file_service.session_factory() as session:
+        rows = session.execute(
+            select(FileRecord).where(FileRecord.facility_code == facility_code).where(FileRecord.is_deleted.is_(False))
+        ).scalars()
+        ranked = [
+            (key, row.id)
+            for row in rows
+            if (key := rank({field: getattr(row, field) for field in ("id", "updated_at", *current_files._RECORD_FIELDS)}, facility_code))
+            is not None
+        ]
+    return max(ranked)[1] if ranked else None
+
+
+def _pointer(file_service, facility_code: str, kind: str) -> int | None:
+    record = file_service.get_current_file_record(facility_code, kind)
+    return record["id"] if record else None
+
+
+def _assert_pointers_match_scan(file_service, facility_code: str = "WC19-1D") -> None:
+    for kind in current_files.FILE_KIND_RULES:
+        assert _pointer(file_service, facility_code, kind) == _scanned_choice(file_service, facility_code, kind)
+
+
+def test_pointers_follow_upload_replace_and_delete(file_service) -> None:
+    history = _add(file_service, "sacinp.M1", "WC19-1D/历史改造/2024")
+    assert _pointer(file_service, "WC19-1D", current_files.CURRENT_SACINP) is None
+    assert _pointer(file_service, "WC19-1D", current_files.LATEST_SACINP) == history
+
+    plain = _add(file_service, "sacinp.txt", "WC19-1D/当前模型/结构模型")
+    best = _add(file_service, "sacinp.JKnew", "WC19-1D/当前模型/结构模型/用户上传")
+    _add(file_service, "seainp.dat", "WC19-1D/当前模型/海洋环境")
+    _add(file_service, "sacinp.JKnew", "WC9-7/当前模型/结构模型", facility_code="WC9-7")
+    _add(file_service, "说明.docx", "WC19-1D/设计资料", module_code="doc_man")
+    assert _pointer(file_service, "WC19-1D", current_files.CURRENT_SACINP) == best
+    _assert_pointers_match_scan(file_service)
+
+    file_service.soft_delete(best)
+    assert _pointer(file_service, "WC19-1D", current_files.CURRENT_SACINP) == plain
+    _assert_pointers_match_scan(file_service)
+
+    file_service.hard_delete(plain)
+    assert _pointer(file_service, "WC19-1D", current_files.CURRENT_SACINP) is None
+    _assert_pointers_match_scan(file_service)
+    _assert_pointers_match_scan(file_service, "WC9-7")
+
+
+def test_current_sacinp_ignores_files_outside_model_files(file_service) -> None:
+    model = _add(file_service, "sacinp.txt", "WC19-1D/当前模型/结构模型")
+    # 其他模块里的同名文件打分更高，但不属于当前模型候选，与原扫描的 module_code 条件一致。
+    _add(file_service, "sacinp.JKnew", "WC19-1D/当前模型/结构模型", module_code="doc_man")
+    assert _pointer(file_service, "WC19-1D", current_files.CURRENT_SACINP) == model
+
+    untagged = _add(file_service, "sacinp.JKnew", "WC19-1D/当前模型/结构模型", module_code="")
+    assert _pointer(file_service, "WC19-1D", current_files.CURRENT_SACINP) == untagged
+    _assert_pointers_match_scan(file_service)
+
+
+def test_rebuild_restores_pointers(file_service) -> None:
+    _add(file_service, "sacinp.JKnew", "WC19-1D/当前模型/结构模型")
+    _add(file_service, "seainp.dat", "WC19-1D/当前模型/海洋环境")
+    with file_service.engine.begin() as conn:
+        conn.execute(delete(CurrentFilePointer))
+
+    assert file_service.rebuild_current_file_pointers() == 1
+    _assert_pointers_match_scan(file_service)
+
+
+def test_server_lookup_uses_pointer_without_scanning(file_service) -> None:
+    best = _add(file_service, "sacinp.JKnew", "WC19-1D/当前模型/结构模型")
+    sea = _add(file_service, "seainp.dat", "WC19-1D/当前模型/海洋环境")
+
+    with patch.object(server_file_service, "_engine", return_value=file_service.engine), patch.object(
+        server_file_service, "_detect_file_table", side_effect=AssertionError("scanned")
+    ):
+        assert server_file_service.get_current_sacinp_record("WC19-1D")["id"] == best
+        assert server_file_service.get_latest_seainp_record("WC19-1D")["id"] == sea
+        assert server_file_service.get_latest_seainp_record("WC9-7") is None
+        with pytest.raises(FileNotFoundError):
+            server_file_service.get_current_sacinp_record("WC9-7")
+
+
+def test_pointer_lock_is_taken_before_the_record_insert(file_service) -> None:
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(" ".join(statement.split()).lower())
+
+    event.listen(file_service.engine, "before_cursor_execute", record)
+    try:
+        _add(file_service, "sacinp.JKnew", "WC19-1D/当前模型/结构模型")
+    finally:
+        event.remove(file_service.engine, "before_cursor_execute", record)
+
+    pointer_lock = next(index for index, sql in enumerate(statements) if sql.startswith("insert into current_file_pointers"))
+    record_insert = next(index for index, sql in enumerate(statements) if sql.startswith("insert into file_records"))
+    # 先锁指针行再插入记录：并发写同一设施时后到的事务在插入前排队，InnoDB 上不会互相等待成死锁。
+    assert pointer_lock < record_insert
+
+
+def test_concurrent_uploads_to_one_facility_both_commit(file_service) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    errors: list[BaseException] = []
+    ids: list[int] = []
+
+    def upload(name: str, logical_path: str) -> None:
+        try:
+            with file_service.session_factory() as session:
+                file_type_id = session.execute(select(FileType.id)).scalar_one()
+                session.rollback()
+                row = FileRecord(
+                    original_name=name,
+                    stored_name=name,
+                    file_type_id=file_type_id,
+                    module_code="model_files",
+                    logical_path=logical_path,
+                    facility_code="WC19-1D",
+                    storage_path=f"model_files/WC19-1D/{logical_path}/{name}",
+                    uploaded_at=datetime(2026, 3, 2),
+                    updated_at=datetime(2026, 3, 2),
+                )
+                session.add(row)
+                barrier.wait()
+                session.commit()
+                ids.append(row.id)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=upload, args=("sacinp.txt", "WC19-1D/当前模型/结构模型")),
+        threading.Thread(target=upload, args=("sacinp.JKnew", "WC19-1D/当前模型/结构模型")),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == [] and len(ids) == 2
+    _assert_pointers_match_scan(file_service)
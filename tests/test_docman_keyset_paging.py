@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from services import file_db_adapter as adapter
+from shiyou_db import database, service as service_module
+from shiyou_db.models import FileRecord, FileType
+
+
+CATEGORIES = ["设计图纸", "计算书", ""]
+DISCIPLINES = ["结构", "工艺"]
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'files.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    base_time = datetime(2026, 1, 1, 8, 0, 0)
+    with session_factory() as session:
+        file_type = FileType(code="doc", name="文档")
+        session.add(file_type)
+        session.flush()
+        for index in range(47):
+            # 每三条共用一个上传时间，翻页必须靠 updated_at / id 区分同一时刻的记录。
+            uploaded_at = base_time + timedelta(minutes=index // 3)
+            session.add(
+                FileRecord(
+                    original_name=f"图纸{index}.pdf",
+                    stored_name=f"图纸{index}.pdf",
+                    file_ext="pdf",
+                    file_type_id=file_type.id,
+                    module_code=adapter.DOC_MAN_MODULE_CODE,
+                    logical_path=f"WC19-1D/设计资料/row_{index}",
+                    facility_code="WC19-1D",
+                    storage_path=f"doc_man/图纸{index}.pdf",
+                    uploaded_at=uploaded_at,
+                    updated_at=uploaded_at,
+                    category_name=CATEGORIES[index % 3],
+                    discipline_name=DISCIPLINES[index % 2],
+                    document_code=f"DOC-{index:03d}",
+                    is_deleted=index == 5,
+                )
+            )
+        session.commit()
+
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = session_factory
+    file_service.storage_root = tmp_path / "storage"
+    adapter._invalidate_file_list_cache()
+    with patch.object(adapter, "_get_service", return_value=file_service):
+        yield file_service
+    adapter._invalidate_file_list_cache()
+
+
+def _record_ids(page_data: dict) -> list[int]:
+    return [record["record_id"] for record in page_data["records"]]
+
+
+def test_keyset_pages_match_offset_pages(file_service) -> None:
+    kwargs = {"page_size": 10, "facility_code": "WC19-1D"}
+    offset_pages = [
+        adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=page, **kwargs) for page in range(5)
+    ]
+    assert sum(len(page_data["records"]) for page_data in offset_pages) == 46
+
+    page_data = offset_pages[0]
+    for page in range(1, 5):
+        cursor = {"page": page, "after": page_data["page_keys"][1]}
+        page_data = adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=page, cursor=cursor, **kwargs)
+        assert _record_ids(page_data) == _record_ids(offset_pages[page])
+    assert page_data["records"][0]["index"] == 41
+
+    for page in range(3, -1, -1):
+        cursor = {"page": page, "before": page_data["page_keys"][0]}
+        page_data = adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=page, cursor=cursor, **kwargs)
+        assert _record_ids(page_data) == _record_ids(offset_pages[page])
+
+
+def test_cursor_for_other_page_falls_back_to_offset(file_service) -> None:
+    first = adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=0, page_size=10)
+    third = adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=2, page_size=10)
+    stale = adapter.load_docman_record_page(
+        ["WC19-1D", "设计资料"],
+        page=2,
+        page_size=10,
+        cursor={"page": 1, "after": first["page_keys"][1]},
+    )
+    assert _record_ids(stale) == _record_ids(third)
+
+
+@pytest.mark.parametrize(
+    ("category", "discipline", "code_query"),
+    [("", "", ""), ("计算书", "", ""), ("", "结构", ""), ("设计图纸", "工艺", ""), ("", "", "DOC-01")],
+)
+def test_facet_totals_and_options_match_separate_queries(file_service, category, discipline, code_query) -> None:
+    page_data = adapter.load_docman_record_page(
+        ["WC19-1D", "设计资料"],
+        page_size=10,
+        category_query=category,
+        discipline_query=discipline,
+        document_code_query=code_query,
+    )
+    common = {
+        "module_code": adapter.DOC_MAN_MODULE_CODE,
+        "logical_path_prefix": "WC19-1D/设计资料",
+        "document_code_query": code_query or None,
+    }
+
+    assert page_data["total"] == file_service.count_files(
+        category_query=category or None, discipline_query=discipline or None, **common
+    )
+    assert page_data["category_options"] == sorted(
+        set(file_service.list_file_categories(discipline_query=discipline or None, **common))
+    )
+    assert page_data["discipline_options"] == sorted(
+        set(file_service.list_file_disciplines(category_query=category or None, **common))
+    )
+
+
+def test_facets_are_cached_until_files_change(file_service) -> None:
+    with patch.object(file_service, "list_file_facets", wraps=file_service.list_file_facets) as list_file_facets:
+        adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=0, page_size=10)
+        adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=1, page_size=10)
+        assert list_file_facets.call_count == 1
+
+        adapter._invalidate_file_list_cache()
+        adapter.load_docman_record_page(["WC19-1D", "设计资料"], page=1, page_size=10)
+        assert list_file_facets.call_count == 2
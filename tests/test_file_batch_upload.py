@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from shiyou_db import database, service as service_module
+from shiyou_db.models import FileRecord, FileType
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'files.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    with session_factory() as session:
+        session.add(FileType(code="model", name="结构模型"))
+        session.commit()
+
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = session_factory
+    file_service.storage_root = tmp_path / "storage"
+    return file_service
+
+
+def _item(local_path: Path, **values) -> dict:
+    item = {
+        "local_path": str(local_path),
+        "file_type_code": "model",
+        "module_code": "model_files",
+        "logical_path": "当前模型/结构模型",
+        "facility_code": "WC19-1D",
+    }
+    item.update(values)
+    return item
+
+
+def _records(file_service) -> list[FileRecord]:
+    with file_service.session_factory() as session:
+        return session.execute(select(FileRecord).order_by(FileRecord.id)).scalars().all()
+
+
+def test_batch_upload_replaces_records_in_one_commit(file_service, tmp_path: Path) -> None:
+    sources = []
+    for index in range(6):
+        path = tmp_path / "src" / f"seainp.{index}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(f"LOADCN {index}\n".encode() * 1000)
+        sources.append(path)
+    old = file_service.upload_file(str(sources[0]), file_type_code="model", module_code="model_files",
+                                   logical_path="当前模型/结构模型", facility_code="WC19-1D")
+    stale = file_service.upload_file(str(sources[1]), file_type_code="model", module_code="model_files",
+                                     logical_path="当前模型/结构模型", facility_code="WC19-1D")
+    (tmp_path / "src" / "seainp.1").write_bytes(b"LOADCN changed\n")
+    progress = []
+
+    batch = file_service.upload_files(
+        [_item(sources[0], delete_record_ids=[old["id"]]), _item(sources[1], delete_record_ids=[stale["id"]])]
+        + [_item(path) for path in sources[2:]]
+        + [_item(tmp_path / "missing.bin"), _item(sources[2], file_type_code="unknown")],
+        max_workers=3,
+        on_progress=progress.append,
+    )
+
+    assert [entry["index"] for entry in batch["results"]] == [0, 1, 2, 3, 4, 5]
+    assert [error["index"] for error in batch["errors"]] == [6, 7]
+    assert not batch["canceled"]
+    assert batch["bytes"] == sum(path.stat().st_size for path in sources)
+    assert [item["done"] for item in progress] == list(range(1, 9))
+
+    records = _records(file_service)
+    assert [row.id for row in records] == sorted(entry["record"]["id"] for entry in batch["results"])
+    # 内容未变的文件沿用原存储文件；内容变化的文件覆盖被替换记录的文件，仍用原文件名。
+    assert batch["results"][0]["record"]["storage_rel_path"] == old["storage_rel_path"]
+    assert (file_service.storage_root / old["storage_rel_path"]).is_file()
+    new_stale = batch["results"][1]["record"]
+    assert new_stale["storage_rel_path"] == stale["storage_rel_path"]
+    assert (file_service.storage_root / new_stale["storage_rel_path"]).read_bytes() == b"LOADCN changed\n"
+
+
+def test_cancelled_batch_uploads_nothing_further(file_service, tmp_path: Path) -> None:
+    source = tmp_path / "sacinp.JK"
+    source.write_bytes(b"JOINT 601L\n")
+
+    batch = file_service.upload_files([_item(source), _item(source)], is_cancelled=lambda: True)
+
+    assert batch["canceled"]
+    assert batch["results"] == []
+    assert _records(file_service) == []
+    assert not file_service.storage_root.exists()
+
+
+def test_replaced_current_model_keeps_its_file_name(file_service, tmp_path: Path) -> None:
+    first = tmp_path / "v1" / "sacinp.JKnew"
+    second = tmp_path / "v2" / "sacinp.JKnew"
+    for path, body in ((first, b"JOINT 601L\n"), (second, b"JOINT 602L\n")):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body * 100)
+    item = {"logical_path": "当前模型/静力模型", "facility_code": "WC2"}
+    old = file_service.upload_files([_item(first, **item)])["results"][0]["record"]
+
+    batch = file_service.upload_files([_item(second, delete_record_ids=[old["id"]], **item)])
+
+    record = batch["results"][0]["record"]
+    stored = file_service.storage_root / record["storage_rel_path"]
+    assert record["stored_name"] == "sacinp.JKnew"
+    assert sorted(path.name for path in stored.parent.iterdir()) == ["sacinp.JKnew"]
+    assert stored.read_bytes() == b"JOINT 602L\n" * 100
+    assert [row.id for row in _records(file_service)] == [record["id"]]
+
+
+def test_reused_file_removed_before_commit_is_copied_outside_the_transaction(file_service, tmp_path: Path) -> None:
+    source = tmp_path / "src" / "sacinp.JKnew"
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_bytes(b"JOINT 601L\n" * 100)
+    old = file_service.upload_files([_item(source)])["results"][0]["record"]
+    stored = file_service.storage_root / old["storage_rel_path"]
+    in_transaction: list[bool] = []
+    commit_once = file_service._commit_staged_uploads_once
+    stage_file = file_service._stage_file
+
+    def remove_then_commit(staged):
+        # 暂存之后、首次入库之前，其他客户端删掉了被复用的文件。
+        if not in_transaction:
+            stored.unlink()
+        return commit_once(staged)
+
+    def watched_stage(*args, **kwargs):
+        in_transaction.append(file_service.engine.pool.checkedout() > 0)
+        return stage_file(*args, **kwargs)
+
+    file_service._commit_staged_uploads_once = remove_then_commit
+    file_service._stage_file = watched_stage
+    batch = file_service.upload_files([_item(source, logical_path="当前模型/结构模型/row_2")])
+
+    record = batch["results"][0]["record"]
+    assert in_transaction == [False]
+    assert (file_service.storage_root / record["storage_rel_path"]).read_bytes() == source.read_bytes()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from shiyou_db import database, service as service_module
+from shiyou_db.models import FileType
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'files.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    with session_factory() as session:
+        session.add(FileType(code="model", name="结构模型"))
+        session.commit()
+
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = session_factory
+    file_service.storage_root = tmp_path / "storage"
+    return file_service
+
+
+def _write(path: Path, content: bytes) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def _upload(file_service, local_path: str, *, facility_code: str = "WC19-1D", logical_path: str = "当前模型/结构模型"):
+    return file_service.upload_file(
+        local_path,
+        file_type_code="model",
+        module_code="model_files",
+        logical_path=logical_path,
+        facility_code=facility_code,
+    )
+
+
+def test_duplicate_upload_links_existing_file_and_gc_on_last_delete(file_service, tmp_path: Path) -> None:
+    first_source = _write(tmp_path / "a" / "sacinp.JKnew", b"JOINT 601L\n" * 100)
+    second_source = _write(tmp_path / "b" / "sacinp.JKnew", b"JOINT 601L\n" * 100)
+
+    first = _upload(file_service, first_source)
+    with patch.object(service_module.FileMetadataService, "_copy_with_sha256") as copy_with_sha256:
+        second = _upload(file_service, second_source)
+    copy_with_sha256.assert_not_called()
+
+    assert second["id"] != first["id"]
+    assert second["storage_rel_path"] == first["storage_rel_path"]
+    assert second["file_hash"] == first["file_hash"]
+    stored = file_service.storage_root / first["storage_rel_path"]
+    assert [path.name for path in stored.parent.iterdir()] == ["sacinp.JKnew"]
+
+    file_service.hard_delete(first["id"])
+    assert stored.read_bytes() == b"JOINT 601L\n" * 100
+
+    file_service.hard_delete(second["id"])
+    assert not stored.exists()
+
+
+def test_upload_stores_new_file_when_name_facility_or_content_differs(file_service, tmp_path: Path) -> None:
+    source = _write(tmp_path / "src" / "psilst.factor", b"MEMBER GROUP SUMMARY\n")
+    renamed = _write(tmp_path / "src" / "psilst.old", b"MEMBER GROUP SUMMARY\n")
+    changed = _write(tmp_path / "changed" / "psilst.factor", b"JOINT CAN SUMMARY\n")
+
+    base = _upload(file_service, source)
+    rel_paths = {
+        base["storage_rel_path"],
+        _upload(file_service, renamed)["storage_rel_path"],
+        _upload(file_service, source, facility_code="WC9-7")["storage_rel_path"],
+        _upload(file_service, changed)["storage_rel_path"],
+    }
+
+    assert len(rel_paths) == 4
+    assert all((file_service.storage_root / rel_path).is_file() for rel_path in rel_paths)
+
+
+def test_upload_to_another_directory_stores_its_own_file(file_service, tmp_path: Path) -> None:
+    source = _write(tmp_path / "src" / "sacinp.JKnew", b"JOINT 601L\n" * 100)
+    current = _upload(file_service, source)
+
+    history = _upload(file_service, source, logical_path="历史改造/2020改造/结构模型")
+    # file_management 的 row_N 行目录与类别目录是同一个存储目录，仍然共用文件。
+    row = _upload(file_service, source, logical_path="当前模型/结构模型/row_2")
+
+    assert history["storage_rel_path"] == "model_files/WC19-1D/历史改造/2020改造/结构模型/sacinp.JKnew"
+    assert (file_service.storage_root / history["storage_rel_path"]).read_bytes() == b"JOINT 601L\n" * 100
+    assert row["storage_rel_path"] == current["storage_rel_path"]
+
+
+def test_missing_shared_file_is_stored_again(file_service, tmp_path: Path) -> None:
+    source = _write(tmp_path / "src" / "report.pdf", b"%PDF-1.7 report")
+    first = _upload(file_service, source)
+    (file_service.storage_root / first["storage_rel_path"]).unlink()
+
+    second = _upload(file_service, source)
+
+    assert (file_service.storage_root / second["storage_rel_path"]).read_bytes() == b"%PDF-1.7 report"
+
+
+def test_hash_and_copy_run_without_holding_a_connection(file_service, tmp_path: Path) -> None:
+    pool = file_service.engine.pool
+    checked_out: list[int] = []
+    sha256 = service_module.FileMetadataService._sha256
+    copy_with_sha256 = service_module.FileMetadataService._copy_with_sha256
+
+    def watched_sha256(path):
+        checked_out.append(pool.checkedout())
+        return sha256(path)
+
+    def watched_copy(source, target):
+        checked_out.append(pool.checkedout())
+        return copy_with_sha256(source, target)
+
+    first_source = _write(tmp_path / "a" / "sacinp.JKnew", b"JOINT 601L\n" * 100)
+    second_source = _write(tmp_path / "b" / "sacinp.JKnew", b"JOINT 601L\n" * 100)
+    with patch.object(service_module.FileMetadataService, "_sha256", staticmethod(watched_sha256)), patch.object(
+        service_module.FileMetadataService, "_copy_with_sha256", staticmethod(watched_copy)
+    ):
+        first = _upload(file_service, first_source)
+        second = _upload(file_service, second_source)
+
+    assert second["storage_rel_path"] == first["storage_rel_path"]
+    assert checked_out and set(checked_out) == {0}
+
+
+def test_storage_rel_path_index_is_created(file_service) -> None:
+    with file_service.engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_file_records_storage_rel_path"))
+    file_service._ensure_schema()
+
+    indexes = {index["name"] for index in inspect(file_service.engine).get_indexes("file_records")}
+    assert "ix_file_records_storage_rel_path" in indexes
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from services import file_db_adapter as adapter
+from shiyou_db import database, service as service_module
+from shiyou_db.models import DocumentRebuildDirectory, FileRecord, FileType
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'files.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    with session_factory() as session:
+        session.add(FileType(code="doc", name="文档"))
+        session.commit()
+
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = session_factory
+    file_service.storage_root = tmp_path / "storage"
+    adapter._invalidate_file_list_cache()
+    adapter._CHANGE_VERSIONS.clear()
+    with patch.object(adapter, "_get_service", return_value=file_service), patch.object(
+        adapter, "FILE_VERSION_CHECK_SECONDS", 0
+    ):
+        yield file_service
+    adapter._invalidate_file_list_cache()
+    adapter._CHANGE_VERSIONS.clear()
+
+
+def _add_record(file_service, name: str, *, facility_code: str, category_name: str = "设计图纸") -> int:
+    with file_service.session_factory() as session:
+        file_type = session.query(FileType).filter_by(code="doc").one()
+        row = FileRecord(
+            original_name=name,
+            stored_name=name,
+            file_type_id=file_type.id,
+            module_code="doc_man",
+            logical_path=f"{facility_code}/设计资料/{name}",
+            facility_code=facility_code,
+            storage_path=f"doc_man/{name}",
+            category_name=category_name,
+        )
+        session.add(row)
+        session.commit()
+        return row.id
+
+
+def _names(rows: list[dict]) -> list[str]:
+    return sorted(row["original_name"] for row in rows)
+
+
+def test_writes_bump_versions_of_old_and_new_scopes(file_service) -> None:
+    record_id = _add_record(file_service, "a.pdf", facility_code="WC19-1D")
+    assert file_service.file_change_versions() == {("doc_man", "WC19-1D", "设计图纸"): 1}
+
+    file_service.update_file_record(record_id, category_name="计算书")
+    assert file_service.file_change_versions() == {
+        ("doc_man", "WC19-1D", "设计图纸"): 2,
+        ("doc_man", "WC19-1D", "计算书"): 1,
+    }
+
+    file_service.hard_delete(record_id)
+    assert file_service.file_change_versions()[("doc_man", "WC19-1D", "计算书")] == 2
+
+
+def test_other_client_write_only_invalidates_its_scope(file_service) -> None:
+    _add_record(file_service, "a.pdf", facility_code="WC19-1D")
+    _add_record(file_service, "b.pdf", facility_code="WC9-7")
+
+    def list_facility(facility_code: str, category: str | None = None) -> list[str]:
+        return _names(
+            adapter.list_files(module_code="doc_man", facility_code=facility_code, category_query=category)
+        )
+
+    assert list_facility("WC19-1D") == ["a.pdf"]
+    assert list_facility("WC9-7") == ["b.pdf"]
+    assert list_facility("WC19-1D", "计算书") == []
+
+    # 不经过本进程适配层的写入，模拟其他客户端或服务端。
+    _add_record(file_service, "c.pdf", facility_code="WC19-1D")
+    with patch.object(file_service, "list_files", wraps=file_service.list_files) as list_files:
+        assert list_facility("WC19-1D") == ["a.pdf", "c.pdf"]
+        assert list_facility("WC9-7") == ["b.pdf"]
+        assert list_facility("WC19-1D", "计算书") == []
+    assert list_files.call_count == 1
+
+
+def test_cache_evicts_least_recently_used_queries(file_service) -> None:
+    _add_record(file_service, "a.pdf", facility_code="WC19-1D")
+    with patch.object(adapter, "_LIST_FILES_CACHE", adapter._ScopedQueryCache(2)), patch.object(
+        file_service, "list_files", wraps=file_service.list_files
+    ) as list_files:
+        for limit in (1, 2, 1, 3, 2):
+            adapter.list_files(module_code="doc_man", limit=limit)
+        assert adapter._LIST_FILES_CACHE.stats() == {"entries": 2, "hits": 1, "misses": 4}
+    assert list_files.call_count == 4
+
+
+def test_rebuild_directory_cache_follows_directory_writes(file_service) -> None:
+    assert adapter.list_rebuild_directories("WC19-1D") == []
+    with file_service.session_factory() as session:
+        session.add(DocumentRebuildDirectory(facility_code="WC19-1D", directory_name="2025 改造"))
+        session.commit()
+
+    assert [row["directory_name"] for row in adapter.list_rebuild_directories("WC19-1D")] == ["2025 改造"]
+
+
+def test_platform_data_signature_follows_facility_rebuild_directories(file_service) -> None:
+    before = adapter.platform_data_signature("WC19-1D")
+    other = adapter.platform_data_signature("WC9-7")
+    with file_service.session_factory() as session:
+        session.add(DocumentRebuildDirectory(facility_code="WC19-1D", directory_name="2026 改造"))
+        session.commit()
+
+    assert adapter.platform_data_signature("WC19-1D") != before
+    assert adapter.platform_data_signature("WC9-7") == other
+
+
+def test_platform_data_signature_follows_facility_load_items(file_service) -> None:
+    before = adapter.platform_data_signature("WC19-1D")
+    other = adapter.platform_data_signature("WC9-7")
+    file_service.replace_platform_load_information_items("WC19-1D", [{"seq_no": "1", "project_name": "新增组块"}])
+
+    assert adapter.platform_data_signature("WC19-1D") != before
+    assert adapter.platform_data_signature("WC9-7") == other
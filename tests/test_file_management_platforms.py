@@ -52,7 +52,7 @@ def patch_summary_profiles(monkeypatch, source_profiles):
     monkeypatch.setattr(
         platforms,
         "load_platform_summary_source",
-        lambda: SimpleNamespace(profiles=source_profiles),
+        lambda **_kwargs: SimpleNamespace(profiles=source_profiles),
         raising=False,
     )
     monkeypatch.setattr(platforms, "list_facility_profiles", lambda: [])
@@ -65,7 +65,7 @@ def test_platform_profiles_are_cached_until_explicit_refresh(monkeypatch):
         [profile("NEW-1", "New Platform")],
     ]
 
-    def load_source():
+    def load_source(**_kwargs):
         calls.append("load")
         index = min(len(calls) - 1, len(source_profiles) - 1)
         return SimpleNamespace(profiles=source_profiles[index])
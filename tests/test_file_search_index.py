@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from shiyou_db import database, search_index, service as service_module
+from shiyou_db.models import FileRecord, FileSearchGram, FileType, SearchIndexState
+
+
+TITLES = ["导管架结构检测报告", "海缆路由图纸", "SACS 模型说明", "平台改造设计基础"]
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    search_index._clear_search_index_ready_cache()
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'files.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    with session_factory() as session:
+        file_type = FileType(code="doc", name="文档")
+        session.add(file_type)
+        session.flush()
+        now = datetime(2026, 1, 1)
+        # bulk_save_objects 不触发事件，模拟建索引之前已有的数据。
+        session.bulk_save_objects(
+            [
+                FileRecord(
+                    original_name=f"SY-{index % 7:02d}-{index:05d}.pdf",
+                    stored_name=f"{index:05d}.pdf",
+                    file_type_id=file_type.id,
+                    module_code="doc_man",
+                    logical_path=f"WC{index % 3}/设计/{index % 5:02d}",
+                    facility_code=f"WC{index % 3}",
+                    storage_path=f"/bench/{index:05d}.pdf",
+                    document_code=f"SY-{index % 7:02d}-{index:05d}",
+                    document_title=f"{TITLES[index % len(TITLES)]} {index}",
+                    uploaded_at=now,
+                    updated_at=now,
+                    is_deleted=index % 11 == 0,
+                )
+                for index in range(400)
+            ]
+        )
+        session.commit()
+
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = session_factory
+    file_service.storage_root = tmp_path / "storage"
+    yield file_service
+    search_index._clear_search_index_ready_cache()
+
+
+QUERIES = [
+    {"document_code_query": "SY-03"},
+    {"document_code_query": "0012"},
+    {"document_code_query": "wc2/设计"},
+    {"document_title_query": "检测报告"},
+    {"document_title_query": "sacs 模型"},
+    {"document_title_query": "图"},
+    {"document_code_query": "SY-0", "document_title_query": "设计基础"},
+    {"document_title_query": "100%"},
+]
+
+
+def _search(file_service, query: dict) -> tuple[list[int], int]:
+    rows = file_service.list_files(module_code="doc_man", **query)
+    return [row["id"] for row in rows], file_service.count_files(module_code="doc_man", **query)
+
+
+def test_indexed_search_matches_like_scan(file_service) -> None:
+    assert not search_index.search_index_ready(file_service.engine)
+    expected = [_search(file_service, query) for query in QUERIES]
+
+    assert file_service.rebuild_search_index() == 400
+    assert search_index.search_index_ready(file_service.engine)
+
+    assert [_search(file_service, query) for query in QUERIES] == expected
+    assert all(count for _ids, count in expected[:-1])
+
+
+def test_grams_follow_record_changes(file_service, tmp_path: Path) -> None:
+    file_service.rebuild_search_index()
+    source = tmp_path / "ZZ-99-77777 吊装分析.pdf"
+    source.write_bytes(b"%PDF")
+
+    record = file_service.upload_file(str(source), file_type_code="doc", module_code="doc_man", logical_path="WC9/吊装")
+    assert [row["id"] for row in file_service.list_files(document_code_query="zz-99")] == [record["id"]]
+
+    with file_service.session_factory() as session:
+        row = session.get(FileRecord, record["id"])
+        row.document_title = "吊装复核"
+        session.commit()
+    assert file_service.count_files(document_title_query="吊装复核") == 1
+
+    file_service.hard_delete(record["id"])
+    with file_service.session_factory() as session:
+        grams = session.execute(select(FileSearchGram).where(FileSearchGram.record_id == record["id"])).all()
+    assert grams == []
+
+
+def test_query_grams_skip_short_and_whitespace_slices() -> None:
+    assert search_index.query_grams("图") == []
+    assert search_index.query_grams("a b") == []
+    assert search_index.query_grams("SY-0") == ["sy-", "y-0"]
+    assert len(search_index.query_grams("导管架结构检测报告设计基础说明")) == search_index.MAX_QUERY_GRAMS
+
+
+def test_grams_fold_case_and_accents_like_mysql_collation() -> None:
+    assert search_index.query_grams("ＳＡＣＳ") == search_index.query_grams("sacs") == ["acs", "sac"]
+    assert set(search_index.query_grams("CAFÉ")) <= search_index.record_grams(["café 说明"])
+    # 非 ASCII、非汉字的切片不参与过滤，只交给 LIKE。
+    assert search_index.query_grams("ケーソン") == []
+    assert search_index.UNINDEXED_GRAM in search_index.record_grams(["Straße"])
+    assert search_index.UNINDEXED_GRAM not in search_index.record_grams(["导管架 SACS-01（结构）"])
+
+
+def test_folded_records_stay_candidates(file_service) -> None:
+    file_service.rebuild_search_index()
+    tmp = file_service.storage_root.parent / "src"
+    tmp.mkdir()
+    ids = {}
+    for title in ("Café Ⅱ", "Straße"):
+        source = tmp / f"{len(ids)}.pdf"
+        source.write_bytes(b"%PDF")
+        record = file_service.upload_file(str(source), file_type_code="doc", module_code="doc_man", logical_path="WC9/杂项")
+        with file_service.session_factory() as session:
+            session.get(FileRecord, record["id"]).document_title = title
+            session.commit()
+        ids[title] = record["id"]
+
+    def candidates(query: str) -> set[int]:
+        with file_service.session_factory() as session:
+            condition = search_index.search_candidate_condition(FileRecord.id, query)
+            return set(session.execute(select(FileRecord.id).where(condition)).scalars())
+
+    assert ids["Café Ⅱ"] in candidates("CAFE II")
+    assert ids["Straße"] in candidates("strasse")
+
+
+def test_ready_state_is_rechecked_until_built(file_service) -> None:
+    assert not search_index.search_index_ready(file_service.engine)
+    # 其他进程完成回填：本进程不清缓存也能看到。
+    with file_service.session_factory() as session:
+        session.add(SearchIndexState(name=search_index.FILE_RECORDS_INDEX, built_at=datetime(2026, 1, 2)))
+        session.commit()
+    assert search_index.search_index_ready(file_service.engine)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from shiyou_db import service as service_module
+from shiyou_db.service import FileMetadataService
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> FileMetadataService:
+    file_service = FileMetadataService.__new__(FileMetadataService)
+    file_service.storage_root = tmp_path / "storage"
+    return file_service
+
+
+def _store(file_service: FileMetadataService, source: Path, module_code: str = "model_files") -> dict:
+    return file_service._store_file(
+        source,
+        module_code=module_code,
+        logical_path="当前模型/结构模型",
+        facility_code="WC19-1D",
+        category_name=None,
+    )
+
+
+def test_store_hashes_while_copying_and_keeps_readable_names(file_service, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(service_module, "COPY_BUFFER_BYTES", 7)
+    source = tmp_path / "sacinp.JKnew"
+    content = b"JOINT 601L 12.0 13.0 -54.5\n" * 50
+    source.write_bytes(content)
+
+    with patch.object(Path, "exists", side_effect=AssertionError("exists() probe")):
+        first = _store(file_service, source)
+        second = _store(file_service, source)
+
+    assert first["sha256"] == second["sha256"] == hashlib.sha256(content).hexdigest()
+    assert [first["stored_name"], second["stored_name"]] == ["sacinp.JKnew", "sacinp (1).JKnew"]
+    target_dir = Path(first["absolute_path"]).parent
+    assert sorted(path.name for path in target_dir.iterdir()) == ["sacinp (1).JKnew", "sacinp.JKnew"]
+    assert Path(second["absolute_path"]).read_bytes() == content
+    assert Path(first["absolute_path"]).stat().st_mtime == pytest.approx(source.stat().st_mtime)
+
+
+def test_failed_copy_leaves_no_partial_file(file_service, tmp_path: Path) -> None:
+    source = tmp_path / "report.pdf"
+    source.write_bytes(b"%PDF-1.7")
+
+    with patch.object(service_module.shutil, "copystat", side_effect=OSError("share went away")):
+        with pytest.raises(OSError):
+            _store(file_service, source, module_code="special_strategy")
+
+    assert [path for path in file_service.storage_root.rglob("*") if path.is_file()] == []
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import sessionmaker
+
+from feasibility_analysis_services import oilfield_env_service
+from shiyou_db import database, keyed_sync, service as service_module
+from shiyou_db.models import InspectionProject, PlatformLoadInformationItem
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'items.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    file_service.storage_root = tmp_path / "storage"
+    return file_service
+
+
+def _load_row(seq_no: int, **fields) -> dict:
+    return {"seq_no": str(seq_no), "project_name": f"改造{seq_no}", "rebuild_directory_id": "7", **fields}
+
+
+def _ids(file_service) -> dict[int, int]:
+    with file_service.session_factory() as session:
+        return dict(session.execute(select(PlatformLoadInformationItem.seq_no, PlatformLoadInformationItem.id)).all())
+
+
+def test_platform_load_items_keep_ids_and_write_only_changes(file_service) -> None:
+    file_service.replace_platform_load_information_items("WC19-1D", [_load_row(1), _load_row(2), _load_row(3)])
+    before = _ids(file_service)
+
+    saved = file_service.replace_platform_load_information_items(
+        "WC19-1D",
+        [_load_row(1), _load_row(2, total_weight_mt="1200"), _load_row(4)],
+    )
+
+    after = _ids(file_service)
+    assert after[1] == before[1] and after[2] == before[2]
+    assert 3 not in after and 4 in after
+    assert [row["seq_no"] for row in saved] == [1, 2, 4]
+    assert saved[1]["total_weight_mt"] == "1200"
+
+
+def test_sync_reports_each_kind_of_change(file_service) -> None:
+    table = PlatformLoadInformationItem.__table__
+    rows = [{"seq_no": index, "project_name": f"P{index}", "sort_order": index} for index in range(3)]
+    with file_service.engine.begin() as conn:
+        first = keyed_sync.sync_keyed_rows(conn, table, {"facility_code": "A"}, rows, key_columns=("seq_no",))
+        second = keyed_sync.sync_keyed_rows(
+            conn,
+            table,
+            {"facility_code": "A"},
+            [rows[0], {**rows[1], "project_name": "P1'"}, {"seq_no": 5, "project_name": "P5", "sort_order": 5}],
+            key_columns=("seq_no",),
+        )
+        other_scope = conn.execute(
+            select(PlatformLoadInformationItem.id).where(PlatformLoadInformationItem.facility_code == "B")
+        ).all()
+
+    assert (first.inserted, first.updated, first.deleted, first.unchanged) == (3, 0, 0, 0)
+    assert (second.inserted, second.updated, second.deleted, second.unchanged) == (1, 1, 1, 1)
+    assert other_scope == []
+
+
+def test_inspection_findings_revive_matching_rows(file_service) -> None:
+    with file_service.session_factory() as session:
+        project = InspectionProject(project_name="2025 定检", facility_code="WC19-1D", project_type="inspection")
+        session.add(project)
+        session.commit()
+        project_id = project.id
+
+    first = file_service.replace_inspection_findings(project_id, [{"item_code": "N1", "risk_level": "高"}, {"item_code": "N2"}])
+    second = file_service.replace_inspection_findings(project_id, [{"item_code": "N2", "conclusion": "复查"}])
+
+    assert [row["item_code"] for row in second] == ["N2"]
+    assert second[0]["id"] == first[1]["id"]
+    assert second[0]["conclusion"] == "复查"
+
+
+def test_oilfield_metric_items_diff_against_existing_rows(tmp_path: Path) -> None:
+    url = f"sqlite:///{(tmp_path / 'env.sqlite3').as_posix()}"
+    engine = database.build_engine_from_url(url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE oilfield_wind_param_item (id INTEGER PRIMARY KEY AUTOINCREMENT, profile_id INTEGER, "
+                "group_name TEXT, item_name TEXT, return_period INTEGER, value NUMERIC, unit TEXT, sort_order INTEGER)"
+            )
+        )
+    items = [
+        {"group_name": "1小时平均", "item_name": "风速", "return_period": period, "value": value, "unit": "m/s"}
+        for period, value in ((1, 20.5), (100, 41.2))
+    ]
+    oilfield_env_service.replace_metric_items("oilfield_wind_param_item", 3, items, mysql_url=url)
+    before = oilfield_env_service.load_metric_items("oilfield_wind_param_item", 3, mysql_url=url)
+
+    items[1]["value"] = 42.0
+    oilfield_env_service.replace_metric_items("oilfield_wind_param_item", 3, items, mysql_url=url)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, return_period, value FROM oilfield_wind_param_item ORDER BY id")).all()
+
+    assert len(before) == 2
+    assert [(row.return_period, float(row.value)) for row in rows] == [(1, 20.5), (100, 42.0)]
+    assert [row.id for row in rows] == [1, 2]
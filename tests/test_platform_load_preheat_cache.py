@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+import services.platform_load_preheat as preheat
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = preheat._PlatformLoadCache(max_entries=3, max_bytes=1024 * 1024)
+    monkeypatch.setattr(preheat, "_PLATFORM_LOAD_DATA_CACHE", cache)
+    signatures: dict[str, object] = {}
+    monkeypatch.setattr(preheat, "platform_data_signature", lambda code: signatures.get(code, (1, 1)))
+    yield signatures
+
+
+def _payload(code: str, rows: int = 3) -> dict:
+    return {
+        "facility_code": code,
+        "profile": {"facility_code": code, "facility_name": f"{code} 平台"},
+        "rows": [{"seq_no": str(index), "project_name": f"P{index}"} for index in range(rows)],
+        "rebuild_projects": [],
+        "rebuild_error": "",
+    }
+
+
+def test_hits_return_the_same_read_only_payload() -> None:
+    preheat.store_platform_load_data_cache(_payload("WC19-1D"))
+
+    first = preheat.get_platform_load_data_cache("WC19-1D")
+    second = preheat.get_platform_load_data_cache("WC19-1D")
+    assert first is second
+    assert isinstance(first, dict) and isinstance(first["rows"], list)
+    assert first["rows"][1] == {"seq_no": "1", "project_name": "P1"}
+
+    with pytest.raises(TypeError):
+        first["rows"].append({})
+    with pytest.raises(TypeError):
+        first["profile"]["facility_name"] = "changed"
+
+    editable = copy.deepcopy(first)
+    editable["rows"].append({"seq_no": "9"})
+    assert type(editable) is dict and len(first["rows"]) == 3
+
+
+def test_recent_facilities_stay_cached_and_oldest_is_evicted() -> None:
+    for code in ("A", "B", "C"):
+        preheat.store_platform_load_data_cache(_payload(code))
+    assert preheat.get_platform_load_data_cache("A") is not None
+
+    preheat.store_platform_load_data_cache(_payload("D"))
+
+    assert preheat.get_platform_load_data_cache("B") is None
+    assert [code for code in "ACD" if preheat.get_platform_load_data_cache(code) is None] == []
+    stats = preheat.platform_load_cache_stats()
+    assert stats["entries"] == 3 and stats["evictions"] == 1 and stats["bytes"] > 0
+
+
+def test_byte_budget_limits_cache_size(monkeypatch) -> None:
+    monkeypatch.setattr(preheat, "_PLATFORM_LOAD_DATA_CACHE", preheat._PlatformLoadCache(max_entries=10, max_bytes=1))
+    preheat.store_platform_load_data_cache(_payload("A", rows=50))
+    preheat.store_platform_load_data_cache(_payload("B", rows=50))
+
+    assert preheat.get_platform_load_data_cache("A") is None
+    assert preheat.get_platform_load_data_cache("B") is not None
+    assert preheat.platform_load_cache_stats()["entries"] == 1
+
+
+def test_version_change_invalidates_only_that_facility(fresh_cache) -> None:
+    signatures = fresh_cache
+    preheat.store_platform_load_data_cache(_payload("A"))
+    preheat.store_platform_load_data_cache(_payload("B"))
+
+    signatures["A"] = (2, 1)
+
+    assert preheat.get_platform_load_data_cache("A") is None
+    assert preheat.get_platform_load_data_cache("B") is not None
+
+
+def test_local_writes_drop_only_unversioned_entries(fresh_cache) -> None:
+    signatures = fresh_cache
+    signatures["A"] = None
+    preheat.store_platform_load_data_cache(_payload("A"))
+    preheat.store_platform_load_data_cache(_payload("B"))
+
+    preheat.platform_load_data_changed()
+
+    assert preheat.get_platform_load_data_cache("A") is None
+    assert preheat.get_platform_load_data_cache("B") is not None
+
+
+def test_preheat_other_facility_keeps_default_cached(monkeypatch) -> None:
+    loads: list[str] = []
+
+    def load(code, defaults):
+        loads.append(code)
+        return _payload(code)
+
+    monkeypatch.setattr(preheat, "default_platform", lambda: {"facility_code": "DEFAULT"})
+    monkeypatch.setattr(preheat, "load_platform_load_payload", load)
+
+    assert preheat.preheat_platform_load_data()
+    assert preheat.preheat_platform_load_data(facility_code="OTHER")
+    assert preheat.preheat_platform_load_data()
+
+    assert loads == ["DEFAULT", "OTHER"]
+    assert preheat.get_platform_load_data_cache("DEFAULT")["facility_code"] == "DEFAULT"
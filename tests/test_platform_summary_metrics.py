@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import sessionmaker
+
+from services import platform_summary_source
+from shiyou_db import database, platform_summary, service as service_module
+from shiyou_db.models import PlatformSummaryMetric, SearchIndexState
+
+_COLUMNS = ["分公司", "作业公司", "设施编码", "设施名称", "投产时间", "设计年限"]
+
+
+@pytest.fixture()
+def file_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'summary.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    file_service = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    file_service.engine = engine
+    file_service.session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    file_service.storage_root = tmp_path / "storage"
+    file_service.rebuild_platform_summary_metrics()
+    yield file_service
+    platform_summary._clear_platform_summary_ready_cache()
+
+
+def _metric_ids(file_service) -> dict[tuple[str, str], int]:
+    with file_service.session_factory() as session:
+        rows = session.execute(
+            select(PlatformSummaryMetric.facility_code, PlatformSummaryMetric.metric, PlatformSummaryMetric.id)
+        ).all()
+    return {(code, metric): row_id for code, metric, row_id in rows}
+
+
+def test_snapshot_profiles_come_from_normalized_rows(file_service) -> None:
+    rows = [
+        ["湛江分公司", "文昌作业公司", "WC19-1D", "WC19-1D平台", "2013-07-15", "15"],
+        ["湛江分公司", "文昌作业公司", "WC9-7", "WC9-7平台", "2010-01-01", "20"],
+    ]
+    file_service.save_platform_summary_snapshot(_COLUMNS, rows)
+    before = _metric_ids(file_service)
+
+    rows[1][5] = "25"
+    file_service.save_platform_summary_snapshot(_COLUMNS, rows)
+    after = _metric_ids(file_service)
+
+    assert before == after
+    profiles = file_service.list_platform_summary_profiles()
+    expected = platform_summary_source.profiles_from_platform_summary_snapshot({"columns": _COLUMNS, "rows": rows})
+    assert profiles == expected
+    assert profiles[1]["design_life"] == "25"
+
+
+def test_summary_source_skips_snapshot_blob_when_profiles_are_normalized(file_service) -> None:
+    file_service.save_platform_summary_snapshot(_COLUMNS, [["湛江", "文昌", "WC19-1D", "平台", "2013", "15"]])
+
+    with patch.object(
+        platform_summary_source, "load_platform_summary_profiles", side_effect=file_service.list_platform_summary_profiles
+    ), patch.object(platform_summary_source, "load_platform_summary_snapshot", side_effect=AssertionError("blob")):
+        source = platform_summary_source.load_platform_summary_source(include_snapshot=False)
+
+    assert source.source == "snapshot"
+    assert [profile["facility_code"] for profile in source.profiles] == ["WC19-1D"]
+
+
+def test_load_metrics_follow_item_replacement(file_service) -> None:
+    file_service.replace_platform_load_information_items(
+        "WC19-1D",
+        [
+            {"seq_no": "0", "total_weight_mt": "1000", "overall_assessment": "是"},
+            {"seq_no": "1", "total_weight_mt": "1100", "weight_delta_mt": "100", "overall_assessment": "/"},
+        ],
+    )
+    file_service.replace_platform_load_information_items("WC9-7", [{"seq_no": "0", "total_weight_mt": "900"}])
+
+    metrics = file_service.list_platform_load_metrics()
+    assert metrics["WC19-1D"]["latest_total_weight_mt"] == "1100"
+    assert metrics["WC19-1D"]["latest_weight_delta_mt"] == "100"
+    assert metrics["WC19-1D"][platform_summary.OVERALL_ASSESSMENT_COUNT] == "1"
+    assert file_service.aggregate_platform_summary_metric("latest_total_weight_mt") == {
+        "count": 2,
+        "sum": 2000.0,
+        "min": 900.0,
+        "max": 1100.0,
+        "avg": 1000.0,
+    }
+
+    file_service.replace_platform_load_information_items("WC9-7", [])
+    assert set(file_service.list_platform_load_metrics()) == {"WC19-1D"}
+
+
+def test_rebuild_backfills_existing_data(file_service) -> None:
+    file_service.save_platform_summary_snapshot(_COLUMNS, [["湛江", "文昌", "WC19-1D", "平台", "2013", "15"]])
+    file_service.replace_platform_load_information_items("WC19-1D", [{"seq_no": "0", "total_weight_mt": "1000"}])
+    with file_service.engine.begin() as conn:
+        conn.execute(delete(PlatformSummaryMetric))
+        conn.execute(delete(SearchIndexState))
+    platform_summary._clear_platform_summary_ready_cache()
+    assert file_service.list_platform_summary_profiles() is None
+
+    assert file_service.rebuild_platform_summary_metrics() == 2
+    assert [profile["facility_code"] for profile in file_service.list_platform_summary_profiles()] == ["WC19-1D"]
+    assert file_service.list_platform_load_metrics(["WC19-1D"])["WC19-1D"]["latest_total_weight_mt"] == "1000"
@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
-from services.preheat_scheduler import PreheatTask, run_preheat_tasks
+import threading
+import time
+
+import pytest
+
+from services.preheat_scheduler import PreheatScheduler, PreheatTask, run_preheat_tasks
 
 
 def test_run_preheat_tasks_executes_tasks_in_order() -> None:
@@ -57,3 +62,109 @@ def test_run_preheat_tasks_pauses_between_tasks_only() -> None:
     )
 
     assert pauses == [0.2, 0.2]
+
+
+def test_scheduler_respects_dependencies_and_priority() -> None:
+    calls: list[str] = []
+
+    scheduler = PreheatScheduler(
+        [
+            PreheatTask("low", lambda: calls.append("low"), priority=1, depends_on=("base",)),
+            PreheatTask("high", lambda: calls.append("high"), priority=9, depends_on=("base",)),
+            PreheatTask("base", lambda: calls.append("base")),
+        ],
+        max_workers=1,
+    )
+    results = scheduler.run()
+
+    assert calls == ["base", "high", "low"]
+    assert all(item.status == "done" and item.duration_ms >= 0 for item in results)
+
+
+def test_scheduler_runs_independent_tasks_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=2)
+
+    scheduler = PreheatScheduler(
+        [PreheatTask("a", barrier.wait), PreheatTask("b", barrier.wait)],
+        max_workers=2,
+    )
+
+    assert [item.status for item in scheduler.run()] == ["done", "done"]
+
+
+def test_scheduler_skips_tasks_whose_dependency_failed() -> None:
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    results = PreheatScheduler(
+        [PreheatTask("bad", fail), PreheatTask("child", lambda: None, depends_on=("bad",))],
+        max_workers=1,
+    ).run()
+
+    assert {item.name: item.status for item in results} == {"bad": "failed", "child": "skipped"}
+
+
+def test_summary_is_logged_once_when_the_last_tasks_are_skipped(capsys) -> None:
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    scheduler = PreheatScheduler(
+        [
+            PreheatTask("bad", fail),
+            PreheatTask("child", lambda: None, depends_on=("bad",)),
+            PreheatTask("grandchild", lambda: None, depends_on=("child",)),
+        ],
+        max_workers=2,
+    )
+    scheduler.run()
+    for thread in scheduler._threads:
+        thread.join(timeout=5)
+
+    summaries = [line for line in capsys.readouterr().out.splitlines() if line.startswith("[preheat]")]
+    assert len(summaries) == 1
+    assert "child=skipped" in summaries[0] and "grandchild=skipped" in summaries[0]
+
+
+def test_scheduler_rejects_unknown_and_cyclic_dependencies() -> None:
+    with pytest.raises(ValueError):
+        PreheatScheduler([PreheatTask("a", lambda: None, depends_on=("missing",))])
+    with pytest.raises(ValueError):
+        PreheatScheduler(
+            [PreheatTask("a", lambda: None, depends_on=("b",)), PreheatTask("b", lambda: None, depends_on=("a",))]
+        )
+
+
+def test_navigation_hint_runs_page_tasks_while_user_is_busy() -> None:
+    calls: list[str] = []
+    scheduler = PreheatScheduler(
+        [
+            PreheatTask("base", lambda: calls.append("base")),
+            PreheatTask("other", lambda: calls.append("other"), priority=9),
+            PreheatTask("page_data", lambda: calls.append("page_data"), depends_on=("base",), pages=("pages.demo_page",)),
+        ],
+        max_workers=1,
+        idle_check=lambda: False,
+        max_defer_seconds=60,
+    )
+    scheduler.start()
+    time.sleep(0.15)
+    assert calls == []
+
+    assert scheduler.prioritize_page("pages.demo_page") == ["page_data"]
+    assert not scheduler.wait(timeout=0.3)
+    assert calls == ["base", "page_data"]
+    assert [item.name for item in scheduler.results()] == ["base", "page_data"]
+
+
+def test_busy_user_only_defers_tasks_up_to_the_limit() -> None:
+    calls: list[str] = []
+    scheduler = PreheatScheduler(
+        [PreheatTask("only", lambda: calls.append("only"))],
+        idle_check=lambda: False,
+        max_defer_seconds=0.2,
+    )
+    started = time.perf_counter()
+
+    assert scheduler.run()[0].wait_ms >= 150
+    assert calls == ["only"]
+    assert time.perf_counter() - started < 2
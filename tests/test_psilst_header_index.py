@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPORT_MODULE_ROOT = PROJECT_ROOT / "pages" / "output_feasibility_analysis_report"
+if str(REPORT_MODULE_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPORT_MODULE_ROOT))
+
+from src.parsers.block_utils import extract_block, find_first_index, find_next_index, index_lines  # noqa: E402
+from src.parsers.joint_can_summary_parser import parse_joint_can_summary  # noqa: E402
+from src.parsers.psilst_reader import PsilstLines  # noqa: E402
+
+
+JOINT_MARKER = "* * J O I N T   C A N   S U M M A R Y * *"
+LINES = [
+    "SEASTATE BASIC LOAD CASE DESCRIPTIONS",
+    "1 OP1 OPERATING CASE",
+    JOINT_MARKER,
+    "(UNITY CHECK ORDER)",
+    " 636W  61.000    1.600    355.000   0.329   2.600     61.000    1.600    355.000   0.329     2.600   W643   EL1A",
+    "\x0c",
+    "  PILE GROUP SUMMARY",
+    JOINT_MARKER,
+    " 637W  61.000    1.600    355.000   0.412   2.600     61.000    1.600    355.000   0.412     2.600   W644   EL1B",
+]
+
+
+def _linear_find(lines: list[str], markers: list[str], start: int) -> int:
+    return next((index for index in range(start, len(lines)) if any(marker in lines[index] for marker in markers)), -1)
+
+
+def test_indexed_lookup_matches_linear_scan(tmp_path: Path) -> None:
+    listing = tmp_path / "psilst.factor"
+    listing.write_bytes("\n".join(LINES).encode("latin-1"))
+
+    for lines in (index_lines(LINES), index_lines(PsilstLines(str(listing)))):
+        for start in range(len(LINES) + 1):
+            assert find_first_index(lines, JOINT_MARKER, start) == _linear_find(LINES, [JOINT_MARKER], start)
+            assert find_next_index(lines, ["PILE GROUP", "OP1", "absent"], start) == _linear_find(
+                LINES, ["PILE GROUP", "OP1", "absent"], start
+            )
+        assert extract_block(lines, JOINT_MARKER, ["PILE GROUP"]) == LINES[2:6]
+        assert parse_joint_can_summary(lines) == parse_joint_can_summary(LINES)
+
+
+def test_header_index_positions_prefix_and_pattern() -> None:
+    lines = index_lines(LINES)
+    header_index = lines.header_index
+
+    assert index_lines(lines) is lines
+    assert header_index.positions(JOINT_MARKER) == [2, 7]
+    assert header_index.find(JOINT_MARKER, 3) == 7
+    assert header_index.find_prefix("PILE GROUP") == 6
+    assert header_index.find_prefix("GROUP SUMMARY") == -1
+    assert header_index.find_pattern(r"W64\d\s+EL1B") == 8
+    assert header_index.pattern_positions(r"^\s*\d+\s+OP") == [1]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPORT_MODULE_ROOT = PROJECT_ROOT / "pages" / "output_feasibility_analysis_report"
+if str(REPORT_MODULE_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPORT_MODULE_ROOT))
+
+from src.parsers import psilst_reader  # noqa: E402
+from src.parsers.block_utils import extract_block, find_first_index  # noqa: E402
+from src.parsers.joint_can_summary_parser import parse_joint_can_summary  # noqa: E402
+from src.parsers.member_group_summary_parser import parse_member_group_summary  # noqa: E402
+from src.parsers.psilst_reader import PsilstLines, read_lines  # noqa: E402
+
+
+MEMBER_MARKER = "* * *  M E M B E R  G R O U P  S U M M A R Y  * * *"
+JOINT_MARKER = "* * J O I N T   C A N   S U M M A R Y * *"
+LISTING_LINES = [
+    "\ufeff SACS CONNECT EDITION  测试",
+    MEMBER_MARKER,
+    "1A1 601L-611L OP17   0.43   0.9    -54.5   33.1    1.8   .2E+03 .6E+06 .3E+03 .3E+03   HYDRO    0.92   0.92   0.85   0.85",
+    "\x0c",
+    JOINT_MARKER,
+    "(UNITY CHECK ORDER)",
+    "                                      LOAD    STRN                                  LOAD    STRN    BRACE   LOAD",
+    " 636W  61.000    1.600    355.000   0.329   2.600     61.000    1.600    355.000   0.329     2.600   W643   EL1A",
+    "\x0c",
+    "tail without newline",
+]
+
+
+@pytest.fixture()
+def listing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # 缩小索引块和解码窗口，让少量行也跨越多个块。
+    monkeypatch.setattr(psilst_reader, "_LINE_INDEX_BLOCK_BYTES", 64)
+    monkeypatch.setattr(psilst_reader, "_LINE_WINDOW_BYTES", 100)
+    factor_path = tmp_path / "psilst.factor"
+    factor_path.write_bytes("\r\n".join(LISTING_LINES).encode("utf-8"))
+    return factor_path
+
+
+def test_lazy_view_matches_full_read(listing: Path) -> None:
+    full = read_lines(str(listing))
+    view = PsilstLines(str(listing))
+
+    assert isinstance(full, list)
+    assert full[0] == " SACS CONNECT EDITION  测试"
+    assert list(view) == full
+    assert len(view) == len(full)
+    assert view[-1] == full[-1] == "tail without newline"
+    assert view[2:8] == full[2:8]
+    assert view[::3] == full[::3]
+    assert view.find_line([JOINT_MARKER]) == full.index(JOINT_MARKER)
+    assert view.find_line(["测试"]) == 0
+    assert view.find_line([MEMBER_MARKER], 2) == -1
+    view.close()
+
+
+def test_parsers_give_same_results_above_full_read_limit(listing: Path) -> None:
+    full = read_lines(str(listing))
+    with patch("src.parsers.psilst_reader.os.path.getsize", return_value=1024 * 1024 * 1024):
+        view = read_lines(str(listing))
+
+    assert isinstance(view, PsilstLines)
+    assert find_first_index(view, JOINT_MARKER) == find_first_index(full, JOINT_MARKER)
+    assert extract_block(view, MEMBER_MARKER, [JOINT_MARKER]) == extract_block(full, MEMBER_MARKER, [JOINT_MARKER])
+    assert parse_member_group_summary(view) == parse_member_group_summary(full)
+    assert parse_joint_can_summary(view) == parse_joint_can_summary(full)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPORT_MODULE_ROOT = PROJECT_ROOT / "pages" / "output_feasibility_analysis_report"
+if str(REPORT_MODULE_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPORT_MODULE_ROOT))
+
+from src.parsers.joint_can_summary_parser import parse_joint_can_summary  # noqa: E402
+from src.parsers.member_group_summary_parser import parse_member_group_summary  # noqa: E402
+from src.parsers.psilst_reader import read_lines  # noqa: E402
+
+
+def test_result_tables_keep_regex_row_semantics(tmp_path: Path) -> None:
+    listing = tmp_path / "psilst.sample"
+    listing.write_bytes(
+        "\n".join(
+            [
+                "\ufeff SACS CONNECT EDITION  测试",
+                "                      M E M B E R  G R O U P  S U M M A R Y",
+                "   GRUP  CRITICAL  LOAD   MAX.  DIST     * APPLIED STRESSES *",
+                " 1A1 601L-611L OP17   0.43   0.9    -54.5   33.1    1.8   .2E+03 .6E+06 .3E+03 .3E+03   HYDRO    0.92   0.92   0.85   0.85",
+                " 1A2 601L-611L OP17   nan    0.9    -54.5   33.1    1.8   .2E+03 .6E+06 .3E+03 .3E+03   HYDRO    0.92   0.92   0.85   0.85",
+                " 1A3 601L-611L OP17   0.21   0.9    -54.5   33.1    1.8   .2E+03 .6E+06 .3E+03 .3E+03   HYDRO    0.92   0.92   0.85",
+                "                      J O I N T   C A N   S U M M A R Y",
+                "                      (UNITY CHECK ORDER)",
+                "         ORIGINAL                          LOAD    STRN    JOINT   CASE",
+                " 636W  61.000    1.600    355.000   0.329   2.600     61.000    1.600    355.000   0.329     0.100   W643   EL1A",
+                " 637W  61.000    1.600    355.000   0.412   -       61.000    1.600    355.000   0.412     0.100   W644   EL1B",
+                "                      P I L E  G R O U P  S U M M A R Y",
+            ]
+        ).encode("utf-8")
+    )
+
+    lines = read_lines(str(listing))
+    assert lines[0] == " SACS CONNECT EDITION  测试"
+
+    member_rows = parse_member_group_summary(lines)["rows"]
+    assert [row["group_id"] for row in member_rows] == ["1A1"]
+    assert member_rows[0]["unity_check"] == 0.43
+    assert member_rows[0]["crit_cond"] == "HYDRO"
+
+    joint_rows = parse_joint_can_summary(lines)["rows"]
+    assert [row["joint"] for row in joint_rows] == ["636W", "637W"]
+    assert joint_rows[0]["design_strn_uc"] == 0.1
+    assert (joint_rows[0]["brace_joint"], joint_rows[0]["load_case"]) == ("W643", "EL1A")
+    # 不满足整行格式的行走回退分支：尺寸置 0，设计 UC 沿用原始 UC。
+    assert joint_rows[1]["orig_diameter"] == 0.0
+    assert joint_rows[1]["orig_strn_uc"] is None
+    assert joint_rows[1]["design_load_uc"] == joint_rows[1]["orig_load_uc"] == 0.412
+    assert (joint_rows[1]["brace_joint"], joint_rows[1]["load_case"]) == ("W644", "EL1B")
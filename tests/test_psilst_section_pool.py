@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import ast
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPORT_MODULE_ROOT = PROJECT_ROOT / "pages" / "output_feasibility_analysis_report"
+if str(REPORT_MODULE_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPORT_MODULE_ROOT))
+
+from src.parsers.joint_can_summary_parser import parse_joint_can_summary  # noqa: E402
+from src.parsers.member_group_summary_parser import parse_member_group_summary  # noqa: E402
+from src.parsers.psilst_reader import open_psilst_buffer, read_lines, read_ui_analysis_lines  # noqa: E402
+from src.parsers import section_pool  # noqa: E402
+from src.parsers.section_pool import parse_sections  # noqa: E402
+
+
+MEMBER_MARKER = "* * *  M E M B E R  G R O U P  S U M M A R Y  * * *"
+JOINT_MARKER = "* * J O I N T   C A N   S U M M A R Y * *"
+LISTING_LINES = [
+    "          **** LOAD CASE STATUS REPORT ****",
+    MEMBER_MARKER,
+    "1A1 601L-611L OP17   0.43   0.9    -54.5   33.1    1.8   .2E+03 .6E+06 .3E+03 .3E+03   HYDRO    0.92   0.92   0.85   0.85",
+    "\x0c",
+    JOINT_MARKER,
+    "(UNITY CHECK ORDER)",
+    "                                      LOAD    STRN                                  LOAD    STRN    BRACE   LOAD",
+    " 636W  61.000    1.600    355.000   0.329   2.600     61.000    1.600    355.000   0.329     2.600   W643   EL1A",
+    "\x0c",
+]
+
+
+def _write_listing(tmp_path: Path) -> Path:
+    factor_path = tmp_path / "psilst.factor"
+    factor_path.write_bytes("\r\n".join(LISTING_LINES).encode("latin-1"))
+    return factor_path
+
+
+def test_shared_buffer_gives_same_lines_as_separate_reads(tmp_path: Path) -> None:
+    factor_path = _write_listing(tmp_path)
+
+    with open_psilst_buffer(str(factor_path)) as buffer:
+        shared = (
+            list(read_lines(str(factor_path), buffer=buffer)),
+            read_ui_analysis_lines(str(factor_path), buffer=buffer),
+        )
+
+    assert shared == (read_lines(str(factor_path)), read_ui_analysis_lines(str(factor_path)))
+    assert shared[0] == LISTING_LINES
+
+
+def test_parse_sections_in_pool_matches_serial_order_and_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    lines = read_lines(str(_write_listing(tmp_path)))
+    parsers = {"joint": parse_joint_can_summary, "member": parse_member_group_summary}
+    serial = {key: parser(lines) for key, parser in parsers.items()}
+
+    monkeypatch.setenv("SHIYOU_PSILST_PARALLEL_MIN_LINES", "1")
+    monkeypatch.setenv("SHIYOU_PSILST_PARSE_WORKERS", "2")
+    pooled = parse_sections(lines, parsers)
+
+    assert list(pooled) == ["joint", "member"]
+    assert pooled == serial
+    assert [row["joint"] for row in pooled["joint"]["rows"]] == ["636W"]
+
+
+def test_parse_sections_runs_unpicklable_parsers_serially(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SHIYOU_PSILST_PARALLEL_MIN_LINES", "1")
+    monkeypatch.setenv("SHIYOU_PSILST_PARSE_WORKERS", "2")
+
+    result = parse_sections(["a", "b"], {"count": lambda lines: len(lines), "first": lambda lines: lines[0]})
+
+    assert result == {"count": 2, "first": "a"}
+
+
+def test_frozen_build_still_parses_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setenv("SHIYOU_PSILST_PARSE_WORKERS", "4")
+    assert section_pool._parallel_workers(8) == 4
+
+
+def test_main_calls_freeze_support_before_running_workers() -> None:
+    tree = ast.parse((PROJECT_ROOT / "main.py").read_text(encoding="utf-8"))
+    main_block = next(
+        node for node in tree.body if isinstance(node, ast.If) and "__main__" in ast.unparse(node.test)
+    )
+    calls = [ast.unparse(node.func) for node in ast.walk(main_block) if isinstance(node, ast.Call)]
+    assert calls.index("multiprocessing.freeze_support") < calls.index("maybe_run_auxiliary_worker")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from shiyou_db import database, query_profiler
+
+
+@pytest.fixture()
+def engine(tmp_path: Path):
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'profile.sqlite3').as_posix()}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (id, name) VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+    query_profiler.enable_query_profiling()
+    query_profiler.reset_query_stats()
+    yield engine
+    query_profiler.enable_query_profiling(False)
+    query_profiler.reset_query_stats()
+
+
+def test_normalize_sql_groups_statements_by_shape() -> None:
+    shapes = {
+        query_profiler.normalize_sql("SELECT * FROM t1 WHERE id = 3 AND name = 'x'"),
+        query_profiler.normalize_sql("SELECT *  FROM t1\nWHERE id = ? AND name = ?"),
+        query_profiler.normalize_sql("SELECT * FROM t1 WHERE id = :id_1 AND name = %(name)s"),
+    }
+    assert shapes == {"SELECT * FROM t1 WHERE id = ? AND name = ?"}
+    assert query_profiler.normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3)") == query_profiler.normalize_sql(
+        "SELECT * FROM t WHERE id IN (?)"
+    )
+
+
+def test_repeated_shape_in_scope_is_reported_as_n_plus_one(engine, capsys) -> None:
+    with query_profiler.query_scope("GET /api/files/strategy-inputs"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id, name FROM items")).all()
+            for item_id in range(query_profiler.N_PLUS_ONE_THRESHOLD):
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id}).all()
+
+    suspects = query_profiler.suspected_n_plus_one()
+    assert suspects == [
+        {
+            "scope": "GET /api/files/strategy-inputs",
+            "shape": "SELECT name FROM items WHERE id = ?",
+            "count": query_profiler.N_PLUS_ONE_THRESHOLD,
+        }
+    ]
+    assert "suspected N+1 in GET /api/files/strategy-inputs" in capsys.readouterr().out
+
+    hotspots = {item["shape"]: item for item in query_profiler.query_hotspots()}
+    per_id = hotspots["SELECT name FROM items WHERE id = ?"]
+    assert per_id["count"] == query_profiler.N_PLUS_ONE_THRESHOLD
+    assert per_id["n_plus_one_scopes"] == {"GET /api/files/strategy-inputs": query_profiler.N_PLUS_ONE_THRESHOLD}
+    assert hotspots["SELECT id, name FROM items"]["n_plus_one_scopes"] == {}
+
+
+def test_disabled_profiling_records_nothing(engine) -> None:
+    query_profiler.enable_query_profiling(False)
+    with query_profiler.query_scope("idle"), engine.connect() as conn:
+        conn.execute(text("SELECT 1")).all()
+
+    assert query_profiler.query_hotspots() == []
+
+
+def test_hotspots_are_ordered_by_total_time() -> None:
+    query_profiler.reset_query_stats()
+    query_profiler.record_statement("SELECT a FROM t WHERE id = 1", 5.0)
+    query_profiler.record_statement("SELECT a FROM t WHERE id = 2", 5.0)
+    query_profiler.record_statement("SELECT b FROM u", 8.0)
+    try:
+        hotspots = query_profiler.query_hotspots()
+    finally:
+        query_profiler.reset_query_stats()
+
+    assert [(item["shape"], item["count"], item["total_ms"]) for item in hotspots] == [
+        ("SELECT a FROM t WHERE id = ?", 2, 10.0),
+        ("SELECT b FROM u", 1, 8.0),
+    ]
+    assert "rows" not in hotspots[0]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from feasibility_analysis_services import oilfield_env_service
+from services import inspection_business_db_adapter, reference_mirror
+from shiyou_db import database, local_mirror, service as service_module
+from shiyou_db.change_versions import FACILITY_PROFILE_SCOPE
+from shiyou_db.models import FacilityProfile
+
+
+@pytest.fixture()
+def remote_service(tmp_path: Path) -> service_module.FileMetadataService:
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'remote.sqlite3').as_posix()}")
+    database.Base.metadata.create_all(engine)
+    remote = service_module.FileMetadataService.__new__(service_module.FileMetadataService)
+    remote.engine = engine
+    remote.session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+    remote.storage_root = tmp_path / "storage"
+    return remote
+
+
+@pytest.fixture()
+def mirror(tmp_path: Path, remote_service):
+    source = local_mirror.MirrorSource(
+        reference_mirror.FACILITY_PROFILES,
+        FacilityProfile.__table__,
+        lambda: remote_service.engine,
+        reference_mirror._versioned_signature(FacilityProfile, FACILITY_PROFILE_SCOPE),
+    )
+    mirror = local_mirror.set_active_mirror(
+        local_mirror.ReferenceMirror(tmp_path / "mirror.sqlite3", [source, *oilfield_env_service.oilfield_mirror_sources()])
+    )
+    yield mirror
+    local_mirror.set_active_mirror(None)
+
+
+def test_facility_profiles_are_answered_locally_after_sync(remote_service, mirror) -> None:
+    remote_service.upsert_facility_profile("WC19-1D", facility_name="WC19-1D平台", branch="湛江分公司")
+    assert reference_mirror.reference_service(reference_mirror.FACILITY_PROFILES) is None
+
+    assert mirror.sync(reference_mirror.FACILITY_PROFILES) == {reference_mirror.FACILITY_PROFILES: True}
+    assert mirror.sync(reference_mirror.FACILITY_PROFILES) == {reference_mirror.FACILITY_PROFILES: False}
+
+    with patch.object(inspection_business_db_adapter, "_get_service", side_effect=AssertionError("remote read")):
+        profiles = inspection_business_db_adapter.list_facility_profiles()
+    assert profiles == remote_service.list_facility_profiles()
+
+    remote_service.upsert_facility_profile("WC19-1D", facility_name="WC19-1D 中心平台")
+    assert mirror.sync(reference_mirror.FACILITY_PROFILES) == {reference_mirror.FACILITY_PROFILES: True}
+    local = reference_mirror.reference_service(reference_mirror.FACILITY_PROFILES)
+    assert local.list_facility_profiles()[0]["facility_name"] == "WC19-1D 中心平台"
+
+
+def test_writes_go_to_remote_and_invalidate_local_copy(remote_service, mirror, tmp_path: Path) -> None:
+    mirror.sync(reference_mirror.FACILITY_PROFILES)
+
+    with patch.object(inspection_business_db_adapter, "_get_service", return_value=remote_service):
+        inspection_business_db_adapter.save_facility_profile("WC9-7", {"facility_name": "WC9-7平台"})
+        assert reference_mirror.reference_service(reference_mirror.FACILITY_PROFILES) is None
+        assert [row["facility_code"] for row in inspection_business_db_adapter.list_facility_profiles()] == ["WC9-7"]
+
+    # 重启后从本地状态恢复，同步前不会读到作废的副本。
+    reopened = local_mirror.ReferenceMirror(tmp_path / "mirror.sqlite3", list(mirror.sources.values()))
+    assert not reopened.ready(reference_mirror.FACILITY_PROFILES)
+    reopened.sync()
+    assert reopened.ready(reference_mirror.FACILITY_PROFILES)
+    assert reopened.last_errors.keys() == set(oilfield_env_service.MIRRORED_ITEM_TABLES)
+
+
+def test_invalidate_during_fetch_discards_stale_rows(remote_service, tmp_path: Path) -> None:
+    remote_service.upsert_facility_profile("WC19-1D", facility_name="WC19-1D平台")
+    fetching = threading.Event()
+    release = threading.Event()
+    signature = reference_mirror._versioned_signature(FacilityProfile, FACILITY_PROFILE_SCOPE)
+
+    def slow_signature(conn):
+        fetching.set()
+        assert release.wait(5)
+        return signature(conn)
+
+    source = local_mirror.MirrorSource(
+        reference_mirror.FACILITY_PROFILES, FacilityProfile.__table__, lambda: remote_service.engine, slow_signature
+    )
+    mirror = local_mirror.ReferenceMirror(tmp_path / "slow.sqlite3", [source])
+    results: list[dict[str, bool]] = []
+    worker = threading.Thread(target=lambda: results.append(mirror.sync()))
+    worker.start()
+    assert fetching.wait(5)
+
+    # 远端拉取不持锁，作废立即返回。
+    invalidator = threading.Thread(target=mirror.invalidate, args=(reference_mirror.FACILITY_PROFILES,))
+    invalidator.start()
+    invalidator.join(2)
+    assert not invalidator.is_alive()
+
+    release.set()
+    worker.join(5)
+    assert results == [{reference_mirror.FACILITY_PROFILES: False}]
+    assert not mirror.ready(reference_mirror.FACILITY_PROFILES)
+
+    assert mirror.sync() == {reference_mirror.FACILITY_PROFILES: True}
+    local_mirror.set_active_mirror(mirror)
+    try:
+        service = reference_mirror.reference_service(reference_mirror.FACILITY_PROFILES)
+        assert service.read_session_factory is mirror.session_factory
+        assert service.list_facility_profiles()[0]["facility_name"] == "WC19-1D平台"
+    finally:
+        local_mirror.set_active_mirror(None)
+
+
+def test_oilfield_items_are_read_from_mirror(tmp_path: Path, mirror) -> None:
+    url = f"sqlite:///{(tmp_path / 'env.sqlite3').as_posix()}"
+    engine = database.build_engine_from_url(url)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE oilfield_wind_param_item (id INTEGER PRIMARY KEY AUTOINCREMENT, profile_id INTEGER, "
+                "group_name TEXT, item_name TEXT, return_period INTEGER, value NUMERIC, unit TEXT, sort_order INTEGER, "
+                "updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+    items = [{"group_name": "1小时平均", "item_name": "风速", "return_period": 100, "value": 41.2, "unit": "m/s"}]
+
+    with patch.object(oilfield_env_service, "_default_mysql_url", return_value=url):
+        oilfield_env_service.replace_metric_items("oilfield_wind_param_item", 3, items)
+        assert mirror.sync("oilfield_wind_param_item") == {"oilfield_wind_param_item": True}
+
+        with patch.object(oilfield_env_service, "_create_mysql_engine", side_effect=AssertionError("remote read")):
+            rows = oilfield_env_service.load_metric_items("oilfield_wind_param_item", 3)
+        assert [(row["item_name"], row["return_period"], float(row["value"])) for row in rows] == [("风速", 100, 41.2)]
+
+        items[0]["value"] = 42.0
+        oilfield_env_service.replace_metric_items("oilfield_wind_param_item", 3, items)
+        assert not mirror.ready("oilfield_wind_param_item")
+        assert float(oilfield_env_service.load_metric_items("oilfield_wind_param_item", 3)[0]["value"]) == 42.0
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import services.result_factor_scanner as scanner
+
+
+LISTING = "\n".join(
+    [
+        "SACS ANALYSIS",
+        "                    FORCE SUMMARY",
+        "  Fx = 12.5  Fy = -3.0  Fz = 400",
+        "  Mx = 1  My = 2  Mz = 3",
+        "  操作工况 安全系数 1.52",
+        "  极端工况 安全系数 1.31",
+    ]
+)
+
+
+class ResultFactorScannerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        scanner.clear_result_factor_cache()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "psilst.factor")
+        with open(self.path, "w", encoding="utf-8") as handle:
+            handle.write(LISTING)
+
+    def tearDown(self) -> None:
+        scanner.clear_result_factor_cache()
+        self._tmp.cleanup()
+
+    def test_batch_scans_each_distinct_file_once_and_reports_each_result(self) -> None:
+        copy_path = os.path.join(self._tmp.name, "psilst.copy")
+        shutil.copyfile(self.path, copy_path)
+        missing_path = os.path.join(self._tmp.name, "psilst.missing")
+        delivered = []
+
+        with patch.object(
+            scanner,
+            "parse_result_factor_file",
+            wraps=scanner.parse_result_factor_file,
+        ) as parse_file:
+            results = scanner.scan_result_factor_files(
+                [self.path, self.path, copy_path, missing_path],
+                max_workers=2,
+                on_result=lambda path, outcome: delivered.append(path),
+            )
+
+        self.assertEqual(1, parse_file.call_count)
+        self.assertCountEqual([self.path, copy_path, missing_path], delivered)
+        self.assertEqual("12", results[self.path]["Fx"])
+        self.assertEqual("1.31", results[copy_path]["极端工况"])
+        self.assertEqual(results[self.path], results[copy_path])
+        self.assertIsInstance(results[missing_path], OSError)
+
+    def test_cached_values_follow_file_changes(self) -> None:
+        self.assertIsNone(scanner.get_cached_result_factor_values(self.path))
+
+        scanner.scan_result_factor_files([self.path])
+        self.assertEqual("1.52", scanner.get_cached_result_factor_values(self.path)["操作工况"])
+
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write("\n")
+        os.utime(self.path, ns=(0, 0))
+        self.assertIsNone(scanner.get_cached_result_factor_values(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gc
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from services import server_file_service
+from shiyou_db import database, migrations
+from shiyou_db.models import SchemaMigration
+
+
+@pytest.fixture()
+def engine(tmp_path: Path):
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'schema.sqlite3').as_posix()}")
+    migrations._clear_migration_cache_for_tests()
+    yield engine
+    migrations._clear_migration_cache_for_tests()
+    with migrations._MIGRATION_LOCK:
+        migrations._MIGRATIONS.pop("test_notes", None)
+
+
+def _register(calls: list[int], version: int, *, fail: bool = False) -> None:
+    def apply(conn) -> None:
+        calls.append(version)
+        if fail:
+            raise RuntimeError("ddl failed")
+        conn.execute(text("CREATE TABLE IF NOT EXISTS test_notes (id INTEGER PRIMARY KEY, body TEXT)"))
+
+    migrations.register_migration("test_notes", version, apply)
+
+
+def _recorded_versions(engine) -> dict[str, int]:
+    with engine.connect() as conn:
+        return dict(conn.execute(select(SchemaMigration.name, SchemaMigration.version)).all())
+
+
+def test_migration_runs_once_and_records_version(engine) -> None:
+    calls: list[int] = []
+    _register(calls, 1)
+
+    migrations.ensure_migrations(engine, "test_notes")
+    migrations.ensure_migrations(engine, "test_notes")
+    assert calls == [1]
+    assert _recorded_versions(engine) == {"test_notes": 1}
+
+    # 新进程：读到已记录的版本，不再执行迁移。
+    migrations._clear_migration_cache_for_tests()
+    migrations.ensure_migrations(engine, "test_notes")
+    assert calls == [1]
+
+    migrations._clear_migration_cache_for_tests()
+    _register(calls, 2)
+    migrations.ensure_migrations(engine, "test_notes")
+    assert calls == [1, 2]
+    assert _recorded_versions(engine) == {"test_notes": 2}
+
+
+def test_cached_migration_issues_no_queries(engine) -> None:
+    _register([], 1)
+    migrations.ensure_migrations(engine, "test_notes")
+
+    with patch.object(engine, "begin", side_effect=AssertionError("queried")):
+        migrations.ensure_migrations(engine, "test_notes")
+
+
+def test_failed_migration_is_retried(engine) -> None:
+    calls: list[int] = []
+    _register(calls, 1, fail=True)
+    with pytest.raises(RuntimeError):
+        migrations.ensure_migrations(engine, "test_notes")
+    assert _recorded_versions(engine) == {}
+
+    _register(calls, 1)
+    migrations.ensure_migrations(engine, "test_notes")
+    assert calls == [1, 1]
+    assert _recorded_versions(engine) == {"test_notes": 1}
+
+
+def test_server_file_table_is_introspected_once(engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE file_records (id INTEGER PRIMARY KEY, original_name TEXT, facility_code TEXT)"))
+
+    server_file_service._clear_schema_cache_for_tests()
+    try:
+        with patch.object(server_file_service, "_engine", return_value=engine) as get_engine, patch.object(
+            server_file_service, "get_mysql_url", return_value="sqlite://test"
+        ):
+            for _ in range(3):
+                table = server_file_service._detect_file_table()
+                assert server_file_service._table_columns(table) == {"id", "original_name", "facility_code"}
+        assert get_engine.call_count == 2
+    finally:
+        server_file_service._clear_schema_cache_for_tests()
+
+
+def test_migration_cache_is_released_with_the_engine(tmp_path: Path) -> None:
+    calls: list[int] = []
+    _register(calls, 1)
+    migrations._clear_migration_cache_for_tests()
+    try:
+        # 不走 build_engine_from_url 的进程级缓存，模拟用完即弃的引擎。
+        first = create_engine(f"sqlite:///{(tmp_path / 'released.sqlite3').as_posix()}")
+        migrations.ensure_migrations(first, "test_notes")
+        assert len(migrations._MIGRATED) == 1
+        first.dispose()
+        del first
+        gc.collect()
+        assert len(migrations._MIGRATED) == 0
+
+        # 新引擎（可能复用同一 id）要重新核对版本表，而不是沿用旧引擎的缓存。
+        second = create_engine(f"sqlite:///{(tmp_path / 'fresh.sqlite3').as_posix()}")
+        migrations.ensure_migrations(second, "test_notes")
+        assert calls == [1, 1]
+    finally:
+        migrations._clear_migration_cache_for_tests()
+        with migrations._MIGRATION_LOCK:
+            migrations._MIGRATIONS.pop("test_notes", None)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+import services.special_strategy_state_db as state_db
+from shiyou_db import database
+
+
+@pytest.fixture()
+def strategy_db(tmp_path: Path, monkeypatch):
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'strategy.sqlite3').as_posix()}")
+
+    @event.listens_for(engine, "connect")
+    def _register_char_length(dbapi_connection, _record):
+        dbapi_connection.create_function("CHAR_LENGTH", 1, lambda value: None if value is None else len(value))
+
+    engine.dispose()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE special_strategy_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, facility_code TEXT NOT NULL, "
+                "params_json TEXT, metadata_json TEXT, inputs_json TEXT, intermediate_workbook TEXT NOT NULL, "
+                "output_report TEXT, config_path TEXT, status TEXT NOT NULL DEFAULT 'completed', "
+                "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP, "
+                "report_generated_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE special_strategy_result_snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER, "
+                "facility_code TEXT NOT NULL, result_json TEXT NOT NULL, result_format TEXT, "
+                "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE special_strategy_result_tables (id INTEGER PRIMARY KEY AUTOINCREMENT, snapshot_id INTEGER NOT NULL, "
+                "table_name TEXT NOT NULL, row_count INTEGER NOT NULL DEFAULT 0, columns_json TEXT, encoding TEXT NOT NULL, "
+                "data BLOB NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        conn.execute(text(state_db._RUN_INDEX_DDL))
+    monkeypatch.setattr(state_db, "is_strategy_state_db_configured", lambda _config_path=None: True)
+    monkeypatch.setattr(state_db, "ensure_strategy_run_table", lambda _config_path=None: None)
+    monkeypatch.setattr(state_db, "ensure_strategy_result_table", lambda _config_path=None: None)
+    monkeypatch.setattr(state_db, "_get_engine", lambda _config_path=None: engine)
+    monkeypatch.setattr(state_db, "_get_read_engine", lambda _config_path=None: engine)
+    return engine
+
+
+def _save_run(code: str, *, status: str = "completed", members: int = 3) -> int:
+    run_id = state_db.save_strategy_run(
+        facility_code=code,
+        params={"rule_overrides": {"x": 1}},
+        metadata={"platform_name": code},
+        inputs={"model": "sacinp.JKnew"},
+        intermediate_workbook=f"D:/runtime/{code}/pipeline.xlsx",
+        output_report=None,
+        config_path="config.json",
+        status=status,
+    )
+    state_db.save_strategy_result_snapshot(
+        facility_code=code,
+        run_id=run_id,
+        result_payload={
+            "context": {"member_inspection_total": members, "member_inspection_total_II": 1},
+            "member_risk_rows_full": [{"JointA": f"A{index}"} for index in range(members)],
+            "node_risk_rows_full": [],
+        },
+    )
+    return run_id
+
+
+def test_history_pages_through_index_rows(strategy_db) -> None:
+    run_ids = [_save_run("WC19-1D", members=index + 2) for index in range(5)]
+    failed = _save_run("WC19-1D", status="failed")
+    _save_run("WC9-7")
+    state_db.update_strategy_report(run_ids[-1], output_report="D:/reports/WC19-1D.docx")
+
+    first = state_db.list_strategy_run_index("WC19-1D", limit=4)
+    assert [row["id"] for row in first] == [failed, *reversed(run_ids[-3:])]
+    second = state_db.list_strategy_run_index("WC19-1D", limit=4, before_run_id=first[-1]["run_id"])
+    assert [row["id"] for row in second] == run_ids[:2][::-1]
+
+    latest_completed = state_db.list_strategy_run_index("WC19-1D", limit=1, status="completed")[0]
+    assert latest_completed["run_id"] == run_ids[-1]
+    assert latest_completed["member_count"] == 6
+    assert latest_completed["node_count"] == 0
+    assert latest_completed["summary"] == {"member_inspection_total": 6, "member_inspection_total_II": 1}
+    assert latest_completed["output_report"] == "D:/reports/WC19-1D.docx"
+    assert latest_completed["report_generated_at"] is not None
+    assert "params_json" not in latest_completed
+
+    snapshot = state_db.load_strategy_result_snapshot_by_run(latest_completed["run_id"])
+    assert snapshot["id"] == latest_completed["snapshot_id"]
+
+
+def test_backfill_indexes_runs_saved_before_the_index_existed(strategy_db) -> None:
+    with strategy_db.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO special_strategy_runs (facility_code, intermediate_workbook, status) "
+                "VALUES ('WC19-1D', 'a.xlsx', 'completed'), ('WC19-1D', 'b.xlsx', 'completed')"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO special_strategy_result_snapshots (run_id, facility_code, result_json) "
+                "VALUES (2, 'WC19-1D', '{}'), (2, 'WC19-1D', '{}')"
+            )
+        )
+        assert state_db._backfill_strategy_run_index(conn) == 2
+        assert state_db._backfill_strategy_run_index(conn) == 0
+
+    rows = state_db.list_strategy_run_index("WC19-1D")
+    assert [(row["run_id"], row["snapshot_id"], row["intermediate_workbook"]) for row in rows] == [
+        (2, 2, "b.xlsx"),
+        (1, None, "a.xlsx"),
+    ]
+
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
 from services.special_strategy_image_service import build_strategy_image_path
+import services.special_strategy_runtime as runtime
 from services.special_strategy_runtime import _prune_runtime_artifacts, load_base_config, run_artifact_paths
 
 
@@ -91,6 +93,27 @@ class SpecialStrategyRuntimeConfigCleanupTests(unittest.TestCase):
                 self.assertIn(f"special_strategy_run_{stamp}", remaining_dirs)
             self.assertIn("runtime_state.json", remaining)
 
+    def test_artifact_prune_runs_in_background_once_per_facility(self) -> None:
+        release = threading.Event()
+        calls: list[str] = []
+
+        def slow_prune(code: str) -> None:
+            calls.append(code)
+            release.wait(5)
+
+        with patch("services.special_strategy_runtime._prune_runtime_artifacts", side_effect=slow_prune):
+            runtime._schedule_runtime_artifact_prune("wc19-1d")
+            runtime._schedule_runtime_artifact_prune("WC19-1D")
+            self.assertEqual(runtime._PRUNE_PENDING, {"WC19-1D"})
+
+            release.set()
+            for thread in threading.enumerate():
+                if thread.name.startswith("special-strategy-prune-"):
+                    thread.join(5)
+
+        self.assertEqual(calls, ["WC19-1D"])
+        self.assertEqual(runtime._PRUNE_PENDING, set())
+
     def test_run_artifact_paths_groups_each_run_into_its_own_directory(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             report_root = Path(tmp) / "reports"
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, text
+
+import services.special_strategy_state_db as state_db
+from services import special_strategy_snapshot_codec as codec
+from shiyou_db import database
+
+
+def _result_payload(rows: int = 400) -> dict:
+    members = [
+        {"JointA": f"J{index:04d}", "JointB": f"J{index + 1:04d}", "risk_level": "II", "score": index * 0.5, "year": 2026}
+        for index in range(rows)
+    ]
+    return {
+        "context": {
+            "platform_name": "WC19-1D",
+            "summary": {"member_count": rows},
+            "member_rows": members[:50],
+            "empty_rows": [],
+        },
+        "member_risk_rows_full": members,
+        "node_risk_rows_full": [{"Joint": "J0001", "level": "III"}, {"Joint": "J0002", "level": "IV", "note": "补测"}],
+        "state": {"facility_code": "WC19-1D", "db_run_id": 12},
+    }
+
+
+def test_tables_round_trip_and_shrink() -> None:
+    payload = _result_payload()
+    skeleton, tables = codec.split_result_tables(payload)
+
+    by_name = {table.name: table for table in tables}
+    assert set(by_name) == {"context.member_rows", "member_risk_rows_full", "node_risk_rows_full"}
+    assert by_name["member_risk_rows_full"].encoding == codec.ENCODING_COLUMNS
+    # 字段不一致的表按行存储，原样还原。
+    assert by_name["node_risk_rows_full"].encoding == codec.ENCODING_ROWS
+    assert skeleton["member_risk_rows_full"] == {codec.TABLE_MARKER: "member_risk_rows_full"}
+    assert skeleton["context"]["empty_rows"] == []
+
+    decoded = {
+        table.name: codec.decode_table(table.encoding, table.columns, table.data)
+        for table in tables
+    }
+    assert codec.merge_result_tables(skeleton, decoded) == payload
+
+    legacy_size = len(json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))
+    columnar_size = len(json.dumps(skeleton).encode("utf-8")) + sum(len(table.data) for table in tables)
+    assert columnar_size * 10 < legacy_size
+
+
+def test_unselected_tables_are_left_out() -> None:
+    payload = _result_payload(rows=5)
+    skeleton, tables = codec.split_result_tables(payload)
+    selected = {
+        table.name: codec.decode_table(table.encoding, table.columns, table.data)
+        for table in tables
+        if codec.table_selected(table.name, ("context",))
+    }
+
+    merged = codec.merge_result_tables(skeleton, selected)
+    assert merged["context"] == payload["context"]
+    assert "member_risk_rows_full" not in merged
+    assert merged["state"] == payload["state"]
+
+
+@pytest.fixture()
+def sqlite_state_db(tmp_path: Path, monkeypatch):
+    engine = database.build_engine_from_url(f"sqlite:///{(tmp_path / 'strategy.sqlite3').as_posix()}")
+
+    @event.listens_for(engine, "connect")
+    def _register_char_length(dbapi_connection, _record):
+        dbapi_connection.create_function("CHAR_LENGTH", 1, lambda value: None if value is None else len(value))
+
+    engine.dispose()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE special_strategy_result_snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER, "
+                "facility_code TEXT NOT NULL, result_json TEXT NOT NULL, result_format TEXT, "
+                "created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE special_strategy_result_tables (id INTEGER PRIMARY KEY AUTOINCREMENT, snapshot_id INTEGER NOT NULL, "
+                "table_name TEXT NOT NULL, row_count INTEGER NOT NULL DEFAULT 0, columns_json TEXT, encoding TEXT NOT NULL, "
+                "data BLOB NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            )
+        )
+        conn.execute(text(state_db._RUN_INDEX_DDL))
+    monkeypatch.setattr(state_db, "is_strategy_state_db_configured", lambda _config_path=None: True)
+    monkeypatch.setattr(state_db, "ensure_strategy_result_table", lambda _config_path=None: None)
+    monkeypatch.setattr(state_db, "_get_engine", lambda _config_path=None: engine)
+    return engine
+
+
+def test_snapshot_is_saved_columnar_and_loaded_per_table(sqlite_state_db) -> None:
+    payload = _result_payload()
+    snapshot_id = state_db.save_strategy_result_snapshot(facility_code="WC19-1D", run_id=12, result_payload=payload)
+
+    with sqlite_state_db.connect() as conn:
+        header = conn.execute(
+            text("SELECT result_json, result_format FROM special_strategy_result_snapshots WHERE id = :id"),
+            {"id": snapshot_id},
+        ).one()
+        stored_tables = conn.execute(text("SELECT COUNT(*) FROM special_strategy_result_tables")).scalar()
+    assert header.result_format == codec.COLUMNAR_FORMAT
+    assert "J0399" not in header.result_json
+    assert stored_tables == 3
+
+    full = state_db.load_strategy_result_snapshot_by_run(12)
+    assert full["id"] == snapshot_id
+    assert "result_format" not in full
+    assert full["result_json"] == payload
+
+    details = state_db.load_latest_strategy_result_snapshot(
+        "WC19-1D", tables=("member_risk_rows_full", "node_risk_rows_full")
+    )["result_json"]
+    assert details["member_risk_rows_full"] == payload["member_risk_rows_full"]
+    assert "member_rows" not in details["context"]
+    assert details["context"]["platform_name"] == "WC19-1D"
+
+    state_only = state_db.load_strategy_result_snapshot_by_run(12, tables=())["result_json"]
+    assert state_only["state"] == payload["state"]
+    assert "member_risk_rows_full" not in state_only
+
+
+def test_result_tables_load_in_one_query(sqlite_state_db) -> None:
+    payload = _result_payload()
+    state_db.save_strategy_result_snapshot(facility_code="WC19-1D", run_id=12, result_payload=payload)
+    statements: list[str] = []
+
+    @event.listens_for(sqlite_state_db, "before_cursor_execute")
+    def _record(_conn, _cursor, statement, _parameters, _context, _executemany):
+        if "special_strategy_result_tables" in statement:
+            statements.append(statement)
+
+    full = state_db.load_strategy_result_snapshot_by_run(12)["result_json"]
+    context_only = state_db.load_strategy_result_snapshot_by_run(12, tables=("context",))["result_json"]
+
+    assert full == payload
+    assert context_only["context"] == payload["context"]
+    assert "member_risk_rows_full" not in context_only
+    assert len(statements) == 2
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import ast
+import importlib
+import sys
+from pathlib import Path
+
+from core import import_profiler
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 启动阶段必然执行的模块：main.py 本身，以及主窗口显示后预热任务导入的模块。
+STARTUP_MODULES = (
+    "main",
+    "services.preheat_scheduler",
+    "services.platform_load_preheat",
+    "services.reference_mirror",
+    "services.schema_migrations",
+    "pages.oilfield_water_level_page",
+)
+
+
+def _preheat_imports() -> set[str]:
+    tree = ast.parse((ROOT / "main.py").read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == "_startup_preheat_tasks":
+            return {
+                item.args[0].value
+                for item in ast.walk(node)
+                if isinstance(item, ast.Call) and getattr(item.func, "id", "") == "lazy_call"
+            }
+    raise AssertionError("_startup_preheat_tasks not found in main.py")
+
+
+def test_startup_preheat_modules_are_covered() -> None:
+    modules = _preheat_imports()
+    assert modules and modules <= set(STARTUP_MODULES)
+
+
+def test_startup_does_not_import_heavy_packages() -> None:
+    assert import_profiler.heavy_startup_imports(STARTUP_MODULES, ROOT) == {}
+
+
+def test_preheat_modules_do_not_reach_excel_reader() -> None:
+    # read_table_xls 在方法里导入 pandas，静态检查看不到；预热路径上不应出现这个模块。
+    assert "pages.read_table_xls" not in import_profiler.startup_import_graph(STARTUP_MODULES, ROOT)
+
+
+def test_static_graph_skips_function_level_imports(tmp_path: Path) -> None:
+    package = tmp_path / "demo_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "entry.py").write_text(
+        "from typing import TYPE_CHECKING\n"
+        "from . import helper\n"
+        "if TYPE_CHECKING:\n"
+        "    import numpy\n"
+        "def load():\n"
+        "    import pandas\n",
+        encoding="utf-8",
+    )
+    (package / "helper.py").write_text("try:\n    import openpyxl\nexcept ImportError:\n    openpyxl = None\n", encoding="utf-8")
+
+    graph = import_profiler.startup_import_graph(["demo_pkg.entry"], tmp_path)
+    assert set(graph) == {"demo_pkg", "demo_pkg.entry", "demo_pkg.helper"}
+    assert import_profiler.heavy_startup_imports(["demo_pkg.entry"], tmp_path) == {"openpyxl": ["demo_pkg.helper"]}
+
+
+def test_profiler_records_self_time_and_milestones(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "profiled_outer.py").write_text("import profiled_inner\nVALUE = profiled_inner.VALUE + 1\n", encoding="utf-8")
+    (tmp_path / "profiled_inner.py").write_text("import time\ntime.sleep(0.02)\nVALUE = 1\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import_profiler.reset_import_profile()
+    assert import_profiler.install_import_profiler(force=True)
+    try:
+        importlib.invalidate_caches()
+        module = importlib.import_module("profiled_outer")
+        import_profiler.mark_startup("demo_loaded")
+        report = import_profiler.import_report(limit=500)
+    finally:
+        import_profiler.uninstall_import_profiler()
+        import_profiler.reset_import_profile()
+        sys.modules.pop("profiled_outer", None)
+        sys.modules.pop("profiled_inner", None)
+
+    assert module.VALUE == 2
+    timings = {item["module"]: item for item in report["slowest_modules"]}
+    assert timings["profiled_inner"]["imported_by"] == "profiled_outer"
+    assert timings["profiled_inner"]["self_ms"] >= 15
+    assert timings["profiled_outer"]["total_ms"] >= timings["profiled_inner"]["total_ms"]
+    assert timings["profiled_outer"]["self_ms"] < timings["profiled_inner"]["self_ms"]
+    assert [item["name"] for item in report["milestones"]] == ["demo_loaded"]